@@ -7,6 +7,15 @@ Step: P21P8S1
 Task: P21P8S1T1 - Async Persistent Memory Implementation
 
 Enable concurrent memory operations with persistence support for Phase 22 arbitration logic.
+Nodes are stored as compact records in append-only segment files (see
+memory_segments.py) rather than one JSON file per node, and a background
+task compacts away overwritten, deleted and expired nodes. Agent, context
+and type indexes are ordered by timestamp and persisted (see
+memory_index.py), so range queries bisect and restarts skip the rescan.
+Queries take no lock: each resolves node IDs from the index in a single
+event loop step, a point-in-time snapshot, then loads nodes from the
+cache and segment store while writes proceed. Writes, cleanup, index
+rebuilds and compaction are serialized by one write lock.
 
 Author: GitBridge Development Team
 Date: 2025-06-19
@@ -18,14 +27,18 @@ import logging
 import asyncio
 import aiofiles
 import os
+from contextlib import contextmanager
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone, timedelta
-from collections import defaultdict
+from collections import OrderedDict, Counter
 import hashlib
 import pickle
 from pathlib import Path
 
+from memory_index import MemoryIndex, ALL_NODES
+from memory_segments import SegmentStore
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -74,28 +87,71 @@ class AsyncPersistentMemory:
     
     Features:
     - Async memory operations with thread safety
-    - Persistent storage with file-based backend
+    - Persistent storage in append-only segment files
     - Temporal querying with time range support
-    - Memory indexing and caching
-    - Concurrent access support
+    - Memory indexing and access-ordered LRU caching
+    - Lock-free queries against point-in-time index snapshots
+    - Writes and compaction serialized by a write lock
+    - Background compaction of deleted and expired nodes
     """
     
-    def __init__(self, storage_path: str = "memory_storage", cache_size: int = 1000):
+    def __init__(
+        self,
+        storage_path: str = "memory_storage",
+        cache_size: int = 1000,
+        segment_size: int = 64 * 1024 * 1024,
+        compaction_threshold: float = 0.5,
+        compaction_interval: float = 300.0,
+        retention_days: Optional[int] = None,
+        index_checkpoint_threshold: int = 10000,
+        read_batch_size: int = 256
+    ):
         """
         Initialize async persistent memory.
         
         Args:
             storage_path: Directory for persistent storage
             cache_size: Maximum number of nodes in memory cache
+            segment_size: Bytes per segment file before a new one is started
+            compaction_threshold: Garbage ratio at which a segment is compacted
+            compaction_interval: Seconds between background compaction runs
+            retention_days: Nodes older than this are removed by the background
+                task (None keeps nodes until cleanup_old_nodes_async is called)
+            index_checkpoint_threshold: Logged index changes before the index
+                snapshot is rewritten
+            read_batch_size: Cache misses per storage read when a query loads
+                many nodes; batches are read concurrently
         """
         self.storage_path = Path(storage_path)
         self.cache_size = cache_size
-        self.cache: Dict[str, MemoryNode] = {}
-        self.index: Dict[str, List[str]] = defaultdict(list)
-        self.temporal_index: Dict[str, List[str]] = defaultdict(list)
-        self._lock = asyncio.Lock()
+        self.cache: "OrderedDict[str, MemoryNode]" = OrderedDict()  # Least recently used first
+        self.read_batch_size = max(1, read_batch_size)
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_evictions = 0
+        self._write_lock = asyncio.Lock()
+        
+        # In-flight reads by the write generation they started at; nodes
+        # written since a read started are not cached from that read
+        self._write_generation = 0
+        self._written: Dict[str, int] = {}
+        self._active_reads: Counter = Counter()
+        self._reads_idle = asyncio.Event()
+        self._reads_idle.set()
         self._ensure_storage_directory()
         
+        # Time-ordered agent, context and type indexes
+        self.index = MemoryIndex(str(self.storage_path / "indexes"), checkpoint_threshold=index_checkpoint_threshold)
+        
+        # Segment storage
+        self.compaction_threshold = compaction_threshold
+        self.compaction_interval = compaction_interval
+        self.retention_days = retention_days
+        self.store = SegmentStore(str(self.storage_path / "segments"), segment_size=segment_size)
+        self._compaction_task: Optional[asyncio.Task] = None
+        self._migrate_node_files()
+        self._open_indexes()
+        
         logger.info(f"[P21P8S1T1] AsyncPersistentMemory initialized with storage: {storage_path}")
         
     def _ensure_storage_directory(self):
@@ -103,10 +159,75 @@ class AsyncPersistentMemory:
         self.storage_path.mkdir(parents=True, exist_ok=True)
         
         # Create subdirectories for organization
-        (self.storage_path / "nodes").mkdir(exist_ok=True)
         (self.storage_path / "indexes").mkdir(exist_ok=True)
         (self.storage_path / "metadata").mkdir(exist_ok=True)
         
+    def _migrate_node_files(self):
+        """Move nodes from the older one-file-per-node layout into segments."""
+        nodes_dir = self.storage_path / "nodes"
+        if not nodes_dir.is_dir():
+            return
+            
+        records = []
+        for node_file in nodes_dir.glob("*.json"):
+            try:
+                node = self._node_from_dict(json.loads(node_file.read_text()))
+                records.append((node.node_id, self._encode_node(node)))
+            except Exception as e:
+                logger.warning(f"[P21P8S1T1] Skipping unreadable node file {node_file}: {e}")
+        self.store.put_many(records)
+        self.store.flush()
+        nodes_dir.rename(self.storage_path / "nodes.migrated")
+        logger.info(f"[P21P8S1T1] Migrated {len(records)} node files into segment storage")
+        
+    def _open_indexes(self):
+        """Load persisted indexes and reconcile them with stored node IDs."""
+        if not self.index.load():
+            self._load_indexes()
+            self.index.checkpoint()
+            return
+            
+        # Writes persist the node before indexing it, so a crash can leave
+        # stored nodes unindexed or, after a delete, indexed nodes missing
+        stored = set(self.store.keys())
+        indexed = self.index.node_ids()
+        for node_id in indexed - stored:
+            self.index.remove(node_id)
+        missing = stored - indexed
+        for payload in self.store.get_many(missing).values():
+            self._index_node(self._decode_node(payload))
+        if missing or indexed - stored:
+            logger.info(f"[P21P8S1T1] Reconciled indexes: {len(missing)} added, {len(indexed - stored)} removed")
+            
+    def _load_indexes(self, index: Optional[MemoryIndex] = None):
+        """Build the indexes (or the given index) from every stored node."""
+        for _, payload in self.store.scan():
+            self._index_node(self._decode_node(payload), index)
+            
+    @staticmethod
+    def _encode_node(node: MemoryNode) -> bytes:
+        """Serialize a node as a compact JSON record."""
+        node_data = asdict(node)
+        node_data['timestamp'] = node.timestamp.isoformat()
+        return json.dumps(node_data, separators=(',', ':'), default=str).encode('utf-8')
+        
+    @classmethod
+    def _decode_node(cls, payload: bytes) -> MemoryNode:
+        return cls._node_from_dict(json.loads(payload))
+        
+    @staticmethod
+    def _node_from_dict(data: Dict[str, Any]) -> MemoryNode:
+        return MemoryNode(
+            node_id=data['node_id'],
+            agent_id=data['agent_id'],
+            task_context=data['task_context'],
+            result=data['result'],
+            timestamp=datetime.fromisoformat(data['timestamp']),
+            metadata=data['metadata'],
+            links=data['links'],
+            persistence_hash=data.get('persistence_hash')
+        )
+        
     async def add_node_async(self, node: MemoryNode) -> str:
         """
         Add a memory node asynchronously with immediate persistence.
@@ -117,19 +238,14 @@ class AsyncPersistentMemory:
         Returns:
             str: Node ID of the added node
         """
-        async with self._lock:
+        async with self._write_lock:
             try:
-                # Add to cache
-                self.cache[node.node_id] = node
-                
-                # Update indexes
-                await self._update_indexes_async(node)
-                
-                # Persist to storage
+                # Persist to storage, then index and cache
                 await self._persist_node_async(node)
-                
-                # Manage cache size
-                await self._manage_cache_size_async()
+                await self._update_indexes_async(node)
+                self._mark_written(node.node_id)
+                self._cache_put(node)
+                self._start_compaction()
                 
                 logger.info(f"[P21P8S1T1] Added node {node.node_id} with persistence")
                 return node.node_id
@@ -140,45 +256,80 @@ class AsyncPersistentMemory:
                 
     async def _update_indexes_async(self, node: MemoryNode):
         """Update memory indexes asynchronously."""
-        # Agent index
-        self.index[f"agent:{node.agent_id}"].append(node.node_id)
-        
-        # Context index
-        self.index[f"context:{node.task_context}"].append(node.node_id)
+        self._index_node(node)
         
-        # Temporal index (by date)
-        date_key = node.timestamp.strftime('%Y-%m-%d')
-        self.temporal_index[date_key].append(node.node_id)
-        
-        # Type index
-        node_type = node.metadata.get('type', 'general')
-        self.index[f"type:{node_type}"].append(node.node_id)
+    def _index_node(self, node: MemoryNode, index: Optional[MemoryIndex] = None):
+        """Add a node to the agent, context and type indexes."""
+        (self.index if index is None else index).add(
+            node.node_id,
+            node.timestamp.timestamp(),
+            node.agent_id,
+            node.task_context,
+            node.metadata.get('type', 'general')
+        )
         
     async def _persist_node_async(self, node: MemoryNode):
         """Persist node to storage asynchronously."""
-        node_file = self.storage_path / "nodes" / f"{node.node_id}.json"
-        
-        # Convert node to dict for JSON serialization
-        node_data = asdict(node)
-        node_data['timestamp'] = node.timestamp.isoformat()
-        
-        async with aiofiles.open(node_file, 'w') as f:
-            await f.write(json.dumps(node_data, indent=2, default=str))
+        # An unsynced append is a single buffered write; doing it in place
+        # keeps the write lock from being held across a thread hand-off,
+        # which under heavy query load costs a full event loop round
+        if self.store.fsync:
+            await asyncio.to_thread(self.store.put, node.node_id, self._encode_node(node))
+        else:
+            self.store.put(node.node_id, self._encode_node(node))
             
-    async def _manage_cache_size_async(self):
-        """Manage cache size using LRU eviction."""
-        if len(self.cache) <= self.cache_size:
-            return
+    def _cache_put(self, node: MemoryNode):
+        """Insert or refresh a node as most recently used, evicting beyond capacity."""
+        self.cache[node.node_id] = node
+        self.cache.move_to_end(node.node_id)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+            self.cache_evictions += 1
             
-        # Simple LRU: remove oldest nodes
-        sorted_nodes = sorted(self.cache.items(), key=lambda x: x[1].timestamp)
-        nodes_to_remove = len(self.cache) - self.cache_size
-        
-        for i in range(nodes_to_remove):
-            node_id, node = sorted_nodes[i]
-            del self.cache[node_id]
+    def _cache_loaded(self, node: MemoryNode, generation: int):
+        """Cache a node loaded from storage unless it was written since the read began."""
+        if self._written.get(node.node_id, 0) <= generation:
+            self._cache_put(node)
             
-        logger.info(f"[P21P8S1T1] Evicted {nodes_to_remove} nodes from cache")
+    def _mark_written(self, node_id: str):
+        """Record a node write so in-flight reads do not cache an older copy."""
+        self._write_generation += 1
+        if self._active_reads:
+            self._written[node_id] = self._write_generation
+            
+    @contextmanager
+    def _reading(self):
+        """
+        Track a lock-free read for the duration of the block.
+        
+        Yields:
+            int: Write generation the read started at
+        """
+        generation = self._write_generation
+        self._active_reads[generation] += 1
+        self._reads_idle.clear()
+        try:
+            yield generation
+        finally:
+            self._active_reads[generation] -= 1
+            if not self._active_reads[generation]:
+                del self._active_reads[generation]
+            if not self._active_reads:
+                self._written.clear()
+                self._reads_idle.set()
+            elif len(self._written) > self.cache_size:
+                oldest = min(self._active_reads)
+                self._written = {node_id: written for node_id, written in self._written.items() if written > oldest}
+                
+    def _cache_get(self, node_id: str) -> Optional[MemoryNode]:
+        """Look up a cached node and mark it most recently used."""
+        node = self.cache.get(node_id)
+        if node is None:
+            self.cache_misses += 1
+            return None
+        self.cache.move_to_end(node_id)
+        self.cache_hits += 1
+        return node
         
     async def query_temporal_async(self, context: str, time_range: TimeRange) -> List[MemoryNode]:
         """
@@ -191,20 +342,16 @@ class AsyncPersistentMemory:
         Returns:
             List[MemoryNode]: Nodes matching the criteria
         """
-        async with self._lock:
+        with self._reading() as generation:
             try:
-                # Get all nodes for the context
-                context_nodes = self.index.get(f"context:{context}", [])
+                # Bisect the context's time-ordered index to the range
+                node_ids = self.index.range(
+                    f"context:{context}",
+                    time_range.start.timestamp(),
+                    time_range.end.timestamp()
+                )
                 
-                # Filter by time range
-                matching_nodes = []
-                for node_id in context_nodes:
-                    node = await self._get_node_async(node_id)
-                    if node and time_range.start <= node.timestamp <= time_range.end:
-                        matching_nodes.append(node)
-                        
-                # Sort by timestamp
-                matching_nodes.sort(key=lambda x: x.timestamp)
+                matching_nodes = await self._get_nodes_async(node_ids, generation)
                 
                 logger.info(f"[P21P8S1T1] Temporal query returned {len(matching_nodes)} nodes")
                 return matching_nodes
@@ -216,142 +363,204 @@ class AsyncPersistentMemory:
     async def _get_node_async(self, node_id: str) -> Optional[MemoryNode]:
         """Get a node from cache or storage asynchronously."""
         # Check cache first
-        if node_id in self.cache:
-            return self.cache[node_id]
+        node = self._cache_get(node_id)
+        if node is not None:
+            return node
             
         # Load from storage
-        node_file = self.storage_path / "nodes" / f"{node_id}.json"
-        if not node_file.exists():
+        if node_id not in self.store:
             return None
             
         try:
-            async with aiofiles.open(node_file, 'r') as f:
-                data = json.loads(await f.read())
+            with self._reading() as generation:
+                payload = await asyncio.to_thread(self.store.get, node_id)
+                if payload is None:
+                    return None
+                node = self._decode_node(payload)
+                
+                # Add to cache
+                self._cache_loaded(node, generation)
                 
-            # Reconstruct node
-            node = MemoryNode(
-                node_id=data['node_id'],
-                agent_id=data['agent_id'],
-                task_context=data['task_context'],
-                result=data['result'],
-                timestamp=datetime.fromisoformat(data['timestamp']),
-                metadata=data['metadata'],
-                links=data['links'],
-                persistence_hash=data.get('persistence_hash')
-            )
-            
-            # Add to cache
-            self.cache[node_id] = node
-            
             return node
             
         except Exception as e:
             logger.error(f"[P21P8S1T1] Failed to load node {node_id}: {e}")
             return None
             
-    async def query_by_agent_async(self, agent_id: str) -> List[MemoryNode]:
-        """Query all nodes by a specific agent."""
-        async with self._lock:
-            agent_nodes = self.index.get(f"agent:{agent_id}", [])
-            nodes = []
+    async def _get_nodes_async(self, node_ids: List[str], generation: int) -> List[MemoryNode]:
+        """
+        Get many nodes, reading every cache miss in concurrent storage batches.
+        
+        Args:
+            node_ids: Node IDs to load
+            generation: Write generation the calling read started at
             
-            for node_id in agent_nodes:
-                node = await self._get_node_async(node_id)
-                if node:
-                    nodes.append(node)
+        Returns:
+            List[MemoryNode]: Nodes found, in the order of node_ids
+        """
+        found: Dict[str, MemoryNode] = {}
+        misses = []
+        for node_id in node_ids:
+            node = self._cache_get(node_id)
+            if node is not None:
+                found[node_id] = node
+            else:
+                misses.append(node_id)
+                
+        if misses:
+            batches = [misses[i:i + self.read_batch_size] for i in range(0, len(misses), self.read_batch_size)]
+            results = await asyncio.gather(*(asyncio.to_thread(self.store.get_many, batch) for batch in batches))
+            for payloads in results:
+                for node_id, payload in payloads.items():
+                    try:
+                        node = self._decode_node(payload)
+                    except Exception as e:
+                        logger.error(f"[P21P8S1T1] Failed to load node {node_id}: {e}")
+                        continue
+                    found[node_id] = node
+                    self._cache_loaded(node, generation)
                     
-            return sorted(nodes, key=lambda x: x.timestamp)
+        return [found[node_id] for node_id in node_ids if node_id in found]
             
-    async def query_by_type_async(self, node_type: str) -> List[MemoryNode]:
-        """Query all nodes by type."""
-        async with self._lock:
-            type_nodes = self.index.get(f"type:{node_type}", [])
-            nodes = []
+    async def query_by_agent_async(self, agent_id: str, time_range: Optional[TimeRange] = None) -> List[MemoryNode]:
+        """Query all nodes by a specific agent, oldest first, optionally within a time range."""
+        with self._reading() as generation:
+            agent_nodes = self._range_ids(f"agent:{agent_id}", time_range)
+            return await self._get_nodes_async(agent_nodes, generation)
             
-            for node_id in type_nodes:
-                node = await self._get_node_async(node_id)
-                if node:
-                    nodes.append(node)
-                    
-            return sorted(nodes, key=lambda x: x.timestamp)
+    async def query_by_type_async(self, node_type: str, time_range: Optional[TimeRange] = None) -> List[MemoryNode]:
+        """Query all nodes by type, oldest first, optionally within a time range."""
+        with self._reading() as generation:
+            type_nodes = self._range_ids(f"type:{node_type}", time_range)
+            return await self._get_nodes_async(type_nodes, generation)
             
+    def _range_ids(self, key: str, time_range: Optional[TimeRange]) -> List[str]:
+        """Node IDs under an index key, limited to a time range if given."""
+        if time_range is None:
+            return self.index.ids(key)
+        return self.index.range(key, time_range.start.timestamp(), time_range.end.timestamp())
+        
     async def get_memory_stats_async(self) -> Dict[str, Any]:
         """Get memory statistics asynchronously."""
-        async with self._lock:
-            total_nodes = len(self.cache)
-            total_agents = len([k for k in self.index.keys() if k.startswith('agent:')])
-            total_contexts = len([k for k in self.index.keys() if k.startswith('context:')])
-            
-            # Calculate storage size
-            storage_size = 0
-            for node_file in (self.storage_path / "nodes").glob("*.json"):
-                storage_size += node_file.stat().st_size
-                
-            return {
-                "total_nodes": total_nodes,
-                "total_agents": total_agents,
-                "total_contexts": total_contexts,
-                "cache_size": len(self.cache),
-                "cache_max_size": self.cache_size,
-                "storage_size_bytes": storage_size,
-                "storage_path": str(self.storage_path)
-            }
+        # Every value is taken in one event loop step, without the write lock
+        total_nodes = len(self.store)
+        total_agents = len(self.index.keys('agent:'))
+        total_contexts = len(self.index.keys('context:'))
+        
+        # Storage size is tracked by the segment store
+        storage_stats = self.store.stats()
             
+        return {
+            "total_nodes": total_nodes,
+            "total_agents": total_agents,
+            "total_contexts": total_contexts,
+            "cache_size": len(self.cache),
+            "cache_max_size": self.cache_size,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_hit_rate": self.cache_hits / (self.cache_hits + self.cache_misses) if self.cache_hits + self.cache_misses else 0.0,
+            "cache_evictions": self.cache_evictions,
+            "active_reads": sum(self._active_reads.values()),
+            "storage_size_bytes": storage_stats["total_bytes"],
+            "storage": storage_stats,
+            "storage_path": str(self.storage_path)
+        }
+        
     async def cleanup_old_nodes_async(self, days_old: int = 30) -> int:
         """Clean up nodes older than specified days."""
-        async with self._lock:
+        async with self._write_lock:
             cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_old)
             removed_count = 0
             
-            # Find old nodes
-            old_nodes = []
-            for node_id, node in self.cache.items():
-                if node.timestamp < cutoff_date:
-                    old_nodes.append(node_id)
+            # Old nodes are a prefix of the time-ordered index
+            old_nodes = self.index.before(ALL_NODES, cutoff_date.timestamp())
                     
-            # Remove from cache and storage
+            # Remove from cache, storage and indexes (space is reclaimed by compaction)
             for node_id in old_nodes:
-                del self.cache[node_id]
-                
-                # Remove from storage
-                node_file = self.storage_path / "nodes" / f"{node_id}.json"
-                if node_file.exists():
-                    node_file.unlink()
-                    
+                self.cache.pop(node_id, None)
+                await asyncio.to_thread(self.store.delete, node_id)
+                self.index.remove(node_id)
+                self._mark_written(node_id)
                 removed_count += 1
-                
-            # Clean up indexes
-            await self._rebuild_indexes_async()
             
             logger.info(f"[P21P8S1T1] Cleaned up {removed_count} old nodes")
             return removed_count
             
     async def _rebuild_indexes_async(self):
-        """Rebuild indexes from cache."""
-        # Clear existing indexes
-        self.index.clear()
-        self.temporal_index.clear()
+        """Rebuild indexes from storage."""
+        async with self._write_lock:
+            # Build aside and swap in, so queries never see a partial index
+            rebuilt = MemoryIndex()
+            await asyncio.to_thread(self._load_indexes, rebuilt)
+            self.index.replace(rebuilt)
+        
+    async def compact_async(self, threshold: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Compact segments holding deleted or overwritten nodes.
+        
+        Holds the write lock, so no node is written meanwhile. Queries keep
+        running: the segment store moves live records without changing what
+        any node ID resolves to, and reads of a moved record are retried.
+        
+        Args:
+            threshold: Garbage ratio at which a segment is compacted
+                (defaults to compaction_threshold)
+                
+        Returns:
+            Dict with segments compacted and bytes reclaimed
+        """
+        threshold = self.compaction_threshold if threshold is None else threshold
+        async with self._write_lock:
+            return await asyncio.to_thread(self.store.compact, threshold)
         
-        # Rebuild from cache
-        for node in self.cache.values():
-            await self._update_indexes_async(node)
+    def _start_compaction(self):
+        """Start the background compaction task on the running loop."""
+        if self._compaction_task is None or self._compaction_task.done():
+            self._compaction_task = asyncio.get_running_loop().create_task(self._compaction_loop())
+            
+    async def _compaction_loop(self):
+        """Periodically expire old nodes and compact garbage-heavy segments."""
+        while True:
+            await asyncio.sleep(self.compaction_interval)
+            try:
+                if self.retention_days is not None:
+                    await self.cleanup_old_nodes_async(self.retention_days)
+                if self.store.garbage_ratio >= self.compaction_threshold:
+                    await self.compact_async()
+            except Exception as e:
+                logger.error(f"[P21P8S1T1] Background compaction failed: {e}")
+                
+    async def close_async(self):
+        """Stop background compaction, wait for in-flight queries and close segment storage."""
+        if self._compaction_task is not None:
+            self._compaction_task.cancel()
+            try:
+                await self._compaction_task
+            except asyncio.CancelledError:
+                pass
+            self._compaction_task = None
+        async with self._write_lock:
+            # Let in-flight queries finish their storage reads
+            await self._reads_idle.wait()
+            await asyncio.to_thread(self.store.close)
+            self.index.checkpoint()
+            self.index.close()
             
     async def export_memory_async(self, export_path: str) -> bool:
         """Export memory to file asynchronously."""
         try:
-            async with self._lock:
-                export_data = {
-                    "export_timestamp": datetime.now(timezone.utc).isoformat(),
-                    "total_nodes": len(self.cache),
-                    "nodes": [asdict(node) for node in self.cache.values()]
-                }
-                
-                async with aiofiles.open(export_path, 'w') as f:
-                    await f.write(json.dumps(export_data, indent=2, default=str))
-                    
-                logger.info(f"[P21P8S1T1] Memory exported to {export_path}")
-                return True
+            export_data = {
+                "export_timestamp": datetime.now(timezone.utc).isoformat(),
+                "total_nodes": len(self.cache),
+                "nodes": [asdict(node) for node in self.cache.values()]
+            }
+            
+            async with aiofiles.open(export_path, 'w') as f:
+                await f.write(json.dumps(export_data, indent=2, default=str))
                 
+            logger.info(f"[P21P8S1T1] Memory exported to {export_path}")
+            return True
+            
         except Exception as e:
             logger.error(f"[P21P8S1T1] Failed to export memory: {e}")
             return False
@@ -432,6 +641,8 @@ async def main():
     # Get stats
     stats = await memory.get_memory_stats_async()
     print(f"Memory stats: {stats}")
+    
+    await memory.close_async()
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+GitBridge Behavior Matrix
+Phase: GBP23
+Part: P23P2
+Step: P23P2S1
+Task: P23P2S1T2 - Vectorized Behavior Prediction
+
+Dense agents x dimensions view of a BehaviorModel. Each row holds an agent's
+trait values and pattern strengths (NaN where the agent has no such trait or
+pattern) next to its interaction counters, so reliability, collaboration and
+adaptability scores and the predict_behavior rules can be evaluated for many
+agents in one NumPy pass. Rows are refreshed lazily: the model marks changed
+agents and only their rows are rewritten before the next query.
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [P23P2 Schema]
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+NUMERIC_PREDICTIONS = ("reliability", "collaboration_tendency", "adaptability", "expected_success_rate")
+DECISION_SPEEDS = np.array(["slow", "medium", "fast"], dtype=object)
+RISK_TOLERANCES = np.array(["low", "medium", "high"], dtype=object)
+COMMUNICATION_STYLES = np.array(["reserved", "neutral", "expressive"], dtype=object)
+
+class BehaviorMatrix:
+    """
+    Vectorized trait, pattern and interaction matrix for behavior prediction.
+
+    Phase: GBP23
+    Part: P23P2
+    Step: P23P2S1
+    Task: P23P2S1T2 - Core Implementation
+
+    Features:
+    - One row per agent, one column per trait or pattern dimension
+    - Lazy row refresh for agents changed since the last query
+    - Batched predict_behavior equivalent for any set of agents
+    - Top-k agents by a predicted score via partial selection
+    """
+
+    def __init__(self, trait_names: Iterable[str] = (), pattern_names: Iterable[str] = (), capacity: int = 64):
+        """
+        Initialize behavior matrix.
+
+        Args:
+            trait_names: Trait dimensions to allocate up front
+            pattern_names: Pattern dimensions to allocate up front
+            capacity: Initial number of agent rows
+        """
+        self._rows: Dict[str, int] = {}
+        self._agent_ids: List[str] = []
+        self._columns: Dict[str, int] = {}
+        self._values = np.full((max(1, capacity), 0), np.nan)
+        self._total = np.zeros(max(1, capacity))
+        self._successful = np.zeros(max(1, capacity))
+        self._specialized: Dict[str, Set[int]] = {}
+        self._row_specializations: List[Set[str]] = []
+        self._dirty: Set[str] = set()
+
+        for name in trait_names:
+            self._column(f"trait:{name}")
+        for name in pattern_names:
+            self._column(f"pattern:{name}")
+
+        # Statistics
+        self.rows_refreshed = 0
+
+    def __len__(self) -> int:
+        return len(self._agent_ids)
+
+    def invalidate(self, agent_ids: Iterable[str]) -> None:
+        """Mark agents whose rows must be rewritten before the next query."""
+        self._dirty.update(agent_ids)
+
+    def refresh(self, agents: Dict[str, Any]) -> int:
+        """
+        Rewrite the rows of agents changed since the last refresh.
+
+        Args:
+            agents: The model's agent_id -> AgentBehavior mapping
+
+        Returns:
+            int: Number of rows rewritten
+        """
+        dirty, self._dirty = self._dirty, set()
+        refreshed = 0
+        for agent_id in dirty:
+            agent = agents.get(agent_id)
+            if agent is not None:
+                self._write_row(agent)
+                refreshed += 1
+        self.rows_refreshed += refreshed
+        return refreshed
+
+    def rows_for(self, agent_ids: Optional[Iterable[str]] = None) -> Tuple[List[str], np.ndarray]:
+        """
+        Resolve agent IDs to row indices, skipping unknown agents.
+
+        Args:
+            agent_ids: Agents to select (None selects every agent)
+
+        Returns:
+            Tuple of (selected agent IDs, row index array)
+        """
+        if agent_ids is None:
+            return list(self._agent_ids), np.arange(len(self._agent_ids))
+        selected = [agent_id for agent_id in agent_ids if agent_id in self._rows]
+        return selected, np.fromiter((self._rows[agent_id] for agent_id in selected), dtype=np.intp, count=len(selected))
+
+    def predict(self, rows: np.ndarray, context: str = "general") -> Dict[str, np.ndarray]:
+        """
+        Evaluate BehaviorModel.predict_behavior for many rows at once.
+
+        Args:
+            rows: Row indices from rows_for
+            context: Context for prediction
+
+        Returns:
+            Dict of prediction name -> array aligned with rows
+        """
+        values = self._values[rows]
+        total = self._total[rows]
+        successful = self._successful[rows]
+
+        def column(key: str) -> np.ndarray:
+            index = self._columns.get(key)
+            return values[:, index] if index is not None else np.full(len(rows), np.nan)
+
+        with np.errstate(invalid='ignore'):
+            has_history = total > 0
+            success_rate = np.where(has_history, successful / np.maximum(total, 1), 0.0)
+
+            # AgentBehavior.reliability/collaboration/adaptability_score
+            consistency = column("pattern:consistency")
+            reliability = np.where(
+                has_history,
+                np.where(np.isnan(consistency), success_rate, (success_rate + (consistency + 1.0) / 2.0) / 2.0),
+                0.0
+            )
+            collaboration = column("pattern:collaboration")
+            collaboration = np.where(np.isnan(collaboration), 0.5, (collaboration + 1.0) / 2.0)
+            adaptability = column("pattern:adaptability")
+            adaptability = np.where(np.isnan(adaptability), 0.5, (adaptability + 1.0) / 2.0)
+
+            # Trait adjustments (NaN compares false, i.e. trait absent)
+            decision_speed = np.ones(len(rows), dtype=np.intp)
+            conscientiousness = column("trait:conscientiousness")
+            reliability = np.where(conscientiousness > 0.5, reliability * 1.2,
+                                   np.where(conscientiousness < -0.5, reliability * 0.8, reliability))
+            decision_speed[conscientiousness > 0.5] = 0
+            decision_speed[conscientiousness < -0.5] = 2
+
+            communication_style = np.ones(len(rows), dtype=np.intp)
+            extraversion = column("trait:extraversion")
+            collaboration = np.where(extraversion > 0.5, collaboration * 1.1, collaboration)
+            communication_style[extraversion > 0.5] = 2
+            communication_style[extraversion < -0.5] = 0
+
+            risk_tolerance = np.ones(len(rows), dtype=np.intp)
+            neuroticism = column("trait:neuroticism")
+            risk_tolerance[neuroticism > 0.5] = 0
+            risk_tolerance[neuroticism < -0.5] = 2
+
+            # Pattern adjustments override trait-based ones
+            speed = column("pattern:speed")
+            decision_speed[speed > 0.5] = 2
+            decision_speed[speed < -0.5] = 0
+            caution = column("pattern:caution")
+            risk_tolerance[caution > 0.5] = 0
+            risk_tolerance[caution < -0.5] = 2
+
+        expected_success_rate = success_rate
+        specialized_rows = self._specialized.get(context)
+        if specialized_rows:
+            specialized = np.isin(rows, np.fromiter(specialized_rows, dtype=np.intp, count=len(specialized_rows)))
+            expected_success_rate = np.where(specialized, success_rate * 1.2, success_rate)
+            reliability = np.where(specialized, reliability * 1.1, reliability)
+
+        return {
+            "reliability": reliability,
+            "collaboration_tendency": collaboration,
+            "adaptability": adaptability,
+            "expected_success_rate": expected_success_rate,
+            "communication_style": COMMUNICATION_STYLES[communication_style],
+            "decision_speed": DECISION_SPEEDS[decision_speed],
+            "risk_tolerance": RISK_TOLERANCES[risk_tolerance]
+        }
+
+    def top_k(self, rows: np.ndarray, scores: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        """
+        Highest scoring rows, best first.
+
+        Args:
+            rows: Row indices the scores belong to
+            scores: Score per row
+            k: Number of agents to return
+
+        Returns:
+            List of (agent_id, score) tuples
+        """
+        k = min(k, len(rows))
+        if k <= 0:
+            return []
+        candidates = np.argpartition(-scores, k - 1)[:k] if k < len(rows) else np.arange(len(rows))
+        candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(self._agent_ids[rows[i]], float(scores[i])) for i in candidates]
+
+    def _column(self, key: str) -> int:
+        index = self._columns.get(key)
+        if index is None:
+            index = self._columns[key] = self._values.shape[1]
+            self._values = np.hstack([self._values, np.full((self._values.shape[0], 1), np.nan)])
+        return index
+
+    def _write_row(self, agent: Any) -> None:
+        row = self._rows.get(agent.agent_id)
+        if row is None:
+            row = self._append_row(agent.agent_id)
+
+        # Columns may be added while writing, so index the array after each lookup
+        self._values[row, :] = np.nan
+        for name, trait in agent.personality_traits.items():
+            index = self._column(f"trait:{name}")
+            self._values[row, index] = trait.value
+        for name, pattern in agent.behavioral_patterns.items():
+            index = self._column(f"pattern:{name}")
+            self._values[row, index] = pattern.strength
+        self._total[row] = agent.total_interactions
+        self._successful[row] = agent.successful_interactions
+
+        previous = self._row_specializations[row]
+        for specialization in previous - agent.specializations:
+            self._specialized[specialization].discard(row)
+        for specialization in agent.specializations - previous:
+            self._specialized.setdefault(specialization, set()).add(row)
+        self._row_specializations[row] = set(agent.specializations)
+
+    def _append_row(self, agent_id: str) -> int:
+        row = len(self._agent_ids)
+        if row >= self._values.shape[0]:
+            capacity = self._values.shape[0] * 2
+            values = np.full((capacity, self._values.shape[1]), np.nan)
+            values[:row] = self._values
+            self._values = values
+            self._total = np.concatenate([self._total, np.zeros(capacity - row)])
+            self._successful = np.concatenate([self._successful, np.zeros(capacity - row)])
+        self._rows[agent_id] = row
+        self._agent_ids.append(agent_id)
+        self._row_specializations.append(set())
+        return row
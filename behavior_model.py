@@ -7,24 +7,35 @@ Step: P23P2S1
 Task: P23P2S1T1 - Agent Traits and Behavior Modeling
 
 Behavior model for storing agent traits, personality dimensions,
-and behavioral patterns for trust analysis.
+and behavioral patterns for trust analysis. Profiles are persisted either as
+one snapshot rewritten on every change, or incrementally: changed agents are
+marked dirty and written on a coalescing timer to per-agent or sharded files,
+so the cost of recording an interaction does not grow with the number of
+agents tracked.
 
 Author: GitBridge Development Team
 Date: 2025-06-19
 Schema: [P23P2 Schema]
 """
 
+import os
 import json
+import zlib
 import logging
-from typing import Dict, List, Any, Optional, Set
+from typing import Dict, List, Any, Optional, Set, Iterable, Tuple
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone
 from pathlib import Path
+from urllib.parse import quote
 import math
 import threading
 
+from behavior_matrix import BehaviorMatrix, NUMERIC_PREDICTIONS
+
 logger = logging.getLogger(__name__)
 
+PERSISTENCE_MODES = ("snapshot", "per_agent", "sharded")
+
 @dataclass
 class PersonalityTrait:
     """Represents a personality trait dimension."""
@@ -151,16 +162,35 @@ class BehaviorModel:
     - Interaction history and success rates
     - Specialization tracking
     - Predictive behavior modeling
+    - Batched interaction recording
+    - Optional incremental per-agent or sharded persistence
+    - Vectorized prediction and top-k ranking across agents
     """
     
-    def __init__(self, storage_path: str = "behavior_data", auto_save: bool = True):
+    def __init__(
+        self,
+        storage_path: str = "behavior_data",
+        auto_save: bool = True,
+        persistence_mode: str = "snapshot",
+        shard_count: int = 64,
+        flush_interval: float = 1.0
+    ):
         """
         Initialize behavior model.
         
         Args:
             storage_path: Directory for storing behavior data
             auto_save: Whether to automatically save changes
+            persistence_mode: "snapshot" rewrites every agent on each change,
+                "per_agent" and "sharded" write only changed agents, to one
+                file per agent or to shard_count shard files
+            shard_count: Number of shard files in "sharded" mode
+            flush_interval: Seconds changes are coalesced before being written
+                in "per_agent" and "sharded" modes
         """
+        if persistence_mode not in PERSISTENCE_MODES:
+            raise ValueError(f"Unsupported persistence mode: {persistence_mode}")
+            
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
         
@@ -170,6 +200,16 @@ class BehaviorModel:
         # Configuration
         self.auto_save = auto_save
         
+        # Persistence
+        self.persistence_mode = persistence_mode
+        self.shard_count = max(1, shard_count)
+        self.flush_interval = flush_interval
+        self._dirty: Set[str] = set()
+        self._serialized: Dict[str, str] = {}  # Cached JSON per agent for shard rewrites
+        self._shard_members: Dict[int, Set[str]] = {}
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_lock = threading.Lock()
+        
         # Default personality dimensions (Big Five + additional)
         self.default_traits = {
             "openness": "Openness to experience",
@@ -201,8 +241,15 @@ class BehaviorModel:
         # Thread safety
         self._lock = threading.RLock()
         
+        # Agents x dimensions view for batched prediction
+        self._matrix = BehaviorMatrix(self.default_traits, self.default_patterns)
+        
         # Load existing data
-        self._load_data()
+        if persistence_mode == "snapshot":
+            self._load_data()
+        else:
+            self._load_incremental()
+        self._matrix.invalidate(self.agents)
         
         logger.info(f"[P23P2S1T1] BehaviorModel initialized with {len(self.agents)} agents")
         
@@ -242,8 +289,8 @@ class BehaviorModel:
                     confidence=0.0
                 )
                 
-            if self.auto_save:
-                self._save_data()
+            self._shard_members.setdefault(self._shard_of(agent_id), set()).add(agent_id)
+            self._changed([agent_id])
                 
             logger.info(f"[P23P2S1T1] Added agent {agent_id} to behavior model")
             return True
@@ -294,8 +341,7 @@ class BehaviorModel:
                 
             agent.updated_at = datetime.now(timezone.utc)
             
-            if self.auto_save:
-                self._save_data()
+            self._changed([agent_id])
                 
             logger.debug(f"[P23P2S1T1] Updated trait {trait_name} for {agent_id}: {value:.3f}")
             return True
@@ -350,8 +396,7 @@ class BehaviorModel:
                 
             agent.updated_at = datetime.now(timezone.utc)
             
-            if self.auto_save:
-                self._save_data()
+            self._changed([agent_id])
                 
             logger.debug(f"[P23P2S1T1] Updated pattern {pattern_type} for {agent_id}: freq={frequency:.3f}, strength={strength:.3f}")
             return True
@@ -376,28 +421,58 @@ class BehaviorModel:
             bool: True if interaction was recorded successfully
         """
         with self._lock:
-            if agent_id not in self.agents:
-                logger.warning(f"[P23P2S1T1] Agent {agent_id} not found in behavior model")
+            if not self._apply_interaction(agent_id, success, metadata):
                 return False
                 
-            agent = self.agents[agent_id]
-            
-            agent.total_interactions += 1
-            if success:
-                agent.successful_interactions += 1
-            else:
-                agent.failed_interactions += 1
+            self._changed([agent_id])
                 
-            agent.updated_at = datetime.now(timezone.utc)
+            logger.debug(f"[P23P2S1T1] Recorded {'successful' if success else 'failed'} interaction for {agent_id}")
+            return True
             
-            if metadata:
-                agent.metadata.update(metadata)
+    def record_interactions_batch(self, interactions: Iterable[Dict[str, Any]]) -> int:
+        """
+        Record many interactions under one lock acquisition and one save.
+        
+        Args:
+            interactions: Dicts with agent_id and success, and optionally
+                context and metadata, as accepted by record_interaction
                 
-            if self.auto_save:
-                self._save_data()
+        Returns:
+            int: Number of interactions recorded (unknown agents are skipped)
+        """
+        with self._lock:
+            recorded = 0
+            touched: Set[str] = set()
+            for interaction in interactions:
+                agent_id = interaction['agent_id']
+                if self._apply_interaction(agent_id, interaction['success'], interaction.get('metadata')):
+                    recorded += 1
+                    touched.add(agent_id)
+                    
+            if touched:
+                self._changed(touched)
                 
-            logger.debug(f"[P23P2S1T1] Recorded {'successful' if success else 'failed'} interaction for {agent_id}")
-            return True
+            logger.debug(f"[P23P2S1T1] Recorded {recorded} interactions for {len(touched)} agents")
+            return recorded
+            
+    def _apply_interaction(self, agent_id: str, success: bool, metadata: Optional[Dict[str, Any]]) -> bool:
+        """Update interaction counters for an agent without persisting."""
+        agent = self.agents.get(agent_id)
+        if agent is None:
+            logger.warning(f"[P23P2S1T1] Agent {agent_id} not found in behavior model")
+            return False
+            
+        agent.total_interactions += 1
+        if success:
+            agent.successful_interactions += 1
+        else:
+            agent.failed_interactions += 1
+            
+        agent.updated_at = datetime.now(timezone.utc)
+        
+        if metadata:
+            agent.metadata.update(metadata)
+        return True
             
     def add_specialization(self, agent_id: str, specialization: str) -> bool:
         """
@@ -419,8 +494,7 @@ class BehaviorModel:
             agent.specializations.add(specialization)
             agent.updated_at = datetime.now(timezone.utc)
             
-            if self.auto_save:
-                self._save_data()
+            self._changed([agent_id])
                 
             logger.debug(f"[P23P2S1T1] Added specialization '{specialization}' for {agent_id}")
             return True
@@ -568,6 +642,62 @@ class BehaviorModel:
                 
             return predictions
             
+    def predict_behavior_many(
+        self,
+        agent_ids: Optional[Iterable[str]] = None,
+        context: str = "general"
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Predict behavior for many agents in one vectorized pass.
+        
+        Args:
+            agent_ids: Agents to predict for (None predicts for every agent)
+            context: Context for prediction
+            
+        Returns:
+            Dict mapping agent ID to the same predictions as predict_behavior;
+            unknown agents are omitted
+        """
+        with self._lock:
+            self._matrix.refresh(self.agents)
+            selected, rows = self._matrix.rows_for(agent_ids)
+            predictions = self._matrix.predict(rows, context)
+            
+        columns = {name: values.tolist() for name, values in predictions.items()}
+        return {
+            agent_id: {name: values[i] for name, values in columns.items()}
+            for i, agent_id in enumerate(selected)
+        }
+        
+    def top_agents(
+        self,
+        k: int = 5,
+        metric: str = "reliability",
+        context: str = "general",
+        agent_ids: Optional[Iterable[str]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Rank agents by a predicted score.
+        
+        Args:
+            k: Number of agents to return
+            metric: "reliability", "collaboration_tendency", "adaptability"
+                or "expected_success_rate"
+            context: Context for prediction
+            agent_ids: Candidate agents (None ranks every agent)
+            
+        Returns:
+            List of (agent_id, score) tuples, best first
+        """
+        if metric not in NUMERIC_PREDICTIONS:
+            raise ValueError(f"Unsupported ranking metric: {metric}")
+            
+        with self._lock:
+            self._matrix.refresh(self.agents)
+            _, rows = self._matrix.rows_for(agent_ids)
+            scores = self._matrix.predict(rows, context)[metric]
+            return self._matrix.top_k(rows, scores, k)
+            
     def get_statistics(self) -> Dict[str, Any]:
         """
         Get comprehensive statistics about the behavior model.
@@ -643,11 +773,119 @@ class BehaviorModel:
             else:
                 raise ValueError(f"Unsupported export format: {format}")
                 
+    def flush(self) -> int:
+        """
+        Write pending changes to disk now.
+        
+        Returns:
+            int: Number of files written
+        """
+        if self.persistence_mode == "snapshot":
+            with self._lock:
+                self._save_data()
+            return 1
+            
+        with self._flush_lock:
+            with self._lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                dirty, self._dirty = self._dirty, set()
+                serialized = {
+                    agent_id: json.dumps(self._agent_record(self.agents[agent_id]), default=str)
+                    for agent_id in dirty if agent_id in self.agents
+                }
+                if self.persistence_mode == "per_agent":
+                    writes = {self._agent_file(agent_id): content for agent_id, content in serialized.items()}
+                    owners = {self._agent_file(agent_id): {agent_id} for agent_id in serialized}
+                else:
+                    # A shard is rewritten from cached JSON; only dirty agents were re-serialized
+                    self._serialized.update(serialized)
+                    owners = {}
+                    for agent_id in dirty:
+                        owners.setdefault(self._shard_file(self._shard_of(agent_id)), set()).add(agent_id)
+                    writes = {
+                        self._shard_file(shard): '{"agents": [' + ', '.join(
+                            self._serialized[agent_id] for agent_id in sorted(self._shard_members.get(shard, ()))
+                        ) + ']}'
+                        for shard in {self._shard_of(agent_id) for agent_id in dirty}
+                    }
+                    
+            written = 0
+            for path, content in writes.items():
+                try:
+                    self._write_atomic(path, content)
+                    written += 1
+                except OSError as e:
+                    logger.error(f"[P23P2S1T1] Failed to save behavior data to {path}: {e}")
+                    # Keep the changes pending for the next flush
+                    with self._lock:
+                        self._dirty.update(owners[path])
+                    
+            if written:
+                logger.debug(f"[P23P2S1T1] Flushed {len(dirty)} agents to {written} files")
+            return written
+            
+    def close(self) -> None:
+        """Write pending changes and stop the flush timer."""
+        self.flush()
+        
+    def _changed(self, agent_ids: Iterable[str]) -> None:
+        """Mark agents stale in the behavior matrix and persist them."""
+        agent_ids = list(agent_ids)
+        self._matrix.invalidate(agent_ids)
+        self._persist(agent_ids)
+        
+    def _persist(self, agent_ids: Iterable[str]) -> None:
+        """
+        Persist changed agents according to the configured persistence mode.
+        
+        Args:
+            agent_ids: Agents whose state changed
+        """
+        if self.persistence_mode == "snapshot":
+            if self.auto_save:
+                self._save_data()
+            return
+            
+        # Dirty agents are tracked even without auto_save so flush() writes them
+        self._dirty.update(agent_ids)
+        if self.auto_save and self._flush_timer is None:
+            # Non-daemon, so changes still pending at interpreter exit get written
+            self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+            self._flush_timer.name = "behavior-model-flush"
+            self._flush_timer.start()
+            
+    def _shard_of(self, agent_id: str) -> int:
+        """Stable shard index for an agent (crc32, unlike hash(), is not salted per process)."""
+        return zlib.crc32(agent_id.encode('utf-8')) % self.shard_count
+        
+    def _agent_file(self, agent_id: str) -> Path:
+        return self.storage_path / "agents" / f"{quote(agent_id, safe='')}.json"
+        
+    def _shard_file(self, shard: int) -> Path:
+        return self.storage_path / "shards" / f"shard_{shard:04d}.json"
+        
+    @staticmethod
+    def _write_atomic(path: Path, content: str) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = path.with_suffix(".json.tmp")
+        with open(tmp_file, 'w') as f:
+            f.write(content)
+        os.replace(tmp_file, path)
+        
+    @staticmethod
+    def _agent_record(agent: AgentBehavior) -> Dict[str, Any]:
+        """Serializable form of an agent; specializations are stored as a list."""
+        record = asdict(agent)
+        record['specializations'] = sorted(agent.specializations)
+        return record
+        
     def _save_data(self) -> None:
         """Save behavior data to disk."""
         try:
             data = {
-                "agents": [asdict(agent) for agent in self.agents.values()],
+                "agents": [self._agent_record(agent) for agent in self.agents.values()],
                 "metadata": {
                     "saved_at": datetime.now(timezone.utc).isoformat(),
                     "version": "1.0.0"
@@ -675,50 +913,115 @@ class BehaviorModel:
                 
             # Load agents
             for agent_data in data.get('agents', []):
-                agent = AgentBehavior(
-                    agent_id=agent_data['agent_id'],
-                    created_at=datetime.fromisoformat(agent_data['created_at']),
-                    updated_at=datetime.fromisoformat(agent_data['updated_at']),
-                    total_interactions=agent_data['total_interactions'],
-                    successful_interactions=agent_data['successful_interactions'],
-                    failed_interactions=agent_data['failed_interactions'],
-                    specializations=set(agent_data.get('specializations', [])),
-                    metadata=agent_data.get('metadata', {})
-                )
-                
-                # Load personality traits
-                for trait_data in agent_data.get('personality_traits', {}).values():
-                    trait = PersonalityTrait(
-                        name=trait_data['name'],
-                        value=trait_data['value'],
-                        confidence=trait_data['confidence'],
-                        evidence_count=trait_data['evidence_count'],
-                        last_updated=datetime.fromisoformat(trait_data['last_updated']),
-                        metadata=trait_data.get('metadata', {})
-                    )
-                    agent.personality_traits[trait.name] = trait
-                    
-                # Load behavioral patterns
-                for pattern_data in agent_data.get('behavioral_patterns', {}).values():
-                    pattern = BehavioralPattern(
-                        pattern_type=pattern_data['pattern_type'],
-                        frequency=pattern_data['frequency'],
-                        strength=pattern_data['strength'],
-                        context=pattern_data['context'],
-                        confidence=pattern_data['confidence'],
-                        observation_count=pattern_data['observation_count'],
-                        first_observed=datetime.fromisoformat(pattern_data['first_observed']),
-                        last_observed=datetime.fromisoformat(pattern_data['last_observed']),
-                        metadata=pattern_data.get('metadata', {})
-                    )
-                    agent.behavioral_patterns[pattern.pattern_type] = pattern
-                    
+                agent = self._agent_from_record(agent_data)
                 self.agents[agent.agent_id] = agent
                 
             logger.info(f"[P23P2S1T1] Loaded behavior data: {len(self.agents)} agents")
             
         except Exception as e:
             logger.error(f"[P23P2S1T1] Failed to load behavior data: {e}")
+            
+    def _load_incremental(self) -> None:
+        """Load per-agent or shard files, migrating from a snapshot if there are none."""
+        pattern = "agents/*.json" if self.persistence_mode == "per_agent" else "shards/shard_*.json"
+        files = sorted(self.storage_path.glob(pattern))
+        if files:
+            for data_file in files:
+                try:
+                    with open(data_file, 'r') as f:
+                        data = json.load(f)
+                    records = data.get('agents', []) if self.persistence_mode == "sharded" else [data]
+                    for agent_data in records:
+                        agent = self._agent_from_record(agent_data)
+                        # Shard files left by an interrupted relayout may hold older copies
+                        current = self.agents.get(agent.agent_id)
+                        if current is None or agent.updated_at >= current.updated_at:
+                            self.agents[agent.agent_id] = agent
+                except Exception as e:
+                    logger.error(f"[P23P2S1T1] Failed to load behavior data from {data_file}: {e}")
+            logger.info(f"[P23P2S1T1] Loaded behavior data: {len(self.agents)} agents from {len(files)} files")
+        else:
+            self._load_data()
+            # Write the migrated snapshot out in the incremental layout
+            self._dirty.update(self.agents)
+            
+        relayout = self.persistence_mode == "sharded" and self._stored_shard_count() != self.shard_count
+        if relayout:
+            # Every agent moves to its shard under the new count
+            self._dirty.update(self.agents)
+                
+        for agent_id, agent in self.agents.items():
+            self._shard_members.setdefault(self._shard_of(agent_id), set()).add(agent_id)
+            if self.persistence_mode == "sharded":
+                self._serialized[agent_id] = json.dumps(self._agent_record(agent), default=str)
+        if self._dirty:
+            self.flush()
+        if relayout and not self._dirty:
+            self._finish_relayout(files)
+            
+    def _stored_shard_count(self) -> Optional[int]:
+        """Shard count recorded in the shard manifest, None without one."""
+        try:
+            with open(self.storage_path / "shards" / "manifest.json", 'r') as f:
+                return json.load(f).get('shard_count')
+        except (OSError, ValueError):
+            return None
+            
+    def _finish_relayout(self, old_files: List[Path]) -> None:
+        """Record the new shard count, then remove shard files it no longer uses."""
+        try:
+            self._write_atomic(self.storage_path / "shards" / "manifest.json", json.dumps({"shard_count": self.shard_count}))
+        except OSError as e:
+            logger.error(f"[P23P2S1T1] Failed to write shard manifest: {e}")
+            return
+        current = {self._shard_file(shard) for shard in range(self.shard_count)}
+        for data_file in old_files:
+            if data_file not in current:
+                data_file.unlink(missing_ok=True)
+        logger.info(f"[P23P2S1T1] Re-sharded behavior data into {self.shard_count} shards")
+            
+    @staticmethod
+    def _agent_from_record(agent_data: Dict[str, Any]) -> AgentBehavior:
+        """Rebuild an agent from its serialized form."""
+        agent = AgentBehavior(
+            agent_id=agent_data['agent_id'],
+            created_at=datetime.fromisoformat(agent_data['created_at']),
+            updated_at=datetime.fromisoformat(agent_data['updated_at']),
+            total_interactions=agent_data['total_interactions'],
+            successful_interactions=agent_data['successful_interactions'],
+            failed_interactions=agent_data['failed_interactions'],
+            specializations=set(agent_data.get('specializations', [])),
+            metadata=agent_data.get('metadata', {})
+        )
+        
+        # Load personality traits
+        for trait_data in agent_data.get('personality_traits', {}).values():
+            trait = PersonalityTrait(
+                name=trait_data['name'],
+                value=trait_data['value'],
+                confidence=trait_data['confidence'],
+                evidence_count=trait_data['evidence_count'],
+                last_updated=datetime.fromisoformat(trait_data['last_updated']),
+                metadata=trait_data.get('metadata', {})
+            )
+            agent.personality_traits[trait.name] = trait
+            
+        # Load behavioral patterns
+        for pattern_data in agent_data.get('behavioral_patterns', {}).values():
+            pattern = BehavioralPattern(
+                pattern_type=pattern_data['pattern_type'],
+                frequency=pattern_data['frequency'],
+                strength=pattern_data['strength'],
+                context=pattern_data['context'],
+                confidence=pattern_data['confidence'],
+                observation_count=pattern_data['observation_count'],
+                first_observed=datetime.fromisoformat(pattern_data['first_observed']),
+                last_observed=datetime.fromisoformat(pattern_data['last_observed']),
+                metadata=pattern_data.get('metadata', {})
+            )
+            agent.behavioral_patterns[pattern.pattern_type] = pattern
+            
+        return agent
 
 def main():
     """CLI interface for behavior model operations."""
@@ -735,10 +1038,11 @@ def main():
     parser.add_argument("--strength", type=float, help="Pattern strength (-1.0 to 1.0)")
     parser.add_argument("--success", action="store_true", help="Interaction was successful")
     parser.add_argument("--format", default="json", choices=["json", "csv"], help="Export format")
+    parser.add_argument("--persistence", default="snapshot", choices=list(PERSISTENCE_MODES), help="Persistence mode")
     
     args = parser.parse_args()
     
-    model = BehaviorModel(storage_path=args.storage)
+    model = BehaviorModel(storage_path=args.storage, persistence_mode=args.persistence)
     
     if args.command == "add":
         if not args.agent_id:
@@ -789,6 +1093,8 @@ def main():
     elif args.command == "export":
         data = model.export_data(args.format)
         print(data)
+        
+    model.close()
 
 if __name__ == "__main__":
     main()
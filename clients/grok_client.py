@@ -18,16 +18,17 @@ import os
 import json
 import logging
 import time
+import asyncio
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timezone
 from dataclasses import dataclass
 from functools import wraps
 
 import requests
-from openai import OpenAI
 from dotenv import load_dotenv
 
 from utils.token_usage_logger import log_token_usage
+from clients.transport import backoff_delay, get_transport
 
 # Load environment variables
 load_dotenv()
@@ -62,7 +63,9 @@ class GrokRateLimitError(GrokAPIError):
 
 def retry_with_backoff(max_retries: int = 3, base_delay: float = 1.0):
     """
-    Retry decorator with exponential backoff.
+    Retry decorator with jittered exponential backoff.
+    
+    Sleeps on the calling thread; coroutines should use async_retry_with_backoff.
     
     Args:
         max_retries: Maximum number of retry attempts
@@ -79,8 +82,8 @@ def retry_with_backoff(max_retries: int = 3, base_delay: float = 1.0):
                 except GrokRateLimitError as e:
                     last_exception = e
                     if attempt < max_retries:
-                        delay = base_delay * (2 ** attempt)
-                        logger.warning(f"[P20P7S2T2] Rate limit hit, retrying in {delay}s (attempt {attempt + 1}/{max_retries})")
+                        delay = backoff_delay(attempt, base_delay)
+                        logger.warning(f"[P20P7S2T2] Rate limit hit, retrying in {delay:.2f}s (attempt {attempt + 1}/{max_retries})")
                         time.sleep(delay)
                     else:
                         logger.error(f"[P20P7S2T2] Max retries exceeded for rate limit: {e}")
@@ -88,8 +91,8 @@ def retry_with_backoff(max_retries: int = 3, base_delay: float = 1.0):
                 except GrokConnectionError as e:
                     last_exception = e
                     if attempt < max_retries:
-                        delay = base_delay * (2 ** attempt)
-                        logger.warning(f"[P20P7S2T2] Connection error, retrying in {delay}s (attempt {attempt + 1}/{max_retries})")
+                        delay = backoff_delay(attempt, base_delay)
+                        logger.warning(f"[P20P7S2T2] Connection error, retrying in {delay:.2f}s (attempt {attempt + 1}/{max_retries})")
                         time.sleep(delay)
                     else:
                         logger.error(f"[P20P7S2T2] Max retries exceeded for connection error: {e}")
@@ -105,6 +108,31 @@ def retry_with_backoff(max_retries: int = 3, base_delay: float = 1.0):
         return wrapper
     return decorator
 
+def async_retry_with_backoff(max_retries: int = 3, base_delay: float = 1.0):
+    """
+    Coroutine variant of retry_with_backoff that sleeps without blocking the event loop.
+    
+    Args:
+        max_retries: Maximum number of retry attempts
+        base_delay: Base delay between retries in seconds
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            for attempt in range(max_retries + 1):
+                try:
+                    return await func(*args, **kwargs)
+                except (GrokRateLimitError, GrokConnectionError) as e:
+                    if attempt >= max_retries:
+                        logger.error(f"[P20P7S2T2] Max retries exceeded: {e}")
+                        raise
+                    delay = backoff_delay(attempt, base_delay)
+                    logger.warning(f"[P20P7S2T2] {type(e).__name__}, retrying in {delay:.2f}s (attempt {attempt + 1}/{max_retries})")
+                    await asyncio.sleep(delay)
+                    
+        return wrapper
+    return decorator
+
 @dataclass
 class GrokResponse:
     """Response from Grok API."""
@@ -147,10 +175,10 @@ class GrokClient:
         # Multi-source credential fallback system
         self.api_key = self._get_credentials(api_key)
         
-        # Initialize OpenAI client (xAI uses OpenAI-compatible API)
-        self.client = OpenAI(
-            api_key=self.api_key,
-            base_url="https://api.x.ai/v1"
+        # OpenAI clients (xAI uses OpenAI-compatible API) on the shared connection pool
+        self.client, self.async_client = get_transport('grok').sdk_clients(
+            self.api_key,
+            base_url=os.getenv('XAI_BASE_URL', "https://api.x.ai/v1")
         )
         
         # Grok-specific configuration
@@ -314,48 +342,77 @@ class GrokClient:
         try:
             start_time = time.time()
             
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=max_tokens or self.max_tokens,
-                temperature=self.temperature
-            )
+            response = self.client.chat.completions.create(**self._completion_params(prompt, max_tokens))
             
-            response_time = time.time() - start_time
+            return self._build_response(response, time.time() - start_time, prompt)
             
-            # Extract response data
-            content = response.choices[0].message.content
-            usage = {
-                'prompt_tokens': response.usage.prompt_tokens,
-                'completion_tokens': response.usage.completion_tokens,
-                'total_tokens': response.usage.total_tokens
-            }
+        except Exception as e:
+            logger.error(f"[P20P7S2T2] Grok response generation failed: {str(e)}")
+            self._handle_api_error(e)
             
-            # Log token usage
-            log_token_usage(
-                usage_data=usage,
-                model=self.model,
-                provider='grok',
-                latency=response_time,
-                success=True
-            )
+    @async_retry_with_backoff(max_retries=3, base_delay=1.0)
+    async def generate_response_async(self, prompt: str, max_tokens: Optional[int] = None) -> GrokResponse:
+        """
+        Generate a response from Grok 3 without blocking the event loop.
+        
+        Args:
+            prompt: Input prompt for Grok
+            max_tokens: Maximum tokens for response (defaults to self.max_tokens)
             
-            result = GrokResponse(
-                content=content,
-                usage=usage,
-                model=self.model,
-                response_time=response_time,
-                timestamp=datetime.now(timezone.utc).isoformat(),
-                metadata={'prompt_length': len(prompt)}
-            )
+        Returns:
+            GrokResponse: Generated response
+        """
+        try:
+            start_time = time.time()
             
-            logger.info(f"[P20P7S2T2] Grok response generated - {response_time:.2f}s, {usage['total_tokens']} tokens")
-            return result
+            response = await self.async_client.chat.completions.create(**self._completion_params(prompt, max_tokens))
+            
+            return self._build_response(response, time.time() - start_time, prompt)
             
         except Exception as e:
-            logger.error(f"[P20P7S2T2] Grok response generation failed: {str(e)}")
+            logger.error(f"[P20P7S2T2] Grok async response generation failed: {str(e)}")
             self._handle_api_error(e)
             
+    def _completion_params(self, prompt: str, max_tokens: Optional[int]) -> Dict[str, Any]:
+        """Build chat completion parameters for a prompt."""
+        return {
+            'model': self.model,
+            'messages': [{"role": "user", "content": prompt}],
+            'max_tokens': max_tokens or self.max_tokens,
+            'temperature': self.temperature
+        }
+        
+    def _build_response(self, response: Any, response_time: float, prompt: str) -> GrokResponse:
+        """Extract content and usage from a completion and log token usage."""
+        # Extract response data
+        content = response.choices[0].message.content
+        usage = {
+            'prompt_tokens': response.usage.prompt_tokens,
+            'completion_tokens': response.usage.completion_tokens,
+            'total_tokens': response.usage.total_tokens
+        }
+        
+        # Log token usage
+        log_token_usage(
+            usage_data=usage,
+            model=self.model,
+            provider='grok',
+            latency=response_time,
+            success=True
+        )
+        
+        result = GrokResponse(
+            content=content,
+            usage=usage,
+            model=self.model,
+            response_time=response_time,
+            timestamp=datetime.now(timezone.utc).isoformat(),
+            metadata={'prompt_length': len(prompt)}
+        )
+        
+        logger.info(f"[P20P7S2T2] Grok response generated - {response_time:.2f}s, {usage['total_tokens']} tokens")
+        return result
+            
     def _handle_api_error(self, error: Exception) -> None:
         """
         Handle API errors with appropriate exception types.
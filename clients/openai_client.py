@@ -23,10 +23,10 @@ from datetime import datetime, timezone
 from dataclasses import dataclass
 
 import requests
-from openai import OpenAI
 from dotenv import load_dotenv
 
 from utils.token_usage_logger import log_token_usage
+from clients.transport import get_transport
 
 # Load environment variables
 load_dotenv()
@@ -84,8 +84,8 @@ class OpenAIClient:
         # Multi-source credential fallback system
         self.api_key = self._get_credentials(api_key)
         
-        # Initialize OpenAI client
-        self.client = OpenAI(api_key=self.api_key)
+        # OpenAI clients (blocking and asyncio) on the shared connection pool
+        self.client, self.async_client = get_transport('openai').sdk_clients(self.api_key, os.getenv('OPENAI_BASE_URL'))
         
         # OpenAI-specific configuration
         self.model = self._get_model_config(model)
@@ -241,54 +241,100 @@ class OpenAIClient:
         try:
             start_time = time.time()
             
-            # Prepare messages
-            messages = []
-            if system_message:
-                messages.append({"role": "system", "content": system_message})
-            messages.append({"role": "user", "content": prompt})
-            
             response = self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                max_tokens=max_tokens or self.max_tokens,
-                temperature=temperature or self.temperature
+                **self._completion_params(prompt, max_tokens, temperature, system_message)
             )
             
-            response_time = time.time() - start_time
+            return self._build_response(response, time.time() - start_time, prompt)
             
-            # Extract response data
-            content = response.choices[0].message.content
-            usage = {
-                'prompt_tokens': response.usage.prompt_tokens,
-                'completion_tokens': response.usage.completion_tokens,
-                'total_tokens': response.usage.total_tokens
-            }
+        except Exception as e:
+            logger.error(f"[P20P7S2T1] OpenAI response generation failed: {str(e)}")
+            raise
             
-            # Log token usage
-            log_token_usage(
-                usage_data=usage,
-                model=self.model,
-                provider='openai',
-                latency=response_time,
-                success=True
-            )
+    async def generate_response_async(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        system_message: Optional[str] = None
+    ) -> OpenAIResponse:
+        """
+        Generate a response from OpenAI without blocking the event loop.
+        
+        Args:
+            prompt: Input prompt for OpenAI
+            max_tokens: Maximum tokens for response (defaults to self.max_tokens)
+            temperature: Temperature for response (defaults to self.temperature)
+            system_message: Optional system message
             
-            result = OpenAIResponse(
-                content=content,
-                usage=usage,
-                model=self.model,
-                response_time=response_time,
-                timestamp=datetime.now(timezone.utc).isoformat(),
-                metadata={'prompt_length': len(prompt)}
+        Returns:
+            OpenAIResponse: Generated response
+        """
+        try:
+            start_time = time.time()
+            
+            response = await self.async_client.chat.completions.create(
+                **self._completion_params(prompt, max_tokens, temperature, system_message)
             )
             
-            logger.info(f"[P20P7S2T1] OpenAI response generated - {response_time:.2f}s, {usage['total_tokens']} tokens")
-            return result
+            return self._build_response(response, time.time() - start_time, prompt)
             
         except Exception as e:
-            logger.error(f"[P20P7S2T1] OpenAI response generation failed: {str(e)}")
+            logger.error(f"[P20P7S2T1] OpenAI async response generation failed: {str(e)}")
             raise
             
+    def _completion_params(
+        self,
+        prompt: str,
+        max_tokens: Optional[int],
+        temperature: Optional[float],
+        system_message: Optional[str]
+    ) -> Dict[str, Any]:
+        """Build chat completion parameters for a prompt."""
+        # Prepare messages
+        messages = []
+        if system_message:
+            messages.append({"role": "system", "content": system_message})
+        messages.append({"role": "user", "content": prompt})
+        
+        return {
+            'model': self.model,
+            'messages': messages,
+            'max_tokens': max_tokens or self.max_tokens,
+            'temperature': temperature or self.temperature
+        }
+        
+    def _build_response(self, response: Any, response_time: float, prompt: str) -> OpenAIResponse:
+        """Extract content and usage from a completion and log token usage."""
+        # Extract response data
+        content = response.choices[0].message.content
+        usage = {
+            'prompt_tokens': response.usage.prompt_tokens,
+            'completion_tokens': response.usage.completion_tokens,
+            'total_tokens': response.usage.total_tokens
+        }
+        
+        # Log token usage
+        log_token_usage(
+            usage_data=usage,
+            model=self.model,
+            provider='openai',
+            latency=response_time,
+            success=True
+        )
+        
+        result = OpenAIResponse(
+            content=content,
+            usage=usage,
+            model=self.model,
+            response_time=response_time,
+            timestamp=datetime.now(timezone.utc).isoformat(),
+            metadata={'prompt_length': len(prompt)}
+        )
+        
+        logger.info(f"[P20P7S2T1] OpenAI response generated - {response_time:.2f}s, {usage['total_tokens']} tokens")
+        return result
+            
     def get_models(self) -> List[Dict[str, Any]]:
         """
         Get available OpenAI models.
@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+GitBridge Shared Provider Transport
+Phase: GBP20
+Part: P20P7
+Step: P20P7S2
+Task: P20P7S2T3 - Pooled Provider Connections
+
+Process-wide HTTP transport for LLM provider clients. Each provider gets one
+blocking httpx client with a bounded keep-alive connection pool (HTTP/2 when
+the h2 package is installed), shared by every OpenAIClient, GrokClient and
+SmartRouter in the process instead of one pool per SDK client. Asyncio
+connections belong to the event loop that opened them, so each running loop
+gets its own asyncio client and pool, created on first use in that loop and
+dropped once the loop is closed. Requests pass through a slot gate sized
+like the pool, which records how many requests are active or waiting and
+how long they waited, so pools can be sized against the request rate.
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [Corrected P20P7 Schema]
+"""
+
+import os
+import time
+import random
+import asyncio
+import logging
+import threading
+import weakref
+from typing import Any, Dict, Optional, Tuple, Callable
+from dataclasses import dataclass
+
+import httpx
+from openai import OpenAI, AsyncOpenAI
+
+try:
+    import h2  # noqa: F401 - enables httpx HTTP/2 support
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class PoolConfig:
+    """Connection pool settings for one provider."""
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 10.0
+    timeout: float = 60.0
+    http2: bool = True
+
+    @classmethod
+    def from_env(cls, provider: str) -> 'PoolConfig':
+        """Defaults overridden by <PROVIDER>_POOL_MAX_CONNECTIONS and <PROVIDER>_POOL_KEEPALIVE."""
+        prefix = provider.upper()
+        config = cls()
+        config.max_connections = int(os.getenv(f'{prefix}_POOL_MAX_CONNECTIONS', config.max_connections))
+        config.max_keepalive_connections = int(os.getenv(f'{prefix}_POOL_KEEPALIVE', config.max_keepalive_connections))
+        return config
+
+@dataclass
+class PoolStats:
+    """Snapshot of one provider's connection pool."""
+    provider: str
+    max_connections: int
+    http2: bool
+    active: int = 0
+    idle: int = 0
+    waiting: int = 0
+    total_requests: int = 0
+    total_wait_time: float = 0.0
+    max_wait_time: float = 0.0
+
+    @property
+    def avg_wait_time(self) -> float:
+        return self.total_wait_time / self.total_requests if self.total_requests else 0.0
+
+class _SlotGate:
+    """Bounds in-flight requests and records active, waiting and wait-time counters."""
+
+    def __init__(self, slots: int):
+        self.slots = slots
+        self._semaphore = threading.BoundedSemaphore(slots)
+        self._async_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.active = 0
+        self.waiting = 0
+        self.requests = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def acquire(self) -> None:
+        start_time = self._begin_wait()
+        self._semaphore.acquire()
+        self._end_wait(start_time)
+
+    async def acquire_async(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._async_semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._async_semaphores[loop] = asyncio.Semaphore(self.slots)
+        start_time = self._begin_wait()
+        try:
+            await semaphore.acquire()
+        except BaseException:
+            with self._lock:
+                self.waiting -= 1
+            raise
+        self._end_wait(start_time)
+        return semaphore
+
+    def release(self, semaphore: Optional[asyncio.Semaphore] = None) -> None:
+        with self._lock:
+            self.active -= 1
+        (semaphore or self._semaphore).release()
+
+    def _begin_wait(self) -> float:
+        with self._lock:
+            self.waiting += 1
+        return time.perf_counter()
+
+    def _end_wait(self, start_time: float) -> None:
+        waited = time.perf_counter() - start_time
+        with self._lock:
+            self.waiting -= 1
+            self.active += 1
+            self.requests += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+class _ReleasingStream(httpx.SyncByteStream):
+    """Response body that frees its slot when the response is closed."""
+
+    def __init__(self, stream: httpx.SyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            release, self._release = self._release, None
+            if release:
+                release()
+
+class _ReleasingAsyncStream(httpx.AsyncByteStream):
+    """Async response body that frees its slot when the response is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            release, self._release = self._release, None
+            if release:
+                release()
+
+class _GatedTransport(httpx.BaseTransport):
+    def __init__(self, transport: httpx.HTTPTransport, gate: _SlotGate):
+        self._transport = transport
+        self._gate = gate
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self._gate.acquire()
+        try:
+            response = self._transport.handle_request(request)
+        except BaseException:
+            self._gate.release()
+            raise
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(response.stream, self._gate.release),
+            extensions=response.extensions
+        )
+
+    def close(self) -> None:
+        self._transport.close()
+
+class _GatedAsyncTransport(httpx.AsyncBaseTransport):
+    def __init__(self, transport: httpx.AsyncHTTPTransport, gate: _SlotGate):
+        self._transport = transport
+        self._gate = gate
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        semaphore = await self._gate.acquire_async()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            self._gate.release(semaphore)
+            raise
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingAsyncStream(response.stream, lambda: self._gate.release(semaphore)),
+            extensions=response.extensions
+        )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+class _LoopClients:
+    """Asyncio pool, httpx client and SDK clients bound to one event loop."""
+
+    def __init__(self, transport: httpx.AsyncHTTPTransport, client: httpx.AsyncClient):
+        self.transport = transport
+        self.client = client
+        self.sdk_clients: Dict[Tuple[str, Optional[str], str], AsyncOpenAI] = {}
+
+class _LoopLocalAsyncOpenAI:
+    """
+    AsyncOpenAI stand-in that forwards to the client of the running event loop.
+
+    Lets OpenAIClient and GrokClient keep one async_client attribute while
+    being driven from several event loops, e.g. one asyncio.run per call.
+    """
+
+    def __init__(self, transport: 'ProviderTransport', api_key: str, base_url: Optional[str], options: Optional[Dict[str, Any]] = None):
+        self._transport = transport
+        self._api_key = api_key
+        self._base_url = base_url
+        self._options = options or {}
+
+    def with_options(self, **options: Any) -> '_LoopLocalAsyncOpenAI':
+        """Same as AsyncOpenAI.with_options, applied in every event loop."""
+        return _LoopLocalAsyncOpenAI(self._transport, self._api_key, self._base_url, {**self._options, **options})
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._transport.async_sdk_client(self._api_key, self._base_url, **self._options), name)
+
+class ProviderTransport:
+    """
+    Pooled blocking and asyncio HTTP clients for one provider.
+
+    Phase: GBP20
+    Part: P20P7
+    Step: P20P7S2
+    Task: P20P7S2T3 - Core Implementation
+
+    Features:
+    - Keep-alive connection pools shared by all SDK clients of the provider
+    - Asyncio clients and pools kept per event loop
+    - HTTP/2 when available
+    - Cached OpenAI-compatible SDK clients per API key and base URL
+    - Active, idle, waiting and wait-time statistics
+    """
+
+    def __init__(self, provider: str, config: Optional[PoolConfig] = None):
+        """
+        Initialize provider transport.
+
+        Args:
+            provider: Provider name, e.g. 'openai' or 'grok'
+            config: Pool settings (defaults to PoolConfig.from_env(provider))
+        """
+        self.provider = provider
+        self.config = config or PoolConfig.from_env(provider)
+        self.http2 = self.config.http2 and HTTP2_AVAILABLE
+
+        self._limits = httpx.Limits(
+            max_connections=self.config.max_connections,
+            max_keepalive_connections=self.config.max_keepalive_connections,
+            keepalive_expiry=self.config.keepalive_expiry
+        )
+        self._timeout = httpx.Timeout(self.config.timeout, connect=self.config.connect_timeout)
+
+        self._sync_gate = _SlotGate(self.config.max_connections)
+        self._async_gate = _SlotGate(self.config.max_connections)
+        self._sync_transport = httpx.HTTPTransport(http2=self.http2, limits=self._limits)
+        self.client = httpx.Client(transport=_GatedTransport(self._sync_transport, self._sync_gate), timeout=self._timeout)
+
+        self._sdk_clients: Dict[Tuple[str, Optional[str]], Tuple[OpenAI, _LoopLocalAsyncOpenAI]] = {}
+        self._loop_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopClients]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+        logger.info(
+            f"[P20P7S2T3] {provider} transport ready "
+            f"(max connections: {self.config.max_connections}, http2: {self.http2})"
+        )
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """The asyncio httpx client of the running event loop."""
+        return self._current_loop_clients().client
+
+    def sdk_clients(self, api_key: str, base_url: Optional[str] = None) -> Tuple[OpenAI, _LoopLocalAsyncOpenAI]:
+        """
+        Get blocking and asyncio SDK clients that use this transport.
+
+        The asyncio client forwards to an AsyncOpenAI bound to whichever
+        event loop is running when it is used.
+
+        Args:
+            api_key: Provider API key
+            base_url: API base URL for OpenAI-compatible providers
+
+        Returns:
+            Tuple of (OpenAI, AsyncOpenAI-compatible) clients, shared per key and base URL
+        """
+        key = (api_key, base_url)
+        with self._lock:
+            clients = self._sdk_clients.get(key)
+            if clients is None:
+                clients = self._sdk_clients[key] = (
+                    OpenAI(api_key=api_key, base_url=base_url, http_client=self.client),
+                    _LoopLocalAsyncOpenAI(self, api_key, base_url)
+                )
+            return clients
+
+    def async_sdk_client(self, api_key: str, base_url: Optional[str] = None, **options: Any) -> AsyncOpenAI:
+        """
+        Get the AsyncOpenAI client for the running event loop.
+
+        Args:
+            api_key: Provider API key
+            base_url: API base URL for OpenAI-compatible providers
+            **options: AsyncOpenAI.with_options arguments, e.g. max_retries
+
+        Returns:
+            AsyncOpenAI: Client on this loop's connection pool, shared per key, base URL and options
+        """
+        loop_clients = self._current_loop_clients()
+        key = (api_key, base_url, repr(sorted(options.items())))
+        with self._lock:
+            client = loop_clients.sdk_clients.get(key)
+            if client is None:
+                client = AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=loop_clients.client)
+                if options:
+                    client = client.with_options(**options)
+                loop_clients.sdk_clients[key] = client
+            return client
+
+    def get_stats(self) -> PoolStats:
+        """
+        Get pool statistics across the blocking and asyncio clients.
+
+        Returns:
+            PoolStats: Active, idle and waiting counts and request wait times
+        """
+        stats = PoolStats(provider=self.provider, max_connections=self.config.max_connections, http2=self.http2)
+        for gate in (self._sync_gate, self._async_gate):
+            with gate._lock:
+                stats.active += gate.active
+                stats.waiting += gate.waiting
+                stats.total_requests += gate.requests
+                stats.total_wait_time += gate.total_wait
+                stats.max_wait_time = max(stats.max_wait_time, gate.max_wait)
+        with self._lock:
+            transports = [self._sync_transport] + [loop_clients.transport for loop_clients in self._loop_clients.values()]
+        for transport in transports:
+            # httpcore exposes pooled connections; idle ones are open but unused
+            connections = getattr(getattr(transport, '_pool', None), 'connections', [])
+            stats.idle += sum(1 for connection in connections if connection.is_idle())
+        return stats
+
+    def close(self) -> None:
+        """
+        Close pooled blocking connections and the asyncio clients of idle event loops.
+
+        Asyncio clients of a loop that is running elsewhere are closed on that
+        loop without waiting; from inside a running loop, await aclose() instead.
+        """
+        self.client.close()
+        with self._lock:
+            loops = list(self._loop_clients.items())
+            self._loop_clients.clear()
+        for loop, loop_clients in loops:
+            if loop.is_closed():
+                continue
+            if loop.is_running():
+                asyncio.run_coroutine_threadsafe(loop_clients.client.aclose(), loop)
+            else:
+                loop.run_until_complete(loop_clients.client.aclose())
+
+    async def aclose(self) -> None:
+        """Close pooled connections, awaiting the asyncio client of the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            loop_clients = self._loop_clients.pop(loop, None)
+        if loop_clients is not None:
+            await loop_clients.client.aclose()
+        self.close()
+
+    def _current_loop_clients(self) -> _LoopClients:
+        """Asyncio clients of the running event loop, created on first use."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            loop_clients = self._loop_clients.get(loop)
+            if loop_clients is None:
+                # Pools of closed loops hold that loop alive and can no longer be used
+                for stale in [other for other in self._loop_clients if other.is_closed()]:
+                    del self._loop_clients[stale]
+                transport = httpx.AsyncHTTPTransport(http2=self.http2, limits=self._limits)
+                loop_clients = self._loop_clients[loop] = _LoopClients(
+                    transport,
+                    httpx.AsyncClient(transport=_GatedAsyncTransport(transport, self._async_gate), timeout=self._timeout)
+                )
+            return loop_clients
+
+_transports: Dict[str, ProviderTransport] = {}
+_pool_configs: Dict[str, PoolConfig] = {}
+_transports_lock = threading.Lock()
+
+def configure_pool(provider: str, config: PoolConfig) -> None:
+    """
+    Set the pool size and timeouts for a provider.
+
+    Takes effect when the provider's transport is first created, so call it
+    before constructing clients.
+
+    Args:
+        provider: Provider name
+        config: Pool settings
+    """
+    with _transports_lock:
+        _pool_configs[provider] = config
+        if provider in _transports:
+            logger.warning(f"[P20P7S2T3] {provider} transport already in use; new pool settings apply after close_transports()")
+
+def get_transport(provider: str) -> ProviderTransport:
+    """Get the shared transport for a provider, creating it on first use."""
+    with _transports_lock:
+        transport = _transports.get(provider)
+        if transport is None:
+            transport = _transports[provider] = ProviderTransport(provider, _pool_configs.get(provider))
+        return transport
+
+def get_pool_stats() -> Dict[str, PoolStats]:
+    """Get pool statistics for every provider transport in use."""
+    with _transports_lock:
+        transports = list(_transports.values())
+    return {transport.provider: transport.get_stats() for transport in transports}
+
+def close_transports() -> None:
+    """Close and forget every shared transport."""
+    with _transports_lock:
+        transports = list(_transports.values())
+        _transports.clear()
+    for transport in transports:
+        transport.close()
+
+async def aclose_transports() -> None:
+    """Close and forget every shared transport from inside a running event loop."""
+    with _transports_lock:
+        transports = list(_transports.values())
+        _transports.clear()
+    for transport in transports:
+        await transport.aclose()
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float = 30.0) -> float:
+    """
+    Exponential backoff with full jitter.
+
+    Randomizing the whole delay keeps clients that failed together from
+    retrying together.
+
+    Args:
+        attempt: Zero-based retry attempt
+        base_delay: Delay before the first retry
+        max_delay: Upper bound for any delay
+
+    Returns:
+        float: Seconds to wait before the next attempt
+    """
+    return random.uniform(0.0, min(max_delay, base_delay * (2 ** attempt)))
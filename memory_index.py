@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+GitBridge Memory Secondary Indexes
+Phase: GBP21
+Part: P21P8
+Step: P21P8S1
+Task: P21P8S1T3 - Durable Time-Ordered Indexes
+
+Secondary indexes for AsyncPersistentMemory. Every index key (agent:<id>,
+context:<name>, type:<name>, plus one key covering all nodes) maps to node
+IDs kept in timestamp order, so a time range is two bisects and a slice.
+The indexes persist as a snapshot of per-node index attributes plus an
+append-only log of changes since that snapshot; the log is folded into a
+new snapshot once it grows past a threshold. Replaying the log is
+idempotent, so a crash between writing a snapshot and truncating the log
+is harmless.
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [P21P8 Schema]
+"""
+
+import os
+import json
+import bisect
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+ALL_NODES = "*"  # Index key covering every node
+INDEX_VERSION = 1
+
+NodeEntry = Tuple[float, str, str, str]  # (timestamp, agent_id, task_context, node type)
+
+class MemoryIndex:
+    """
+    Time-ordered secondary indexes with snapshot and log persistence.
+
+    Phase: GBP21
+    Part: P21P8
+    Step: P21P8S1
+    Task: P21P8S1T3 - Core Implementation
+
+    Features:
+    - Agent, context and type indexes ordered by timestamp
+    - Time range lookups by bisect
+    - Re-adding a node replaces its previous entries
+    - Lookups return copies, a stable snapshot for callers that await
+    - Snapshot plus append-only change log, compacted by threshold
+    """
+
+    def __init__(self, path: Optional[str] = None, checkpoint_threshold: int = 10000):
+        """
+        Initialize memory index.
+
+        Args:
+            path: Directory for the snapshot and log (None keeps the index in memory only)
+            checkpoint_threshold: Logged changes before a new snapshot is written
+        """
+        self.path = Path(path) if path else None
+        self.checkpoint_threshold = checkpoint_threshold
+        self._nodes: Dict[str, NodeEntry] = {}
+        self._postings: Dict[str, Tuple[List[float], List[str]]] = {}
+        self._log = None
+        self._log_entries = 0
+        if self.path:
+            self.path.mkdir(parents=True, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._nodes
+
+    def node_ids(self) -> Set[str]:
+        """IDs of every indexed node."""
+        return set(self._nodes)
+
+    def add(self, node_id: str, timestamp: float, agent_id: str, task_context: str, node_type: str) -> None:
+        """
+        Index a node, replacing any earlier entries for the same ID.
+
+        Args:
+            node_id: Node ID
+            timestamp: Node timestamp as POSIX seconds
+            agent_id: Agent that produced the node
+            task_context: Task context of the node
+            node_type: Node type from its metadata
+        """
+        self._apply_add(node_id, (timestamp, agent_id, task_context, node_type))
+        self._append_log(["+", node_id, timestamp, agent_id, task_context, node_type])
+
+    def remove(self, node_id: str) -> bool:
+        """
+        Remove a node from every index.
+
+        Returns:
+            bool: True if the node was indexed
+        """
+        if not self._apply_remove(node_id):
+            return False
+        self._append_log(["-", node_id])
+        return True
+
+    def ids(self, key: str) -> List[str]:
+        """Node IDs under an index key, oldest first."""
+        postings = self._postings.get(key)
+        return list(postings[1]) if postings else []
+
+    def range(self, key: str, start: Optional[float] = None, end: Optional[float] = None) -> List[str]:
+        """
+        Node IDs under an index key with start <= timestamp <= end, oldest first.
+
+        Args:
+            key: Index key, e.g. "context:analysis" or ALL_NODES
+            start: Earliest timestamp (None for unbounded)
+            end: Latest timestamp (None for unbounded)
+
+        Returns:
+            List of node IDs
+        """
+        postings = self._postings.get(key)
+        if not postings:
+            return []
+        times, node_ids = postings
+        low = 0 if start is None else bisect.bisect_left(times, start)
+        high = len(times) if end is None else bisect.bisect_right(times, end)
+        return node_ids[low:high]
+
+    def before(self, key: str, timestamp: float) -> List[str]:
+        """Node IDs under an index key with timestamp strictly before the given one."""
+        postings = self._postings.get(key)
+        if not postings:
+            return []
+        times, node_ids = postings
+        return node_ids[:bisect.bisect_left(times, timestamp)]
+
+    def count(self, key: str) -> int:
+        """Number of nodes under an index key."""
+        postings = self._postings.get(key)
+        return len(postings[1]) if postings else 0
+
+    def keys(self, prefix: str = "") -> List[str]:
+        """Non-empty index keys starting with prefix."""
+        return [key for key in self._postings if key.startswith(prefix)]
+
+    def clear(self) -> None:
+        """Drop every entry and start a fresh snapshot."""
+        self._nodes.clear()
+        self._postings.clear()
+        self.checkpoint()
+
+    def replace(self, other: "MemoryIndex") -> None:
+        """Adopt every entry of an index built aside, in one step, and start a fresh snapshot."""
+        self._nodes, self._postings = other._nodes, other._postings
+        other._nodes, other._postings = {}, {}
+        self.checkpoint()
+
+    def load(self) -> bool:
+        """
+        Load the snapshot and replay the change log.
+
+        Returns:
+            bool: True if a persisted index was found
+        """
+        if not self.path:
+            return False
+        snapshot_file = self.path / "memory_index.json"
+        log_file = self.path / "memory_index.log"
+        found = torn = False
+
+        try:
+            with open(snapshot_file, 'r') as f:
+                snapshot = json.load(f)
+            if snapshot.get("version") != INDEX_VERSION:
+                logger.warning(f"[P21P8S1T3] Ignoring memory index snapshot with version {snapshot.get('version')}")
+                return False
+            for node_id, timestamp, agent_id, task_context, node_type in snapshot["nodes"]:
+                self._nodes[node_id] = (timestamp, agent_id, task_context, node_type)
+            self._build_postings()
+            found = True
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"[P21P8S1T3] Ignoring unreadable memory index snapshot: {e}")
+            self._nodes.clear()
+            return False
+
+        try:
+            with open(log_file, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        torn = True  # Torn trailing entry
+                        break
+                    if entry[0] == "+":
+                        self._apply_add(entry[1], tuple(entry[2:6]))
+                    else:
+                        self._apply_remove(entry[1])
+                    self._log_entries += 1
+            found = True
+        except FileNotFoundError:
+            pass
+
+        if torn:
+            # Later appends would land after the torn bytes; start a clean log
+            self.checkpoint()
+        logger.info(f"[P21P8S1T3] Loaded memory index with {len(self._nodes)} nodes ({self._log_entries} logged changes)")
+        return found
+
+    def checkpoint(self) -> None:
+        """Write a snapshot and truncate the change log."""
+        if not self.path:
+            return
+        snapshot_file = self.path / "memory_index.json"
+        tmp_file = snapshot_file.with_suffix(".json.tmp")
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump({
+                    "version": INDEX_VERSION,
+                    "nodes": [[node_id, *entry] for node_id, entry in self._nodes.items()]
+                }, f, separators=(',', ':'))
+            os.replace(tmp_file, snapshot_file)
+        except OSError as e:
+            logger.error(f"[P21P8S1T3] Failed to write memory index snapshot: {e}")
+            return
+
+        if self._log is not None:
+            self._log.close()
+        self._log = open(self.path / "memory_index.log", 'w')
+        self._log_entries = 0
+        logger.debug(f"[P21P8S1T3] Checkpointed memory index with {len(self._nodes)} nodes")
+
+    def close(self) -> None:
+        """Flush and close the change log."""
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def _append_log(self, entry: list) -> None:
+        if not self.path:
+            return
+        if self._log is None:
+            self._log = open(self.path / "memory_index.log", 'a')
+        self._log.write(json.dumps(entry, separators=(',', ':')) + "\n")
+        self._log.flush()
+        self._log_entries += 1
+        if self._log_entries >= self.checkpoint_threshold:
+            self.checkpoint()
+
+    def _apply_add(self, node_id: str, entry: NodeEntry) -> None:
+        if node_id in self._nodes:
+            self._apply_remove(node_id)
+        self._nodes[node_id] = entry
+        timestamp = entry[0]
+        for key in self._keys_for(entry):
+            times, node_ids = self._postings.setdefault(key, ([], []))
+            if not times or times[-1] <= timestamp:
+                # Nodes mostly arrive in time order
+                times.append(timestamp)
+                node_ids.append(node_id)
+            else:
+                position = bisect.bisect_right(times, timestamp)
+                times.insert(position, timestamp)
+                node_ids.insert(position, node_id)
+
+    def _apply_remove(self, node_id: str) -> bool:
+        entry = self._nodes.pop(node_id, None)
+        if entry is None:
+            return False
+        timestamp = entry[0]
+        for key in self._keys_for(entry):
+            times, node_ids = self._postings[key]
+            position = bisect.bisect_left(times, timestamp)
+            while node_ids[position] != node_id:
+                position += 1
+            del times[position]
+            del node_ids[position]
+            if not node_ids:
+                del self._postings[key]
+        return True
+
+    def _build_postings(self) -> None:
+        """Rebuild every posting list from node entries with one sort."""
+        self._postings.clear()
+        for node_id, entry in sorted(self._nodes.items(), key=lambda item: item[1][0]):
+            for key in self._keys_for(entry):
+                times, node_ids = self._postings.setdefault(key, ([], []))
+                times.append(entry[0])
+                node_ids.append(node_id)
+
+    @staticmethod
+    def _keys_for(entry: NodeEntry) -> Iterable[str]:
+        _, agent_id, task_context, node_type = entry
+        return (ALL_NODES, f"agent:{agent_id}", f"context:{task_context}", f"type:{node_type}")
@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+"""
+GitBridge Memory Segment Store
+Phase: GBP21
+Part: P21P8
+Step: P21P8S1
+Task: P21P8S1T2 - Segment Storage Engine
+
+Append-only key/value storage for persistent memory nodes. Records are
+length-prefixed and checksummed and are appended to large segment files,
+so millions of nodes need a handful of files instead of one file (and
+inode) each. An in-memory offset index maps every live key to its segment,
+offset and record size. When a segment fills up it is sealed and a hint
+file listing its record headers is written next to it, so startup reads
+the hints instead of the data. Overwritten and deleted records are
+reclaimed by compaction, which copies the live records of mostly-garbage
+sealed segments into the active segment and removes the old files.
+
+Record layout (little endian):
+    payload length (4) | crc32 (4) | op (1) | key length (2) | key | payload
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [P21P8 Schema]
+"""
+
+import os
+import struct
+import zlib
+import logging
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+RECORD_HEADER = struct.Struct('<IIBH')
+HINT_RECORD = struct.Struct('<QIBH')  # offset, record size, op, key length
+OP_PUT = 1
+OP_DELETE = 2
+SEGMENT_SUFFIX = ".seg"
+HINT_SUFFIX = ".hint"
+
+Location = Tuple[int, int, int]  # (segment id, offset, record size)
+
+def _checksum(op: int, key: bytes, payload: bytes) -> int:
+    return zlib.crc32(payload, zlib.crc32(key, op))
+
+def _encode(op: int, key: bytes, payload: bytes) -> bytes:
+    return RECORD_HEADER.pack(len(payload), _checksum(op, key, payload), op, len(key)) + key + payload
+
+@dataclass
+class _Segment:
+    """One segment file and its space accounting."""
+    segment_id: int
+    path: Path
+    fd: int
+    size: int = 0
+    dead_bytes: int = 0
+    # Record headers of the active segment, written out as its hint file when sealed
+    hints: List[Tuple[int, int, int, bytes]] = field(default_factory=list)
+
+    @property
+    def garbage_ratio(self) -> float:
+        return self.dead_bytes / self.size if self.size else 0.0
+
+class SegmentStore:
+    """
+    Append-only segment storage with an in-memory offset index.
+
+    Phase: GBP21
+    Part: P21P8
+    Step: P21P8S1
+    Task: P21P8S1T2 - Core Implementation
+
+    Features:
+    - Length-prefixed, checksummed records in large segment files
+    - O(1) key lookups through an offset index, positional reads
+    - Hint files for fast startup; torn tail records are truncated
+    - Incremental compaction of overwritten, deleted and expired records
+    """
+
+    def __init__(self, path: str, segment_size: int = 64 * 1024 * 1024, fsync: bool = False):
+        """
+        Initialize segment store and rebuild its offset index.
+
+        Args:
+            path: Directory holding segment and hint files
+            segment_size: Bytes after which the active segment is sealed
+            fsync: Whether to fsync after every write
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.segment_size = segment_size
+        self.fsync = fsync
+
+        self._index: Dict[str, Location] = {}
+        self._segments: Dict[int, _Segment] = {}
+        self._retired_fds: List[int] = []
+        self._lock = threading.Lock()
+        self._write_fd: Optional[int] = None
+        self._active: Optional[_Segment] = None
+
+        # Statistics
+        self.compactions = 0
+        self.bytes_reclaimed = 0
+
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def keys(self) -> List[str]:
+        """Snapshot of the live keys."""
+        with self._lock:
+            return list(self._index)
+
+    def put(self, key: str, value: bytes) -> None:
+        """Store a value, replacing any previous value for the key."""
+        self.put_many([(key, value)])
+
+    def put_many(self, items: Iterable[Tuple[str, bytes]]) -> int:
+        """
+        Store several values with a single write.
+
+        Args:
+            items: (key, value) pairs
+
+        Returns:
+            int: Number of records written
+        """
+        with self._lock:
+            return self._append([(OP_PUT, key.encode('utf-8'), value) for key, value in items])
+
+    def delete(self, key: str) -> bool:
+        """
+        Delete a key by appending a tombstone.
+
+        Returns:
+            bool: True if the key existed
+        """
+        with self._lock:
+            if key not in self._index:
+                return False
+            self._append([(OP_DELETE, key.encode('utf-8'), b'')])
+            return True
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Read the current value of a key, or None if it does not exist."""
+        for attempt in range(2):
+            with self._lock:
+                location = self._index.get(key)
+                if location is None:
+                    return None
+                segment = self._segments[location[0]]
+            # Positional read outside the lock; compaction may move the record
+            # concurrently, in which case the retry resolves its new location
+            value = self._read(segment.fd, location, key)
+            if value is not None:
+                return value
+        logger.error(f"[P21P8S1T2] Unreadable record for {key} in segment {location[0]}")
+        return None
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        """
+        Read several keys in storage order.
+
+        Args:
+            keys: Keys to read; missing keys are omitted from the result
+
+        Returns:
+            Dict mapping key to value
+        """
+        # Descriptors are captured with their locations; compaction may retire a
+        # segment before it is read, and get() then resolves the record's new location
+        with self._lock:
+            located = sorted(
+                (location, key, self._segments[location[0]].fd) for key in keys
+                for location in (self._index.get(key),) if location is not None
+            )
+        values = {}
+        for location, key, fd in located:
+            value = self._read(fd, location, key)
+            if value is None:
+                value = self.get(key)
+            if value is not None:
+                values[key] = value
+        return values
+
+    def scan(self) -> Iterator[Tuple[str, bytes]]:
+        """Yield every live (key, value) pair, segment by segment."""
+        for segment_id in sorted(self._segments):
+            segment = self._segments.get(segment_id)
+            if segment is None:
+                continue
+            try:
+                for offset, size, op, key_bytes, payload in self._records(segment.path):
+                    if op != OP_PUT:
+                        continue
+                    key = key_bytes.decode('utf-8')
+                    if self._index.get(key) == (segment_id, offset, size):
+                        yield key, payload
+            except FileNotFoundError:
+                # Compacted meanwhile; its live records moved to the active segment
+                continue
+
+    @property
+    def garbage_ratio(self) -> float:
+        """Share of sealed segment bytes held by dead records."""
+        with self._lock:
+            sealed = [segment for segment in self._segments.values() if segment is not self._active]
+            size = sum(segment.size for segment in sealed)
+            return sum(segment.dead_bytes for segment in sealed) / size if size else 0.0
+
+    def compact(
+        self,
+        threshold: float = 0.5,
+        max_segments: Optional[int] = None,
+        expired: Optional[Callable[[str, bytes], bool]] = None
+    ) -> Dict[str, object]:
+        """
+        Rewrite sealed segments whose garbage ratio is at least threshold.
+
+        Live records are appended to the active segment and the old segment
+        files are removed. Tombstones are carried forward only while an older
+        segment might still hold the deleted value.
+
+        Args:
+            threshold: Minimum garbage ratio of a segment to compact it
+            max_segments: Stop after this many segments (None compacts all)
+            expired: Optional predicate; live records it accepts are dropped
+
+        Returns:
+            Dict with segments compacted, bytes reclaimed and expired keys
+        """
+        with self._lock:
+            candidates = sorted(
+                segment_id for segment_id, segment in self._segments.items()
+                if segment is not self._active and (expired is not None or segment.garbage_ratio >= threshold)
+            )
+        if max_segments is not None:
+            candidates = candidates[:max_segments]
+
+        # File descriptors retired by the previous compaction are no longer in use
+        with self._lock:
+            retired, self._retired_fds = self._retired_fds, []
+        for fd in retired:
+            os.close(fd)
+
+        compacted, reclaimed, expired_keys = 0, 0, []
+        for segment_id in candidates:
+            segment = self._segments.get(segment_id)
+            if segment is None:
+                continue
+            # Sealed segments are immutable, so they are read without the lock;
+            # liveness is decided under it against the current index
+            records = list(self._records(segment.path))
+            with self._lock:
+                if self._segments.get(segment_id) is not segment:
+                    continue
+                has_older = any(other < segment_id for other in self._segments)
+                carried = []
+                for offset, size, op, key_bytes, payload in records:
+                    key = key_bytes.decode('utf-8')
+                    live = op == OP_PUT and self._index.get(key) == (segment_id, offset, size)
+                    if live and expired is not None and expired(key, payload):
+                        del self._index[key]
+                        expired_keys.append(key)
+                        if has_older:
+                            carried.append((OP_DELETE, key_bytes, b''))
+                    elif live:
+                        carried.append((OP_PUT, key_bytes, payload))
+                    elif op == OP_DELETE and has_older and key not in self._index:
+                        carried.append((OP_DELETE, key_bytes, b''))
+                self._append(carried)
+
+                del self._segments[segment_id]
+                self._retired_fds.append(segment.fd)
+                reclaimed += segment.size - sum(RECORD_HEADER.size + len(key) + len(payload) for _, key, payload in carried)
+            self._remove_files(segment)
+            compacted += 1
+
+        if compacted:
+            self.compactions += 1
+            self.bytes_reclaimed += max(0, reclaimed)
+            logger.info(f"[P21P8S1T2] Compacted {compacted} segments, reclaimed {reclaimed} bytes")
+        return {"segments_compacted": compacted, "bytes_reclaimed": max(0, reclaimed), "expired_keys": expired_keys}
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Get storage statistics.
+
+        Returns:
+            Dict with key, segment, byte and compaction counters
+        """
+        with self._lock:
+            total = sum(segment.size for segment in self._segments.values())
+            dead = sum(segment.dead_bytes for segment in self._segments.values())
+            return {
+                "keys": len(self._index),
+                "segments": len(self._segments),
+                "total_bytes": total,
+                "live_bytes": total - dead,
+                "dead_bytes": dead,
+                "compactions": self.compactions,
+                "bytes_reclaimed": self.bytes_reclaimed
+            }
+
+    def flush(self) -> None:
+        """Force written records to stable storage."""
+        with self._lock:
+            if self._write_fd is not None:
+                os.fsync(self._write_fd)
+
+    def close(self) -> None:
+        """Flush and close every file; the active segment stays unsealed."""
+        with self._lock:
+            if self._write_fd is not None:
+                os.fsync(self._write_fd)
+                os.close(self._write_fd)
+                self._write_fd = None
+            for segment in self._segments.values():
+                os.close(segment.fd)
+            for fd in self._retired_fds:
+                os.close(fd)
+            self._segments.clear()
+            self._retired_fds = []
+            self._active = None
+
+    def _append(self, records: List[Tuple[int, bytes, bytes]]) -> int:
+        """Append encoded records to the active segment and update the index."""
+        if not records:
+            return 0
+        if self._active is None or self._active.size >= self.segment_size:
+            self._roll()
+
+        active = self._active
+        offset = active.size
+        chunks = []
+        for op, key_bytes, payload in records:
+            record = _encode(op, key_bytes, payload)
+            chunks.append(record)
+            key = key_bytes.decode('utf-8')
+            previous = self._index.get(key)
+            if previous is not None and previous[0] in self._segments:
+                self._segments[previous[0]].dead_bytes += previous[2]
+            if op == OP_PUT:
+                self._index[key] = (active.segment_id, offset, len(record))
+            else:
+                self._index.pop(key, None)
+                active.dead_bytes += len(record)
+            active.hints.append((offset, len(record), op, key_bytes))
+            offset += len(record)
+
+        os.write(self._write_fd, b''.join(chunks))
+        if self.fsync:
+            os.fsync(self._write_fd)
+        active.size = offset
+        return len(records)
+
+    def _roll(self) -> None:
+        """Seal the active segment and start a new one."""
+        if self._active is not None:
+            os.fsync(self._write_fd)
+            os.close(self._write_fd)
+            self._write_hints(self._active)
+        segment_id = max(self._segments, default=0) + 1
+        path = self.path / f"segment_{segment_id:06d}{SEGMENT_SUFFIX}"
+        self._write_fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._active = self._segments[segment_id] = _Segment(segment_id, path, os.open(path, os.O_RDONLY))
+
+    def _write_hints(self, segment: _Segment) -> None:
+        hint_path = segment.path.with_suffix(HINT_SUFFIX)
+        tmp_path = hint_path.with_suffix(".hint.tmp")
+        with open(tmp_path, 'wb') as f:
+            for offset, size, op, key_bytes in segment.hints:
+                f.write(HINT_RECORD.pack(offset, size, op, len(key_bytes)) + key_bytes)
+        os.replace(tmp_path, hint_path)
+        segment.hints = []
+
+    def _read(self, fd: int, location: Location, key: str) -> Optional[bytes]:
+        """Read and verify one record; None if it is not the expected record."""
+        _, offset, size = location
+        try:
+            data = os.pread(fd, size, offset)
+        except OSError:
+            return None
+        if len(data) != size:
+            return None
+        length, checksum, op, key_length = RECORD_HEADER.unpack_from(data)
+        key_bytes = data[RECORD_HEADER.size:RECORD_HEADER.size + key_length]
+        payload = data[RECORD_HEADER.size + key_length:]
+        if op != OP_PUT or len(payload) != length or key_bytes != key.encode('utf-8') or _checksum(op, key_bytes, payload) != checksum:
+            return None
+        return payload
+
+    @staticmethod
+    def _records(path: Path) -> Iterator[Tuple[int, int, int, bytes, bytes]]:
+        """Yield (offset, size, op, key, payload) until the end or the first torn record."""
+        with open(path, 'rb') as f:
+            offset = 0
+            while True:
+                header = f.read(RECORD_HEADER.size)
+                if len(header) < RECORD_HEADER.size:
+                    return
+                length, checksum, op, key_length = RECORD_HEADER.unpack(header)
+                body = f.read(key_length + length)
+                if len(body) < key_length + length:
+                    return
+                key_bytes, payload = body[:key_length], body[key_length:]
+                if op not in (OP_PUT, OP_DELETE) or _checksum(op, key_bytes, payload) != checksum:
+                    return
+                size = RECORD_HEADER.size + key_length + length
+                yield offset, size, op, key_bytes, payload
+                offset += size
+
+    @staticmethod
+    def _hint_records(path: Path) -> Iterator[Tuple[int, int, int, bytes]]:
+        with open(path, 'rb') as f:
+            data = f.read()
+        position = 0
+        while position + HINT_RECORD.size <= len(data):
+            offset, size, op, key_length = HINT_RECORD.unpack_from(data, position)
+            position += HINT_RECORD.size
+            yield offset, size, op, data[position:position + key_length]
+            position += key_length
+
+    def _load(self) -> None:
+        """Rebuild the offset index from hint files and the unsealed tail."""
+        segment_files = sorted(self.path.glob(f"segment_*{SEGMENT_SUFFIX}"))
+        for index, path in enumerate(segment_files):
+            segment_id = int(path.stem.split('_')[1])
+            segment = self._segments[segment_id] = _Segment(segment_id, path, os.open(path, os.O_RDONLY))
+            hint_path = path.with_suffix(HINT_SUFFIX)
+            is_last = index == len(segment_files) - 1
+
+            if hint_path.exists() and not is_last:
+                entries = self._hint_records(hint_path)
+                segment.size = path.stat().st_size
+            else:
+                records = [(offset, size, op, key_bytes) for offset, size, op, key_bytes, _ in self._records(path)]
+                segment.size = records[-1][0] + records[-1][1] if records else 0
+                if segment.size < path.stat().st_size:
+                    logger.warning(f"[P21P8S1T2] Truncating torn tail of {path} at {segment.size} bytes")
+                    os.truncate(path, segment.size)
+                entries = records
+                if is_last:
+                    segment.hints = list(records)
+
+            for offset, size, op, key_bytes in entries:
+                key = key_bytes.decode('utf-8')
+                previous = self._index.get(key)
+                if previous is not None:
+                    self._segments[previous[0]].dead_bytes += previous[2]
+                if op == OP_PUT:
+                    self._index[key] = (segment_id, offset, size)
+                else:
+                    self._index.pop(key, None)
+                    segment.dead_bytes += size
+
+        if segment_files:
+            self._active = self._segments[max(self._segments)]
+            self._write_fd = os.open(self._active.path, os.O_WRONLY | os.O_APPEND)
+        logger.info(f"[P21P8S1T2] Segment store loaded {len(self._index)} keys from {len(segment_files)} segments")
+
+    @staticmethod
+    def _remove_files(segment: _Segment) -> None:
+        for path in (segment.path, segment.path.with_suffix(HINT_SUFFIX)):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+GitBridge AsyncPersistentMemory Concurrency Benchmark
+Phase: GBP21
+Part: P21P8
+Step: P21P8S1
+Task: P21P8S1T4 - Mixed Read/Write Benchmark
+
+Runs a mixed workload of agent, type and temporal queries plus node writes
+against AsyncPersistentMemory at several concurrency levels and reports
+throughput and read/write latency percentiles per level. The store is
+pre-populated and the cache kept small, so most queries read from disk.
+
+--serialize wraps every operation in one shared lock, reproducing the
+single-lock behaviour queries had before they ran without the write lock,
+for comparison on the same data.
+
+Results are written to benchmark_results/.
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [P21P8 Schema]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import logging
+import argparse
+import tempfile
+from datetime import datetime, timezone, timedelta
+from typing import Dict, Any, List, Optional
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from async_persistent_memory import AsyncPersistentMemory, MemoryNode, TimeRange
+
+logger = logging.getLogger(__name__)
+
+NODE_TYPES = ["analysis", "review", "decision", "summary"]
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile, None for no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered))) - 1))]
+
+def summarize(values: List[float]) -> Dict[str, Optional[float]]:
+    """Mean and p50/p95/p99/max in milliseconds."""
+    if not values:
+        return {"count": 0, "mean_ms": None, "p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+    return {
+        "count": len(values),
+        "mean_ms": sum(values) / len(values) * 1000,
+        "p50_ms": percentile(values, 0.50) * 1000,
+        "p95_ms": percentile(values, 0.95) * 1000,
+        "p99_ms": percentile(values, 0.99) * 1000,
+        "max_ms": max(values) * 1000
+    }
+
+def make_node(index: int, args: argparse.Namespace, now: datetime, rng: random.Random) -> MemoryNode:
+    """Node spread over agents, contexts, types and the benchmark time window."""
+    return MemoryNode(
+        node_id=f"node_{index}",
+        agent_id=f"agent_{rng.randrange(args.agents)}",
+        task_context=f"context_{rng.randrange(args.contexts)}",
+        result={"content": "x" * args.payload_bytes, "confidence": rng.random()},
+        timestamp=now - timedelta(seconds=rng.uniform(0, args.window_hours * 3600)),
+        metadata={"type": rng.choice(NODE_TYPES)}
+    )
+
+async def populate(memory: AsyncPersistentMemory, args: argparse.Namespace, now: datetime, rng: random.Random) -> None:
+    """Write the initial nodes, a few at a time."""
+    for start in range(0, args.nodes, 100):
+        await asyncio.gather(*(
+            memory.add_node_async(make_node(index, args, now, rng))
+            for index in range(start, min(start + 100, args.nodes))
+        ))
+
+async def run_level(memory: AsyncPersistentMemory, concurrency: int, args: argparse.Namespace, now: datetime) -> Dict[str, Any]:
+    """Run the mixed workload with a fixed number of concurrent clients."""
+    rng = random.Random(args.seed + concurrency)
+    serial_lock = asyncio.Lock() if args.serialize else None
+    reads: List[float] = []
+    writes: List[float] = []
+    nodes_read = 0
+    next_node = args.nodes
+    deadline = time.perf_counter() + args.duration
+
+    async def operation() -> None:
+        nonlocal nodes_read, next_node
+        if rng.random() < args.write_ratio:
+            if rng.random() < 0.5:
+                node = make_node(next_node, args, now, rng)
+                next_node += 1
+            else:
+                node = make_node(rng.randrange(args.nodes), args, now, rng)  # Overwrite
+            await memory.add_node_async(node)
+            return None
+
+        end = now - timedelta(seconds=rng.uniform(0, args.window_hours * 3600))
+        time_range = TimeRange(start=end - timedelta(minutes=args.query_minutes), end=end)
+        kind = rng.randrange(3)
+        if kind == 0:
+            result = await memory.query_by_agent_async(f"agent_{rng.randrange(args.agents)}", time_range)
+        elif kind == 1:
+            result = await memory.query_by_type_async(rng.choice(NODE_TYPES), time_range)
+        else:
+            result = await memory.query_temporal_async(f"context_{rng.randrange(args.contexts)}", time_range)
+        nodes_read += len(result)
+        return result
+
+    async def client() -> None:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            if serial_lock is not None:
+                async with serial_lock:
+                    result = await operation()
+            else:
+                result = await operation()
+            (writes if result is None else reads).append(time.perf_counter() - started)
+
+    stats_before = await memory.get_memory_stats_async()
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    stats_after = await memory.get_memory_stats_async()
+
+    hits = stats_after["cache_hits"] - stats_before["cache_hits"]
+    misses = stats_after["cache_misses"] - stats_before["cache_misses"]
+    return {
+        "concurrency": concurrency,
+        "serialized": args.serialize,
+        "elapsed_s": elapsed,
+        "operations": len(reads) + len(writes),
+        "throughput_ops": (len(reads) + len(writes)) / elapsed,
+        "reads_per_s": len(reads) / elapsed,
+        "writes_per_s": len(writes) / elapsed,
+        "nodes_read_per_s": nodes_read / elapsed,
+        "cache_hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        "read_latency": summarize(reads),
+        "write_latency": summarize(writes)
+    }
+
+async def run_benchmark(args: argparse.Namespace, storage_path: str) -> List[Dict[str, Any]]:
+    """Populate a store, then run every concurrency level against it."""
+    now = datetime.now(timezone.utc)
+    memory = AsyncPersistentMemory(
+        storage_path=storage_path,
+        cache_size=args.cache_size,
+        compaction_interval=args.compaction_interval
+    )
+    try:
+        print(f"📝 Writing {args.nodes} nodes...")
+        populate_started = time.perf_counter()
+        await populate(memory, args, now, random.Random(args.seed))
+        print(f"   done in {time.perf_counter() - populate_started:.2f}s")
+
+        results = []
+        for concurrency in args.concurrency:
+            result = await run_level(memory, concurrency, args, now)
+            print_result(result)
+            results.append(result)
+        return results
+    finally:
+        await memory.close_async()
+
+def print_result(result: Dict[str, Any]) -> None:
+    def fmt(value: Optional[float]) -> str:
+        return "-" if value is None else f"{value:8.3f}"
+
+    print(f"\n📊 Concurrency {result['concurrency']} ({'serialized' if result['serialized'] else 'concurrent reads'})")
+    print("=" * 60)
+    print(f"  Throughput: {result['throughput_ops']:.1f} ops/s "
+          f"(reads {result['reads_per_s']:.1f}/s, writes {result['writes_per_s']:.1f}/s, "
+          f"nodes read {result['nodes_read_per_s']:.0f}/s)")
+    print(f"  Cache hit rate: {result['cache_hit_rate']:.1%}")
+    print(f"  {'':8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for label, key in (("Reads", "read_latency"), ("Writes", "write_latency")):
+        stats = result[key]
+        print(f"  {label:8}{fmt(stats['p50_ms']):>10}{fmt(stats['p95_ms']):>10}{fmt(stats['p99_ms']):>10}{fmt(stats['max_ms']):>10}")
+
+def main():
+    """Main benchmark function."""
+    parser = argparse.ArgumentParser(
+        description="AsyncPersistentMemory mixed read/write benchmark",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  Default levels (1, 4, 16, 64 clients), 10%% writes:
+    %(prog)s
+
+  Write-heavy workload:
+    %(prog)s --write-ratio 0.5
+
+  Same workload with every operation serialized, for comparison:
+    %(prog)s --serialize
+"""
+    )
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 64], help='Concurrent clients per level')
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds of load per level')
+    parser.add_argument('--write-ratio', type=float, default=0.1, help='Share of operations that write a node')
+    parser.add_argument('--nodes', type=int, default=20000, help='Nodes written before the run')
+    parser.add_argument('--agents', type=int, default=50, help='Distinct agents')
+    parser.add_argument('--contexts', type=int, default=20, help='Distinct task contexts')
+    parser.add_argument('--payload-bytes', type=int, default=512, help='Result content size per node')
+    parser.add_argument('--window-hours', type=float, default=24.0, help='Time span the node timestamps cover')
+    parser.add_argument('--query-minutes', type=float, default=60.0, help='Time range of each query')
+    parser.add_argument('--cache-size', type=int, default=1000, help='Node cache capacity')
+    parser.add_argument('--compaction-interval', type=float, default=1.0, help='Seconds between background compaction runs')
+    parser.add_argument('--serialize', action='store_true', help='Hold one shared lock around every operation')
+    parser.add_argument('--storage-path', help='Storage directory (defaults to a temporary directory)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--output', help='Results file (defaults to benchmark_results/memory_benchmark_<time>.json)')
+    parser.add_argument('--log-level', default='WARNING', help='Logging level during the run')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(getattr(logging, args.log_level.upper()))
+
+    print("🤖 GitBridge AsyncPersistentMemory Concurrency Benchmark")
+    print("Task: P21P8S1T4 - Mixed Read/Write Benchmark")
+    print("=" * 60)
+
+    if args.storage_path:
+        results = asyncio.run(run_benchmark(args, args.storage_path))
+    else:
+        with tempfile.TemporaryDirectory() as storage_path:
+            results = asyncio.run(run_benchmark(args, storage_path))
+
+    output = args.output or os.path.join(
+        'benchmark_results', f"memory_benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({"timestamp": datetime.now().isoformat(), "config": vars(args), "results": results}, f, indent=2)
+    print(f"\n💾 Results saved to {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+GitBridge SmartRouter Offline Benchmark
+Phase: GBP20
+Part: P20P7
+Step: P20P7S3
+Task: P20P7S3T7 - End-to-End Latency Benchmark
+
+Drives SmartRouter at a fixed request rate against simulated providers and
+reports throughput, end-to-end latency percentiles, failover latency and the
+overhead the router (and, in http mode, the clients and connection pools)
+adds on top of provider service time. Needs no API keys or network:
+- inprocess mode routes to SimulatedProvider clients
+- http mode runs the real OpenAIClient/GrokClient against local stub servers
+
+Scenarios:
+- overhead: zero-latency providers, isolating routing and metrics cost
+- steady: configured latency distribution and error rate on both providers
+- failover: forced primary provider failing at --failover-error-rate
+
+Results are written to benchmark_results/ and can be compared against a
+previous run with --baseline to fail on overhead regressions.
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [Corrected P20P7 Schema]
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from smart_router.smart_router import SmartRouter, ProviderType
+from smart_router.provider_simulator import (
+    LatencyProfile,
+    ProviderProfile,
+    ProviderStubServer,
+    SimulatedProvider,
+    parse_service_time
+)
+
+logger = logging.getLogger(__name__)
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile, None for no values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered))) - 1))]
+
+def summarize(values: List[float]) -> Dict[str, Optional[float]]:
+    """Mean and p50/p95/p99/max in milliseconds."""
+    if not values:
+        return {"count": 0, "mean_ms": None, "p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+    return {
+        "count": len(values),
+        "mean_ms": sum(values) / len(values) * 1000,
+        "p50_ms": percentile(values, 0.50) * 1000,
+        "p95_ms": percentile(values, 0.95) * 1000,
+        "p99_ms": percentile(values, 0.99) * 1000,
+        "max_ms": max(values) * 1000
+    }
+
+def scenario_profiles(name: str, args: argparse.Namespace) -> Dict[ProviderType, ProviderProfile]:
+    """Provider behaviour for a scenario."""
+    latency = LatencyProfile(
+        median=args.latency,
+        sigma=args.sigma,
+        tail_probability=args.tail_probability,
+        tail_latency=args.tail_latency
+    )
+    if name == "overhead":
+        return {
+            ProviderType.OPENAI: ProviderProfile(model="gpt-4o", latency=LatencyProfile(median=0.0)),
+            ProviderType.GROK: ProviderProfile(model="grok-3-mini", latency=LatencyProfile(median=0.0))
+        }
+    if name == "steady":
+        return {
+            ProviderType.OPENAI: ProviderProfile(model="gpt-4o", latency=latency, error_rate=args.error_rate),
+            ProviderType.GROK: ProviderProfile(model="grok-3-mini", latency=latency, error_rate=args.error_rate)
+        }
+    return {
+        ProviderType.OPENAI: ProviderProfile(model="gpt-4o", latency=latency, error_rate=args.failover_error_rate),
+        ProviderType.GROK: ProviderProfile(model="grok-3-mini", latency=latency)
+    }
+
+def build_providers(profiles: Dict[ProviderType, ProviderProfile], args: argparse.Namespace, servers: List[ProviderStubServer]) -> Dict[ProviderType, Any]:
+    """Simulated clients, or real clients pointed at freshly started stub servers."""
+    if args.mode == "inprocess":
+        return {provider: SimulatedProvider(profile, seed=args.seed) for provider, profile in profiles.items()}
+
+    from clients.openai_client import OpenAIClient
+    from clients.grok_client import GrokClient
+
+    openai_stub = ProviderStubServer(profiles[ProviderType.OPENAI], seed=args.seed, error_status=args.error_status).start()
+    grok_stub = ProviderStubServer(profiles[ProviderType.GROK], seed=args.seed, error_status=args.error_status).start()
+    servers.extend([openai_stub, grok_stub])
+    os.environ['OPENAI_BASE_URL'] = openai_stub.url
+    os.environ['XAI_BASE_URL'] = grok_stub.url
+    clients = {
+        ProviderType.OPENAI: OpenAIClient(api_key=os.getenv('OPENAI_API_KEY', 'sim-key'), model="gpt-4o"),
+        ProviderType.GROK: GrokClient(api_key=os.getenv('XAI_API_KEY', 'sim-key'), model="grok-3-mini")
+    }
+    for client in clients.values():
+        # SDK retries would hide failures from SmartRouter's own failover
+        client.client = client.client.with_options(max_retries=args.sdk_retries)
+        client.async_client = client.async_client.with_options(max_retries=args.sdk_retries)
+    return clients
+
+class ScenarioRun:
+    """Collects per-request measurements for one scenario."""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.overheads: List[float] = []
+        self.failover_latencies: List[float] = []
+        self.schedule_lag: List[float] = []
+        self.failures = 0
+        self.by_provider: Dict[str, int] = {}
+
+    def record(self, elapsed: float, response: Any) -> None:
+        self.latencies.append(elapsed)
+        self.by_provider[response.provider.value] = self.by_provider.get(response.provider.value, 0) + 1
+        if response.metadata.get('failover'):
+            self.failover_latencies.append(elapsed)
+            return
+        service_time = parse_service_time(response.content)
+        if service_time is not None:
+            self.overheads.append(max(0.0, elapsed - service_time))
+
+async def drive_async(router: SmartRouter, run: ScenarioRun, args: argparse.Namespace, force_provider: Optional[ProviderType]) -> None:
+    """Open-loop load: requests start on schedule regardless of completions."""
+    loop = asyncio.get_running_loop()
+
+    async def one(index: int) -> None:
+        start_time = time.perf_counter()
+        try:
+            response = await router.route_request_async(
+                f"Benchmark request {index}: summarize the routing benchmark.",
+                force_provider=force_provider,
+                use_cache=False
+            )
+        except Exception:
+            run.failures += 1
+            return
+        run.record(time.perf_counter() - start_time, response)
+
+    total = int(args.rps * args.duration)
+    start = loop.time()
+    tasks = []
+    for index in range(total):
+        target = start + index / args.rps
+        delay = target - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        run.schedule_lag.append(max(0.0, loop.time() - target))
+        tasks.append(asyncio.ensure_future(one(index)))
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        if args.mode != "inprocess":
+            # Asyncio connections belong to this loop; close them before asyncio.run closes it
+            from clients.transport import aclose_transports
+            await aclose_transports()
+
+def drive_sync(router: SmartRouter, run: ScenarioRun, args: argparse.Namespace, force_provider: Optional[ProviderType]) -> None:
+    """Open-loop load through the blocking route_request on a thread pool."""
+    def one(index: int) -> None:
+        start_time = time.perf_counter()
+        try:
+            response = router.route_request(
+                f"Benchmark request {index}: summarize the routing benchmark.",
+                force_provider=force_provider,
+                use_cache=False
+            )
+        except Exception:
+            run.failures += 1
+            return
+        run.record(time.perf_counter() - start_time, response)
+
+    total = int(args.rps * args.duration)
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        start = time.perf_counter()
+        for index in range(total):
+            target = start + index / args.rps
+            delay = target - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            run.schedule_lag.append(max(0.0, time.perf_counter() - target))
+            executor.submit(one, index)
+
+def run_scenario(name: str, args: argparse.Namespace, log_dir: str) -> Dict[str, Any]:
+    """Run one scenario and summarize it."""
+    servers: List[ProviderStubServer] = []
+    providers = build_providers(scenario_profiles(name, args), args, servers)
+    router = SmartRouter(
+        providers=providers,
+        health_check_interval=3600,
+        max_concurrency=args.concurrency,
+        routing_log_file=os.path.join(log_dir, f"{name}_routing_decision.jsonl")
+    )
+    force_provider = ProviderType.OPENAI if name == "failover" else None
+    run = ScenarioRun()
+
+    start_time = time.perf_counter()
+    try:
+        if args.sync:
+            drive_sync(router, run, args, force_provider)
+        else:
+            asyncio.run(drive_async(router, run, args, force_provider))
+    finally:
+        router.shutdown()
+        if args.sync and args.mode != "inprocess":
+            from clients.transport import close_transports
+            close_transports()
+        for server in servers:
+            server.stop()
+    elapsed = time.perf_counter() - start_time
+
+    return {
+        "scenario": name,
+        "mode": args.mode,
+        "sync": args.sync,
+        "offered_rps": args.rps,
+        "duration_s": elapsed,
+        "requests": len(run.latencies) + run.failures,
+        "completed": len(run.latencies),
+        "failed": run.failures,
+        "throughput_rps": len(run.latencies) / elapsed if elapsed else 0.0,
+        "by_provider": run.by_provider,
+        "latency": summarize(run.latencies),
+        "router_overhead": summarize(run.overheads),
+        "failover_latency": summarize(run.failover_latencies),
+        "schedule_lag": summarize(run.schedule_lag)
+    }
+
+def check_regressions(results: List[Dict[str, Any]], baseline_file: str, max_regression: float) -> List[str]:
+    """Scenarios whose p99 router overhead grew more than max_regression over the baseline."""
+    with open(baseline_file, 'r') as f:
+        baseline = {result["scenario"]: result for result in json.load(f)["results"]}
+    regressions = []
+    for result in results:
+        previous = baseline.get(result["scenario"], {}).get("router_overhead", {}).get("p99_ms")
+        current = result["router_overhead"]["p99_ms"]
+        if previous and current and current > previous * (1.0 + max_regression):
+            regressions.append(f"{result['scenario']}: p99 overhead {current:.3f}ms vs baseline {previous:.3f}ms")
+    return regressions
+
+def print_result(result: Dict[str, Any]) -> None:
+    def fmt(value: Optional[float]) -> str:
+        return "-" if value is None else f"{value:8.3f}"
+
+    print(f"\n📊 Scenario: {result['scenario']} ({result['mode']}, {'sync' if result['sync'] else 'async'})")
+    print("=" * 60)
+    print(f"  Requests: {result['requests']}  completed: {result['completed']}  failed: {result['failed']}")
+    print(f"  Throughput: {result['throughput_rps']:.1f} req/s (offered {result['offered_rps']:.1f})")
+    print(f"  Providers: {result['by_provider']}")
+    print(f"  {'':18}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for label, key in (("End-to-end", "latency"), ("Router overhead", "router_overhead"),
+                       ("Failover", "failover_latency"), ("Schedule lag", "schedule_lag")):
+        stats = result[key]
+        print(f"  {label:18}{fmt(stats['p50_ms']):>10}{fmt(stats['p95_ms']):>10}{fmt(stats['p99_ms']):>10}{fmt(stats['max_ms']):>10}")
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command line options for the benchmark."""
+    parser = argparse.ArgumentParser(
+        description="SmartRouter offline latency benchmark",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  All scenarios against in-process simulators:
+    %(prog)s
+
+  Real clients over HTTP stubs at 100 req/s:
+    %(prog)s --mode http --rps 100
+
+  Fail if overhead regressed more than 20%%:
+    %(prog)s --baseline benchmark_results/smartrouter_benchmark_previous.json
+"""
+    )
+    parser.add_argument('--scenario', choices=['overhead', 'steady', 'failover', 'all'], default='all', help='Scenario to run')
+    parser.add_argument('--mode', choices=['inprocess', 'http'], default='inprocess', help='Simulated clients or real clients over local stubs')
+    parser.add_argument('--sync', action='store_true', help='Use blocking route_request on a thread pool')
+    parser.add_argument('--workers', type=int, default=64, help='Thread pool size for --sync')
+    parser.add_argument('--rps', type=float, default=200.0, help='Offered requests per second')
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds of load per scenario')
+    parser.add_argument('--concurrency', type=int, default=64, help='SmartRouter per-provider concurrency limit')
+    parser.add_argument('--latency', type=float, default=0.05, help='Median provider latency in seconds')
+    parser.add_argument('--sigma', type=float, default=0.3, help='Log-normal latency shape')
+    parser.add_argument('--tail-probability', type=float, default=0.01, help='Chance of a slow provider response')
+    parser.add_argument('--tail-latency', type=float, default=0.5, help='Extra seconds for a slow response')
+    parser.add_argument('--error-rate', type=float, default=0.01, help='Provider error rate in the steady scenario')
+    parser.add_argument('--failover-error-rate', type=float, default=0.3, help='Primary error rate in the failover scenario')
+    parser.add_argument('--sdk-retries', type=int, default=0, help='OpenAI SDK retries per request in http mode')
+    parser.add_argument('--error-status', type=int, default=500, help='HTTP status of stub failures in http mode')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--output', help='Results file (defaults to benchmark_results/smartrouter_benchmark_<time>.json)')
+    parser.add_argument('--baseline', help='Previous results file to compare router overhead against')
+    parser.add_argument('--max-regression', type=float, default=0.2, help='Allowed p99 overhead growth over the baseline')
+    parser.add_argument('--log-level', default='CRITICAL', help='Logging level during the run (injected failures log errors)')
+    return parser
+
+def main():
+    """Main benchmark function."""
+    args = build_parser().parse_args()
+
+    logging.getLogger().setLevel(getattr(logging, args.log_level.upper()))
+    scenarios = ['overhead', 'steady', 'failover'] if args.scenario == 'all' else [args.scenario]
+
+    print("🤖 GitBridge SmartRouter Offline Benchmark")
+    print("Task: P20P7S3T7 - End-to-End Latency Benchmark")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        results = [run_scenario(name, args, log_dir) for name in scenarios]
+    for result in results:
+        print_result(result)
+
+    output = args.output or os.path.join(
+        'benchmark_results', f"smartrouter_benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({"timestamp": datetime.now().isoformat(), "config": vars(args), "results": results}, f, indent=2)
+    print(f"\n💾 Results saved to {output}")
+
+    if args.baseline:
+        regressions = check_regressions(results, args.baseline, args.max_regression)
+        for regression in regressions:
+            print(f"❌ Regression - {regression}")
+        if regressions:
+            sys.exit(1)
+        print("✅ No router overhead regressions")
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,9 @@ Task: P21P5S1T1 - Shared Memory Graph Implementation
 Develop shared memory graph for agents.
 Scoped memory context recall based on task bundling.
 Record metadata: agent ID, task context, results, timestamp.
+Nodes are indexed by agent, by context and by (agent, context), and links
+are indexed in both directions, so recall touches only matching nodes and
+its latency does not grow with total memory size.
 
 Author: GitBridge Development Team
 Date: 2025-06-19
@@ -18,7 +21,7 @@ Schema: [P21P5 Schema]
 import json
 import logging
 import argparse
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple, Iterator
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 import os
@@ -50,11 +53,16 @@ class SharedMemoryGraph:
     - Add and link memory nodes
     - Scoped memory context recall
     - Metadata and provenance tracking
+    - Agent, context and (agent, context) hash indexes
+    - Reverse-link index for backlink lookups
+    - Streaming JSON export
     """
     def __init__(self):
         self.nodes: Dict[str, MemoryNode] = {}
         self.agent_index: Dict[str, List[str]] = {}
         self.context_index: Dict[str, List[str]] = {}
+        self.agent_context_index: Dict[Tuple[str, str], List[str]] = {}
+        self.reverse_links: Dict[str, List[str]] = {}  # node_id -> node_ids linking to it
         logger.info("[P21P5S1T1] SharedMemoryGraph initialized")
 
     def add_node(self, agent_id: str, task_context: str, result: Any, metadata: Optional[Dict[str, Any]] = None, links: Optional[List[str]] = None) -> str:
@@ -70,12 +78,16 @@ class SharedMemoryGraph:
         self.nodes[node_id] = node
         self.agent_index.setdefault(agent_id, []).append(node_id)
         self.context_index.setdefault(task_context, []).append(node_id)
+        self.agent_context_index.setdefault((agent_id, task_context), []).append(node_id)
+        for linked_id in node.links:
+            self.reverse_links.setdefault(linked_id, []).append(node_id)
         logger.info(f"[P21P5S1T1] Added node {node_id} for agent {agent_id}")
         return node_id
 
     def link_nodes(self, from_node_id: str, to_node_id: str) -> None:
         if from_node_id in self.nodes and to_node_id in self.nodes:
             self.nodes[from_node_id].links.append(to_node_id)
+            self.reverse_links.setdefault(to_node_id, []).append(from_node_id)
             logger.info(f"[P21P5S1T1] Linked node {from_node_id} -> {to_node_id}")
 
     def get_nodes_by_agent(self, agent_id: str) -> List[MemoryNode]:
@@ -85,16 +97,26 @@ class SharedMemoryGraph:
         return [self.nodes[nid] for nid in self.context_index.get(task_context, [])]
 
     def recall_context(self, agent_id: str, task_context: str) -> List[MemoryNode]:
-        # Scoped recall: intersection of agent and context
-        agent_nodes = set(self.agent_index.get(agent_id, []))
-        context_nodes = set(self.context_index.get(task_context, []))
-        node_ids = agent_nodes & context_nodes
+        # Scoped recall: the (agent, context) index holds the intersection
+        node_ids = self.agent_context_index.get((agent_id, task_context), [])
         logger.info(f"[P21P5S1T1] Recalled {len(node_ids)} nodes for agent {agent_id} and context {task_context}")
         return [self.nodes[nid] for nid in node_ids]
 
-    def export_memory(self, output_path: str = "shared_memory_export.json") -> None:
-        export_data = [
-            {
+    def get_linked_nodes(self, node_id: str) -> List[MemoryNode]:
+        """Nodes the given node links to."""
+        node = self.nodes.get(node_id)
+        if node is None:
+            return []
+        return [self.nodes[nid] for nid in node.links if nid in self.nodes]
+
+    def get_backlinks(self, node_id: str) -> List[MemoryNode]:
+        """Nodes that link to the given node."""
+        return [self.nodes[nid] for nid in self.reverse_links.get(node_id, [])]
+
+    def iter_export_records(self) -> Iterator[Dict[str, Any]]:
+        """Yield the export record of each node, one at a time."""
+        for node in self.nodes.values():
+            yield {
                 'node_id': node.node_id,
                 'agent_id': node.agent_id,
                 'task_context': node.task_context,
@@ -103,11 +125,25 @@ class SharedMemoryGraph:
                 'metadata': node.metadata,
                 'links': node.links
             }
-            for node in self.nodes.values()
-        ]
-        with open(output_path, 'w') as f:
-            json.dump(export_data, f, indent=2)
-        logger.info(f"[P21P5S1T1] Exported shared memory to {output_path}")
+
+    def export_memory(self, output_path: str = "shared_memory_export.json") -> None:
+        # Stream one record at a time into the same layout json.dump(..., indent=2)
+        # produces; a temporary file keeps a failed export from truncating the last one
+        tmp_path = f"{output_path}.tmp"
+        count = 0
+        try:
+            with open(tmp_path, 'w') as f:
+                for record in self.iter_export_records():
+                    encoded = json.dumps(record, indent=2).replace("\n", "\n  ")
+                    f.write(("[\n  " if count == 0 else ",\n  ") + encoded)
+                    count += 1
+                f.write("\n]" if count else "[]")
+            os.replace(tmp_path, output_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        logger.info(f"[P21P5S1T1] Exported {count} shared memory nodes to {output_path}")
 
     def preview_operations(self) -> str:
         """Preview memory operations without executing them."""
@@ -117,6 +153,7 @@ class SharedMemoryGraph:
         preview.append(f"Total nodes: {len(self.nodes)}")
         preview.append(f"Total agents: {len(self.agent_index)}")
         preview.append(f"Total contexts: {len(self.context_index)}")
+        preview.append(f"Total links: {sum(len(ids) for ids in self.reverse_links.values())}")
         preview.append("")
         
         # Preview agent nodes
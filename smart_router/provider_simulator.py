@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+GitBridge SmartRouter Provider Simulator
+Phase: GBP20
+Part: P20P7
+Step: P20P7S3
+Task: P20P7S3T7 - Offline Provider Simulator
+
+Offline stand-ins for the OpenAI and Grok APIs. SimulatedProvider is an
+in-process client with the OpenAIClient/GrokClient interface that SmartRouter
+can route to directly, and ProviderStubServer serves the OpenAI-compatible
+chat completions endpoint on localhost so the real clients, connection pools
+and retries can be exercised without keys or network. Both draw latency from
+a configurable log-normal distribution with an optional slow tail, fail at a
+configurable rate and report token usage derived from the prompt.
+
+Every response's content ends with the simulated service time, e.g.
+"Simulated gpt-4o response (0.051234s)", so benchmarks can subtract it from
+end-to-end latency to get the overhead added by the router and clients.
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [Corrected P20P7 Schema]
+"""
+
+import re
+import json
+import time
+import random
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional, Tuple
+
+from clients.openai_client import OpenAIResponse
+
+logger = logging.getLogger(__name__)
+
+SERVICE_TIME_PATTERN = re.compile(r'\((\d+\.\d+)s\)$')
+
+class SimulatedProviderError(Exception):
+    """Injected provider failure."""
+    pass
+
+@dataclass
+class LatencyProfile:
+    """Service time distribution in seconds."""
+    median: float = 0.5
+    sigma: float = 0.0              # Log-normal shape; 0 gives a constant median
+    tail_probability: float = 0.0   # Chance of a slow request
+    tail_latency: float = 0.0       # Extra seconds for a slow request
+
+    def sample(self, rng: random.Random) -> float:
+        latency = self.median * (rng.lognormvariate(0.0, self.sigma) if self.sigma > 0 else 1.0)
+        if self.tail_probability and rng.random() < self.tail_probability:
+            latency += self.tail_latency
+        return latency
+
+@dataclass
+class ProviderProfile:
+    """Behaviour of one simulated provider."""
+    model: str = "simulated-model"
+    latency: LatencyProfile = field(default_factory=LatencyProfile)
+    error_rate: float = 0.0
+    chars_per_token: float = 4.0
+    completion_tokens: Tuple[int, int] = (50, 300)  # Uniform range, capped by max_tokens
+
+def parse_service_time(content: str) -> Optional[float]:
+    """Simulated service time reported at the end of a response, if any."""
+    match = SERVICE_TIME_PATTERN.search(content or '')
+    return float(match.group(1)) if match else None
+
+class _Simulation:
+    """Seeded sampling shared by the in-process client and the stub server."""
+
+    def __init__(self, profile: ProviderProfile, seed: Optional[int]):
+        self.profile = profile
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+
+    def plan(self, prompt: str, max_tokens: Optional[int]) -> Tuple[float, bool, Dict[str, int]]:
+        """Sample (latency, fails, usage) for one request."""
+        with self._lock:
+            self.calls += 1
+            latency = self.profile.latency.sample(self._rng)
+            fails = self._rng.random() < self.profile.error_rate
+            low, high = self.profile.completion_tokens
+            completion_tokens = self._rng.randint(low, high)
+            if fails:
+                self.failures += 1
+        if max_tokens:
+            completion_tokens = min(completion_tokens, max_tokens)
+        prompt_tokens = max(1, int(len(prompt) / self.profile.chars_per_token))
+        return latency, fails, {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'total_tokens': prompt_tokens + completion_tokens
+        }
+
+    def content(self, service_time: float) -> str:
+        return f"Simulated {self.profile.model} response ({service_time:.6f}s)"
+
+class SimulatedProvider:
+    """
+    In-process provider client with simulated latency, errors and usage.
+
+    Phase: GBP20
+    Part: P20P7
+    Step: P20P7S3
+    Task: P20P7S3T7 - Core Implementation
+
+    Implements generate_response, generate_response_async and test_connection
+    like OpenAIClient and GrokClient, so it can replace them in SmartRouter.
+    """
+
+    def __init__(self, profile: Optional[ProviderProfile] = None, seed: Optional[int] = None):
+        """
+        Initialize simulated provider.
+
+        Args:
+            profile: Latency, error and token behaviour
+            seed: Random seed for reproducible runs
+        """
+        self.profile = profile or ProviderProfile()
+        self.model = self.profile.model
+        self._simulation = _Simulation(self.profile, seed)
+
+    @property
+    def calls(self) -> int:
+        return self._simulation.calls
+
+    @property
+    def failures(self) -> int:
+        return self._simulation.failures
+
+    def generate_response(self, prompt: str, max_tokens: Optional[int] = None, **kwargs) -> OpenAIResponse:
+        """Blocking simulated completion."""
+        latency, fails, usage = self._simulation.plan(prompt, max_tokens)
+        start_time = time.perf_counter()
+        time.sleep(latency)
+        return self._respond(time.perf_counter() - start_time, fails, usage)
+
+    async def generate_response_async(self, prompt: str, max_tokens: Optional[int] = None, **kwargs) -> OpenAIResponse:
+        """Simulated completion that sleeps on the event loop."""
+        latency, fails, usage = self._simulation.plan(prompt, max_tokens)
+        start_time = time.perf_counter()
+        await asyncio.sleep(latency)
+        return self._respond(time.perf_counter() - start_time, fails, usage)
+
+    def test_connection(self) -> OpenAIResponse:
+        """Simulated health probe."""
+        return self.generate_response("ping", max_tokens=5)
+
+    def _respond(self, service_time: float, fails: bool, usage: Dict[str, int]) -> OpenAIResponse:
+        if fails:
+            raise SimulatedProviderError(f"Simulated {self.model} failure after {service_time:.3f}s")
+        return OpenAIResponse(
+            content=self._simulation.content(service_time),
+            usage=usage,
+            model=self.model,
+            response_time=service_time,
+            timestamp=datetime.now(timezone.utc).isoformat(),
+            metadata={'simulated': True}
+        )
+
+class ProviderStubServer:
+    """
+    Local OpenAI-compatible HTTP endpoint backed by a simulated provider.
+
+    Phase: GBP20
+    Part: P20P7
+    Step: P20P7S3
+    Task: P20P7S3T7 - Core Implementation
+
+    Serves POST .../chat/completions and GET .../models. Point clients at
+    url (OPENAI_BASE_URL for OpenAIClient, XAI_BASE_URL for GrokClient).
+    """
+
+    def __init__(
+        self,
+        profile: Optional[ProviderProfile] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: Optional[int] = None,
+        error_status: int = 500
+    ):
+        """
+        Initialize stub server.
+
+        Args:
+            profile: Latency, error and token behaviour
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+            seed: Random seed for reproducible runs
+            error_status: HTTP status returned for injected failures
+        """
+        self.profile = profile or ProviderProfile()
+        self.error_status = error_status
+        self._simulation = _Simulation(self.profile, seed)
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def calls(self) -> int:
+        return self._simulation.calls
+
+    def start(self) -> 'ProviderStubServer':
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="provider-stub", daemon=True)
+        self._thread.start()
+        logger.info(f"[P20P7S3T7] Provider stub for {self.profile.model} listening on {self.url}")
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> 'ProviderStubServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Send headers and body in one segment; separate small writes
+            # stall on delayed ACKs and would show up as client overhead
+            disable_nagle_algorithm = True
+            wbufsize = 64 * 1024
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                if not self.path.rstrip('/').endswith('/chat/completions'):
+                    return self._send(404, {"error": {"message": "Not found"}})
+                prompt = ' '.join(str(message.get('content', '')) for message in body.get('messages', []))
+                latency, fails, usage = stub._simulation.plan(prompt, body.get('max_tokens'))
+                start_time = time.perf_counter()
+                time.sleep(latency)
+                service_time = time.perf_counter() - start_time
+                if fails:
+                    return self._send(stub.error_status, {"error": {"message": "Simulated failure", "type": "server_error"}})
+                self._send(200, {
+                    "id": f"chatcmpl-sim-{stub._simulation.calls}",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get('model', stub.profile.model),
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": stub._simulation.content(service_time)},
+                        "finish_reason": "stop"
+                    }],
+                    "usage": usage
+                })
+
+            def do_GET(self):
+                if not self.path.rstrip('/').endswith('/models'):
+                    return self._send(404, {"error": {"message": "Not found"}})
+                self._send(200, {"object": "list", "data": [{"id": stub.profile.model, "object": "model", "created": 0, "owned_by": "simulator"}]})
+
+            def _send(self, status: int, payload: Dict[str, Any]) -> None:
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+GitBridge SmartRouter Streaming Provider Statistics
+Phase: GBP20
+Part: P20P7
+Step: P20P7S3
+Task: P20P7S3T3 - Streaming Latency and Cost Statistics
+
+Constant-time, fixed-memory statistics for SmartRouter provider selection.
+Latency, success rate and cost are tracked as exponentially weighted moving
+averages, and latency quantiles come from a log-bucketed sketch whose buckets
+decay at the same rate, so p50/p95/p99 follow recent traffic without keeping
+a sample list.
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [Corrected P20P7 Schema]
+"""
+
+import math
+from typing import Dict, Optional
+
+DEFAULT_ALPHA = 0.1             # EWMA weight of the newest sample
+DEFAULT_RELATIVE_ERROR = 0.02   # Quantile values are accurate to +/- 2%
+MIN_TRACKED_LATENCY = 0.001     # Seconds; faster samples share the first bucket
+MAX_TRACKED_LATENCY = 600.0     # Seconds; slower samples share the last bucket
+RESCALE_LIMIT = 1e100           # Sample weight at which the sketch is renormalized
+
+class QuantileSketch:
+    """
+    Fixed-memory latency quantile sketch.
+
+    Phase: GBP20
+    Part: P20P7
+    Step: P20P7S3
+    Task: P20P7S3T3 - Core Implementation
+
+    Samples fall into logarithmic buckets with a bounded relative error.
+    Instead of decaying every bucket on each sample, the weight of new samples
+    grows by 1/decay, which is equivalent and keeps updates O(1); buckets are
+    renormalized only when that weight becomes very large.
+    """
+
+    def __init__(self, relative_error: float = DEFAULT_RELATIVE_ERROR, decay: float = 1.0 - DEFAULT_ALPHA / 10):
+        """
+        Initialize quantile sketch.
+
+        Args:
+            relative_error: Relative accuracy of reported quantiles
+            decay: Weight kept by older samples per new sample (1.0 never forgets)
+        """
+        self.gamma = (1.0 + relative_error) / (1.0 - relative_error)
+        self._log_gamma = math.log(self.gamma)
+        self._offset = math.floor(math.log(MIN_TRACKED_LATENCY) / self._log_gamma)
+        size = math.ceil(math.log(MAX_TRACKED_LATENCY) / self._log_gamma) - self._offset + 1
+        self._buckets = [0.0] * size
+        self._growth = 1.0 / decay
+        self._weight = 1.0
+        self._total = 0.0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        """Record one sample."""
+        index = math.floor(math.log(max(value, MIN_TRACKED_LATENCY)) / self._log_gamma) - self._offset
+        self._buckets[max(0, min(len(self._buckets) - 1, index))] += self._weight
+        self._total += self._weight
+        self.count += 1
+
+        self._weight *= self._growth
+        if self._weight > RESCALE_LIMIT:
+            scale = 1.0 / self._weight
+            self._buckets = [weight * scale for weight in self._buckets]
+            self._total *= scale
+            self._weight = 1.0
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile of recent samples.
+
+        Args:
+            q: Quantile in [0, 1], e.g. 0.95
+
+        Returns:
+            Estimated value, or None if nothing was recorded
+        """
+        if self._total <= 0.0:
+            return None
+        rank = q * self._total
+        cumulative = 0.0
+        occupied = 0
+        for index, weight in enumerate(self._buckets):
+            if weight > 0.0:
+                occupied = index
+                cumulative += weight
+                if cumulative >= rank:
+                    break
+        # Rounding can leave the running sum just short of a rank near the
+        # total, in which case the highest occupied bucket holds the quantile.
+        # Bucket midpoint in log space keeps the error within relative_error
+        return 2.0 * self.gamma ** (occupied + self._offset + 1) / (self.gamma + 1.0)
+
+class StreamingStats:
+    """
+    EWMA latency, success rate and cost with a latency quantile sketch.
+
+    Phase: GBP20
+    Part: P20P7
+    Step: P20P7S3
+    Task: P20P7S3T3 - Core Implementation
+
+    Latency statistics cover successful requests only; failures show up in
+    the success rate instead of skewing latency with fast errors or timeouts.
+    """
+
+    def __init__(self, alpha: float = DEFAULT_ALPHA, quantile_decay: Optional[float] = None):
+        """
+        Initialize streaming statistics.
+
+        Args:
+            alpha: EWMA weight of the newest sample
+            quantile_decay: Per-sample decay of the quantile sketch; defaults to
+                a ten times longer memory than the EWMAs
+        """
+        self.alpha = alpha
+        self.latency: Optional[float] = None
+        self.success_rate: Optional[float] = None
+        self.cost_per_1k_tokens: Optional[float] = None
+        self.requests = 0
+        self.successes = 0
+        self.latency_sketch = QuantileSketch(decay=quantile_decay or 1.0 - alpha / 10)
+
+    def _ewma(self, current: Optional[float], sample: float) -> float:
+        return sample if current is None else current + self.alpha * (sample - current)
+
+    def record(self, latency: float, success: bool, cost_per_1k_tokens: Optional[float] = None) -> None:
+        """
+        Record one request in O(1).
+
+        Args:
+            latency: Response time in seconds
+            success: Whether the request succeeded
+            cost_per_1k_tokens: Cost of the request per 1k tokens, if known
+        """
+        self.requests += 1
+        self.success_rate = self._ewma(self.success_rate, 1.0 if success else 0.0)
+        if success:
+            self.successes += 1
+            self.latency = self._ewma(self.latency, latency)
+            self.latency_sketch.add(latency)
+        if cost_per_1k_tokens is not None:
+            self.cost_per_1k_tokens = self._ewma(self.cost_per_1k_tokens, cost_per_1k_tokens)
+
+    def latency_quantile(self, q: float) -> Optional[float]:
+        """Estimated latency quantile of recent successful requests."""
+        return self.latency_sketch.quantile(q)
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        """
+        Get current statistics.
+
+        Returns:
+            Dict with EWMA values, p50/p95/p99 latency and request counts
+        """
+        return {
+            "requests": self.requests,
+            "successes": self.successes,
+            "latency_ewma": self.latency,
+            "success_rate_ewma": self.success_rate,
+            "cost_per_1k_tokens_ewma": self.cost_per_1k_tokens,
+            "p50_latency": self.latency_quantile(0.5),
+            "p95_latency": self.latency_quantile(0.95),
+            "p99_latency": self.latency_quantile(0.99)
+        }
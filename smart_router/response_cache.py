@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+GitBridge SmartRouter Response Cache
+Phase: GBP20
+Part: P20P7
+Step: P20P7S3
+Task: P20P7S3T6 - Response Cache and Request Collapsing
+
+Response cache in front of SmartRouter. Requests are keyed by a hash of the
+whitespace-normalized prompt and system message together with the task type,
+max_tokens, temperature and forced provider. Entries expire after a TTL and
+the in-memory tier is bounded by entry count and content size with LRU
+eviction; an optional directory tier keeps responses across restarts.
+Concurrent identical requests are collapsed so only one of them reaches a
+provider and the others, threads or coroutines, share its result.
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [Corrected P20P7 Schema]
+"""
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, asdict, field
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class CachedResponse:
+    """Provider response stored in the cache."""
+    content: str
+    provider: str
+    model: str
+    usage: Dict[str, Any]
+    response_time: float
+    cost: float
+    created_at: float = field(default_factory=time.time)
+
+    @property
+    def size(self) -> int:
+        return len(self.content) + 256
+
+class _Flight:
+    """One in-progress request that identical requests wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.entry: Optional[CachedResponse] = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._lock = threading.Lock()
+
+    def wait(self, timeout: Optional[float]) -> Optional[CachedResponse]:
+        if not self.done.wait(timeout):
+            raise TimeoutError("Timed out waiting for identical in-flight request")
+        return self._outcome()
+
+    async def wait_async(self) -> Optional[CachedResponse]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            if not self.done.is_set():
+                self._async_waiters.append((loop, future))
+                future = asyncio.shield(future)
+            else:
+                future = None
+        if future is not None:
+            await future
+        return self._outcome()
+
+    def resolve(self, entry: Optional[CachedResponse], error: Optional[BaseException]) -> None:
+        with self._lock:
+            self.entry, self.error = entry, error
+            self.done.set()
+            waiters, self._async_waiters = self._async_waiters, []
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(lambda f=future: f.done() or f.set_result(None))
+
+    def _outcome(self) -> Optional[CachedResponse]:
+        if self.error is not None:
+            raise self.error
+        return self.entry
+
+class ResponseCache:
+    """
+    TTL and LRU bounded response cache with request collapsing.
+
+    Phase: GBP20
+    Part: P20P7
+    Step: P20P7S3
+    Task: P20P7S3T6 - Core Implementation
+
+    Features:
+    - Normalized request hashing
+    - TTL expiry and entry/size bounded LRU eviction
+    - Optional on-disk tier of JSON files
+    - Collapsing of concurrent identical requests (singleflight)
+    - Hit, miss and saved latency/cost/token counters
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 32 * 1024 * 1024,
+        ttl: float = 3600.0,
+        disk_path: Optional[str] = None,
+        disk_max_entries: int = 100000,
+        wait_timeout: Optional[float] = 300.0
+    ):
+        """
+        Initialize response cache.
+
+        Args:
+            max_entries: Maximum number of responses kept in memory
+            max_bytes: Maximum approximate size of responses kept in memory
+            ttl: Seconds a response stays valid
+            disk_path: Directory for the on-disk tier (None disables it)
+            disk_max_entries: Maximum number of responses kept on disk
+            wait_timeout: Longest a collapsed request waits for the identical one
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.disk_path = disk_path
+        self.disk_max_entries = disk_max_entries
+        self.wait_timeout = wait_timeout
+
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._bytes = 0
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self._disk_writes = 0
+        if disk_path:
+            os.makedirs(disk_path, exist_ok=True)
+
+        # Statistics
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.collapsed = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.saved_seconds = 0.0
+        self.saved_cost = 0.0
+        self.saved_tokens = 0
+
+    @staticmethod
+    def make_key(
+        prompt: str,
+        system_message: Optional[str],
+        task_type: str,
+        max_tokens: Optional[int],
+        temperature: Optional[float],
+        provider: Optional[str] = None
+    ) -> str:
+        """
+        Hash a request; prompts differing only in whitespace share a key.
+
+        Args:
+            prompt: Input prompt
+            system_message: Optional system message
+            task_type: Type of task
+            max_tokens: Maximum tokens for the response
+            temperature: Temperature for the response
+            provider: Forced provider, if any
+
+        Returns:
+            str: Hex digest identifying the request
+        """
+        normalized = [
+            ' '.join(prompt.split()),
+            ' '.join(system_message.split()) if system_message else None,
+            task_type,
+            max_tokens,
+            None if temperature is None else round(float(temperature), 4),
+            provider
+        ]
+        return hashlib.sha256(json.dumps(normalized).encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Look up a response in memory, then on disk.
+
+        Args:
+            key: Request key from make_key
+
+        Returns:
+            CachedResponse, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry.created_at <= self.ttl:
+                    self._entries.move_to_end(key)
+                    self._record_hit(entry)
+                    self.hits += 1
+                    return entry
+                self._remove(key)
+                self.expirations += 1
+
+        entry = self._disk_get(key, now)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self._store(key, entry)
+            self._record_hit(entry)
+            self.disk_hits += 1
+            return entry
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        """
+        Cache a response in memory and, if enabled, on disk.
+
+        Args:
+            key: Request key from make_key
+            entry: Response to cache
+        """
+        with self._lock:
+            self._store(key, entry)
+        self._disk_put(key, entry)
+
+    def join(self, key: str) -> Optional[_Flight]:
+        """
+        Join an identical in-flight request.
+
+        Args:
+            key: Request key from make_key
+
+        Returns:
+            The flight to wait on, or None if the caller must make the request
+            and then call complete(), also when it fails or is cancelled
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                entry = self._entries.get(key)
+                if entry is not None and time.time() - entry.created_at <= self.ttl:
+                    # An identical request finished after the caller's get()
+                    self._entries.move_to_end(key)
+                    self._record_hit(entry)
+                    self.collapsed += 1
+                    flight = _Flight()
+                    flight.resolve(entry, None)
+                    return flight
+                self._flights[key] = _Flight()
+                return None
+            flight.waiters += 1
+            self.collapsed += 1
+            return flight
+
+    def complete(self, key: str, entry: Optional[CachedResponse], error: Optional[BaseException] = None) -> None:
+        """
+        Finish the caller's flight, caching the response and waking waiters.
+
+        Args:
+            key: Request key passed to join()
+            entry: Response, or None if the request failed or was abandoned
+            error: Failure passed on to waiting requests; with neither entry nor
+                error, waiters get None and should join() again
+        """
+        if entry is not None:
+            self.put(key, entry)
+        with self._lock:
+            flight = self._flights.pop(key, None)
+            if flight is not None and entry is not None:
+                self._record_hit(entry, flight.waiters)
+        if flight is not None:
+            flight.resolve(entry, error)
+
+    def wait(self, flight: _Flight) -> Optional[CachedResponse]:
+        """Block until a joined flight finishes and return its response (None if it was abandoned)."""
+        return flight.wait(self.wait_timeout)
+
+    async def wait_async(self, flight: _Flight) -> Optional[CachedResponse]:
+        """Await a joined flight without blocking the event loop (None if it was abandoned)."""
+        return await asyncio.wait_for(flight.wait_async(), self.wait_timeout)
+
+    def clear(self) -> None:
+        """Drop every in-memory entry."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict containing size, hit rate and saved latency, cost and tokens
+        """
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "collapsed": self.collapsed,
+                # Share of lookups answered without calling a provider
+                "hit_rate": (self.hits + self.disk_hits + self.collapsed) / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "in_flight": len(self._flights),
+                "saved_seconds": self.saved_seconds,
+                "saved_cost": self.saved_cost,
+                "saved_tokens": self.saved_tokens
+            }
+
+    def _record_hit(self, entry: CachedResponse, count: int = 1) -> None:
+        self.saved_seconds += entry.response_time * count
+        self.saved_cost += entry.cost * count
+        self.saved_tokens += entry.usage.get('total_tokens', 0) * count
+
+    def _store(self, key: str, entry: CachedResponse) -> None:
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            old_key = next(iter(self._entries))
+            self._remove(old_key)
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        self._bytes -= self._entries.pop(key).size
+
+    def _disk_file(self, key: str) -> str:
+        return os.path.join(self.disk_path, key[:2], f"{key}.json")
+
+    def _disk_get(self, key: str, now: float) -> Optional[CachedResponse]:
+        if not self.disk_path:
+            return None
+        path = self._disk_file(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = CachedResponse(**json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"[P20P7S3T6] Unreadable cached response {path}: {e}")
+            return None
+        if now - entry.created_at > self.ttl:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return entry
+
+    def _disk_put(self, key: str, entry: CachedResponse) -> None:
+        if not self.disk_path:
+            return
+        path = self._disk_file(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(asdict(entry), f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"[P20P7S3T6] Failed to write cached response {path}: {e}")
+            return
+
+        with self._lock:
+            self._disk_writes += 1
+            prune = self._disk_writes % max(1, self.disk_max_entries // 10) == 0
+        if prune:
+            self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        """Delete expired files and the oldest ones beyond disk_max_entries."""
+        files = []
+        for root, _, names in os.walk(self.disk_path):
+            for name in names:
+                if name.endswith('.json'):
+                    path = os.path.join(root, name)
+                    try:
+                        files.append((os.path.getmtime(path), path))
+                    except OSError:
+                        continue
+        files.sort()
+        cutoff = time.time() - self.ttl
+        excess = len(files) - self.disk_max_entries
+        for index, (modified, path) in enumerate(files):
+            if index >= excess and modified >= cutoff:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
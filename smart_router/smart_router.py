@@ -17,12 +17,14 @@ Date: 2025-06-19
 Schema: [Corrected P20P7 Schema]
 """
 
-import os
-import json
 import logging
 import time
 import threading
-from typing import Dict, Any, Optional, List, Tuple
+import asyncio
+import inspect
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor, wait as wait_futures
+from typing import Dict, Any, Optional, List, Tuple, Set, Union
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
@@ -31,7 +33,12 @@ import statistics
 
 from clients.openai_client import OpenAIClient, OpenAIResponse
 from clients.grok_client import GrokClient, GrokResponse
+from clients.transport import get_pool_stats
 from utils.token_usage_logger import log_token_usage
+from utils.log_sink import LogSink, get_log_sink
+
+from smart_router.provider_stats import StreamingStats
+from smart_router.response_cache import ResponseCache, CachedResponse
 
 # Configure logging with P20P7 schema
 logging.basicConfig(
@@ -45,6 +52,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+ROUTING_DECISION_LOG = 'logs/routing_decision.jsonl'
+
 class ProviderType(Enum):
     """Available AI providers."""
     OPENAI = "openai"
@@ -71,6 +80,8 @@ class ProviderMetrics:
     is_healthy: bool = True
     consecutive_failures: int = 0
     max_consecutive_failures: int = 3
+    last_health_check: Optional[datetime] = None
+    health_source: str = "probe"  # "probe" or "traffic"
 
 @dataclass
 class RoutingDecision:
@@ -129,7 +140,22 @@ class SmartRouter:
         performance_weight: float = 0.3,
         availability_weight: float = 0.3,
         metrics_window: int = 100,
-        health_check_interval: int = 60
+        health_check_interval: int = 60,
+        max_concurrency: int = 8,
+        provider_concurrency: Optional[Dict[ProviderType, int]] = None,
+        hedge_percentile: Optional[float] = None,
+        hedge_min_samples: int = 20,
+        health_probe_timeout: float = 10.0,
+        passive_min_requests: int = 5,
+        max_error_rate: float = 0.5,
+        max_healthy_latency: float = 30.0,
+        latency_quantile: Optional[float] = None,
+        ewma_alpha: float = 0.1,
+        min_task_samples: int = 10,
+        log_sink: Optional[LogSink] = None,
+        response_cache: Optional[ResponseCache] = None,
+        providers: Optional[Dict[ProviderType, Any]] = None,
+        routing_log_file: str = ROUTING_DECISION_LOG
     ):
         """
         Initialize SmartRouter.
@@ -141,6 +167,27 @@ class SmartRouter:
             availability_weight: Weight for availability optimization (0.0-1.0)
             metrics_window: Number of recent requests to track
             health_check_interval: Health check interval in seconds
+            max_concurrency: Default limit on in-flight async requests per provider
+            provider_concurrency: Per-provider overrides of max_concurrency
+            hedge_percentile: Latency percentile (e.g. 0.95) after which async requests
+                are hedged to a second provider; None disables hedging
+            hedge_min_samples: Successful requests needed before a provider is hedged
+            health_probe_timeout: Seconds before an unanswered health probe counts as failed
+            passive_min_requests: Requests within the last health_check_interval needed
+                to judge health from traffic instead of an active probe
+            max_error_rate: Highest recent error rate for a provider to stay healthy
+            max_healthy_latency: Highest recent average latency for a provider to stay healthy
+            latency_quantile: Score performance on this latency quantile (e.g. 0.95)
+                instead of the EWMA latency; None uses the EWMA
+            ewma_alpha: Weight of the newest request in latency, success and cost EWMAs
+            min_task_samples: Successful requests of a task type needed before its own
+                statistics are used for scoring instead of the provider-wide ones
+            log_sink: Background writer for routing decision logs (defaults to the shared sink)
+            response_cache: Cache answering repeated requests without a provider call
+                (None disables caching)
+            providers: Provider clients to route to (defaults to OpenAIClient and GrokClient),
+                e.g. simulated providers for offline benchmarks
+            routing_log_file: JSONL file receiving routing decisions
         """
         self.strategy = strategy
         self.cost_weight = cost_weight
@@ -149,7 +196,7 @@ class SmartRouter:
         self.metrics_window = metrics_window
         
         # Initialize providers
-        self.providers = {
+        self.providers = providers or {
             ProviderType.OPENAI: OpenAIClient(),
             ProviderType.GROK: GrokClient()
         }
@@ -166,7 +213,17 @@ class SmartRouter:
             ProviderType.GROK: deque(maxlen=metrics_window)
         }
         
+        # Streaming statistics per (provider, task_type); task_type None is provider-wide
+        self.latency_quantile = latency_quantile
+        self.ewma_alpha = ewma_alpha
+        self.min_task_samples = min_task_samples
+        self.provider_stats: Dict[Tuple[ProviderType, Optional[str]], StreamingStats] = {}
+        
+        self.response_cache = response_cache
+        
         # Routing decision history
+        self._log_sink = log_sink or get_log_sink()
+        self.routing_log_file = routing_log_file
         self.routing_history = deque(maxlen=1000)
         
         # Retry scoreboard
@@ -175,6 +232,22 @@ class SmartRouter:
         # Thread safety
         self._lock = threading.Lock()
         
+        # Async concurrency limits and hedging
+        self.max_concurrency = max_concurrency
+        self.provider_concurrency = dict(provider_concurrency or {})
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[ProviderType, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+        
+        # Health checks: passive from traffic, active probes off the routing lock
+        self.health_check_interval = health_check_interval
+        self.health_probe_timeout = health_probe_timeout
+        self.passive_min_requests = passive_min_requests
+        self.max_error_rate = max_error_rate
+        self.max_healthy_latency = max_healthy_latency
+        self._health_executor = ThreadPoolExecutor(max_workers=max(1, len(self.providers)), thread_name_prefix="smartrouter-health")
+        self._probe_futures: Dict[ProviderType, Future] = {}
+        
         # Health check thread
         self._health_check_thread = None
         self._stop_health_check = threading.Event()
@@ -201,43 +274,100 @@ class SmartRouter:
         logger.info(f"[P20P7S3T1] Health check thread started (interval: {interval}s)")
         
     def _perform_health_checks(self) -> None:
-        """Perform health checks on all providers."""
+        """
+        Refresh provider health.
+        
+        Providers with enough recent traffic are judged from their request
+        history. The others are probed concurrently without holding the lock,
+        so routing never waits on a probe, and all results are then published
+        in a single critical section.
+        """
+        now = datetime.now()
         with self._lock:
-            for provider_type, client in self.providers.items():
-                try:
-                    start_time = time.time()
-                    if provider_type == ProviderType.OPENAI:
-                        response = client.test_connection()
-                    else:
-                        response = client.test_connection()
-                    
-                    response_time = time.time() - start_time
-                    
-                    # Update metrics
-                    metrics = self.provider_metrics[provider_type]
-                    metrics.is_healthy = True
-                    metrics.consecutive_failures = 0
-                    metrics.last_request_time = datetime.now()
-                    
-                    # Update latency (rolling average)
-                    if len(self.request_history[provider_type]) > 0:
-                        latencies = [req['latency'] for req in self.request_history[provider_type]]
-                        metrics.avg_latency = statistics.mean(latencies)
-                    else:
-                        metrics.avg_latency = response_time
-                        
-                    logger.debug(f"[P20P7S3T1] Health check passed for {provider_type.value} (latency: {response_time:.2f}s)")
-                    
-                except Exception as e:
-                    logger.warning(f"[P20P7S3T1] Health check failed for {provider_type.value}: {e}")
-                    metrics = self.provider_metrics[provider_type]
+            passive = {provider: self._passive_health(provider, now) for provider in self.providers}
+            
+        # Probe idle providers, skipping any whose previous probe is still running
+        probes = {}
+        for provider, healthy in passive.items():
+            if healthy is not None:
+                continue
+            previous = self._probe_futures.get(provider)
+            if previous is not None and not previous.done():
+                continue
+            probes[provider] = self._probe_futures[provider] = self._health_executor.submit(self._probe_provider, provider)
+            
+        done, _ = wait_futures(probes.values(), timeout=self.health_probe_timeout)
+        
+        with self._lock:
+            for provider, healthy in passive.items():
+                if healthy is None:
+                    continue
+                metrics = self.provider_metrics[provider]
+                metrics.is_healthy = healthy
+                metrics.last_health_check = now
+                metrics.health_source = "traffic"
+                
+            for provider, future in probes.items():
+                metrics = self.provider_metrics[provider]
+                metrics.last_health_check = now
+                metrics.health_source = "probe"
+                outcome = future.result() if future in done else TimeoutError(f"no response in {self.health_probe_timeout}s")
+                
+                if isinstance(outcome, Exception):
+                    logger.warning(f"[P20P7S3T1] Health check failed for {provider.value}: {outcome}")
                     metrics.consecutive_failures += 1
                     metrics.is_healthy = metrics.consecutive_failures < metrics.max_consecutive_failures
+                    continue
+                    
+                # Update metrics
+                metrics.is_healthy = True
+                metrics.consecutive_failures = 0
+                metrics.last_request_time = datetime.now()
+                
+                # Keep the traffic latency once there is traffic
+                stats = self.provider_stats.get((provider, None))
+                metrics.avg_latency = outcome if stats is None or stats.latency is None else stats.latency
                     
+                logger.debug(f"[P20P7S3T1] Health check passed for {provider.value} (latency: {outcome:.2f}s)")
+                
+    def _probe_provider(self, provider: ProviderType) -> Union[float, Exception]:
+        """Run one active probe; returns its latency, or the exception it raised."""
+        try:
+            start_time = time.time()
+            self.providers[provider].test_connection()
+            return time.time() - start_time
+        except Exception as e:
+            return e
+            
+    def _passive_health(self, provider: ProviderType, now: datetime) -> Optional[bool]:
+        """
+        Judge provider health from requests in the last health check interval.
+        
+        Must be called with the lock held.
+        
+        Returns:
+            Optional[bool]: Health from real traffic, or None if there is too little traffic
+        """
+        window = [
+            req for req in self.request_history[provider]
+            if (now - req['timestamp']).total_seconds() <= self.health_check_interval
+        ]
+        if len(window) < self.passive_min_requests:
+            return None
+            
+        error_rate = sum(1 for req in window if not req['success']) / len(window)
+        average_latency = statistics.mean(req['latency'] for req in window)
+        metrics = self.provider_metrics[provider]
+        return (
+            error_rate <= self.max_error_rate
+            and average_latency <= self.max_healthy_latency
+            and metrics.consecutive_failures < metrics.max_consecutive_failures
+        )
+        
     def _log_routing_decision(self, decision: RoutingDecision, response_time: float, 
                             usage: Dict[str, Any], fallback_used: bool = False) -> None:
         """
-        Log routing decision to JSONL file.
+        Queue routing decision for the JSONL log; the log sink does the file I/O.
         
         Args:
             decision: The routing decision made
@@ -251,7 +381,7 @@ class SmartRouter:
                 'strategy': decision.strategy.value,
                 'provider_selected': decision.provider.value,
                 'latency': response_time,
-                'cost': usage.get('total_tokens', 0) * 0.01 / 1000 if decision.provider == ProviderType.OPENAI else usage.get('total_tokens', 0) * 0.005 / 1000,
+                'cost': self._estimate_cost(decision.provider, usage),
                 'fallback_used': fallback_used,
                 'reason_for_selection': decision.reasoning,
                 'confidence': decision.confidence,
@@ -259,13 +389,9 @@ class SmartRouter:
                 'metrics_used': decision.metrics_used
             }
             
-            # Ensure logs directory exists
-            os.makedirs('logs', exist_ok=True)
-            
-            # Write to JSONL file
-            with open('logs/routing_decision.jsonl', 'a') as f:
-                json.dump(decision_log, f)
-                f.write('\n')
+            if not self._log_sink.write(self.routing_log_file, decision_log):
+                logger.debug("[P20P7S3T1] Routing decision log queue full, record dropped")
+                return
                 
             logger.debug(f"[P20P7S3T1] Routing decision logged: {decision.provider.value} (confidence: {decision.confidence:.2f})")
             
@@ -331,10 +457,28 @@ class SmartRouter:
         if not metrics.is_healthy:
             return 0.0, {"reason": "Provider unhealthy"}
             
+        # Prefer task-specific statistics once the task type has enough traffic
+        stats = self.provider_stats.get((provider, task_type))
+        if stats is None or stats.successes < self.min_task_samples:
+            stats = self.provider_stats.get((provider, None))
+            
+        latency = metrics.avg_latency
+        availability = metrics.success_rate
+        cost = metrics.avg_cost_per_1k_tokens
+        if stats is not None:
+            if self.latency_quantile is not None and stats.successes:
+                latency = stats.latency_quantile(self.latency_quantile)
+            elif stats.latency is not None:
+                latency = stats.latency
+            if stats.success_rate is not None:
+                availability = stats.success_rate
+            if stats.cost_per_1k_tokens is not None:
+                cost = stats.cost_per_1k_tokens
+                
         # Base scores for different strategies
-        cost_score = 1.0 - (metrics.avg_cost_per_1k_tokens / 0.02)  # Normalize to 0-1
-        performance_score = 1.0 - min(metrics.avg_latency / 5.0, 1.0)  # Normalize to 0-1
-        availability_score = metrics.success_rate
+        cost_score = 1.0 - (cost / 0.02)  # Normalize to 0-1
+        performance_score = 1.0 - min(latency / 5.0, 1.0)  # Normalize to 0-1
+        availability_score = availability
         
         # Task-specific adjustments
         if task_type == "code_review":
@@ -354,7 +498,7 @@ class SmartRouter:
             metrics_used = {"cost_score": cost_score}
         elif self.strategy == RoutingStrategy.PERFORMANCE_OPTIMIZED:
             score = performance_score
-            metrics_used = {"performance_score": performance_score}
+            metrics_used = {"performance_score": performance_score, "latency": latency}
         elif self.strategy == RoutingStrategy.AVAILABILITY_OPTIMIZED:
             score = availability_score
             metrics_used = {"availability_score": availability_score}
@@ -456,17 +600,27 @@ class SmartRouter:
         provider: ProviderType,
         response_time: float,
         success: bool,
-        usage: Dict[str, Any]
+        usage: Dict[str, Any],
+        task_type: str = "general"
     ) -> None:
         """
         Update provider metrics after a request.
         
+        Every update is O(1): latency, success rate and cost feed streaming
+        statistics for the provider and for the task type.
+        
         Args:
             provider: Provider used
             response_time: Response time in seconds
             success: Whether request succeeded
             usage: Token usage data
+            task_type: Type of task performed
         """
+        # Estimate cost per 1k tokens (this could be improved with actual cost data)
+        cost_per_1k_tokens = None
+        if usage and usage.get('total_tokens'):
+            cost_per_1k_tokens = 0.01 if provider == ProviderType.OPENAI else 0.005  # GPT-4o / Grok rate
+            
         with self._lock:
             metrics = self.provider_metrics[provider]
             
@@ -485,7 +639,7 @@ class SmartRouter:
             if metrics.total_requests > 0:
                 metrics.success_rate = (metrics.total_requests - metrics.failed_requests) / metrics.total_requests
                 
-            # Update latency
+            # Record request for passive health checks
             request_record = {
                 'latency': response_time,
                 'timestamp': datetime.now(),
@@ -493,29 +647,77 @@ class SmartRouter:
             }
             self.request_history[provider].append(request_record)
             
-            # Calculate rolling average latency
-            if len(self.request_history[provider]) > 0:
-                latencies = [req['latency'] for req in self.request_history[provider]]
-                metrics.avg_latency = statistics.mean(latencies)
+            # Update streaming statistics
+            for key in ((provider, None), (provider, task_type)):
+                stats = self.provider_stats.get(key)
+                if stats is None:
+                    stats = self.provider_stats[key] = StreamingStats(alpha=self.ewma_alpha)
+                stats.record(response_time, success, cost_per_1k_tokens)
+                
+            provider_stats = self.provider_stats[(provider, None)]
+            if provider_stats.latency is not None:
+                metrics.avg_latency = provider_stats.latency
+            if provider_stats.cost_per_1k_tokens is not None:
+                metrics.avg_cost_per_1k_tokens = provider_stats.cost_per_1k_tokens
                 
-            # Update cost metrics
-            if usage and 'total_tokens' in usage:
-                total_tokens = usage['total_tokens']
-                # Estimate cost (this could be improved with actual cost data)
-                if provider == ProviderType.OPENAI:
-                    estimated_cost = (total_tokens / 1000) * 0.01  # GPT-4o rate
-                else:
-                    estimated_cost = (total_tokens / 1000) * 0.005  # Grok rate
-                    
-                # Update average cost per 1k tokens
-                if metrics.total_requests > 0:
-                    current_avg = metrics.avg_cost_per_1k_tokens
-                    new_avg = (current_avg * (metrics.total_requests - 1) + estimated_cost * 1000 / total_tokens) / metrics.total_requests
-                    metrics.avg_cost_per_1k_tokens = new_avg
-                    
             metrics.last_request_time = datetime.now()
             
     def route_request(
+        self,
+        prompt: str,
+        task_type: str = "general",
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        system_message: Optional[str] = None,
+        force_provider: Optional[ProviderType] = None,
+        use_cache: bool = True
+    ) -> SmartRouterResponse:
+        """
+        Route a request, answering from the response cache when possible.
+        
+        Concurrent identical requests wait for the first one instead of each
+        calling a provider.
+        
+        Args:
+            prompt: Input prompt
+            task_type: Type of task
+            max_tokens: Maximum tokens for response
+            temperature: Temperature for response
+            system_message: Optional system message
+            force_provider: Force specific provider
+            use_cache: Whether this request may use the response cache
+            
+        Returns:
+            SmartRouterResponse: Cached or provider response (metadata['cache_hit'] marks cached ones)
+            
+        Raises:
+            Exception: If all providers fail
+        """
+        request = (prompt, task_type, max_tokens, temperature, system_message, force_provider)
+        if self.response_cache is None or not use_cache:
+            return self._route_request(*request)
+            
+        start_time = time.time()
+        key = self._cache_key(*request)
+        cached = self.response_cache.get(key)
+        while cached is None:
+            flight = self.response_cache.join(key)
+            if flight is None:
+                try:
+                    response = self._route_request(*request)
+                except Exception as e:
+                    self.response_cache.complete(key, None, e)
+                    raise
+                except BaseException:
+                    # Cancellation or interrupt of this caller only; a waiter makes the request instead
+                    self.response_cache.complete(key, None)
+                    raise
+                self.response_cache.complete(key, self._cache_entry(response))
+                return response
+            cached = self.response_cache.wait(flight)
+        return self._cached_response(cached, task_type, prompt, time.time() - start_time)
+        
+    def _route_request(
         self,
         prompt: str,
         task_type: str = "general",
@@ -551,23 +753,14 @@ class SmartRouter:
         
         # Try the selected provider
         try:
-            if provider == ProviderType.OPENAI:
-                response = client.generate_response(
-                    prompt=prompt,
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                    system_message=system_message
-                )
-            else:
-                response = client.generate_response(
-                    prompt=prompt,
-                    max_tokens=max_tokens
-                )
+            response = client.generate_response(
+                **self._request_kwargs(provider, prompt, max_tokens, temperature, system_message)
+            )
                 
             response_time = time.time() - start_time
             
             # Update metrics
-            self._update_metrics(provider, response_time, True, response.usage)
+            self._update_metrics(provider, response_time, True, response.usage, task_type)
             
             # Create SmartRouter response
             smart_response = SmartRouterResponse(
@@ -601,7 +794,7 @@ class SmartRouter:
             logger.error(f"[P20P7S3T1] Request failed via {provider.value}: {e}")
             
             # Update metrics
-            self._update_metrics(provider, response_time, False, {})
+            self._update_metrics(provider, response_time, False, {}, task_type)
             
             # Try failover to other providers
             other_providers = [p for p in self.providers if p != provider and self.provider_metrics[p].is_healthy]
@@ -611,23 +804,14 @@ class SmartRouter:
                     logger.info(f"[P20P7S3T1] Attempting failover to {failover_provider.value}")
                     failover_client = self.providers[failover_provider]
                     
-                    if failover_provider == ProviderType.OPENAI:
-                        failover_response = failover_client.generate_response(
-                            prompt=prompt,
-                            max_tokens=max_tokens,
-                            temperature=temperature,
-                            system_message=system_message
-                        )
-                    else:
-                        failover_response = failover_client.generate_response(
-                            prompt=prompt,
-                            max_tokens=max_tokens
-                        )
+                    failover_response = failover_client.generate_response(
+                        **self._request_kwargs(failover_provider, prompt, max_tokens, temperature, system_message)
+                    )
                         
                     failover_time = time.time() - start_time
                     
                     # Update metrics
-                    self._update_metrics(failover_provider, failover_time, True, failover_response.usage)
+                    self._update_metrics(failover_provider, failover_time, True, failover_response.usage, task_type)
                     
                     # Update retry scoreboard
                     self._update_retry_scoreboard(True, provider, failover_provider)
@@ -671,7 +855,7 @@ class SmartRouter:
                     
                 except Exception as failover_error:
                     logger.error(f"[P20P7S3T1] Failover to {failover_provider.value} also failed: {failover_error}")
-                    self._update_metrics(failover_provider, time.time() - start_time, False, {})
+                    self._update_metrics(failover_provider, time.time() - start_time, False, {}, task_type)
                     
             # All providers failed - update retry scoreboard
             self._update_retry_scoreboard(False, provider, provider)
@@ -679,6 +863,414 @@ class SmartRouter:
             # All providers failed
             raise Exception(f"All providers failed. Original error: {e}")
             
+    async def route_request_async(
+        self,
+        prompt: str,
+        task_type: str = "general",
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        system_message: Optional[str] = None,
+        force_provider: Optional[ProviderType] = None,
+        hedge: Optional[bool] = None,
+        use_cache: bool = True
+    ) -> SmartRouterResponse:
+        """
+        Async route_request: answers from the response cache when possible.
+        
+        Args:
+            prompt: Input prompt
+            task_type: Type of task
+            max_tokens: Maximum tokens for response
+            temperature: Temperature for response
+            system_message: Optional system message
+            force_provider: Force specific provider
+            hedge: Override hedging for this request (defaults to hedge_percentile being set;
+                forced requests are never hedged)
+            use_cache: Whether this request may use the response cache
+            
+        Returns:
+            SmartRouterResponse: Cached or provider response (metadata['cache_hit'] marks cached ones)
+            
+        Raises:
+            Exception: If all providers fail
+        """
+        request = (prompt, task_type, max_tokens, temperature, system_message, force_provider)
+        if self.response_cache is None or not use_cache:
+            return await self._route_request_async(*request, hedge)
+            
+        start_time = time.time()
+        key = self._cache_key(*request)
+        cached = self.response_cache.get(key)
+        while cached is None:
+            flight = self.response_cache.join(key)
+            if flight is None:
+                try:
+                    response = await self._route_request_async(*request, hedge)
+                except Exception as e:
+                    self.response_cache.complete(key, None, e)
+                    raise
+                except BaseException:
+                    # Cancellation or interrupt of this caller only; a waiter makes the request instead
+                    self.response_cache.complete(key, None)
+                    raise
+                self.response_cache.complete(key, self._cache_entry(response))
+                return response
+            cached = await self.response_cache.wait_async(flight)
+        return self._cached_response(cached, task_type, prompt, time.time() - start_time)
+        
+    async def _route_request_async(
+        self,
+        prompt: str,
+        task_type: str = "general",
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        system_message: Optional[str] = None,
+        force_provider: Optional[ProviderType] = None,
+        hedge: Optional[bool] = None
+    ) -> SmartRouterResponse:
+        """
+        Route a request to the best available provider without blocking a thread.
+        
+        In-flight calls are bounded per provider. With hedging enabled, a request
+        still running after the provider's hedge_percentile latency is also sent
+        to the next best provider and the first successful response wins.
+        
+        Args:
+            prompt: Input prompt
+            task_type: Type of task
+            max_tokens: Maximum tokens for response
+            temperature: Temperature for response
+            system_message: Optional system message
+            force_provider: Force specific provider
+            hedge: Override hedging for this request (defaults to hedge_percentile being set;
+                forced requests are never hedged)
+            
+        Returns:
+            SmartRouterResponse: Response from the provider that answered first
+            
+        Raises:
+            Exception: If all providers fail
+        """
+        start_time = time.time()
+        
+        # Select provider
+        provider, decision = self._select_provider(task_type, force_provider)
+        request = (prompt, max_tokens, temperature, system_message)
+        # Forced requests stay on their provider, so they are never hedged
+        use_hedge = force_provider is None and (self.hedge_percentile is not None if hedge is None else hedge)
+        tried = {provider}
+        
+        logger.info(f"[P20P7S3T1] Routing async request to {provider.value} (confidence: {decision.confidence:.2f})")
+        
+        try:
+            final_provider, response = await self._hedged_call_async(provider, request, tried, use_hedge, task_type)
+            
+        except Exception as e:
+            logger.error(f"[P20P7S3T1] Async request failed via {provider.value}: {e}")
+            
+            # Try failover to providers not already attempted
+            other_providers = [p for p in self.providers if p not in tried and self.provider_metrics[p].is_healthy]
+            
+            for failover_provider in other_providers:
+                try:
+                    logger.info(f"[P20P7S3T1] Attempting failover to {failover_provider.value}")
+                    failover_response = await self._call_provider_async(failover_provider, request, task_type)
+                except Exception as failover_error:
+                    logger.error(f"[P20P7S3T1] Failover to {failover_provider.value} also failed: {failover_error}")
+                    continue
+                    
+                self._update_retry_scoreboard(True, provider, failover_provider)
+                failover_decision = RoutingDecision(
+                    provider=failover_provider,
+                    strategy=self.strategy,
+                    confidence=0.5,  # Lower confidence for failover
+                    reasoning=f"Failover from {provider.value} to {failover_provider.value}"
+                )
+                return self._finish_request(
+                    failover_decision, failover_response, time.time() - start_time, task_type, prompt,
+                    fallback_used=True, metadata={'failover': True, 'original_provider': provider.value}
+                )
+                
+            # All providers failed - update retry scoreboard
+            self._update_retry_scoreboard(False, provider, provider)
+            raise Exception(f"All providers failed. Original error: {e}")
+            
+        metadata = {'hedged': len(tried) > 1}
+        if final_provider != provider:
+            decision = RoutingDecision(
+                provider=final_provider,
+                strategy=self.strategy,
+                confidence=decision.confidence,
+                reasoning=f"Hedged {provider.value} request answered first by {final_provider.value}",
+                metrics_used=decision.metrics_used
+            )
+            metadata['original_provider'] = provider.value
+            
+        return self._finish_request(decision, response, time.time() - start_time, task_type, prompt, metadata=metadata)
+        
+    async def route_batch(
+        self,
+        prompts: List[str],
+        task_type: str = "general",
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        system_message: Optional[str] = None,
+        force_provider: Optional[ProviderType] = None,
+        return_exceptions: bool = True
+    ) -> List[Union[SmartRouterResponse, Exception]]:
+        """
+        Route many prompts concurrently, bounded by the per-provider limits.
+        
+        Args:
+            prompts: Input prompts
+            task_type: Type of task
+            max_tokens: Maximum tokens for each response
+            temperature: Temperature for each response
+            system_message: Optional system message for every prompt
+            force_provider: Force specific provider
+            return_exceptions: Return failures in place instead of raising the first one
+            
+        Returns:
+            List of responses (or exceptions) in prompt order
+        """
+        return await asyncio.gather(
+            *(
+                self.route_request_async(prompt, task_type, max_tokens, temperature, system_message, force_provider)
+                for prompt in prompts
+            ),
+            return_exceptions=return_exceptions
+        )
+        
+    def _cache_key(
+        self,
+        prompt: str,
+        task_type: str,
+        max_tokens: Optional[int],
+        temperature: Optional[float],
+        system_message: Optional[str],
+        force_provider: Optional[ProviderType]
+    ) -> str:
+        """Response cache key; forced requests only share responses from that provider."""
+        return ResponseCache.make_key(
+            prompt, system_message, task_type, max_tokens, temperature,
+            force_provider.value if force_provider else None
+        )
+        
+    def _cache_entry(self, response: SmartRouterResponse) -> CachedResponse:
+        """Cacheable copy of a provider response."""
+        return CachedResponse(
+            content=response.content,
+            provider=response.provider.value,
+            model=response.metadata.get('model', ''),
+            usage=dict(response.usage),
+            response_time=response.response_time,
+            cost=self._estimate_cost(response.provider, response.usage)
+        )
+        
+    def _cached_response(self, entry: CachedResponse, task_type: str, prompt: str, response_time: float) -> SmartRouterResponse:
+        """Wrap a cached response; provider metrics are not touched since no provider was called."""
+        provider = ProviderType(entry.provider)
+        decision = RoutingDecision(
+            provider=provider,
+            strategy=self.strategy,
+            confidence=1.0,
+            reasoning=f"Cached response from {provider.value}"
+        )
+        logger.debug(f"[P20P7S3T6] Cache hit for {provider.value} response ({entry.response_time:.2f}s saved)")
+        return SmartRouterResponse(
+            content=entry.content,
+            provider=provider,
+            response_time=response_time,
+            usage=dict(entry.usage),
+            routing_decision=decision,
+            metadata={
+                'task_type': task_type,
+                'prompt_length': len(prompt),
+                'model': entry.model,
+                'cache_hit': True,
+                'original_response_time': entry.response_time
+            }
+        )
+        
+    def _estimate_cost(self, provider: ProviderType, usage: Dict[str, Any]) -> float:
+        """Estimated request cost in USD from token usage."""
+        rate = 0.01 if provider == ProviderType.OPENAI else 0.005  # GPT-4o / Grok rate per 1k tokens
+        return usage.get('total_tokens', 0) * rate / 1000
+        
+    def _request_kwargs(
+        self,
+        provider: ProviderType,
+        prompt: str,
+        max_tokens: Optional[int],
+        temperature: Optional[float],
+        system_message: Optional[str]
+    ) -> Dict[str, Any]:
+        """Keyword arguments accepted by a provider's generate_response."""
+        if provider == ProviderType.OPENAI:
+            return {
+                'prompt': prompt,
+                'max_tokens': max_tokens,
+                'temperature': temperature,
+                'system_message': system_message
+            }
+        return {'prompt': prompt, 'max_tokens': max_tokens}
+        
+    def _get_semaphore(self, provider: ProviderType) -> asyncio.Semaphore:
+        """Get the provider's concurrency limit for the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphores = self._semaphores.get(loop)
+        if semaphores is None:
+            semaphores = self._semaphores[loop] = {}
+        if provider not in semaphores:
+            semaphores[provider] = asyncio.Semaphore(self.provider_concurrency.get(provider, self.max_concurrency))
+        return semaphores[provider]
+        
+    async def _call_provider_async(self, provider: ProviderType, request: Tuple, task_type: str = "general") -> Any:
+        """
+        Call one provider within its concurrency limit and record the outcome.
+        
+        Clients without generate_response_async run in the default executor.
+        A cancelled await cannot stop the worker thread, so such a call keeps
+        its concurrency slot until the thread finishes. Cancelled calls (hedge
+        losers) are not recorded as failures.
+        """
+        client = self.providers[provider]
+        kwargs = self._request_kwargs(provider, *request)
+        generate_async = getattr(client, 'generate_response_async', None)
+        semaphore = self._get_semaphore(provider)
+        
+        await semaphore.acquire()
+        start_time = time.time()
+        try:
+            if inspect.iscoroutinefunction(generate_async):
+                try:
+                    response = await generate_async(**kwargs)
+                finally:
+                    semaphore.release()
+            else:
+                call = asyncio.ensure_future(asyncio.to_thread(client.generate_response, **kwargs))
+                call.add_done_callback(lambda future: self._release_thread_slot(semaphore, future))
+                response = await asyncio.shield(call)
+        except Exception:
+            self._update_metrics(provider, time.time() - start_time, False, {}, task_type)
+            raise
+            
+        self._update_metrics(provider, time.time() - start_time, True, response.usage, task_type)
+        return response
+        
+    def _release_thread_slot(self, semaphore: asyncio.Semaphore, call: "asyncio.Future") -> None:
+        """Free a provider slot once its executor call finishes, retrieving any unawaited error."""
+        semaphore.release()
+        if not call.cancelled():
+            call.exception()
+            
+    async def _hedged_call_async(
+        self,
+        provider: ProviderType,
+        request: Tuple,
+        tried: Set[ProviderType],
+        hedge: bool,
+        task_type: str = "general"
+    ) -> Tuple[ProviderType, Any]:
+        """
+        Call a provider, hedging to a second one if it is slower than usual.
+        
+        Args:
+            provider: Primary provider
+            request: (prompt, max_tokens, temperature, system_message)
+            tried: Providers attempted so far; the hedge provider is added to it
+            hedge: Whether hedging is allowed
+            task_type: Type of task, for per-task statistics
+            
+        Returns:
+            Tuple of (provider that answered, client response)
+        """
+        hedge_provider, hedge_delay = self._plan_hedge(provider, tried, task_type) if hedge else (None, None)
+        if hedge_provider is None:
+            return provider, await self._call_provider_async(provider, request, task_type)
+            
+        calls = {asyncio.ensure_future(self._call_provider_async(provider, request, task_type)): provider}
+        try:
+            done, _ = await asyncio.wait(set(calls), timeout=hedge_delay)
+            if not done and not self._get_semaphore(hedge_provider).locked():
+                # Only hedge into spare capacity so hedges never queue behind real traffic
+                logger.info(f"[P20P7S3T1] Hedging {provider.value} request to {hedge_provider.value} after {hedge_delay:.2f}s")
+                tried.add(hedge_provider)
+                calls[asyncio.ensure_future(self._call_provider_async(hedge_provider, request, task_type))] = hedge_provider
+                
+            pending = set(calls)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return calls[task], task.result()
+                    error = error or task.exception()
+            raise error
+        finally:
+            for task in calls:
+                if not task.done():
+                    task.cancel()
+                    
+    def _plan_hedge(
+        self,
+        provider: ProviderType,
+        tried: Set[ProviderType],
+        task_type: str = "general"
+    ) -> Tuple[Optional[ProviderType], Optional[float]]:
+        """Pick the hedge provider and delay, or (None, None) if hedging does not apply."""
+        delay = self._latency_percentile(provider, self.hedge_percentile or 0.95)
+        if delay is None:
+            return None, None
+            
+        candidates = [p for p in self.providers if p not in tried and self.provider_metrics[p].is_healthy]
+        if not candidates:
+            return None, None
+        return max(candidates, key=lambda p: self._calculate_provider_score(p, task_type)[0]), delay
+        
+    def _latency_percentile(self, provider: ProviderType, percentile: float) -> Optional[float]:
+        """Latency percentile of recent successful requests, None until hedge_min_samples exist."""
+        with self._lock:
+            stats = self.provider_stats.get((provider, None))
+            if stats is None or stats.successes < self.hedge_min_samples:
+                return None
+            return stats.latency_quantile(percentile)
+            
+    def _finish_request(
+        self,
+        decision: RoutingDecision,
+        response: Any,
+        response_time: float,
+        task_type: str,
+        prompt: str,
+        fallback_used: bool = False,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> SmartRouterResponse:
+        """Record and log a completed async request and wrap the client response."""
+        smart_response = SmartRouterResponse(
+            content=response.content,
+            provider=decision.provider,
+            response_time=response_time,
+            usage=response.usage,
+            routing_decision=decision,
+            metadata={
+                'task_type': task_type,
+                'prompt_length': len(prompt),
+                'model': response.model,
+                **(metadata or {})
+            }
+        )
+        
+        # Store and log routing decision
+        self.routing_history.append(decision)
+        self._log_routing_decision(decision, response_time, response.usage, fallback_used=fallback_used)
+        
+        logger.info(
+            f"[P20P7S3T1] Async request completed via {decision.provider.value} "
+            f"(time: {response_time:.2f}s, tokens: {response.usage.get('total_tokens', 0)})"
+        )
+        return smart_response
+        
     def set_strategy(self, strategy: RoutingStrategy) -> None:
         """Change the routing strategy."""
         self.strategy = strategy
@@ -700,6 +1292,23 @@ class SmartRouter:
         with self._lock:
             return self.provider_metrics.copy()
             
+    def get_provider_stats(self, task_type: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get streaming statistics per provider.
+        
+        Args:
+            task_type: Task type to report, or None for provider-wide statistics
+            
+        Returns:
+            Dict mapping provider name to EWMA values and p50/p95/p99 latency
+        """
+        with self._lock:
+            return {
+                provider.value: stats.snapshot()
+                for (provider, stats_task_type), stats in self.provider_stats.items()
+                if stats_task_type == task_type
+            }
+            
     def get_routing_history(self, limit: int = 10) -> List[RoutingDecision]:
         """Get recent routing decisions."""
         with self._lock:
@@ -721,6 +1330,7 @@ class SmartRouter:
             for provider in self.provider_metrics:
                 self.provider_metrics[provider] = ProviderMetrics()
                 self.request_history[provider].clear()
+            self.provider_stats.clear()
             self.routing_history.clear()
             self.retry_scoreboard = RetryScoreboard()
             logger.info("[P20P7S3T1] All metrics reset")
@@ -730,6 +1340,8 @@ class SmartRouter:
         self._stop_health_check.set()
         if self._health_check_thread:
             self._health_check_thread.join(timeout=5)
+        self._health_executor.shutdown(wait=False)
+        self._log_sink.flush()
         logger.info("[P20P7S3T1] SmartRouter shutdown complete")
 
     def submit_feedback(self, provider: str, feedback: dict) -> None:
@@ -770,6 +1382,8 @@ class SmartRouter:
             'routing_history': self.get_routing_history(),
             'health_status': self.get_health_status(),
             'retry_scoreboard': self.get_retry_scoreboard(),
+            'connection_pools': get_pool_stats(),
+            'response_cache': self.response_cache.get_stats() if self.response_cache else None,
             'scoring_trends': getattr(self, '_scoring_trends', {})
         }
         return metadata
@@ -787,3 +1401,7 @@ def get_smart_router() -> SmartRouter:
 def route_request(*args, **kwargs) -> SmartRouterResponse:
     """Convenience function to route a request using the global router."""
     return get_smart_router().route_request(*args, **kwargs)
+
+async def route_request_async(*args, **kwargs) -> SmartRouterResponse:
+    """Convenience coroutine to route a request using the global router."""
+    return await get_smart_router().route_request_async(*args, **kwargs)
@@ -607,5 +607,47 @@ class TestPhase23LoadPerformance(unittest.TestCase):
         if num_updates > 1000:
             assert batch_throughput >= individual_throughput * 0.8, "Batch should be competitive for large datasets"
 
+    def test_network_metrics_scaling(self):
+        """Test that network metrics scale linearly up to 50k agents."""
+        print("\n=== Testing Network Metrics Scaling ===")
+        
+        timings = {}
+        operations = {}
+        for num_agents in (5000, 20000, 50000):
+            trust_graph = TrustGraph(
+                storage_path=os.path.join(self.temp_dir, f"scale_{num_agents}"),
+                auto_save=False,
+                high_performance=True
+            )
+            updates = [
+                (
+                    f"scale_agent_{random.randrange(num_agents)}",
+                    f"scale_agent_{random.randrange(num_agents)}",
+                    random.uniform(0.0, 1.0),
+                    random.uniform(0.5, 1.0),
+                    None
+                )
+                for _ in range(num_agents * 4)
+            ]
+            trust_graph.update_trust_batch(updates, high_performance=True)
+            calculator = TrustMetricsCalculator(trust_graph)
+            
+            start_time = time.time()
+            network_metrics = calculator.calculate_network_metrics()
+            timings[num_agents] = time.time() - start_time
+            operations[num_agents] = dict(calculator.network_operations)
+            
+            self.assertEqual(network_metrics.total_agents, len(trust_graph.get_all_agents()))
+            self.assertGreater(network_metrics.trust_resilience, 0.0)
+            print(f"  {num_agents} agents, {network_metrics.total_edges} edges: {timings[num_agents]:.3f}s, "
+                  f"operations {operations[num_agents]}")
+            
+        # Every phase should do about 10x the work for 10x the agents and edges
+        self.assertLess(timings[50000], 60.0, f"50k agents took {timings[50000]:.2f} seconds")
+        self.assertEqual(set(operations[5000]), {"structure", "articulation", "clustering", "efficiency"})
+        for phase, work in operations[5000].items():
+            self.assertGreater(work, 0, phase)
+            self.assertLess(operations[50000][phase], work * 15, phase)
+
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+GitBridge Async Persistent Memory Unit Tests
+Phase: GBP21
+Part: P21P8
+Step: P21P8S1
+Task: P21P8S1T4 - LRU Cache and Batched Reads
+
+Unit tests for the AsyncPersistentMemory node cache: LRU order, hit, miss
+and eviction counters, batched storage reads for query cache misses, and
+writes racing lock-free query reads.
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [P21P8 Schema]
+"""
+
+import unittest
+import asyncio
+import tempfile
+import threading
+import shutil
+from datetime import datetime, timezone, timedelta
+
+from async_persistent_memory import AsyncPersistentMemory, MemoryNode
+
+class AsyncMemoryTestCase(unittest.TestCase):
+    """Shared fixtures for AsyncPersistentMemory tests."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.start = datetime(2025, 6, 19, 12, 0, tzinfo=timezone.utc)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+
+    def make_node(self, position: int, result: str = "original") -> MemoryNode:
+        return MemoryNode(
+            node_id=f"node_{position}",
+            agent_id="agent_1",
+            task_context="analysis",
+            result=result,
+            timestamp=self.start + timedelta(minutes=position),
+            metadata={"type": "review"}
+        )
+
+    def run_memory(self, scenario, **kwargs):
+        """Run a scenario against a fresh memory and close it afterwards."""
+        async def run():
+            memory = AsyncPersistentMemory(storage_path=self.temp_dir, **kwargs)
+            try:
+                return await scenario(memory)
+            finally:
+                await memory.close_async()
+        return asyncio.run(run())
+
+class TestAsyncMemoryCache(AsyncMemoryTestCase):
+    """Unit tests for the LRU node cache and batched reads."""
+
+    def test_lru_order_and_eviction(self):
+        """Test that lookups refresh recency and the least recently used node is evicted."""
+        async def scenario(memory):
+            for position in range(4):
+                await memory.add_node_async(self.make_node(position))
+            after_adds = list(memory.cache)
+
+            # A hit makes node_1 most recently used, so node_2 is evicted next
+            self.assertIsNotNone(await memory._get_node_async("node_1"))
+            await memory.add_node_async(self.make_node(4))
+            return after_adds, list(memory.cache), await memory.get_memory_stats_async()
+
+        after_adds, cached, stats = self.run_memory(scenario, cache_size=3)
+
+        self.assertEqual(after_adds, ["node_1", "node_2", "node_3"])
+        self.assertEqual(cached, ["node_3", "node_1", "node_4"])
+        self.assertEqual(stats["cache_evictions"], 2)
+        self.assertEqual((stats["cache_hits"], stats["cache_misses"]), (1, 0))
+
+    def test_hit_and_miss_counters(self):
+        """Test that queries count hits and misses and cache nodes loaded from storage."""
+        async def scenario(memory):
+            for position in range(4):
+                await memory.add_node_async(self.make_node(position))
+            nodes = await memory.query_by_agent_async("agent_1")
+            first = await memory.get_memory_stats_async()
+            await memory.query_by_agent_async("agent_1")
+            return nodes, first, await memory.get_memory_stats_async(), list(memory.cache)
+
+        nodes, first, second, cached = self.run_memory(scenario, cache_size=2)
+
+        self.assertEqual([node.node_id for node in nodes], ["node_0", "node_1", "node_2", "node_3"])
+        # node_2 and node_3 were cached by the adds; node_0 and node_1 came from storage
+        self.assertEqual((first["cache_hits"], first["cache_misses"]), (2, 2))
+        self.assertEqual(cached, ["node_2", "node_3"])
+        self.assertAlmostEqual(first["cache_hit_rate"], 0.5)
+        self.assertEqual(second["cache_misses"] - first["cache_misses"], 2)
+        self.assertEqual(second["cache_size"], 2)
+
+    def test_batched_reads(self):
+        """Test that cache misses are read from storage in read_batch_size batches."""
+        async def scenario(memory):
+            for position in range(5):
+                await memory.add_node_async(self.make_node(position))
+            memory.cache.clear()
+
+            batches = []
+            get_many = memory.store.get_many
+
+            def recording_get_many(keys):
+                batches.append(list(keys))
+                return get_many(keys)
+
+            memory.store.get_many = recording_get_many
+            nodes = await memory.query_by_agent_async("agent_1")
+            cold = list(batches)
+            await memory.query_by_agent_async("agent_1")
+            return nodes, cold, batches, await memory.get_memory_stats_async()
+
+        nodes, cold, batches, stats = self.run_memory(scenario, read_batch_size=2)
+
+        self.assertEqual([node.node_id for node in nodes], [f"node_{i}" for i in range(5)])
+        self.assertEqual(cold, [["node_0", "node_1"], ["node_2", "node_3"], ["node_4"]])
+        # The second query is answered from the cache
+        self.assertEqual(batches, cold)
+        self.assertEqual((stats["cache_hits"], stats["cache_misses"]), (5, 5))
+
+class TestAsyncMemoryConcurrentReads(AsyncMemoryTestCase):
+    """Unit tests for writes and close racing in-flight query reads."""
+
+    def block_reads(self, memory):
+        """Make storage batch reads wait for release after reading their payloads."""
+        started = threading.Event()
+        release = threading.Event()
+        finished = threading.Event()
+        get_many = memory.store.get_many
+
+        def blocking_get_many(keys):
+            payloads = get_many(keys)
+            started.set()
+            release.wait(5)
+            finished.set()
+            return payloads
+
+        memory.store.get_many = blocking_get_many
+        return started, release, finished
+
+    def test_overwrite_during_read_is_not_cached_stale(self):
+        """Test that a query reading an old copy does not cache it over a newer write."""
+        async def scenario(memory):
+            await memory.add_node_async(self.make_node(0, "original"))
+            memory.cache.clear()
+            started, release, _ = self.block_reads(memory)
+
+            query = asyncio.ensure_future(memory.query_by_agent_async("agent_1"))
+            self.assertTrue(await asyncio.to_thread(started.wait, 5))
+            await memory.add_node_async(self.make_node(0, "updated"))
+            release.set()
+            return await query, memory.cache.get("node_0")
+
+        nodes, cached = self.run_memory(scenario)
+
+        # The query began before the write, so it may return either copy
+        self.assertIn(nodes[0].result, ("original", "updated"))
+        self.assertEqual(cached.result, "updated")
+
+    def test_delete_during_read_is_not_cached(self):
+        """Test that a query reading a node deleted meanwhile leaves no cache entry."""
+        async def scenario(memory):
+            await memory.add_node_async(self.make_node(0))
+            memory.cache.clear()
+            started, release, _ = self.block_reads(memory)
+
+            query = asyncio.ensure_future(memory.query_by_agent_async("agent_1"))
+            self.assertTrue(await asyncio.to_thread(started.wait, 5))
+            # Nodes are from 2025, so a 30-day cleanup removes them
+            removed = await memory.cleanup_old_nodes_async(30)
+            release.set()
+            await query
+            return removed, "node_0" in memory.cache, "node_0" in memory.store
+
+        removed, cached, stored = self.run_memory(scenario)
+
+        self.assertEqual(removed, 1)
+        self.assertFalse(cached)
+        self.assertFalse(stored)
+
+    def test_close_waits_for_in_flight_reads(self):
+        """Test that close_async waits for a query's storage read before closing storage."""
+        async def scenario(memory):
+            await memory.add_node_async(self.make_node(0))
+            memory.cache.clear()
+            started, release, finished = self.block_reads(memory)
+
+            closed_after_read = []
+            close = memory.store.close
+
+            def recording_close():
+                closed_after_read.append(finished.is_set())
+                close()
+
+            memory.store.close = recording_close
+            query = asyncio.ensure_future(memory.query_by_agent_async("agent_1"))
+            self.assertTrue(await asyncio.to_thread(started.wait, 5))
+
+            closing = asyncio.ensure_future(memory.close_async())
+            await asyncio.sleep(0.1)
+            close_pending = not closing.done()
+            release.set()
+            await closing
+            return await query, close_pending, closed_after_read
+
+        async def run():
+            memory = AsyncPersistentMemory(storage_path=self.temp_dir)
+            return await scenario(memory)
+
+        nodes, close_pending, closed_after_read = asyncio.run(run())
+
+        self.assertTrue(close_pending)
+        self.assertEqual(closed_after_read, [True])
+        self.assertEqual([node.node_id for node in nodes], ["node_0"])
+
+if __name__ == "__main__":
+    unittest.main()
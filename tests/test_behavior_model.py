@@ -18,6 +18,7 @@ import tempfile
 import os
 import json
 from datetime import datetime, timezone, timedelta
+from unittest.mock import patch
 
 from behavior_model import (
     BehaviorModel, 
@@ -310,6 +311,141 @@ class TestBehaviorModel(unittest.TestCase):
         self.assertIn("consistency", behavior.behavioral_patterns)
         self.assertEqual(behavior.total_interactions, 1)
         
+    def test_record_interactions_batch(self):
+        """Test batched interaction recording."""
+        self.behavior_model.add_agent("agent1")
+        self.behavior_model.add_agent("agent2")
+        
+        recorded = self.behavior_model.record_interactions_batch([
+            {"agent_id": "agent1", "success": True},
+            {"agent_id": "agent1", "success": False, "metadata": {"last_task": "review"}},
+            {"agent_id": "agent2", "success": True},
+            {"agent_id": "missing", "success": True}
+        ])
+        
+        self.assertEqual(recorded, 3)
+        agent1 = self.behavior_model.get_agent_behavior("agent1")
+        self.assertEqual(agent1.total_interactions, 2)
+        self.assertEqual(agent1.failed_interactions, 1)
+        self.assertEqual(agent1.metadata["last_task"], "review")
+        self.assertEqual(self.behavior_model.get_agent_behavior("agent2").successful_interactions, 1)
+        
+    def test_sharded_persistence(self):
+        """Test sharded persistence writes only dirty shards and reloads."""
+        storage = os.path.join(self.temp_dir, "sharded")
+        model = BehaviorModel(storage_path=storage, persistence_mode="sharded", shard_count=8, flush_interval=60)
+        for i in range(50):
+            model.add_agent(f"agent{i}")
+        model.add_specialization("agent3", "code_review")
+        self.assertEqual(model.flush(), 8)
+        
+        model.record_interactions_batch([{"agent_id": "agent3", "success": True}] * 5)
+        self.assertEqual(model.flush(), 1)
+        self.assertEqual(model.flush(), 0)
+        model.close()
+        
+        reloaded = BehaviorModel(storage_path=storage, persistence_mode="sharded", shard_count=8)
+        self.assertEqual(len(reloaded.agents), 50)
+        agent3 = reloaded.get_agent_behavior("agent3")
+        self.assertEqual(agent3.total_interactions, 5)
+        self.assertEqual(agent3.specializations, {"code_review"})
+        reloaded.close()
+
+    def test_sharded_persistence_shard_count_change(self):
+        """Test changing shard_count rewrites the layout instead of reviving stale shards."""
+        storage = os.path.join(self.temp_dir, "resharded")
+        model = BehaviorModel(storage_path=storage, persistence_mode="sharded", shard_count=8, flush_interval=60)
+        for i in range(20):
+            model.add_agent(f"agent{i}")
+        model.close()
+
+        model = BehaviorModel(storage_path=storage, persistence_mode="sharded", shard_count=3, flush_interval=60)
+        self.assertEqual(len(os.listdir(os.path.join(storage, "shards"))), 4)  # 3 shards + manifest
+        model.record_interactions_batch([{"agent_id": f"agent{i}", "success": True} for i in range(20)])
+        model.close()
+
+        reloaded = BehaviorModel(storage_path=storage, persistence_mode="sharded", shard_count=3)
+        self.assertEqual(len(reloaded.agents), 20)
+        for i in range(20):
+            self.assertEqual(reloaded.get_agent_behavior(f"agent{i}").total_interactions, 1)
+        reloaded.close()
+
+    def test_failed_flush_keeps_changes_pending(self):
+        """Test agents whose file could not be written are flushed again later."""
+        storage = os.path.join(self.temp_dir, "failing")
+        model = BehaviorModel(storage_path=storage, persistence_mode="per_agent", flush_interval=60)
+        model.add_agent("agent1")
+        with patch.object(BehaviorModel, "_write_atomic", side_effect=OSError("disk full")):
+            self.assertEqual(model.flush(), 0)
+        self.assertEqual(model.flush(), 1)
+        model.close()
+
+        reloaded = BehaviorModel(storage_path=storage, persistence_mode="per_agent")
+        self.assertIn("agent1", reloaded.agents)
+        reloaded.close()
+
+    def test_per_agent_persistence_migrates_snapshot(self):
+        """Test per-agent mode picks up an existing snapshot."""
+        self.behavior_model.add_agent("agent/1")
+        self.behavior_model.record_interaction("agent/1", True)
+        
+        model = BehaviorModel(storage_path=self.behavior_file, persistence_mode="per_agent", flush_interval=60)
+        self.assertEqual(len(os.listdir(os.path.join(self.behavior_file, "agents"))), 1)
+        model.record_interaction("agent/1", False)
+        model.close()
+        
+        reloaded = BehaviorModel(storage_path=self.behavior_file, persistence_mode="per_agent")
+        self.assertEqual(reloaded.get_agent_behavior("agent/1").total_interactions, 2)
+        reloaded.close()
+        
+    def test_predict_behavior_many_matches_predict_behavior(self):
+        """Test vectorized predictions agree with per-agent predictions."""
+        import random
+        rng = random.Random(7)
+        agent_ids = [f"agent{i}" for i in range(40)]
+        for agent_id in agent_ids:
+            self.behavior_model.add_agent(agent_id)
+        self.behavior_model.auto_save = False
+        for agent_id in agent_ids:
+            for trait in ("conscientiousness", "extraversion", "neuroticism", "custom_trait"):
+                self.behavior_model.update_personality_trait(agent_id, trait, rng.uniform(-1, 1))
+            for pattern in ("consistency", "collaboration", "adaptability", "speed", "caution"):
+                self.behavior_model.update_behavioral_pattern(agent_id, pattern, rng.random(), rng.uniform(-1, 1))
+            for _ in range(rng.randint(0, 5)):
+                self.behavior_model.record_interaction(agent_id, rng.random() < 0.7)
+            if rng.random() < 0.3:
+                self.behavior_model.add_specialization(agent_id, "code_review")
+        self.behavior_model.agents["agent0"].behavioral_patterns.pop("consistency")
+        self.behavior_model._matrix.invalidate(["agent0"])
+                
+        predictions = self.behavior_model.predict_behavior_many(agent_ids + ["missing"], "code_review")
+        
+        self.assertEqual(set(predictions), set(agent_ids))
+        for agent_id in agent_ids:
+            expected = self.behavior_model.predict_behavior(agent_id, "code_review")
+            for key, value in expected.items():
+                if isinstance(value, float):
+                    self.assertAlmostEqual(predictions[agent_id][key], value, places=9)
+                else:
+                    self.assertEqual(predictions[agent_id][key], value)
+                    
+    def test_top_agents(self):
+        """Test top-k ranking by predicted score."""
+        for agent_id, successes in (("agent1", 1), ("agent2", 3), ("agent3", 2)):
+            self.behavior_model.add_agent(agent_id)
+            for i in range(3):
+                self.behavior_model.record_interaction(agent_id, i < successes)
+                
+        top = self.behavior_model.top_agents(k=2, metric="expected_success_rate")
+        self.assertEqual([agent_id for agent_id, _ in top], ["agent2", "agent3"])
+        self.assertAlmostEqual(top[0][1], 1.0)
+        
+        top = self.behavior_model.top_agents(k=5, metric="expected_success_rate", agent_ids=["agent1", "agent3"])
+        self.assertEqual([agent_id for agent_id, _ in top], ["agent3", "agent1"])
+        
+        with self.assertRaises(ValueError):
+            self.behavior_model.top_agents(metric="unknown")
+            
     def test_error_handling(self):
         """Test error handling for invalid inputs."""
         # Test operations on non-existent agent
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+GitBridge Buffered Log Sink Unit Tests
+Phase: GBP20
+Part: P20P7
+Step: P20P7S3
+Task: P20P7S3T4 - Buffered Asynchronous Log Writer
+
+Unit tests for the background JSONL log sink: backpressure drops, size and
+age rotation, and flush and close ordering.
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [Corrected P20P7 Schema]
+"""
+
+import unittest
+import tempfile
+import threading
+import shutil
+import json
+import time
+import os
+from unittest.mock import patch
+
+from utils.log_sink import LogSink
+
+class TestLogSink(unittest.TestCase):
+    """Unit tests for LogSink class."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.temp_dir, "logs", "routing.jsonl")
+        self.sinks = []
+
+    def tearDown(self):
+        """Clean up test environment."""
+        for sink in self.sinks:
+            sink.close()
+        shutil.rmtree(self.temp_dir)
+
+    def make_sink(self, **kwargs) -> LogSink:
+        sink = LogSink(**kwargs)
+        self.sinks.append(sink)
+        return sink
+
+    def read_records(self, path: str):
+        with open(path, 'r') as f:
+            return [json.loads(line) for line in f]
+
+    def test_drops_counted_when_queue_full(self):
+        """Test that records are dropped and counted instead of blocking when the queue is full."""
+        sink = self.make_sink(max_queue=2, flush_interval=0.05)
+        writing, release = threading.Event(), threading.Event()
+        write_batch = sink._write_batch
+
+        def stalled(records):
+            writing.set()
+            release.wait(5.0)
+            write_batch(records)
+
+        with patch.object(sink, '_write_batch', side_effect=stalled):
+            self.assertTrue(sink.write(self.log_file, {"n": 0}))
+            self.assertTrue(writing.wait(5.0))  # Writer holds record 0
+            self.assertTrue(sink.write(self.log_file, {"n": 1}))
+            self.assertTrue(sink.write(self.log_file, {"n": 2}))
+            started = time.perf_counter()
+            self.assertFalse(sink.write(self.log_file, {"n": 3}))
+            self.assertLess(time.perf_counter() - started, 0.5)
+            release.set()
+            self.assertTrue(sink.flush())
+
+        stats = sink.get_stats()
+        self.assertEqual(stats["enqueued"], 3)
+        self.assertEqual(stats["dropped"], 1)
+        self.assertEqual(stats["written"], 3)
+        self.assertEqual([record["n"] for record in self.read_records(self.log_file)], [0, 1, 2])
+
+    def test_size_rotation_keeps_backup_count(self):
+        """Test that full files shift to numbered backups and the oldest is discarded."""
+        sink = self.make_sink(max_bytes=100, backup_count=2)
+        for position in range(5):
+            sink.write(self.log_file, {"n": position, "padding": "x" * 80})
+            self.assertTrue(sink.flush())
+
+        self.assertEqual(sink.get_stats()["rotations"], 5)
+        self.assertEqual(self.read_records(f"{self.log_file}.1")[0]["n"], 4)
+        self.assertEqual(self.read_records(f"{self.log_file}.2")[0]["n"], 3)
+        self.assertFalse(os.path.exists(f"{self.log_file}.3"))
+
+        sink.write(self.log_file, {"n": 5})
+        self.assertTrue(sink.flush())
+        self.assertEqual([record["n"] for record in self.read_records(self.log_file)], [5])
+
+    def test_age_rotation_while_idle(self):
+        """Test that an open file is rotated by age even when no records arrive."""
+        sink = self.make_sink(rotate_interval=0.1, flush_interval=0.05)
+        sink.write(self.log_file, {"n": 0})
+        self.assertTrue(sink.flush())
+
+        deadline = time.time() + 5.0
+        while not os.path.exists(f"{self.log_file}.1") and time.time() < deadline:
+            time.sleep(0.05)
+
+        self.assertEqual([record["n"] for record in self.read_records(f"{self.log_file}.1")], [0])
+        self.assertGreaterEqual(sink.get_stats()["rotations"], 1)
+
+    def test_flush_writes_everything_enqueued_before_it(self):
+        """Test that flush returns only after earlier records reach their files."""
+        sink = self.make_sink(batch_size=7, flush_interval=10.0)
+        other_file = os.path.join(self.temp_dir, "usage.jsonl")
+        for position in range(50):
+            sink.write(self.log_file if position % 2 else other_file, {"n": position})
+
+        self.assertTrue(sink.flush())
+
+        self.assertEqual([record["n"] for record in self.read_records(other_file)], list(range(0, 50, 2)))
+        self.assertEqual([record["n"] for record in self.read_records(self.log_file)], list(range(1, 50, 2)))
+
+    def test_close_writes_pending_then_drops(self):
+        """Test that close writes pending records and later writes are dropped."""
+        sink = self.make_sink(flush_interval=10.0)
+        for position in range(10):
+            sink.write(self.log_file, {"n": position})
+
+        self.assertTrue(sink.close())
+        self.assertTrue(sink.close())  # Idempotent
+
+        self.assertEqual(len(self.read_records(self.log_file)), 10)
+        self.assertFalse(sink.write(self.log_file, {"n": 10}))
+        self.assertFalse(sink.flush(timeout=0.1))
+        self.assertEqual(sink.get_stats()["dropped"], 1)
+
+    def test_unserializable_record_counted(self):
+        """Test that a record json cannot encode is counted as a write error, not raised."""
+        sink = self.make_sink()
+        record = {"n": 0}
+        record["self"] = record
+        sink.write(self.log_file, record)
+        sink.write(self.log_file, {"n": 1})
+        self.assertTrue(sink.flush())
+
+        self.assertEqual(sink.get_stats()["write_errors"], 1)
+        self.assertEqual(self.read_records(self.log_file), [{"n": 1}])
+
+    def test_failed_idle_rotation_keeps_writer_running(self):
+        """Test that an OSError while rotating an idle file is counted and the writer survives."""
+        sink = self.make_sink(rotate_interval=0.1, flush_interval=0.05)
+        sink.write(self.log_file, {"n": 0})
+        self.assertTrue(sink.flush())
+
+        with patch('utils.log_sink.os.replace', side_effect=PermissionError("denied")):
+            deadline = time.time() + 5.0
+            while not sink.get_stats()["write_errors"] and time.time() < deadline:
+                time.sleep(0.05)
+
+        self.assertGreaterEqual(sink.get_stats()["write_errors"], 1)
+        self.assertEqual(sink.get_stats()["rotations"], 0)
+        self.assertTrue(sink._thread.is_alive())
+
+        # The unrotated file is reopened and appended to
+        sink.rotate_interval = None
+        sink.write(self.log_file, {"n": 1})
+        self.assertTrue(sink.flush())
+        self.assertEqual([record["n"] for record in self.read_records(self.log_file)], [0, 1])
+
+    def test_failed_write_closes_handle(self):
+        """Test that a handle whose write fails is closed before it is dropped."""
+        sink = self.make_sink()
+        sink.write(self.log_file, {"n": 0})
+        self.assertTrue(sink.flush())
+        handle = sink._files[self.log_file][0]
+
+        with patch.object(handle, 'write', side_effect=OSError("disk full")):
+            sink.write(self.log_file, {"n": 1})
+            self.assertTrue(sink.flush())
+
+        self.assertTrue(handle.closed)
+        self.assertEqual(sink.get_stats()["write_errors"], 1)
+
+        sink.write(self.log_file, {"n": 2})
+        self.assertTrue(sink.flush())
+        self.assertEqual([record["n"] for record in self.read_records(self.log_file)], [0, 2])
+
+if __name__ == "__main__":
+    unittest.main()
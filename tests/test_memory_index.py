@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+GitBridge Memory Secondary Index Unit Tests
+Phase: GBP21
+Part: P21P8
+Step: P21P8S1
+Task: P21P8S1T3 - Durable Time-Ordered Indexes
+
+Unit tests for the time-ordered memory indexes, their snapshot and log
+persistence, and their reconciliation with segment storage on startup.
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [P21P8 Schema]
+"""
+
+import unittest
+import asyncio
+import tempfile
+import shutil
+import os
+from datetime import datetime, timezone, timedelta
+
+from memory_index import MemoryIndex, ALL_NODES
+from async_persistent_memory import AsyncPersistentMemory, MemoryNode
+
+class TestMemoryIndex(unittest.TestCase):
+    """Unit tests for MemoryIndex class."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.index = MemoryIndex(self.temp_dir)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.index.close()
+        shutil.rmtree(self.temp_dir)
+
+    def reload(self, checkpoint_threshold: int = 10000) -> MemoryIndex:
+        self.index.close()
+        self.index = MemoryIndex(self.temp_dir, checkpoint_threshold=checkpoint_threshold)
+        self.assertTrue(self.index.load())
+        return self.index
+
+    def test_time_ordered_ranges(self):
+        """Test that lookups return node IDs in timestamp order regardless of insertion order."""
+        self.index.add("node_3", 30.0, "agent_1", "analysis", "review")
+        self.index.add("node_1", 10.0, "agent_1", "analysis", "review")
+        self.index.add("node_2", 20.0, "agent_2", "analysis", "decision")
+
+        self.assertEqual(self.index.ids("agent:agent_1"), ["node_1", "node_3"])
+        self.assertEqual(self.index.range("context:analysis", 15.0, 30.0), ["node_2", "node_3"])
+        self.assertEqual(self.index.range(ALL_NODES, end=20.0), ["node_1", "node_2"])
+        self.assertEqual(self.index.before(ALL_NODES, 20.0), ["node_1"])
+        self.assertEqual(self.index.count("type:review"), 2)
+        self.assertEqual(sorted(self.index.keys("agent:")), ["agent:agent_1", "agent:agent_2"])
+
+    def test_readd_replaces_and_remove_drops(self):
+        """Test that re-adding a node moves it and removing it empties its keys."""
+        self.index.add("node_1", 10.0, "agent_1", "analysis", "review")
+        self.index.add("node_1", 40.0, "agent_2", "planning", "review")
+
+        self.assertEqual(self.index.ids("agent:agent_1"), [])
+        self.assertNotIn("agent:agent_1", self.index.keys())
+        self.assertEqual(self.index.range("context:planning", 30.0), ["node_1"])
+
+        self.assertTrue(self.index.remove("node_1"))
+        self.assertFalse(self.index.remove("node_1"))
+        self.assertEqual(len(self.index), 0)
+        self.assertEqual(self.index.keys(), [])
+
+    def test_reload_from_snapshot_and_log(self):
+        """Test that a reloaded index replays logged changes on top of its snapshot."""
+        self.index.add("node_1", 10.0, "agent_1", "analysis", "review")
+        self.index.checkpoint()
+        self.index.add("node_2", 20.0, "agent_1", "analysis", "review")
+        self.index.remove("node_1")
+
+        index = self.reload()
+
+        self.assertEqual(index.node_ids(), {"node_2"})
+        self.assertEqual(index.ids("agent:agent_1"), ["node_2"])
+
+    def test_checkpoint_threshold_truncates_log(self):
+        """Test that the log is folded into a snapshot after checkpoint_threshold changes."""
+        self.index.close()
+        self.index = MemoryIndex(self.temp_dir, checkpoint_threshold=3)
+        for position in range(4):
+            self.index.add(f"node_{position}", float(position), "agent_1", "analysis", "review")
+
+        with open(os.path.join(self.temp_dir, "memory_index.log")) as f:
+            self.assertEqual(len(f.readlines()), 1)
+        self.assertEqual(len(self.reload(checkpoint_threshold=3)), 4)
+
+    def test_reload_with_torn_log_line(self):
+        """Test that a torn last log line is ignored and later appends survive another reload."""
+        self.index.add("node_1", 10.0, "agent_1", "analysis", "review")
+        self.index.close()
+        with open(os.path.join(self.temp_dir, "memory_index.log"), 'a') as f:
+            f.write('["+","node_2",20.0,"agen')
+
+        index = self.reload()
+        self.assertEqual(index.node_ids(), {"node_1"})
+
+        index.add("node_3", 30.0, "agent_1", "analysis", "review")
+        index = self.reload()
+        self.assertEqual(index.ids("agent:agent_1"), ["node_1", "node_3"])
+
+    def test_unreadable_snapshot_is_ignored(self):
+        """Test that a corrupt snapshot makes load() report no persisted index."""
+        self.index.add("node_1", 10.0, "agent_1", "analysis", "review")
+        self.index.checkpoint()
+        self.index.close()
+        with open(os.path.join(self.temp_dir, "memory_index.json"), 'w') as f:
+            f.write('{"version": 1, "nodes": [[')
+
+        index = MemoryIndex(self.temp_dir)
+        self.assertFalse(index.load())
+        self.assertEqual(len(index), 0)
+        index.close()
+
+class TestIndexReconciliation(unittest.TestCase):
+    """Unit tests for reconciling persisted indexes with segment storage."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.start = datetime(2025, 6, 19, 12, 0, tzinfo=timezone.utc)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+
+    def make_node(self, position: int) -> MemoryNode:
+        return MemoryNode(
+            node_id=f"node_{position}",
+            agent_id="agent_1",
+            task_context="analysis",
+            result={"position": position},
+            timestamp=self.start + timedelta(minutes=position),
+            metadata={"type": "review"}
+        )
+
+    def test_reconcile_after_crash_between_store_and_index(self):
+        """Test that startup indexes stored-but-unindexed nodes and drops indexed-but-deleted ones."""
+        async def crash():
+            memory = AsyncPersistentMemory(storage_path=self.temp_dir)
+            for position in range(3):
+                await memory.add_node_async(self.make_node(position))
+            # Writes that reached segment storage but not the index
+            memory.store.put("node_3", memory._encode_node(self.make_node(3)))
+            memory.store.delete("node_0")
+            # Crash: no index checkpoint, files closed as the process dies
+            memory._compaction_task.cancel()
+            memory.store.close()
+            memory.index.close()
+
+        async def reopen():
+            memory = AsyncPersistentMemory(storage_path=self.temp_dir)
+            try:
+                return memory.index.node_ids(), await memory.query_by_agent_async("agent_1")
+            finally:
+                await memory.close_async()
+
+        asyncio.run(crash())
+        indexed, nodes = asyncio.run(reopen())
+
+        self.assertEqual(indexed, {"node_1", "node_2", "node_3"})
+        self.assertEqual([node.node_id for node in nodes], ["node_1", "node_2", "node_3"])
+        self.assertEqual(nodes[-1].result, {"position": 3})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+GitBridge Memory Segment Store Unit Tests
+Phase: GBP21
+Part: P21P8
+Step: P21P8S1
+Task: P21P8S1T2 - Segment Storage Engine
+
+Unit tests for the append-only segment store and the migration of
+one-file-per-node storage into it.
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [P21P8 Schema]
+"""
+
+import unittest
+import asyncio
+import tempfile
+import shutil
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+from memory_segments import SegmentStore, SEGMENT_SUFFIX, HINT_SUFFIX
+from async_persistent_memory import AsyncPersistentMemory
+
+class TestSegmentStore(unittest.TestCase):
+    """Unit tests for SegmentStore class."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.store_path = os.path.join(self.temp_dir, "segments")
+        self.store = SegmentStore(self.store_path, segment_size=256)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.store.close()
+        shutil.rmtree(self.temp_dir)
+
+    def reopen(self) -> SegmentStore:
+        self.store.close()
+        self.store = SegmentStore(self.store_path, segment_size=256)
+        return self.store
+
+    def segment_files(self):
+        return sorted(Path(self.store_path).glob(f"*{SEGMENT_SUFFIX}"))
+
+    def test_put_overwrite_delete(self):
+        """Test storing, replacing and deleting values."""
+        self.store.put("node_1", b"first")
+        self.store.put("node_2", b"second")
+        self.store.put("node_1", b"replaced")
+
+        self.assertEqual(self.store.get("node_1"), b"replaced")
+        self.assertEqual(self.store.get_many(["node_1", "node_2", "missing"]), {"node_1": b"replaced", "node_2": b"second"})
+        self.assertEqual(len(self.store), 2)
+
+        self.assertTrue(self.store.delete("node_1"))
+        self.assertFalse(self.store.delete("node_1"))
+        self.assertIsNone(self.store.get("node_1"))
+        self.assertEqual(sorted(self.store.keys()), ["node_2"])
+        self.assertEqual(dict(self.store.scan()), {"node_2": b"second"})
+
+    def test_reload_from_hints_and_active_segment(self):
+        """Test that a reopened store sees every write across sealed and active segments."""
+        for index in range(20):
+            self.store.put(f"node_{index}", f"value_{index}".encode() * 4)
+        self.store.put("node_3", b"replaced")
+        self.store.delete("node_5")
+        self.assertGreater(len(self.segment_files()), 1)
+        self.assertTrue(list(Path(self.store_path).glob(f"*{HINT_SUFFIX}")))
+
+        store = self.reopen()
+
+        self.assertEqual(len(store), 19)
+        self.assertEqual(store.get("node_3"), b"replaced")
+        self.assertIsNone(store.get("node_5"))
+        self.assertEqual(store.get("node_19"), b"value_19" * 4)
+
+    def test_reload_with_torn_last_record(self):
+        """Test that a torn last record is dropped and truncated away."""
+        self.store.put("node_1", b"complete")
+        self.store.put("node_2", b"torn record")
+        last_segment = self.segment_files()[-1]
+        size = last_segment.stat().st_size
+        self.store.close()
+        os.truncate(last_segment, size - 4)
+
+        store = SegmentStore(self.store_path, segment_size=256)
+        self.store = store
+
+        self.assertEqual(store.get("node_1"), b"complete")
+        self.assertIsNone(store.get("node_2"))
+        self.assertEqual(last_segment.stat().st_size, size - len("node_2") - len(b"torn record") - 11)
+
+        # Appends after the repair must be readable after another reload
+        store.put("node_3", b"after repair")
+        store = self.reopen()
+        self.assertEqual(store.get("node_1"), b"complete")
+        self.assertEqual(store.get("node_3"), b"after repair")
+
+    def test_compaction_keeps_tombstones_for_older_segments(self):
+        """Test that compaction carries a tombstone while an older segment holds the deleted value."""
+        self.store.put("deleted", b"x" * 200)                    # Segment 1
+        self.store.put("kept", b"k" * 200)                       # Segment 1
+        self.store.put("churn", b"c" * 200)                      # Segment 2
+        self.store.delete("deleted")                             # Tombstone in segment 2
+        self.store.put("churn", b"d" * 200)                      # Segment 2
+        self.store.put("churn", b"e" * 200)                      # Segment 3, segment 2 is all garbage
+
+        result = self.store.compact(threshold=0.9)
+
+        self.assertEqual(result["segments_compacted"], 1)
+        self.assertEqual([path.name for path in self.segment_files()], ["segment_000001.seg", "segment_000003.seg"])
+        store = self.reopen()
+        self.assertIsNone(store.get("deleted"))
+        self.assertEqual(sorted(store.keys()), ["churn", "kept"])
+        self.assertEqual(store.get("churn"), b"e" * 200)
+
+    def test_get_many_during_compaction(self):
+        """Test that a batched read racing compaction still returns every value."""
+        for round_index in range(3):
+            for index in range(4):
+                self.store.put(f"node_{index}", f"{round_index}".encode() * 60)
+        read = self.store._read
+        compacted = []
+
+        def read_after_compaction(fd, location, key):
+            # Compact once, after the locations were captured
+            if not compacted:
+                compacted.append(self.store.compact(threshold=0.0))
+            return read(fd, location, key)
+
+        self.store._read = read_after_compaction
+        values = self.store.get_many([f"node_{index}" for index in range(4)])
+
+        self.assertGreater(compacted[0]["segments_compacted"], 0)
+        self.assertEqual(values, {f"node_{index}": b"2" * 60 for index in range(4)})
+
+    def test_compaction_reclaims_space(self):
+        """Test that compaction removes overwritten values and keeps live ones."""
+        for round_index in range(5):
+            for index in range(5):
+                self.store.put(f"node_{index}", f"{round_index}".encode() * 60)
+        before = self.store.stats()
+
+        result = self.store.compact(threshold=0.5)
+
+        after = self.store.stats()
+        self.assertGreater(result["bytes_reclaimed"], 0)
+        self.assertLess(after["total_bytes"], before["total_bytes"])
+        store = self.reopen()
+        for index in range(5):
+            self.assertEqual(store.get(f"node_{index}"), b"4" * 60)
+
+    def test_compaction_expires_records(self):
+        """Test that the expired predicate drops live records during compaction."""
+        for index in range(6):
+            self.store.put(f"node_{index}", (b"old" if index % 2 else b"new") * 30)
+        self.store.put("active", b"a" * 300)
+
+        result = self.store.compact(expired=lambda key, value: value.startswith(b"old"))
+
+        self.assertEqual(sorted(result["expired_keys"]), ["node_1", "node_3", "node_5"])
+        store = self.reopen()
+        self.assertEqual(sorted(store.keys()), ["active", "node_0", "node_2", "node_4"])
+
+class TestNodeFileMigration(unittest.TestCase):
+    """Unit tests for migrating node files into segment storage."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_migration_from_node_files(self):
+        """Test that nodes/*.json files move into segments and stay queryable."""
+        nodes_dir = Path(self.temp_dir) / "nodes"
+        nodes_dir.mkdir()
+        for index in range(3):
+            (nodes_dir / f"node_{index}.json").write_text(json.dumps({
+                "node_id": f"node_{index}",
+                "agent_id": "agent_1",
+                "task_context": "analysis",
+                "result": {"index": index},
+                "timestamp": datetime(2025, 6, 19, 12, index, tzinfo=timezone.utc).isoformat(),
+                "metadata": {"type": "review"},
+                "links": []
+            }))
+        (nodes_dir / "broken.json").write_text("{not json")
+
+        async def run():
+            memory = AsyncPersistentMemory(storage_path=self.temp_dir)
+            try:
+                return len(memory.store), await memory.query_by_agent_async("agent_1")
+            finally:
+                await memory.close_async()
+
+        stored, nodes = asyncio.run(run())
+
+        self.assertEqual(stored, 3)
+        self.assertEqual([node.node_id for node in nodes], ["node_0", "node_1", "node_2"])
+        self.assertEqual(nodes[1].result, {"index": 1})
+        self.assertFalse(nodes_dir.exists())
+        self.assertTrue((Path(self.temp_dir) / "nodes.migrated").is_dir())
+
+if __name__ == "__main__":
+    unittest.main()
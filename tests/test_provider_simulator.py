@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+GitBridge Provider Simulator Unit Tests
+Phase: GBP20
+Part: P20P7
+Step: P20P7S3
+Task: P20P7S3T7 - End-to-End Latency Benchmark
+
+Unit tests for the OpenAI-compatible provider stub server, driven by the real
+OpenAIClient, and a smoke test of the SmartRouter benchmark scenarios. Every
+request stays on the loopback interface.
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [Corrected P20P7 Schema]
+"""
+
+import os
+import shutil
+import unittest
+import tempfile
+import importlib.util
+from unittest import mock
+
+import openai
+
+from clients.openai_client import OpenAIClient
+from clients.transport import close_transports
+from smart_router.provider_simulator import (
+    ProviderStubServer,
+    ProviderProfile,
+    LatencyProfile,
+    parse_service_time
+)
+
+BENCHMARK_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts", "benchmark_smartrouter.py")
+
+def load_benchmark():
+    """Import the benchmark script, which is not part of a package."""
+    spec = importlib.util.spec_from_file_location("benchmark_smartrouter", BENCHMARK_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+class TestProviderStubServer(unittest.TestCase):
+    """Unit tests for ProviderStubServer class."""
+
+    def setUp(self):
+        """Set up test environment."""
+        # Keep token usage records out of the working directory
+        patcher = mock.patch("clients.openai_client.log_token_usage")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(close_transports)
+
+    def make_client(self, stub: ProviderStubServer) -> OpenAIClient:
+        with mock.patch.dict(os.environ, {"OPENAI_BASE_URL": stub.url}):
+            client = OpenAIClient(api_key="sim-key", model="gpt-4o")
+        client.client = client.client.with_options(max_retries=0)
+        return client
+
+    def test_openai_client_request_succeeds(self):
+        """Test that OpenAIClient gets a completion from the stub through OPENAI_BASE_URL."""
+        profile = ProviderProfile(model="stub", latency=LatencyProfile(median=0.0), error_rate=0.0)
+        with ProviderStubServer(profile, port=0, seed=1) as stub:
+            self.assertNotEqual(stub.url.rsplit(":", 1)[1], "0/v1")
+            response = self.make_client(stub).generate_response("hello stub")
+
+            self.assertEqual(stub.calls, 1)
+            self.assertIsNotNone(parse_service_time(response.content))
+            self.assertGreater(response.usage["total_tokens"], 0)
+
+    def test_openai_client_request_fails(self):
+        """Test that injected failures reach OpenAIClient with the configured status."""
+        profile = ProviderProfile(model="stub", latency=LatencyProfile(median=0.0), error_rate=1.0)
+        with ProviderStubServer(profile, port=0, seed=1, error_status=503) as stub:
+            with self.assertRaises(openai.APIStatusError) as context:
+                self.make_client(stub).generate_response("hello stub")
+
+            self.assertEqual(context.exception.status_code, 503)
+            self.assertEqual(stub.calls, 1)
+
+class TestBenchmarkScenarios(unittest.TestCase):
+    """Smoke tests for the SmartRouter benchmark's run_scenario."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.benchmark = load_benchmark()
+        for target in ("clients.openai_client.log_token_usage", "clients.grok_client.log_token_usage"):
+            patcher = mock.patch(target)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        # http mode points the clients at its stubs through the environment
+        patcher = mock.patch.dict(os.environ)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Clean up test environment."""
+        close_transports()
+        shutil.rmtree(self.temp_dir)
+
+    def test_run_scenario_short_duration(self):
+        """Test that each mode completes a brief steady and failover run."""
+        for mode in ("inprocess", "http"):
+            for scenario in ("steady", "failover"):
+                with self.subTest(mode=mode, scenario=scenario):
+                    args = self.benchmark.build_parser().parse_args([
+                        "--mode", mode,
+                        "--duration", "0.1",
+                        "--rps", "50",
+                        "--latency", "0.001",
+                        "--tail-probability", "0",
+                        "--error-rate", "0",
+                        "--failover-error-rate", "1"
+                    ])
+                    result = self.benchmark.run_scenario(scenario, args, self.temp_dir)
+
+                    self.assertEqual(result["scenario"], scenario)
+                    self.assertEqual(result["requests"], 5)
+                    self.assertEqual(result["completed"], 5)
+                    self.assertEqual(result["latency"]["count"], 5)
+                    if scenario == "failover":
+                        # The forced primary always fails; once it is marked unhealthy
+                        # requests skip it instead of failing over
+                        self.assertEqual(result["by_provider"], {"grok": 5})
+                        self.assertGreater(result["failover_latency"]["count"], 0)
+                    else:
+                        self.assertEqual(result["router_overhead"]["count"], 5)
+
+if __name__ == "__main__":
+    unittest.main()
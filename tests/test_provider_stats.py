@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+GitBridge SmartRouter Streaming Provider Statistics Unit Tests
+Phase: GBP20
+Part: P20P7
+Step: P20P7S3
+Task: P20P7S3T3 - Streaming Latency and Cost Statistics
+
+Unit tests for the latency quantile sketch, the streaming provider
+statistics and their use in SmartRouter provider scoring.
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [Corrected P20P7 Schema]
+"""
+
+import os
+import math
+import random
+import shutil
+import unittest
+import tempfile
+
+from smart_router.smart_router import SmartRouter, ProviderType, RoutingStrategy
+from smart_router.provider_simulator import SimulatedProvider
+from smart_router.provider_stats import QuantileSketch, StreamingStats, RESCALE_LIMIT
+
+def within_error(actual: float, expected: float, relative_error: float = 0.02) -> bool:
+    """Whether a sketch estimate is within the sketch's relative error of the true value."""
+    return abs(actual - expected) <= relative_error * expected + 1e-12
+
+class TestQuantileSketch(unittest.TestCase):
+    """Unit tests for QuantileSketch accuracy and decay."""
+
+    def test_quantiles_within_relative_error(self):
+        """Test that p50/p95/p99 of a known distribution are within relative_error."""
+        rng = random.Random(7)
+        values = [rng.lognormvariate(math.log(0.3), 0.8) for _ in range(5000)]
+        sketch = QuantileSketch(relative_error=0.02, decay=1.0)
+        for value in values:
+            sketch.add(value)
+
+        ordered = sorted(values)
+        for q in (0.5, 0.95, 0.99):
+            expected = ordered[math.ceil(q * len(ordered)) - 1]
+            self.assertTrue(within_error(sketch.quantile(q), expected), f"q={q}")
+        self.assertEqual(sketch.count, 5000)
+
+    def test_max_quantile_of_long_streams(self):
+        """Test that quantile(1.0) stays at the largest sample despite rounding in the running sum."""
+        for seed in range(10):
+            rng = random.Random(seed)
+            values = [rng.lognormvariate(math.log(0.3), 0.8) for _ in range(20000)]
+            undecayed = QuantileSketch(decay=1.0)
+            decayed = QuantileSketch(decay=0.99)
+            for value in values:
+                undecayed.add(value)
+                decayed.add(value)
+
+            self.assertTrue(within_error(undecayed.quantile(1.0), max(values)), f"seed={seed}")
+            # Old samples keep negligible weight, so the decayed maximum covers at least recent ones
+            self.assertLessEqual(decayed.quantile(1.0), max(values) * 1.02, f"seed={seed}")
+            self.assertGreaterEqual(decayed.quantile(1.0), max(values[-100:]) * 0.98, f"seed={seed}")
+
+    def test_empty_sketch(self):
+        """Test that a sketch without samples has no quantiles."""
+        self.assertIsNone(QuantileSketch().quantile(0.5))
+
+    def test_decay_follows_latency_shift(self):
+        """Test that decayed quantiles move to a new latency level and undecayed ones lag."""
+        decayed = QuantileSketch(decay=0.99)
+        undecayed = QuantileSketch(decay=1.0)
+        for value in [0.1] * 500 + [1.0] * 300:
+            decayed.add(value)
+            undecayed.add(value)
+
+        self.assertTrue(within_error(decayed.quantile(0.5), 1.0))
+        self.assertTrue(within_error(decayed.quantile(0.05), 1.0))
+        self.assertTrue(within_error(undecayed.quantile(0.5), 0.1))
+
+    def test_rescale_keeps_quantiles(self):
+        """Test that renormalizing the sample weight keeps quantiles and recency."""
+        sketch = QuantileSketch(decay=0.5)
+        for _ in range(1000):
+            sketch.add(0.2)
+
+        # The weight doubles per sample, so it passed RESCALE_LIMIT several times
+        self.assertLessEqual(sketch._weight, RESCALE_LIMIT)
+        self.assertTrue(math.isfinite(sketch._total))
+        self.assertTrue(within_error(sketch.quantile(0.5), 0.2))
+
+        for _ in range(5):
+            sketch.add(2.0)
+        self.assertTrue(within_error(sketch.quantile(0.5), 2.0))
+        self.assertTrue(within_error(sketch.quantile(0.01), 0.2))
+
+class TestStreamingStats(unittest.TestCase):
+    """Unit tests for StreamingStats EWMAs."""
+
+    def test_failures_feed_success_rate_not_latency(self):
+        """Test that failed requests lower the success rate without touching latency."""
+        stats = StreamingStats(alpha=0.5)
+        stats.record(0.2, True, 0.01)
+        stats.record(30.0, False)
+
+        self.assertEqual((stats.requests, stats.successes), (2, 1))
+        self.assertAlmostEqual(stats.success_rate, 0.5)
+        self.assertAlmostEqual(stats.latency, 0.2)
+        self.assertTrue(within_error(stats.latency_quantile(0.99), 0.2))
+        self.assertAlmostEqual(stats.cost_per_1k_tokens, 0.01)
+
+    def test_ewma(self):
+        """Test that the latency EWMA weights the newest sample by alpha."""
+        stats = StreamingStats(alpha=0.25)
+        stats.record(1.0, True)
+        stats.record(2.0, True)
+
+        self.assertAlmostEqual(stats.latency, 1.25)
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot["successes"], 2)
+        self.assertTrue(within_error(snapshot["p99_latency"], 2.0))
+
+class TestProviderScoring(unittest.TestCase):
+    """Unit tests for SmartRouter scoring from streaming statistics."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.routers = []
+
+    def tearDown(self):
+        """Clean up test environment."""
+        for router in self.routers:
+            router.shutdown()
+        shutil.rmtree(self.temp_dir)
+
+    def make_router(self, **kwargs) -> SmartRouter:
+        router = SmartRouter(
+            strategy=RoutingStrategy.PERFORMANCE_OPTIMIZED,
+            providers={ProviderType.OPENAI: SimulatedProvider()},
+            health_check_interval=3600,
+            routing_log_file=os.path.join(self.temp_dir, "routing_decision.jsonl"),
+            **kwargs
+        )
+        self.routers.append(router)
+        return router
+
+    def test_latency_quantile_scoring(self):
+        """Test that latency_quantile scores on the quantile instead of the EWMA."""
+        router = self.make_router(latency_quantile=0.95)
+        for i in range(100):
+            router._update_metrics(ProviderType.OPENAI, 4.0 if i % 2 else 0.5, True, {'total_tokens': 10})
+
+        _, metrics_used = router._calculate_provider_score(ProviderType.OPENAI)
+        stats = router.provider_stats[(ProviderType.OPENAI, None)]
+
+        self.assertTrue(within_error(metrics_used["latency"], 4.0))
+        self.assertLess(stats.latency, 3.0)
+
+        ewma_router = self.make_router()
+        for i in range(100):
+            ewma_router._update_metrics(ProviderType.OPENAI, 4.0 if i % 2 else 0.5, True, {'total_tokens': 10})
+        _, ewma_metrics = ewma_router._calculate_provider_score(ProviderType.OPENAI)
+        self.assertAlmostEqual(ewma_metrics["latency"], ewma_router.provider_stats[(ProviderType.OPENAI, None)].latency)
+
+    def test_task_stats_fall_back_to_provider_stats(self):
+        """Test that task types below min_task_samples are scored on provider-wide stats."""
+        router = self.make_router(min_task_samples=10)
+        for _ in range(20):
+            router._update_metrics(ProviderType.OPENAI, 1.0, True, {'total_tokens': 10}, "general")
+        for _ in range(5):
+            router._update_metrics(ProviderType.OPENAI, 4.0, True, {'total_tokens': 10}, "analysis")
+
+        provider_wide = router.provider_stats[(ProviderType.OPENAI, None)].latency
+        _, metrics_used = router._calculate_provider_score(ProviderType.OPENAI, "analysis")
+        self.assertAlmostEqual(metrics_used["latency"], provider_wide)
+
+        # Unseen task types also use the provider-wide stats
+        _, metrics_used = router._calculate_provider_score(ProviderType.OPENAI, "code_review")
+        self.assertAlmostEqual(metrics_used["latency"], provider_wide)
+
+        for _ in range(5):
+            router._update_metrics(ProviderType.OPENAI, 4.0, True, {'total_tokens': 10}, "analysis")
+        _, metrics_used = router._calculate_provider_score(ProviderType.OPENAI, "analysis")
+        self.assertAlmostEqual(metrics_used["latency"], 4.0)
+
+if __name__ == "__main__":
+    unittest.main()
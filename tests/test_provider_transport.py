@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+GitBridge Provider Transport Unit Tests
+Phase: GBP20
+Part: P20P7
+Step: P20P7S2
+Task: P20P7S2T3 - Pooled Provider Connections
+
+Unit tests for the shared provider transport's per-event-loop asyncio
+clients and close paths. No request leaves the process.
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [Corrected P20P7 Schema]
+"""
+
+import unittest
+import asyncio
+
+from clients.transport import ProviderTransport, PoolConfig
+
+class TestProviderTransport(unittest.TestCase):
+    """Unit tests for ProviderTransport class."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.transport = ProviderTransport("test", PoolConfig(max_connections=4, max_keepalive_connections=2))
+        self.sync_client, self.async_sdk = self.transport.sdk_clients("test-key", "http://provider.invalid/v1")
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.transport.close()
+
+    def test_async_clients_per_event_loop(self):
+        """Test that each event loop gets its own asyncio clients."""
+        async def current():
+            return self.transport.async_client, self.async_sdk._client, self.async_sdk.api_key
+
+        first_client, first_sdk, api_key = asyncio.run(current())
+        second_client, second_sdk, _ = asyncio.run(current())
+
+        self.assertEqual(api_key, "test-key")
+        self.assertIsNot(first_client, second_client)
+        self.assertIsNot(first_sdk, second_sdk)
+        self.assertIs(first_sdk, first_client)
+
+    def test_async_clients_shared_within_event_loop(self):
+        """Test that asyncio clients are reused inside one event loop."""
+        async def twice():
+            first = self.transport.async_sdk_client("test-key", "http://provider.invalid/v1")
+            second = self.transport.async_sdk_client("test-key", "http://provider.invalid/v1")
+            return first, second, self.async_sdk.with_options(max_retries=0).max_retries
+
+        first, second, max_retries = asyncio.run(twice())
+        self.assertIs(first, second)
+        self.assertEqual(max_retries, 0)
+
+    def test_async_client_requires_running_loop(self):
+        """Test that the asyncio client is only available inside an event loop."""
+        with self.assertRaises(RuntimeError):
+            self.transport.async_client
+
+    def test_aclose_closes_async_client(self):
+        """Test closing the transport from inside an event loop."""
+        async def close():
+            client = self.transport.async_client
+            await self.transport.aclose()
+            return client
+
+        client = asyncio.run(close())
+        self.assertTrue(client.is_closed)
+        self.assertTrue(self.transport.client.is_closed)
+
+    def test_close_closes_async_clients_of_idle_loops(self):
+        """Test that close() closes asyncio clients of loops that are not running."""
+        async def current():
+            return self.transport.async_client
+
+        loop = asyncio.new_event_loop()
+        try:
+            client = loop.run_until_complete(current())
+            self.transport.close()
+            self.assertTrue(client.is_closed)
+        finally:
+            loop.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+GitBridge SmartRouter Response Cache Unit Tests
+Phase: GBP20
+Part: P20P7
+Step: P20P7S3
+Task: P20P7S3T6 - Response Cache and Request Collapsing
+
+Unit tests for the response cache: key normalization, TTL expiry, LRU and
+size eviction, the disk tier, and collapsing of identical requests.
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [Corrected P20P7 Schema]
+"""
+
+import os
+import shutil
+import unittest
+import asyncio
+import tempfile
+import threading
+import time
+
+from smart_router.smart_router import SmartRouter, ProviderType
+from smart_router.provider_simulator import SimulatedProvider, ProviderProfile, LatencyProfile
+from smart_router.response_cache import ResponseCache, CachedResponse
+
+def make_entry(content: str = "response", response_time: float = 1.0) -> CachedResponse:
+    return CachedResponse(
+        content=content,
+        provider="openai",
+        model="gpt-4o",
+        usage={"total_tokens": 10},
+        response_time=response_time,
+        cost=0.01
+    )
+
+class TestResponseCache(unittest.TestCase):
+    """Unit tests for ResponseCache storage and eviction."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_key_normalization(self):
+        """Test that whitespace is ignored and every request parameter is part of the key."""
+        key = ResponseCache.make_key("Summarize  the\nchanges", None, "general", 100, 0.3)
+        self.assertEqual(key, ResponseCache.make_key(" Summarize the changes ", None, "general", 100, 0.3))
+        self.assertNotEqual(key, ResponseCache.make_key("Summarize the changes", None, "general", 200, 0.3))
+        self.assertNotEqual(key, ResponseCache.make_key("Summarize the changes", None, "general", 100, 0.3, "grok"))
+        self.assertNotEqual(key, ResponseCache.make_key("Summarize the changes", "Be brief", "general", 100, 0.3))
+
+    def test_hit_records_savings(self):
+        """Test that hits count and accumulate saved latency, cost and tokens."""
+        cache = ResponseCache()
+        cache.put("key", make_entry(response_time=2.0))
+
+        self.assertEqual(cache.get("key").content, "response")
+        self.assertIsNone(cache.get("missing"))
+
+        stats = cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertAlmostEqual(stats["saved_seconds"], 2.0)
+        self.assertAlmostEqual(stats["saved_cost"], 0.01)
+        self.assertEqual(stats["saved_tokens"], 10)
+
+    def test_ttl_expiry(self):
+        """Test that entries older than the TTL are removed on lookup."""
+        cache = ResponseCache(ttl=60.0)
+        stale = make_entry()
+        stale.created_at = time.time() - 120.0
+        cache.put("stale", stale)
+        cache.put("fresh", make_entry())
+
+        self.assertIsNone(cache.get("stale"))
+        self.assertIsNotNone(cache.get("fresh"))
+        stats = cache.get_stats()
+        self.assertEqual(stats["expirations"], 1)
+        self.assertEqual(stats["entries"], 1)
+
+    def test_lru_eviction_by_entries(self):
+        """Test that the least recently used entry is evicted beyond max_entries."""
+        cache = ResponseCache(max_entries=2)
+        cache.put("a", make_entry("a"))
+        cache.put("b", make_entry("b"))
+        cache.get("a")  # b is now least recently used
+        cache.put("c", make_entry("c"))
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a").content, "a")
+        self.assertEqual(cache.get("c").content, "c")
+        self.assertEqual(cache.get_stats()["evictions"], 1)
+
+    def test_eviction_by_size(self):
+        """Test that oldest entries are evicted once content size exceeds max_bytes."""
+        entry_size = make_entry("x" * 1000).size
+        cache = ResponseCache(max_bytes=entry_size * 2)
+        for name in ("a", "b", "c"):
+            cache.put(name, make_entry("x" * 1000))
+
+        stats = cache.get_stats()
+        self.assertEqual(stats["entries"], 2)
+        self.assertEqual(stats["bytes"], entry_size * 2)
+        self.assertIsNone(cache.get("a"))
+
+        cache.put("b", make_entry("small"))  # Replacing an entry releases its size
+        self.assertEqual(cache.get_stats()["bytes"], entry_size + make_entry("small").size)
+
+    def test_disk_tier_survives_restart(self):
+        """Test that responses are served from disk by a new cache and expire there too."""
+        ResponseCache(disk_path=self.temp_dir).put("key", make_entry("persisted"))
+
+        cache = ResponseCache(disk_path=self.temp_dir)
+        self.assertEqual(cache.get("key").content, "persisted")
+        self.assertEqual(cache.get_stats()["disk_hits"], 1)
+        self.assertEqual(cache.get("key").content, "persisted")
+        self.assertEqual(cache.get_stats()["hits"], 1)  # Promoted to memory
+
+        expired = ResponseCache(disk_path=self.temp_dir, ttl=0.0)
+        time.sleep(0.01)
+        self.assertIsNone(expired.get("key"))
+        self.assertFalse(os.path.exists(expired._disk_file("key")))
+
+class TestResponseCacheCollapsing(unittest.TestCase):
+    """Unit tests for ResponseCache request collapsing."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.cache = ResponseCache(wait_timeout=5.0)
+        self.key = ResponseCache.make_key("prompt", None, "general", None, None)
+
+    def test_concurrent_identical_requests_collapse(self):
+        """Test that one of many concurrent identical requests is made and the rest share it."""
+        entry = make_entry(response_time=1.5)
+        leaders, results = [], []
+        joined = threading.Barrier(9)
+        lock = threading.Lock()
+
+        def request():
+            flight = self.cache.join(self.key)
+            with lock:
+                if flight is None:
+                    leaders.append(threading.current_thread().name)
+            joined.wait(5.0)
+            if flight is None:
+                self.cache.complete(self.key, entry)
+                result = entry
+            else:
+                result = self.cache.wait(flight)
+            with lock:
+                results.append(result)
+
+        threads = [threading.Thread(target=request) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        joined.wait(5.0)
+        for thread in threads:
+            thread.join(5.0)
+
+        self.assertEqual(len(leaders), 1)
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(result is entry for result in results))
+        stats = self.cache.get_stats()
+        self.assertEqual(stats["collapsed"], 7)
+        self.assertAlmostEqual(stats["saved_seconds"], 1.5 * 7)
+        self.assertEqual(stats["in_flight"], 0)
+
+    def test_async_waiters_share_response(self):
+        """Test that coroutines waiting on a flight get the leader's response."""
+        entry = make_entry()
+
+        async def run():
+            self.assertIsNone(self.cache.join(self.key))
+            waiters = [asyncio.ensure_future(self.cache.wait_async(self.cache.join(self.key))) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            self.cache.complete(self.key, entry)
+            return await asyncio.gather(*waiters)
+
+        self.assertTrue(all(result is entry for result in asyncio.run(run())))
+
+    def test_waiter_times_out(self):
+        """Test that a waiter gives up after wait_timeout."""
+        cache = ResponseCache(wait_timeout=0.05)
+        self.assertIsNone(cache.join(self.key))
+        flight = cache.join(self.key)
+
+        with self.assertRaises(TimeoutError):
+            cache.wait(flight)
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(cache.wait_async(flight))
+
+    def test_abandoned_flight_lets_waiter_retry(self):
+        """Test that an abandoned request wakes waiters without an error so one retries."""
+        self.assertIsNone(self.cache.join(self.key))
+        flight = self.cache.join(self.key)
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(self.cache.wait(flight)))
+        waiter.start()
+
+        self.cache.complete(self.key, None)
+        waiter.join(5.0)
+
+        self.assertEqual(results, [None])
+        self.assertIsNone(self.cache.join(self.key))  # The waiter becomes the new leader
+        self.assertEqual(self.cache.get_stats()["in_flight"], 1)
+
+    def test_failed_flight_passes_error_to_waiters(self):
+        """Test that a failed request raises its error in waiting requests."""
+        self.assertIsNone(self.cache.join(self.key))
+        flight = self.cache.join(self.key)
+        self.cache.complete(self.key, None, ValueError("provider failed"))
+
+        with self.assertRaises(ValueError):
+            self.cache.wait(flight)
+
+    def test_join_after_leader_cached_response(self):
+        """Test that a caller joining after the leader finished gets the cached response."""
+        self.assertIsNone(self.cache.join(self.key))
+        entry = make_entry()
+        self.cache.complete(self.key, entry)
+
+        flight = self.cache.join(self.key)
+
+        self.assertIsNotNone(flight)
+        self.assertIs(self.cache.wait(flight), entry)
+        self.assertEqual(self.cache.get_stats()["in_flight"], 0)
+
+class TestSmartRouterCollapsing(unittest.TestCase):
+    """Unit tests for SmartRouter's use of request collapsing."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        provider = SimulatedProvider(ProviderProfile(latency=LatencyProfile(median=0.2)), seed=1)
+        self.router = SmartRouter(
+            providers={ProviderType.OPENAI: provider},
+            response_cache=ResponseCache(wait_timeout=5.0),
+            health_check_interval=3600,
+            routing_log_file=os.path.join(self.temp_dir, "routing_decision.jsonl")
+        )
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.router.shutdown()
+        shutil.rmtree(self.temp_dir)
+
+    def test_cancelled_leader_does_not_cancel_waiters(self):
+        """Test that cancelling the collapsed request's leader lets a waiter make the request."""
+        async def run():
+            leader = asyncio.ensure_future(self.router.route_request_async("collapsed prompt"))
+            await asyncio.sleep(0.05)
+            waiter = asyncio.ensure_future(self.router.route_request_async("collapsed prompt"))
+            await asyncio.sleep(0.05)
+            leader.cancel()
+            response = await waiter
+            with self.assertRaises(asyncio.CancelledError):
+                await leader
+            return response
+
+        response = asyncio.run(run())
+
+        self.assertEqual(response.provider, ProviderType.OPENAI)
+        self.assertFalse(response.metadata.get('cache_hit', False))
+        self.assertEqual(self.router.response_cache.get_stats()["in_flight"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+GitBridge Shared Memory Graph Unit Tests
+Phase: GBP21
+Part: P21P5
+Step: P21P5S1
+Task: P21P5S1T1 - Shared Memory Graph Implementation
+
+Unit tests for the shared memory graph indexes, backlinks and the
+streaming JSON export.
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [P21P5 Schema]
+"""
+
+import os
+import json
+import shutil
+import unittest
+import tempfile
+
+from shared_memory import SharedMemoryGraph
+
+class TestSharedMemoryGraph(unittest.TestCase):
+    """Unit tests for SharedMemoryGraph."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.graph = SharedMemoryGraph()
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_recall_by_agent_and_context(self):
+        """Test that recall returns only the pair's nodes, in insertion order."""
+        first = self.graph.add_node("agent_1", "review", "first")
+        self.graph.add_node("agent_1", "planning", "other context")
+        self.graph.add_node("agent_2", "review", "other agent")
+        second = self.graph.add_node("agent_1", "review", "second")
+
+        recalled = self.graph.recall_context("agent_1", "review")
+
+        self.assertEqual([node.node_id for node in recalled], [first, second])
+        self.assertEqual(self.graph.agent_context_index[("agent_1", "review")], [first, second])
+        self.assertEqual(self.graph.recall_context("agent_2", "planning"), [])
+        self.assertEqual(len(self.graph.get_nodes_by_agent("agent_1")), 3)
+        self.assertEqual(len(self.graph.get_nodes_by_context("review")), 3)
+
+    def test_backlinks_from_add_node_and_link_nodes(self):
+        """Test that links from add_node and link_nodes are indexed in both directions."""
+        root = self.graph.add_node("agent_1", "review", "root")
+        child = self.graph.add_node("agent_2", "review", "child", links=[root])
+        sibling = self.graph.add_node("agent_3", "review", "sibling")
+        self.graph.link_nodes(sibling, root)
+        self.graph.link_nodes(sibling, child)
+
+        self.assertEqual([node.node_id for node in self.graph.get_backlinks(root)], [child, sibling])
+        self.assertEqual([node.node_id for node in self.graph.get_backlinks(child)], [sibling])
+        self.assertEqual(self.graph.get_backlinks(sibling), [])
+        self.assertEqual([node.node_id for node in self.graph.get_linked_nodes(sibling)], [root, child])
+        self.assertEqual([node.node_id for node in self.graph.get_linked_nodes(child)], [root])
+        self.assertEqual(self.graph.get_linked_nodes("missing"), [])
+
+    def test_link_to_unknown_node_is_ignored(self):
+        """Test that link_nodes ignores unknown node IDs."""
+        root = self.graph.add_node("agent_1", "review", "root")
+        self.graph.link_nodes(root, "missing")
+
+        self.assertEqual(self.graph.nodes[root].links, [])
+        self.assertNotIn("missing", self.graph.reverse_links)
+
+    def test_export_matches_json_dump(self):
+        """Test that the streaming export is byte-identical to json.dump(..., indent=2)."""
+        root = self.graph.add_node("agent_1", "review", {"score": 0.9, "notes": ["a", "b\nc"]})
+        self.graph.add_node(
+            "agent_2", "review", "café \"quoted\"",
+            metadata={"nested": {"empty": {}, "list": []}}, links=[root]
+        )
+        self.graph.add_node("agent_3", "planning", None)
+        output_path = os.path.join(self.temp_dir, "export.json")
+
+        self.graph.export_memory(output_path)
+
+        expected = json.dumps(list(self.graph.iter_export_records()), indent=2)
+        with open(output_path) as f:
+            self.assertEqual(f.read(), expected)
+        self.assertFalse(os.path.exists(output_path + ".tmp"))
+
+    def test_export_empty_graph(self):
+        """Test that an empty graph exports as json.dump would write it."""
+        output_path = os.path.join(self.temp_dir, "export.json")
+
+        self.graph.export_memory(output_path)
+
+        with open(output_path) as f:
+            self.assertEqual(f.read(), json.dumps([], indent=2))
+
+    def test_failed_export_keeps_previous_file(self):
+        """Test that a failed export removes its temporary file and keeps the last export."""
+        output_path = os.path.join(self.temp_dir, "export.json")
+        self.graph.add_node("agent_1", "review", "exportable")
+        self.graph.export_memory(output_path)
+        with open(output_path) as f:
+            previous = f.read()
+
+        self.graph.add_node("agent_2", "review", object())
+        with self.assertRaises(TypeError):
+            self.graph.export_memory(output_path)
+
+        with open(output_path) as f:
+            self.assertEqual(f.read(), previous)
+        self.assertFalse(os.path.exists(output_path + ".tmp"))
+
+if __name__ == "__main__":
+    unittest.main()
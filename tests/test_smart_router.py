@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+GitBridge SmartRouter Unit Tests
+Phase: GBP20
+Part: P20P7
+Step: P20P7S3
+Task: P20P7S3T1 - SmartRouter Core Implementation
+
+Unit tests for asyncio routing: per-provider concurrency limits, hedging
+of slow requests and batch routing; and for health checks that run off the
+routing lock.
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [Corrected P20P7 Schema]
+"""
+
+import os
+import shutil
+import unittest
+import asyncio
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+
+from clients.openai_client import OpenAIResponse
+from smart_router.smart_router import SmartRouter, ProviderType, RoutingStrategy
+from smart_router.provider_simulator import SimulatedProvider, ProviderProfile, LatencyProfile
+
+class EchoProvider:
+    """Async provider that echoes the prompt, tracks in-flight calls and fails on request."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def generate_response_async(self, prompt, max_tokens=None, **kwargs):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            # Later prompts finish first when given a "delay=" prefix
+            delay = float(prompt.split("=", 1)[1].split()[0]) if prompt.startswith("delay=") else self.delay
+            await asyncio.sleep(delay)
+            if "fail" in prompt:
+                raise RuntimeError(f"failed: {prompt}")
+            return OpenAIResponse(
+                content=prompt,
+                usage={'total_tokens': 10},
+                model="echo",
+                response_time=delay,
+                timestamp=datetime.now(timezone.utc).isoformat(),
+                metadata={}
+            )
+        finally:
+            self.in_flight -= 1
+
+    def test_connection(self):
+        return None
+
+class BlockingProbeProvider:
+    """Provider whose health probe blocks until released."""
+
+    def __init__(self):
+        self.probes = 0
+        self.probing = threading.Event()
+        self.release = threading.Event()
+
+    def test_connection(self):
+        self.probes += 1
+        self.probing.set()
+        self.release.wait(10)
+
+class BlockingSyncProvider:
+    """Sync-only provider whose calls block until released."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def generate_response(self, prompt, max_tokens=None, **kwargs):
+        self.started.set()
+        self.release.wait(10)
+        return OpenAIResponse(
+            content=prompt,
+            usage={'total_tokens': 10},
+            model="blocking",
+            response_time=0.0,
+            timestamp=datetime.now(timezone.utc).isoformat(),
+            metadata={}
+        )
+
+    def test_connection(self):
+        return None
+
+class TestSmartRouterAsync(unittest.TestCase):
+    """Unit tests for route_request_async and route_batch."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.routers = []
+
+    def tearDown(self):
+        """Clean up test environment."""
+        for router in self.routers:
+            router.shutdown()
+        shutil.rmtree(self.temp_dir)
+
+    def make_router(self, providers, **kwargs) -> SmartRouter:
+        router = SmartRouter(
+            providers=providers,
+            health_check_interval=3600,
+            routing_log_file=os.path.join(self.temp_dir, "routing_decision.jsonl"),
+            **kwargs
+        )
+        self.routers.append(router)
+        return router
+
+    def make_hedging_router(self) -> SmartRouter:
+        """OpenAI looks fast from its history but now answers slowly; Grok answers quickly."""
+        slow = SimulatedProvider(ProviderProfile(model="slow", latency=LatencyProfile(median=0.5)), seed=1)
+        fast = SimulatedProvider(ProviderProfile(model="fast", latency=LatencyProfile(median=0.01)), seed=2)
+        router = self.make_router(
+            {ProviderType.OPENAI: slow, ProviderType.GROK: fast},
+            strategy=RoutingStrategy.PERFORMANCE_OPTIMIZED,
+            hedge_percentile=0.95,
+            hedge_min_samples=5
+        )
+        for _ in range(5):
+            router._update_metrics(ProviderType.OPENAI, 0.02, True, {'total_tokens': 10})
+            router._update_metrics(ProviderType.GROK, 2.0, True, {'total_tokens': 10})
+        return router
+
+    def test_provider_concurrency_limit(self):
+        """Test that in-flight calls to a provider never exceed provider_concurrency."""
+        provider = EchoProvider(delay=0.02)
+        router = self.make_router(
+            {ProviderType.OPENAI: provider},
+            provider_concurrency={ProviderType.OPENAI: 3}
+        )
+
+        results = asyncio.run(router.route_batch([f"prompt {i}" for i in range(20)]))
+
+        self.assertEqual(provider.calls, 20)
+        self.assertEqual(provider.peak_in_flight, 3)
+        self.assertEqual([r.content for r in results], [f"prompt {i}" for i in range(20)])
+
+    def test_cancelled_sync_call_keeps_slot_until_thread_finishes(self):
+        """Test that cancelling a sync client's call holds its concurrency slot while the thread runs."""
+        provider = BlockingSyncProvider()
+        router = self.make_router(
+            {ProviderType.OPENAI: provider},
+            provider_concurrency={ProviderType.OPENAI: 1}
+        )
+
+        async def cancel_in_flight():
+            call = asyncio.ensure_future(router._call_provider_async(ProviderType.OPENAI, ("prompt", None, None, None)))
+            while not provider.started.is_set():
+                await asyncio.sleep(0.01)
+            call.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await call
+
+            semaphore = router._get_semaphore(ProviderType.OPENAI)
+            held_after_cancel = semaphore.locked()
+            provider.release.set()
+            for _ in range(100):
+                if not semaphore.locked():
+                    break
+                await asyncio.sleep(0.01)
+            return held_after_cancel, semaphore.locked()
+
+        held_after_cancel, held_after_thread = asyncio.run(cancel_in_flight())
+
+        self.assertTrue(held_after_cancel)
+        self.assertFalse(held_after_thread)
+
+    def test_slow_primary_is_hedged(self):
+        """Test that a request slower than its p95 is hedged and the faster response wins."""
+        router = self.make_hedging_router()
+        scored_task_types = []
+        score = router._calculate_provider_score
+
+        def recording_score(provider, task_type="general"):
+            scored_task_types.append(task_type)
+            return score(provider, task_type)
+
+        router._calculate_provider_score = recording_score
+
+        start_time = time.time()
+        response = asyncio.run(router.route_request_async("hedged prompt", task_type="analysis"))
+        elapsed = time.time() - start_time
+
+        self.assertEqual(response.provider, ProviderType.GROK)
+        self.assertTrue(response.metadata['hedged'])
+        self.assertEqual(response.metadata['original_provider'], ProviderType.OPENAI.value)
+        self.assertLess(elapsed, 0.4)
+        self.assertEqual(router.providers[ProviderType.GROK].calls, 1)
+        # Hedge candidates are ranked for the request's task type
+        self.assertTrue(scored_task_types)
+        self.assertEqual(set(scored_task_types), {"analysis"})
+
+    def test_forced_request_is_never_hedged(self):
+        """Test that a forced provider answers even when it is slower than its p95."""
+        router = self.make_hedging_router()
+
+        response = asyncio.run(router.route_request_async(
+            "forced prompt", force_provider=ProviderType.OPENAI, hedge=True
+        ))
+
+        self.assertEqual(response.provider, ProviderType.OPENAI)
+        self.assertFalse(response.metadata['hedged'])
+        self.assertEqual(router.providers[ProviderType.GROK].calls, 0)
+
+    def test_route_batch_keeps_prompt_order(self):
+        """Test that batch results, failures included, come back in prompt order."""
+        router = self.make_router({ProviderType.OPENAI: EchoProvider()})
+        prompts = ["delay=0.06 first", "delay=0.01 fail second", "delay=0.03 third"]
+
+        results = asyncio.run(router.route_batch(prompts))
+
+        self.assertEqual(results[0].content, prompts[0])
+        self.assertIsInstance(results[1], Exception)
+        self.assertIn("fail second", str(results[1]))
+        self.assertEqual(results[2].content, prompts[2])
+
+    def test_route_batch_raises_without_return_exceptions(self):
+        """Test that return_exceptions=False raises the first failure."""
+        router = self.make_router({ProviderType.OPENAI: EchoProvider()})
+
+        with self.assertRaises(Exception) as context:
+            asyncio.run(router.route_batch(["ok", "fail"], return_exceptions=False))
+        self.assertIn("failed: fail", str(context.exception))
+
+class TestSmartRouterHealthChecks(unittest.TestCase):
+    """Unit tests for passive health and non-blocking active probes."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.provider = BlockingProbeProvider()
+
+    def tearDown(self):
+        """Clean up test environment."""
+        self.provider.release.set()
+        self.router.shutdown()
+        shutil.rmtree(self.temp_dir)
+
+    def make_router(self, **kwargs) -> SmartRouter:
+        self.router = SmartRouter(
+            providers={ProviderType.OPENAI: self.provider},
+            health_check_interval=3600,
+            routing_log_file=os.path.join(self.temp_dir, "routing_decision.jsonl"),
+            **kwargs
+        )
+        return self.router
+
+    def test_routing_proceeds_during_probe(self):
+        """Test that metrics updates and provider selection do not wait on a running probe."""
+        router = self.make_router(health_probe_timeout=10.0)
+        checker = threading.Thread(target=router._perform_health_checks)
+        checker.start()
+        self.assertTrue(self.provider.probing.wait(5))
+
+        start_time = time.time()
+        router._update_metrics(ProviderType.OPENAI, 0.1, True, {'total_tokens': 10})
+        provider, _ = router._select_provider()
+        elapsed = time.time() - start_time
+
+        self.assertTrue(checker.is_alive())
+        self.assertEqual(provider, ProviderType.OPENAI)
+        self.assertLess(elapsed, 1.0)
+
+        self.provider.release.set()
+        checker.join(5)
+        metrics = router.provider_metrics[ProviderType.OPENAI]
+        self.assertTrue(metrics.is_healthy)
+        self.assertEqual(metrics.health_source, "probe")
+        self.assertEqual(metrics.consecutive_failures, 0)
+
+    def test_probe_timeout_counts_as_failure(self):
+        """Test that an unanswered probe fails and is not resubmitted while still running."""
+        router = self.make_router(health_probe_timeout=0.1)
+        metrics = router.provider_metrics[ProviderType.OPENAI]
+
+        router._perform_health_checks()
+        self.assertEqual(metrics.consecutive_failures, 1)
+        self.assertEqual(metrics.health_source, "probe")
+        self.assertTrue(metrics.is_healthy)
+
+        # The first probe is still blocked, so no second probe is started
+        router._perform_health_checks()
+        self.assertEqual(self.provider.probes, 1)
+        self.assertEqual(metrics.consecutive_failures, 1)
+
+    def test_recent_traffic_skips_probe(self):
+        """Test that enough recent requests judge health without an active probe."""
+        router = self.make_router(passive_min_requests=3)
+        for _ in range(3):
+            router._update_metrics(ProviderType.OPENAI, 0.1, True, {'total_tokens': 10})
+
+        router._perform_health_checks()
+
+        metrics = router.provider_metrics[ProviderType.OPENAI]
+        self.assertEqual(self.provider.probes, 0)
+        self.assertEqual(metrics.health_source, "traffic")
+        self.assertTrue(metrics.is_healthy)
+
+if __name__ == "__main__":
+    unittest.main()
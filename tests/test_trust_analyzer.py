@@ -163,6 +163,44 @@ class TestTrustAnalyzer(unittest.TestCase):
         self.assertEqual(analysis1.best_path, analysis2.best_path)
         self.assertEqual(len(analysis1.all_paths), len(analysis2.all_paths))
         
+    def test_cache_invalidation(self):
+        """Test that trust changes only invalidate analyses whose neighborhood they touch."""
+        self.trust_graph.update_trust("agent_x", "agent_y", 0.9, 0.9)
+        
+        analysis = self.analyzer.analyze_trust_paths("agent_a", "agent_e")
+        isolated = self.analyzer.analyze_trust_paths("agent_x", "agent_y")
+        
+        # An update far from agent_a keeps its analysis cached
+        self.trust_graph.update_trust("agent_y", "agent_x", 0.5, 0.5)
+        self.assertIs(self.analyzer.analyze_trust_paths("agent_a", "agent_e"), analysis)
+        self.assertIsNot(self.analyzer.analyze_trust_paths("agent_x", "agent_y"), isolated)
+        
+        # An update on a path from agent_a is picked up immediately
+        self.trust_graph.update_trust("agent_a", "agent_e", 0.95, 0.9)
+        updated = self.analyzer.analyze_trust_paths("agent_a", "agent_e")
+        self.assertIsNot(updated, analysis)
+        self.assertEqual(updated.direct_trust, 0.95)
+        
+        # Results computed across a change are not cached
+        version = self.trust_graph.version
+        self.trust_graph.update_trust("agent_a", "agent_b", 0.1, 0.9)
+        self.assertFalse(self.analyzer._analysis_cache.put("stale", analysis, {"agent_a"}, version))
+        self.assertTrue(self.analyzer._analysis_cache.put("fresh", analysis, {"agent_x"}, version))
+        
+    def test_cache_eviction(self):
+        """Test that the analysis cache is a bounded LRU."""
+        analyzer = TrustAnalyzer(self.trust_graph, cache_size=2)
+        first = analyzer.analyze_trust_paths("agent_a", "agent_b")
+        analyzer.analyze_trust_paths("agent_a", "agent_c")
+        self.assertIs(analyzer.analyze_trust_paths("agent_a", "agent_b"), first)
+        analyzer.analyze_trust_paths("agent_a", "agent_d")
+        
+        self.assertEqual(len(analyzer._analysis_cache), 2)
+        self.assertIs(analyzer.analyze_trust_paths("agent_a", "agent_b"), first)
+        stats = analyzer._analysis_cache.get_stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["hits"], 2)
+        
     def test_cache_clear(self):
         """Test cache clearing functionality."""
         # Perform analysis to populate cache
@@ -174,6 +212,25 @@ class TestTrustAnalyzer(unittest.TestCase):
         # Cache should be empty
         self.assertEqual(len(self.analyzer._analysis_cache), 0)
         
+    def test_cache_listeners_are_released(self):
+        """Test dropped or closed analyzers stop listening to the graph."""
+        from trust_metrics import TrustMetricsCalculator
+        baseline = len(self.trust_graph._listeners)
+
+        for _ in range(100):
+            TrustAnalyzer(self.trust_graph).analyze_trust_paths("agent_a", "agent_b")
+            TrustMetricsCalculator(self.trust_graph).calculate_agent_metrics("agent_a")
+        self.assertEqual(len(self.trust_graph._listeners), baseline)
+
+        with TrustAnalyzer(self.trust_graph):
+            self.assertEqual(len(self.trust_graph._listeners), baseline + 1)
+        self.assertEqual(len(self.trust_graph._listeners), baseline)
+
+        # Mutations still reach the caches that remain
+        self.analyzer.analyze_trust_paths("agent_a", "agent_b")
+        self.trust_graph.update_trust("agent_a", "agent_b", 0.1)
+        self.assertEqual(len(self.analyzer._analysis_cache), 0)
+
     def test_max_path_length(self):
         """Test max path length configuration."""
         # Create analyzer with limited path length
@@ -255,6 +312,103 @@ class TestTrustAnalyzer(unittest.TestCase):
             self.assertEqual(path.path[0], "agent_a")
             self.assertEqual(path.path[-1], "agent_c")
 
+    def path_trust(self, path):
+        """Decayed trust product along a path, computed edge by edge."""
+        trust = 1.0
+        for hop, (from_agent, to_agent) in enumerate(zip(path, path[1:])):
+            trust *= self.trust_graph.get_edge(from_agent, to_agent).trust_score * self.analyzer.decay_factor ** hop
+        return trust
+        
+    def test_paths_are_exact_k_best(self):
+        """Test that returned paths are the highest-trust simple paths."""
+        # Every simple path agent_a -> agent_e within the hop limit
+        expected = sorted(
+            (
+                self.path_trust(path)
+                for path in (
+                    ["agent_a", "agent_c", "agent_e"],
+                    ["agent_a", "agent_b", "agent_d", "agent_e"],
+                    ["agent_a", "agent_b", "agent_c", "agent_e"],
+                    ["agent_a", "agent_c", "agent_d", "agent_e"],
+                    ["agent_a", "agent_b", "agent_c", "agent_d", "agent_e"],
+                )
+            ),
+            reverse=True
+        )
+        
+        paths = self.analyzer._find_trust_paths("agent_a", "agent_e", 10, 0.0)
+        self.assertEqual(len(paths), 5)
+        for path, trust in zip(paths, expected):
+            self.assertAlmostEqual(path.total_trust, trust)
+            self.assertAlmostEqual(path.total_trust, self.path_trust(path.path))
+            self.assertEqual(path.path_length, len(path.path) - 1)
+            
+        top_two = self.analyzer._find_trust_paths("agent_a", "agent_e", 2, 0.0)
+        self.assertEqual([p.path for p in top_two], [p.path for p in paths[:2]])
+        
+    def test_path_constraints(self):
+        """Test hop and confidence limits on path search."""
+        short_analyzer = TrustAnalyzer(self.trust_graph, max_path_length=3)
+        for path in short_analyzer._find_trust_paths("agent_a", "agent_e", 10, 0.0):
+            self.assertLess(path.path_length, 3)
+            
+        for path in self.analyzer._find_trust_paths("agent_a", "agent_e", 10, 0.3):
+            self.assertGreaterEqual(path.confidence, 0.3)
+
+    def assertMatrixMatchesPaths(self, analyzer):
+        """Assert every matrix cell equals the best path found by search."""
+        matrix = analyzer.get_trust_matrix()
+        agents = self.trust_graph.get_all_agents()
+        for source in agents:
+            for target in agents:
+                if source == target:
+                    continue
+                paths = analyzer._find_trust_paths(source, target, 1, 0.0)
+                if paths:
+                    self.assertAlmostEqual(matrix.get_trust(source, target), paths[0].total_trust)
+                    self.assertEqual(matrix.get_path_length(source, target), paths[0].path_length)
+                    self.assertAlmostEqual(matrix.get_confidence(source, target), paths[0].confidence)
+                else:
+                    self.assertEqual(matrix.get_trust(source, target), 0.0)
+                    self.assertFalse(matrix.is_reachable(source, target))
+
+    def test_trust_matrix(self):
+        """Test all-pairs transitive trust against path search."""
+        self.assertMatrixMatchesPaths(self.analyzer)
+        self.assertMatrixMatchesPaths(TrustAnalyzer(self.trust_graph, max_path_length=3, decay_factor=0.5))
+
+        matrix = self.analyzer.get_trust_matrix()
+        self.assertEqual(matrix.get_reachable_count("agent_a"), 4)
+        self.assertEqual(matrix.get_trust("agent_a", "unknown"), 0.0)
+        self.assertGreater(matrix.get_efficiency(), 0.0)
+
+    def test_trust_matrix_incremental_updates(self):
+        """Test that graph changes are applied without a full rebuild."""
+        matrix = self.analyzer.get_trust_matrix()
+        matrix.get_trust("agent_a", "agent_e")
+        self.assertEqual(matrix.get_stats()['full_rebuilds'], 1)
+
+        # Strengthen, weaken, add and distrust edges, including new agents
+        self.trust_graph.set_high_performance_mode(True)
+        self.trust_graph.update_trust("agent_a", "agent_e", 0.95, 0.9)
+        self.assertMatrixMatchesPaths(self.analyzer)
+        self.trust_graph.update_trust("agent_b", "agent_c", 0.1, 0.9)
+        self.trust_graph.update_trust("agent_e", "agent_f", 0.7, 0.9)
+        self.assertMatrixMatchesPaths(self.analyzer)
+        self.trust_graph.update_trust("agent_a", "agent_e", -0.5, 0.9)
+        self.trust_graph.add_agent("agent_g")
+        self.assertMatrixMatchesPaths(self.analyzer)
+
+        stats = matrix.get_stats()
+        self.assertEqual(stats['full_rebuilds'], 1)
+        self.assertEqual(stats['agents'], 7)
+        self.assertEqual(stats['incremental_updates'], 3)
+
+        # Bulk changes fall back to a rebuild
+        self.trust_graph.remove_agent("agent_c")
+        self.assertMatrixMatchesPaths(self.analyzer)
+        self.assertEqual(matrix.get_stats()['full_rebuilds'], 2)
+
 class TestTrustAnalysis(unittest.TestCase):
     """Unit tests for TrustAnalysis class."""
     
@@ -78,6 +78,21 @@ class TestTrustGraph(unittest.TestCase):
         success = self.graph.remove_agent("nonexistent")
         self.assertFalse(success)
         
+    def test_agent_removal_updates_adjacency(self):
+        """Test that the adjacency view drops removed agents and shows re-added ones."""
+        self.graph.update_trust("agent1", "agent2", 0.5)
+        self.graph.update_trust("agent2", "agent3", 0.5)
+        self.graph.remove_agent("agent2")
+        
+        self.assertNotIn("agent2", self.graph.adjacency_list)
+        self.assertEqual(sorted(self.graph.adjacency_list), ["agent1", "agent3"])
+        self.assertEqual(len(self.graph.adjacency_list), 2)
+        self.assertEqual(list(self.graph.adjacency_list["agent1"]), [])
+        
+        self.graph.add_agent("agent2")
+        self.assertIn("agent2", self.graph.adjacency_list)
+        self.assertEqual(len(self.graph.adjacency_list), 3)
+        
     def test_trust_score_tracking(self):
         """Test trust score tracking and updates."""
         # Add agents
@@ -391,6 +406,305 @@ class TestTrustGraph(unittest.TestCase):
         edge = self.graph.edges[edge_key]
         self.assertGreater(edge.interaction_count, 0)
 
+    def test_change_notifications(self):
+        """Test that subscribers receive agent and edge change events."""
+        events = []
+        self.graph.subscribe(events.append)
+        
+        self.graph.update_trust("agent1", "agent2", 0.8)
+        self.assertEqual([(e.kind, e.key) for e in events], [
+            ("agent_added", ("agent1", None)),
+            ("agent_added", ("agent2", None)),
+            ("edge_upserted", ("agent1", "agent2"))
+        ])
+        self.assertEqual(events[-1].version, self.graph.version)
+        self.assertEqual(events[-1].agents, ("agent1", "agent2"))
+        
+        events.clear()
+        self.graph.update_trust_batch([("agent2", "agent3", 0.5, 0.9, None)])
+        self.assertIn(("agent_added", ("agent3", None)), [(e.kind, e.key) for e in events])
+        self.assertIn(("edge_upserted", ("agent2", "agent3")), [(e.kind, e.key) for e in events])
+        
+        events.clear()
+        self.graph.remove_agent("agent2")
+        self.assertEqual(sorted((e.kind, e.key) for e in events), [
+            ("agent_removed", ("agent2", None)),
+            ("edge_removed", ("agent1", "agent2")),
+            ("edge_removed", ("agent2", "agent3"))
+        ])
+        
+        events.clear()
+        self.graph.update_trust("agent1", "agent3", 0.6)
+        self.graph.apply_decay()
+        self.assertEqual(events[-1].kind, "reset")
+        self.assertEqual(events[-1].agents, ())
+        
+        # Unsubscribed listeners stop receiving events
+        self.assertTrue(self.graph.unsubscribe(events.append))
+        events.clear()
+        self.graph.update_trust("agent3", "agent1", 0.6)
+        self.assertEqual(events, [])
+
+class TestColumnarTrustGraph(TestTrustGraph):
+    """Run the core trust graph tests against the columnar edge store."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.test_dir = tempfile.mkdtemp()
+        self.graph = TrustGraph(storage_path=self.test_dir, auto_save=False, storage_backend="columnar")
+        
+    def test_metadata_side_table_is_sparse(self):
+        """Test that only edges with metadata occupy the side table."""
+        self.graph.update_trust("agent1", "agent2", 0.5)
+        self.graph.update_trust("agent1", "agent3", 0.5, metadata={"task": "review"})
+        self.graph.update_trust("agent1", "agent2", 0.7, metadata={"task": "audit"})
+        
+        stats = self.graph.get_performance_stats()
+        self.assertEqual(stats["storage_backend"], "columnar")
+        self.assertEqual(stats["metadata_entries"], 2)
+        self.assertEqual(self.graph.get_edge("agent1", "agent2").metadata, {"task": "audit"})
+        
+    def test_neighbors_after_index_rebuild_and_compaction(self):
+        """Test CSR adjacency across rebuilds, removals and compaction."""
+        updates = [(f"src{i % 50}", f"dst{i}", 0.5, 0.9, None) for i in range(3000)]
+        self.graph.update_trust_batch(updates)
+        self.assertEqual(len(self.graph.get_neighbors("src0")), 60)
+        
+        self.graph.remove_agent("src0")
+        for i in range(1, 40):
+            self.graph.remove_agent(f"src{i}")
+        self.assertEqual(len(self.graph.edges), 600)
+        self.assertEqual(self.graph.get_neighbors("src0"), [])
+        self.assertEqual(sorted(self.graph.get_neighbors("src45")),
+                         sorted(f"dst{i}" for i in range(45, 3000, 50)))
+        # Tombstones were reclaimed once they outnumbered live edges
+        self.assertLess(self.graph.get_performance_stats()["dead_slots"], 1024)
+        
+    def test_detached_metadata_after_compaction(self):
+        """Test that metadata fetched before a compaction is written to its own edge."""
+        for i in range(10):
+            self.graph.update_trust(f"agent{i}", "target", 0.5)
+        metadata = self.graph.get_edge("agent9", "target").metadata
+        other = self.graph.get_edge("agent8", "target").metadata
+        
+        for i in range(5):
+            del self.graph.edges[(f"agent{i}", "target")]
+        self.assertEqual(self.graph.edges.compact(), 5)
+        
+        metadata["task"] = "review"
+        other.update(task="audit")
+        self.assertEqual(self.graph.get_edge("agent9", "target").metadata, {"task": "review"})
+        self.assertEqual(self.graph.get_edge("agent8", "target").metadata, {"task": "audit"})
+        for i in range(5, 8):
+            self.assertEqual(self.graph.get_edge(f"agent{i}", "target").metadata, {})
+        self.assertEqual(self.graph.get_performance_stats()["metadata_entries"], 2)
+        
+        # Metadata of a removed edge is not attached to another edge
+        removed = self.graph.get_edge("agent5", "target").metadata
+        del self.graph.edges[("agent5", "target")]
+        removed["task"] = "stale"
+        self.assertEqual(self.graph.get_performance_stats()["metadata_entries"], 2)
+        
+    def test_vectorized_decay_matches_per_edge_decay(self):
+        """Test that bulk decay reproduces TrustEdge.decay_score."""
+        reference = TrustGraph(storage_path=self.test_dir, auto_save=False)
+        now = datetime.now(timezone.utc)
+        for graph in (self.graph, reference):
+            for i in range(20):
+                graph.update_trust("agent0", f"agent{i + 1}", 0.9 - 0.05 * i, 0.8)
+                graph.edges[("agent0", f"agent{i + 1}")].updated_at = now - timedelta(hours=6 * i)
+            graph.edges[("agent0", "agent20")].ttl_hours = 1
+            
+        self.assertEqual(self.graph._decay_edges(0.1, now), reference._decay_edges(0.1, now))
+        for key, edge in reference.edges.items():
+            columnar_edge = self.graph.edges[key]
+            self.assertAlmostEqual(columnar_edge.trust_score, edge.trust_score)
+            self.assertAlmostEqual(columnar_edge.confidence, edge.confidence)
+            self.assertEqual(columnar_edge.updated_at, edge.updated_at)
+            
+    def test_expired_mask(self):
+        """Test that expiry is reported as a slot mask and cleaned up in bulk."""
+        for i in range(10):
+            self.graph.update_trust("agent0", f"agent{i + 1}", 0.5)
+        for i in (2, 5, 7):
+            edge = self.graph.edges[("agent0", f"agent{i + 1}")]
+            edge.ttl_hours = 0
+            edge.updated_at = datetime.now(timezone.utc) - timedelta(hours=1)
+            
+        mask = self.graph._decay_engine.expired_mask()
+        self.assertEqual(mask.nonzero()[0].tolist(), [2, 5, 7])
+        self.assertEqual(self.graph.cleanup_expired_edges(), 3)
+        self.assertEqual(len(self.graph.edges), 7)
+        self.assertFalse(self.graph._decay_engine.expired_mask().any())
+        
+    def test_persistence_round_trip(self):
+        """Test that columnar graphs save and load through the snapshot format."""
+        graph1 = TrustGraph(storage_path=self.test_dir, storage_backend="columnar")
+        graph1.update_trust("agent1", "agent2", 0.8, 0.9, {"task": "test"})
+        
+        graph2 = TrustGraph(storage_path=self.test_dir, auto_save=False)
+        edge = graph2.edges[("agent1", "agent2")]
+        self.assertEqual(edge.trust_score, 0.8)
+        self.assertEqual(edge.metadata["task"], "test")
+        
+        graph3 = TrustGraph(storage_path=self.test_dir, auto_save=False, storage_backend="columnar")
+        self.assertEqual(graph3.get_trust_score("agent1", "agent2"), 0.8)
+        self.assertEqual(graph3.get_neighbors("agent1"), ["agent2"])
+
+class TestTrustGraphWAL(unittest.TestCase):
+    """Test cases for write-ahead log persistence."""
+    
+    def setUp(self):
+        """Set up test environment."""
+        self.test_dir = tempfile.mkdtemp()
+        
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.test_dir)
+        
+    def _open(self, **kwargs):
+        return TrustGraph(storage_path=self.test_dir, persistence_mode="wal", **kwargs)
+        
+    def test_updates_append_without_snapshot(self):
+        """Test that updates are appended to the WAL instead of rewriting the snapshot."""
+        graph = self._open()
+        graph.update_trust("agent1", "agent2", 0.8, 0.9, {"task": "review"})
+        graph.update_trust("agent2", "agent3", -0.4, 0.6)
+        graph.close()
+        
+        self.assertFalse((Path(self.test_dir) / "trust_graph.json").exists())
+        wal_lines = (Path(self.test_dir) / "trust_graph.wal").read_text().splitlines()
+        self.assertGreater(len(wal_lines), 0)
+        self.assertTrue(all(json.loads(line)["op"] in ("node", "edge") for line in wal_lines))
+        
+    def test_replay_restores_state(self):
+        """Test that snapshot plus WAL replay reproduces the graph."""
+        graph = self._open()
+        graph.update_trust("agent1", "agent2", 0.8, 0.9, {"task": "review"})
+        graph.update_trust("agent2", "agent3", -0.4, 0.6)
+        graph.update_trust("agent3", "agent1", 0.5)
+        graph.remove_agent("agent3")
+        graph.apply_decay()
+        graph.close()
+        
+        reloaded = self._open()
+        self.assertEqual(set(reloaded.nodes), {"agent1", "agent2"})
+        self.assertEqual(set(reloaded.edges), {("agent1", "agent2")})
+        edge = reloaded.edges[("agent1", "agent2")]
+        original = graph.edges[("agent1", "agent2")]
+        self.assertAlmostEqual(edge.trust_score, original.trust_score)
+        self.assertEqual(edge.updated_at, original.updated_at)
+        self.assertEqual(edge.metadata["task"], "review")
+        self.assertEqual(reloaded.nodes["agent2"].successful_interactions, 1)
+        reloaded.close()
+        
+    def test_compaction_folds_wal_into_snapshot(self):
+        """Test periodic compaction into a snapshot."""
+        graph = self._open(wal_compact_threshold=5)
+        for i in range(10):
+            graph.update_trust("agent1", f"agent{i + 2}", 0.1 * i)
+        graph.close()
+        
+        snapshot = json.loads((Path(self.test_dir) / "trust_graph.json").read_text())
+        self.assertGreater(snapshot["metadata"]["wal_seq"], 0)
+        self.assertLess(graph.get_performance_stats()["wal_records"], 5)
+        
+        reloaded = self._open()
+        self.assertEqual(len(reloaded.edges), 10)
+        reloaded.close()
+        
+    def test_load_from_file_survives_reopen(self):
+        """Test that a graph loaded from a file is what the next start sees."""
+        source = TrustGraph(storage_path=str(Path(self.test_dir) / "source"), auto_save=False)
+        source.update_trust("agent3", "agent4", 0.6, 0.7)
+        export_file = str(Path(self.test_dir) / "export.json")
+        self.assertTrue(source.save_to_file(export_file))
+        
+        graph = self._open()
+        graph.update_trust("agent1", "agent2", 0.8)
+        graph.compact()
+        graph.update_trust("agent1", "agent2", 0.2)
+        self.assertTrue(graph.load_from_file(export_file))
+        graph.close()
+        
+        reloaded = self._open()
+        self.assertEqual(set(reloaded.nodes), {"agent3", "agent4"})
+        self.assertEqual(set(reloaded.edges), {("agent3", "agent4")})
+        self.assertAlmostEqual(reloaded.get_trust_score("agent3", "agent4"), 0.6)
+        reloaded.close()
+        
+    def test_replay_skips_records_in_snapshot(self):
+        """Test that a WAL left behind after compaction is not applied twice."""
+        graph = self._open()
+        graph.update_trust("agent1", "agent2", 0.8)
+        graph.close()
+        wal_path = Path(self.test_dir) / "trust_graph.wal"
+        stale_wal = wal_path.read_text()
+        
+        graph = self._open()
+        graph.compact()
+        graph.update_trust("agent1", "agent2", 0.2)
+        graph.close()
+        expected = graph.get_trust_score("agent1", "agent2")
+        
+        # Simulate a crash between snapshot replacement and WAL truncation
+        wal_path.write_text(stale_wal + wal_path.read_text())
+        
+        reloaded = self._open()
+        self.assertAlmostEqual(reloaded.get_trust_score("agent1", "agent2"), expected)
+        self.assertEqual(reloaded.edges[("agent1", "agent2")].interaction_count, 2)
+        reloaded.close()
+        
+    def test_torn_tail_record_is_ignored(self):
+        """Test recovery from a partially written final record."""
+        graph = self._open()
+        graph.update_trust("agent1", "agent2", 0.8)
+        graph.close()
+        
+        with open(Path(self.test_dir) / "trust_graph.wal", "a") as f:
+            f.write('{"op":"edge","from_agent":"agent1"')
+            
+        reloaded = self._open()
+        self.assertEqual(reloaded.get_trust_score("agent1", "agent2"), 0.8)
+        
+        # Updates after recovery must not be appended onto the torn bytes
+        reloaded.update_trust("agent2", "agent3", 0.6)
+        reloaded.update_trust("agent3", "agent4", 0.7)
+        reloaded.close()
+        
+        recovered = self._open()
+        self.assertEqual(recovered.get_trust_score("agent1", "agent2"), 0.8)
+        self.assertEqual(recovered.get_trust_score("agent2", "agent3"), 0.6)
+        self.assertEqual(recovered.get_trust_score("agent3", "agent4"), 0.7)
+        recovered.close()
+        
+    def test_corrupt_middle_record_keeps_later_records(self):
+        """Test that a corrupt record followed by valid ones is skipped, not truncated away."""
+        graph = self._open()
+        graph.update_trust("agent1", "agent2", 0.8)
+        graph.update_trust("agent2", "agent3", 0.6)
+        graph.close()
+        
+        # Corrupt a record in the middle of the log
+        wal_path = Path(self.test_dir) / "trust_graph.wal"
+        lines = wal_path.read_text().splitlines(keepends=True)
+        lines.insert(1, '{"op":"edge","from_agent":\n')
+        wal_path.write_text("".join(lines))
+        size = wal_path.stat().st_size
+        
+        with self.assertLogs("trust_wal", level="ERROR"):
+            reloaded = self._open()
+        self.assertEqual(reloaded.get_trust_score("agent1", "agent2"), 0.8)
+        self.assertEqual(reloaded.get_trust_score("agent2", "agent3"), 0.6)
+        self.assertEqual(reloaded.get_performance_stats()["wal_corrupt_records"], 1)
+        self.assertEqual(wal_path.stat().st_size, size)
+        reloaded.close()
+        
+    def test_invalid_persistence_mode(self):
+        """Test rejection of unknown persistence modes."""
+        with self.assertRaises(ValueError):
+            TrustGraph(storage_path=self.test_dir, persistence_mode="invalid")
+
 class TestTrustEdge(unittest.TestCase):
     """Test cases for TrustEdge functionality."""
     
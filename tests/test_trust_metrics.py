@@ -163,6 +163,26 @@ class TestTrustMetricsCalculator(unittest.TestCase):
         # Cache should be empty
         self.assertEqual(len(self.metrics_calculator._metrics_cache), 0)
         
+    def test_cache_invalidation(self):
+        """Test that agent metrics follow trust updates without a cache clear."""
+        metrics = self.metrics_calculator.calculate_agent_metrics("agent_b")
+        self.assertIs(self.metrics_calculator.calculate_agent_metrics("agent_b"), metrics)
+        
+        self.trust_graph.update_trust("agent_c", "agent_b", 0.2, 0.9)
+        updated = self.metrics_calculator.calculate_agent_metrics("agent_b")
+        self.assertIsNot(updated, metrics)
+        self.assertNotAlmostEqual(updated.average_trust_score, metrics.average_trust_score)
+        
+        # New agents change every agent's centrality
+        self.trust_graph.add_agent("agent_z")
+        self.assertIsNot(self.metrics_calculator.calculate_agent_metrics("agent_b"), updated)
+        
+        # Network metrics are recomputed after any change
+        network = self.metrics_calculator.calculate_network_metrics()
+        self.assertIs(self.metrics_calculator.calculate_network_metrics(), network)
+        self.trust_graph.update_trust("agent_z", "agent_a", 0.9, 0.9)
+        self.assertEqual(self.metrics_calculator.calculate_network_metrics().total_edges, network.total_edges + 1)
+        
     def test_metrics_export(self):
         """Test metrics export functionality."""
         # Calculate metrics
@@ -265,6 +285,151 @@ class TestTrustMetricsCalculator(unittest.TestCase):
         self.assertGreaterEqual(metrics_b.average_trust_score, 0.0)
         self.assertLessEqual(metrics_b.average_trust_score, 1.0)
 
+    def test_network_structure(self):
+        """Test single-pass degree and component summary."""
+        self.trust_graph.update_trust("agent_x", "agent_y", 0.9, 0.9)
+        self.trust_graph.add_agent("agent_z")
+
+        structure = self.metrics_calculator.network_engine.compute()
+        index = {agent: i for i, agent in enumerate(structure.agents)}
+        edges = self.trust_graph.get_all_edges()
+
+        self.assertEqual(structure.total_edges, len(edges))
+        for agent, i in index.items():
+            self.assertEqual(structure.out_degree[i], sum(1 for e in edges if e.from_agent == agent))
+            self.assertEqual(structure.in_degree[i], sum(1 for e in edges if e.to_agent == agent))
+
+        # a-b-c-d-e linked at trust >= 0.3, plus x-y and the isolated z
+        self.assertEqual(sorted(structure.connected_sizes), [1, 2, 5])
+        self.assertAlmostEqual(structure.resilience(), 5 / 8)
+        # Clusters at trust >= 0.6: {a, b, c, d, e}, {x, y}
+        self.assertEqual(sorted(structure.cluster_sizes), [2, 5])
+        self.assertAlmostEqual(structure.fragmentation(), 1.0 - 3.5 / 8)
+
+        network_metrics = self.metrics_calculator.calculate_network_metrics()
+        self.assertEqual(network_metrics.total_agents, 8)
+        self.assertEqual(network_metrics.trust_communities, 2)
+        self.assertAlmostEqual(network_metrics.trust_centralization, structure.centralization())
+        self.assertEqual(
+            network_metrics.high_trust_agents,
+            sum(
+                1 for agent in structure.agents
+                if self.metrics_calculator.calculate_agent_metrics(agent, include_behavior=False).average_trust_score >= 0.7
+            )
+        )
+
+    def test_reachability_index_matches_search(self):
+        """Test that reachability read from the index equals reachability found by search."""
+        graph = TrustGraph(storage_path=os.path.join(self.temp_dir, "chains"), auto_save=False)
+        # A 9-agent chain of strong edges and a 5-agent chain of weak ones
+        for i in range(8):
+            graph.update_trust(f"strong_{i}", f"strong_{i + 1}", 0.9, 0.9)
+        for i in range(4):
+            graph.update_trust(f"weak_{i}", f"weak_{i + 1}", 0.1, 0.9)
+
+        indexed = TrustMetricsCalculator(graph)
+        searched = TrustMetricsCalculator(graph)
+        searched.max_matrix_agents = 0
+
+        def assert_agree():
+            for agent in graph.get_all_agents():
+                self.assertAlmostEqual(
+                    indexed._calculate_reachability(agent),
+                    len(searched._find_reachable(agent, 0.3)) / len(graph.get_all_agents())
+                )
+                self.assertAlmostEqual(indexed._calculate_reachability(agent), searched._calculate_reachability(agent))
+
+        assert_agree()
+        total = len(graph.get_all_agents())
+        self.assertAlmostEqual(indexed._calculate_reachability("strong_0"), 9 / total)
+        self.assertAlmostEqual(indexed._calculate_reachability("weak_0"), 1 / total)
+        self.assertIsNotNone(indexed._reachability_index)
+        self.assertIsNone(searched._reachability_index)
+
+        # Join the chains into a cycle, then cut it; additions are applied in place
+        graph.set_high_performance_mode(True)
+        graph.update_trust("strong_8", "weak_0", 0.9, 0.9)
+        graph.update_trust("weak_0", "weak_1", 0.9, 0.9)
+        graph.update_trust("weak_1", "strong_0", 0.9, 0.9)
+        assert_agree()
+        self.assertAlmostEqual(indexed._calculate_reachability("strong_4"), 11 / total)
+        graph.update_trust("strong_8", "weak_0", 0.0, 0.9)
+        assert_agree()
+
+        stats = indexed._reachability_index.get_stats()
+        self.assertEqual(stats['incremental_updates'], 1)
+        self.assertEqual(stats['full_rebuilds'], 2)
+
+    def test_efficiency_matrix_matches_search(self):
+        """Test that efficiency read from the matrix equals efficiency found by search."""
+        graph = TrustGraph(storage_path=os.path.join(self.temp_dir, "chain"), auto_save=False)
+        for i in range(20):
+            graph.update_trust(f"chain_{i}", f"chain_{i + 1}", 0.9, 0.9)
+        # Low-confidence shortcuts are best paths too; confidence does not constrain efficiency
+        graph.update_trust("chain_0", "chain_2", 0.95, 0.05)
+        graph.update_trust("chain_3", "chain_5", 0.95, 0.05)
+
+        matrix_sized = TrustMetricsCalculator(graph)
+        searched = TrustMetricsCalculator(graph)
+        searched.max_matrix_agents = 0
+        # 21 agents have 420 ordered pairs, so the search covers all of them
+        self.assertLessEqual(21 * 20, searched.efficiency_sample_pairs)
+
+        efficiency = matrix_sized.calculate_network_metrics().trust_efficiency
+        self.assertGreater(efficiency, 0.0)
+        self.assertAlmostEqual(efficiency, searched.calculate_network_metrics().trust_efficiency)
+        self.assertIsNotNone(matrix_sized.analyzer._trust_matrix)
+        self.assertIsNone(searched.analyzer._trust_matrix)
+
+        matrix = matrix_sized.analyzer.get_trust_matrix()
+        self.assertEqual(matrix.get_path_length("chain_0", "chain_2"), 1)
+        self.assertAlmostEqual(efficiency, matrix.get_efficiency())
+
+    def test_efficiency_samples_pairs_above_matrix_limit(self):
+        """Test that efficiency above the matrix limit is estimated from sampled pairs."""
+        graph = TrustGraph(storage_path=os.path.join(self.temp_dir, "complete"), auto_save=False)
+        agents = [f"agent_{i}" for i in range(25)]
+        for source in agents:
+            for target in agents:
+                if source != target:
+                    graph.update_trust(source, target, 0.9, 0.9)
+
+        searched = TrustMetricsCalculator(graph)
+        searched.max_matrix_agents = 0
+        searched.efficiency_sample_pairs = 100
+
+        # 600 ordered pairs, each best reached over its direct edge
+        self.assertAlmostEqual(searched._calculate_efficiency(), 0.5)
+        self.assertIsNone(searched.analyzer._trust_matrix)
+
+    def test_resilience_articulation_points(self):
+        """Test resilience and criticality from articulation points."""
+        graph = TrustGraph(storage_path=os.path.join(self.temp_dir, "hub"), auto_save=False)
+        # Two triangles joined at hub_h, plus hub_e hanging off hub_h
+        for source, target in [
+            ("hub_a", "hub_b"), ("hub_b", "hub_h"), ("hub_h", "hub_a"),
+            ("hub_c", "hub_d"), ("hub_d", "hub_h"), ("hub_h", "hub_c"),
+            ("hub_h", "hub_e"), ("hub_e", "hub_h")
+        ]:
+            graph.update_trust(source, target, 0.8, 0.9)
+        # Below the connectivity threshold, so it does not connect the triangles
+        graph.update_trust("hub_a", "hub_c", 0.1, 0.9)
+        
+        calculator = TrustMetricsCalculator(graph)
+        structure = calculator.network_engine.compute()
+        
+        # Losing hub_h leaves {a, b}, {c, d} and {e}: 3 of 5 others cut off
+        self.assertEqual(calculator.get_critical_agents(), [("hub_h", 3 / 5)])
+        self.assertEqual(structure.bridges(), [("hub_h", "hub_e")])
+        
+        # Any other failure keeps the remaining 5 agents connected
+        expected = (5 * 5 + 2) / (6 * 5)
+        self.assertAlmostEqual(calculator._calculate_resilience(), expected)
+        
+        network_metrics = calculator.calculate_network_metrics()
+        self.assertAlmostEqual(network_metrics.trust_resilience, expected)
+        self.assertEqual(network_metrics.metadata["articulation_points"], 1)
+
 class TestTrustMetrics(unittest.TestCase):
     """Unit tests for TrustMetrics class."""
     
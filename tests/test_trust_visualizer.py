@@ -99,6 +99,14 @@ class TestTrustVisualizer(unittest.TestCase):
                 self.assertIsInstance(path.confidence, float)
                 self.assertIsInstance(path.color, str)
                 
+    def test_unreachable_path_builds_no_matrix(self):
+        """Test that highlighting an unreachable pair finds no paths without building the trust matrix."""
+        self.trust_graph.add_agent("agent_isolated")
+        
+        self.assertEqual(self.visualizer.highlight_trust_path("agent_a", "agent_isolated"), [])
+        self.assertTrue(self.visualizer.highlight_trust_path("agent_a", "agent_e"))
+        self.assertIsNone(self.analyzer._trust_matrix)
+        
     def test_cluster_highlighting(self):
         """Test trust cluster highlighting functionality."""
         # Highlight trust clusters
@@ -165,6 +173,51 @@ class TestTrustVisualizer(unittest.TestCase):
             # SVG export might not be fully implemented
             pass
         
+    def test_streaming_export(self):
+        """Test streaming export with level-of-detail culling."""
+        import io
+
+        # Streamed JSON matches the in-memory export
+        stream = io.StringIO()
+        summary = self.visualizer.stream_visualization(stream, "json")
+        data = json.loads(stream.getvalue())
+        self.assertEqual(summary.nodes_written, 5)
+        self.assertEqual(summary.edges_written, 8)
+        self.assertEqual(len(data["nodes"]), len(self.visualizer.nodes))
+        self.assertEqual(len(data["edges"]), len(self.visualizer.edges))
+        self.assertEqual(summary.characters_written, len(stream.getvalue()))
+
+        # Edges below the threshold are dropped
+        culled = json.loads(self.visualizer.export_visualization("json", min_trust=0.6))
+        self.assertEqual(len(culled["edges"]), 5)
+        self.assertEqual(culled["metadata"]["culled_edges"], 3)
+        self.assertTrue(all(edge["trust_score"] >= 0.6 for edge in culled["edges"]))
+
+        # Only a-b, b-c and d-e reach 0.8 trust, giving two clusters
+        aggregated = json.loads(self.visualizer.export_visualization("json", cluster_threshold=0.8))
+        node_ids = {node["id"] for node in aggregated["nodes"]}
+        self.assertEqual(node_ids, {"cluster_0", "cluster_1"})
+        cluster_members = {node["id"]: set(node["metadata"]["members"]) for node in aggregated["nodes"]}
+        self.assertEqual(cluster_members["cluster_0"], {"agent_a", "agent_b", "agent_c"})
+        self.assertEqual(cluster_members["cluster_1"], {"agent_d", "agent_e"})
+        merged = {(edge["source"], edge["target"]): edge for edge in aggregated["edges"]}
+        self.assertEqual(set(merged), {("cluster_0", "cluster_1"), ("cluster_1", "cluster_0")})
+        self.assertEqual(merged[("cluster_0", "cluster_1")]["metadata"]["edges"], 3)
+        self.assertAlmostEqual(merged[("cluster_0", "cluster_1")]["trust_score"], (0.7 + 0.5 + 0.4) / 3)
+
+        # File, SVG and DOT outputs
+        output_file = os.path.join(self.temp_dir, "trust.dot")
+        self.assertEqual(self.visualizer.export_visualization("dot", output_file), output_file)
+        with open(output_file) as f:
+            dot_content = f.read()
+        self.assertEqual(dot_content.count(" -> "), 8)
+        svg_content = "".join(self.visualizer.iter_visualization("svg", min_trust=0.6))
+        self.assertEqual(svg_content.count("<line"), 5)
+        self.assertEqual(svg_content.count("<circle"), 5)
+
+        with self.assertRaises(ValueError):
+            self.visualizer.iter_visualization("invalid_format")
+        
     def test_metadata_integration(self):
         """Test metadata integration in visualization."""
         # Add metadata to agents
@@ -260,7 +313,70 @@ class TestTrustVisualizer(unittest.TestCase):
         # Should have more nodes and edges
         self.assertGreater(len(updated_data["nodes"]), len(initial_data["nodes"]))
         self.assertGreater(len(updated_data["edges"]), len(initial_data["edges"]))
-        
+
+    def test_layout_warm_start(self):
+        """Test that rebuilds keep existing agents near their previous positions."""
+        initial_positions = {node_id: (node.x, node.y) for node_id, node in self.visualizer.nodes.items()}
+
+        self.trust_graph.add_agent("agent_f")
+        self.trust_graph.update_trust("agent_f", "agent_a", 0.7, 0.8)
+        self.visualizer._build_visualization()
+
+        for node_id, (x, y) in initial_positions.items():
+            node = self.visualizer.nodes[node_id]
+            moved = ((node.x - x) ** 2 + (node.y - y) ** 2) ** 0.5
+            self.assertLess(moved, self.visualizer.edge_length)
+
+    def test_large_graph_layout(self):
+        """Test tree-accelerated layout on a graph above the exact repulsion limit."""
+        from trust_layout import ForceLayoutEngine, EXACT_REPULSION_LIMIT
+
+        node_ids = [f"agent_{i}" for i in range(EXACT_REPULSION_LIMIT * 2)]
+        edges = [(node_ids[i], node_ids[(i + 1) % len(node_ids)], 0.8) for i in range(len(node_ids))]
+
+        positions = ForceLayoutEngine().layout(node_ids, edges)
+
+        self.assertEqual(positions.shape, (len(node_ids), 2))
+        self.assertTrue((abs(positions) < 1e6).all())
+        self.assertEqual(len({(round(x, 3), round(y, 3)) for x, y in positions.tolist()}), len(node_ids))
+
+    def test_repulsion_accuracy(self):
+        """Test tree repulsion stays close to exact all-pairs repulsion on clustered agents."""
+        import numpy as np
+        from trust_layout import ForceLayoutEngine
+
+        rng = np.random.default_rng(0)
+        centers = rng.normal(0.0, 2000.0, (20, 2))
+        positions = centers[rng.integers(0, 20, 2000)] + rng.normal(0.0, 30.0, (2000, 2))
+
+        engine = ForceLayoutEngine()
+        exact = engine._pair_repulsion(positions[:, None, :] - positions[None, :, :])
+        exact[np.arange(2000), np.arange(2000)] = 0.0
+        exact = exact.sum(axis=1)
+        approx = engine._repulsion(positions)
+
+        error = np.linalg.norm(approx - exact, axis=1) / np.linalg.norm(exact, axis=1)
+        self.assertLess(np.median(error), 0.05)
+        self.assertLess(np.percentile(error, 95), 0.25)
+
+    def test_repulsion_scales_near_linearly(self):
+        """Test 4x the agents examines at most about 5x the repulsion pairs on clustered agents."""
+        import numpy as np
+        from trust_layout import ForceLayoutEngine
+
+        rng = np.random.default_rng(0)
+        centers = rng.normal(0.0, 2000.0, (20, 2))
+
+        def pairs_examined(n):
+            engine = ForceLayoutEngine()
+            engine._repulsion(centers[rng.integers(0, 20, n)] + rng.normal(0.0, 30.0, (n, 2)))
+            return engine.repulsion_pairs
+
+        small, large = pairs_examined(4000), pairs_examined(16000)
+        self.assertLess(large / small, 5.5)
+        # Far below the 16000^2 pairs of exact repulsion
+        self.assertLess(large, 16000 * 200)
+
     def test_custom_styling(self):
         """Test custom styling functionality."""
         # Note: The actual implementation doesn't have set_node_style and set_edge_style methods
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+GitBridge Token Usage Rollup Unit Tests
+Phase: GBP20
+Part: P20P7
+Step: P20P7S3
+Task: P20P7S3T5 - Incremental Token Usage Aggregation
+
+Unit tests for incremental hourly usage rollups: incremental refresh,
+rotation handoff and checkpoint resume.
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [Corrected P20P7 Schema]
+"""
+
+import unittest
+import tempfile
+import shutil
+import json
+import os
+from datetime import datetime
+
+from utils.usage_rollup import UsageRollup
+
+class TestUsageRollup(unittest.TestCase):
+    """Unit tests for UsageRollup class."""
+
+    def setUp(self):
+        """Set up test environment."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.temp_dir, "token_usage.jsonl")
+
+    def tearDown(self):
+        """Clean up test environment."""
+        shutil.rmtree(self.temp_dir)
+
+    def append(self, count: int, hour: int = 10, model: str = "gpt-4o", path: str = None) -> None:
+        with open(path or self.log_file, 'a') as f:
+            for _ in range(count):
+                f.write(json.dumps({
+                    "timestamp": f"2025-06-19T{hour:02d}:15:00",
+                    "provider": "openai",
+                    "model": model,
+                    "cost_usd": 0.5,
+                    "total_tokens": 100,
+                    "success": True,
+                    "latency": 2.0
+                }) + "\n")
+
+    def test_refresh_reads_only_new_lines(self):
+        """Test that refresh folds in appended lines once and waits for partial lines."""
+        rollup = UsageRollup(self.log_file)
+        self.append(3)
+        self.assertEqual(rollup.refresh(), 3)
+        self.assertEqual(rollup.refresh(), 0)
+
+        self.append(2, hour=11, model="gpt-4o-mini")
+        with open(self.log_file, 'a') as f:
+            f.write("plain log line\n")
+            f.write('{"timestamp": "2025-06-19T11:20:00", "provid')
+        self.assertEqual(rollup.refresh(), 2)
+        self.assertEqual(rollup.lines_skipped, 1)
+
+        summary = rollup.summary()
+        self.assertEqual(summary["total_calls"], 5)
+        self.assertEqual(summary["total_tokens"], 500)
+        self.assertAlmostEqual(summary["total_cost"], 2.5)
+        self.assertAlmostEqual(summary["average_latency"], 2.0)
+        self.assertEqual(summary["by_model"]["gpt-4o-mini"]["calls"], 2)
+        self.assertEqual(rollup.summary(start=datetime(2025, 6, 19, 11))["total_calls"], 2)
+        self.assertEqual([row["hour"] for row in rollup.hourly()], ["2025-06-19T10", "2025-06-19T11"])
+
+    def test_rotation_finishes_backup_then_reads_new_file(self):
+        """Test that lines appended before rotation are read from the backup, then the new log."""
+        rollup = UsageRollup(self.log_file)
+        self.append(3)
+        self.assertEqual(rollup.refresh(), 3)
+
+        self.append(2)  # Written before rotation but not yet refreshed
+        os.replace(self.log_file, f"{self.log_file}.1")
+        self.append(4, hour=11)
+
+        self.assertEqual(rollup.refresh(), 6)
+        self.assertEqual(rollup.summary()["total_calls"], 9)
+        self.assertEqual([row["total_calls"] for row in rollup.hourly()], [5, 4])
+
+    def rotate(self, backup_count: int = 5) -> None:
+        """Shift the log to .1 the way LogSink does, keeping backup_count backups."""
+        for index in range(backup_count - 1, 0, -1):
+            if os.path.exists(f"{self.log_file}.{index}"):
+                os.replace(f"{self.log_file}.{index}", f"{self.log_file}.{index + 1}")
+        os.replace(self.log_file, f"{self.log_file}.1")
+
+    def test_multiple_rotations_read_every_backup(self):
+        """Test that rotating twice between refreshes reads the old tail and the middle backup."""
+        rollup = UsageRollup(self.log_file)
+        self.append(3)
+        self.assertEqual(rollup.refresh(), 3)
+
+        self.append(2)  # Tail of the old log, now in .2
+        self.rotate()
+        self.append(4, hour=11)  # Complete backup, now in .1
+        self.rotate()
+        self.append(1, hour=12)
+
+        self.assertEqual(rollup.refresh(), 7)
+        self.assertEqual([row["total_calls"] for row in rollup.hourly()], [5, 4, 1])
+        self.assertEqual(rollup.rotations_missed, 0)
+        self.assertEqual(rollup.refresh(), 0)
+
+    def test_rotation_past_last_backup_is_counted(self):
+        """Test that losing the old log to backup pruning is counted and reading resumes."""
+        rollup = UsageRollup(self.log_file)
+        self.append(3)
+        rollup.refresh()
+
+        self.append(2)
+        # Holding the old log open stops its inode from being reused by a new file
+        with open(self.log_file, 'rb'):
+            for hour in (11, 12, 13):
+                self.rotate(backup_count=2)
+                self.append(1, hour=hour)
+
+            with self.assertLogs("utils.usage_rollup", level="WARNING"):
+                self.assertEqual(rollup.refresh(), 1)
+        self.assertEqual(rollup.rotations_missed, 1)
+        self.assertEqual(rollup.summary()["total_calls"], 4)
+
+    def test_truncated_log_is_read_from_start(self):
+        """Test that a log truncated in place is re-read from its beginning."""
+        rollup = UsageRollup(self.log_file)
+        self.append(5)
+        rollup.refresh()
+
+        with open(self.log_file, 'w'):
+            pass
+        self.append(2, hour=12)
+
+        self.assertEqual(rollup.refresh(), 2)
+        self.assertEqual(rollup.summary()["total_calls"], 7)
+
+    def test_checkpoint_resume(self):
+        """Test that a new rollup resumes from the checkpoint without re-reading history."""
+        rollup = UsageRollup(self.log_file)
+        self.append(4)
+        rollup.refresh()
+
+        self.append(3, hour=11)
+        resumed = UsageRollup(self.log_file)
+        self.assertEqual(resumed.summary()["total_calls"], 4)
+        self.assertEqual(resumed.refresh(), 3)
+        self.assertEqual(resumed.lines_parsed, 3)
+        self.assertEqual(resumed.summary()["total_calls"], 7)
+
+    def test_checkpoint_for_other_log_ignored(self):
+        """Test that a checkpoint written for a different log file is not applied."""
+        rollup = UsageRollup(self.log_file)
+        self.append(4)
+        rollup.refresh()
+
+        other_log = os.path.join(self.temp_dir, "other.jsonl")
+        self.append(1, path=other_log)
+        other = UsageRollup(other_log, checkpoint_file=rollup.checkpoint_file)
+
+        self.assertEqual(other.summary()["total_calls"], 0)
+        self.assertEqual(other.refresh(), 1)
+
+    def test_unreadable_checkpoint_starts_over(self):
+        """Test that a corrupt checkpoint is ignored and the log is read from the start."""
+        self.append(3)
+        with open(f"{self.log_file}.rollup.json", 'w') as f:
+            f.write('{"offset": ')
+
+        rollup = UsageRollup(self.log_file)
+        self.assertEqual(rollup.refresh(), 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -21,11 +21,12 @@ from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 import math
-import heapq
 from collections import defaultdict, deque
 import threading
 
 from trust_graph import TrustGraph, TrustEdge
+from trust_paths import TrustPathEngine
+from trust_cache import NeighborhoodCache, bounded_neighborhood
 
 logger = logging.getLogger(__name__)
 
@@ -78,7 +79,13 @@ class TrustAnalyzer:
     - Trust network analysis
     """
     
-    def __init__(self, trust_graph: TrustGraph, max_path_length: int = 5, decay_factor: float = 0.8):
+    def __init__(
+        self,
+        trust_graph: TrustGraph,
+        max_path_length: int = 5,
+        decay_factor: float = 0.8,
+        cache_size: int = 1024
+    ):
         """
         Initialize trust analyzer.
         
@@ -86,19 +93,24 @@ class TrustAnalyzer:
             trust_graph: Trust graph to analyze
             max_path_length: Maximum path length to consider
             decay_factor: Trust decay factor per hop (0.0 to 1.0)
+            cache_size: Maximum number of cached path analyses
         """
         self.trust_graph = trust_graph
         self.max_path_length = max_path_length
         self.decay_factor = decay_factor
         
-        # Analysis cache
-        self._analysis_cache: Dict[str, TrustAnalysis] = {}
+        # Analysis cache, invalidated by trust changes near each analysis
+        self._analysis_cache = NeighborhoodCache(trust_graph, max_entries=cache_size)
         self._cache_lock = threading.RLock()
         
         # Configuration
         self.min_confidence_threshold = 0.1
         self.max_paths_per_analysis = 10
         
+        # Lazily built all-pairs transitive trust
+        self._trust_matrix = None
+        self.path_labels_settled = 0  # Search labels expanded by path analysis, cumulative
+        
         logger.info(f"[P23P3S1T1] TrustAnalyzer initialized with max_path_length={max_path_length}, decay_factor={decay_factor}")
         
     def analyze_trust_paths(
@@ -126,16 +138,15 @@ class TrustAnalyzer:
             min_confidence = self.min_confidence_threshold
             
         # Check cache first
-        cache_key = f"{source}:{target}"
-        with self._cache_lock:
-            if cache_key in self._analysis_cache:
-                cached = self._analysis_cache[cache_key]
-                # Check if cache is still valid (within 1 hour)
-                if (datetime.now(timezone.utc) - cached.analysis_timestamp).total_seconds() < 3600:
-                    logger.debug(f"[P23P3S1T1] Using cached analysis for {source} -> {target}")
-                    return cached
-                    
+        cache_key = (source, target, max_paths, min_confidence)
+        cached = self._analysis_cache.get(cache_key)
+        # Edges also expire with time, so cached analyses still age out after 1 hour
+        if cached is not None and (datetime.now(timezone.utc) - cached.analysis_timestamp).total_seconds() < 3600:
+            logger.debug(f"[P23P3S1T1] Using cached analysis for {source} -> {target}")
+            return cached
+            
         # Perform analysis
+        graph_version = self.trust_graph.version
         analysis = TrustAnalysis(source=source, target=target)
         
         # Check for direct trust
@@ -163,9 +174,13 @@ class TrustAnalyzer:
             # Build trust network
             analysis.trust_network = self._build_trust_network(paths)
             
-        # Cache results
-        with self._cache_lock:
-            self._analysis_cache[cache_key] = analysis
+        # Cache results against every agent a path edge could start from
+        dependencies = bounded_neighborhood(
+            self.trust_graph, source, max(0, self.max_path_length - 2), self._analysis_cache.max_dependencies
+        )
+        if dependencies is not None:
+            dependencies.add(target)
+        self._analysis_cache.put(cache_key, analysis, dependencies, graph_version)
             
         logger.info(f"[P23P3S1T1] Analyzed trust paths {source} -> {target}: {len(paths)} paths found")
         return analysis
@@ -178,7 +193,7 @@ class TrustAnalyzer:
         min_confidence: float
     ) -> List[TrustPath]:
         """
-        Find trust paths between source and target using modified Dijkstra's algorithm.
+        Find the highest-trust paths between source and target.
         
         Args:
             source: Source agent ID
@@ -187,93 +202,24 @@ class TrustAnalyzer:
             min_confidence: Minimum confidence threshold
             
         Returns:
-            List of trust paths
-        """
-        if source == target:
-            return []
-            
-        # Priority queue for path exploration
-        # (negative_trust_score, path_length, current_node, path, total_confidence)
-        pq = [(0, 0, source, [source], 1.0)]
-        visited = set()
-        paths = []
-        
-        while pq and len(paths) < max_paths:
-            neg_trust, path_length, current, path, confidence = heapq.heappop(pq)
-            
-            # Skip if path is too long or confidence is too low
-            if path_length >= self.max_path_length or confidence < min_confidence:
-                continue
-                
-            # Skip if we've already found a better path to this node
-            path_key = (current, tuple(path))
-            if path_key in visited:
-                continue
-            visited.add(path_key)
-            
-            # Check if we've reached the target
-            if current == target and len(path) > 1:  # Must have at least one hop
-                total_trust = self._calculate_path_trust(path)
-                trust_path = TrustPath(
-                    source=source,
-                    target=target,
-                    path=path.copy(),
-                    total_trust=total_trust,
-                    path_length=len(path) - 1,
-                    confidence=confidence
-                )
-                paths.append(trust_path)
-                continue
-                
-            # Explore neighbors
-            neighbors = self.trust_graph.get_neighbors(current)
-            for neighbor in neighbors:
-                if neighbor not in path:  # Avoid cycles
-                    edge = self.trust_graph.get_edge(current, neighbor)
-                    if edge and edge.trust_score > 0:
-                        new_path = path + [neighbor]
-                        new_confidence = confidence * edge.confidence
-                        
-                        # Apply decay factor
-                        decayed_trust = edge.trust_score * (self.decay_factor ** path_length)
-                        
-                        heapq.heappush(pq, (
-                            -decayed_trust,  # Negative for max-heap behavior
-                            path_length + 1,
-                            neighbor,
-                            new_path,
-                            new_confidence
-                        ))
-                        
-        # Sort paths by total trust (descending)
-        paths.sort(key=lambda p: p.total_trust, reverse=True)
-        return paths[:max_paths]
-        
-    def _calculate_path_trust(self, path: List[str]) -> float:
-        """
-        Calculate total trust score for a path.
-        
-        Args:
-            path: List of agent IDs representing the path
-            
-        Returns:
-            float: Total trust score
+            List of trust paths, highest total trust first
         """
-        if len(path) < 2:
-            return 0.0
-            
-        total_trust = 1.0
-        
-        for i in range(len(path) - 1):
-            edge = self.trust_graph.get_edge(path[i], path[i + 1])
-            if edge:
-                # Apply decay factor for each hop
-                hop_trust = edge.trust_score * (self.decay_factor ** i)
-                total_trust *= hop_trust
-            else:
-                return 0.0
-                
-        return total_trust
+        # Paths must reach the target in fewer than max_path_length hops
+        engine = TrustPathEngine(self.trust_graph, self.max_path_length - 1, self.decay_factor)
+        results = engine.k_best_paths(source, target, max_paths, min_confidence)
+        self.path_labels_settled += engine.labels_settled
+        
+        return [
+            TrustPath(
+                source=source,
+                target=target,
+                path=result.nodes,
+                total_trust=result.total_trust,
+                path_length=len(result.nodes) - 1,
+                confidence=result.confidence
+            )
+            for result in results
+        ]
         
     def _build_trust_network(self, paths: List[TrustPath]) -> Dict[str, float]:
         """
@@ -515,6 +461,42 @@ class TrustAnalyzer:
         else:
             raise ValueError(f"Unsupported export format: {format}")
             
+    def get_trust_matrix(self, max_agents: Optional[int] = None):
+        """
+        Get the incrementally maintained all-pairs transitive trust matrix.
+        
+        The matrix uses the same hop bound and decay factor as path analysis
+        and brings itself up to date with the trust graph on every read.
+        
+        Args:
+            max_agents: Optional agent count above which no matrix is returned,
+                since the dense matrix takes O(N^2) memory
+            
+        Returns:
+            Optional[TransitiveTrustMatrix]: Shared matrix for this analyzer, or
+            None if the graph has more than max_agents agents
+        """
+        if max_agents is not None and len(self.trust_graph.nodes) > max_agents:
+            return None
+        with self._cache_lock:
+            if self._trust_matrix is None:
+                from trust_matrix import TransitiveTrustMatrix
+                self._trust_matrix = TransitiveTrustMatrix(
+                    self.trust_graph, self.max_path_length - 1, self.decay_factor
+                )
+            return self._trust_matrix
+            
+    def close(self) -> None:
+        """Stop listening to trust graph changes and drop cached results."""
+        with self._cache_lock:
+            self._analysis_cache.close()
+            
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        
     def clear_cache(self) -> None:
         """Clear the analysis cache."""
         with self._cache_lock:
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+GitBridge Trust Neighborhood Cache
+Phase: GBP23
+Part: P23P3
+Step: P23P3S2
+Task: P23P3S2T1 - Event-Driven Cache Invalidation
+
+Bounded LRU cache for TrustAnalyzer and TrustMetricsCalculator results that
+subscribes to TrustGraph change notifications. Every entry records the agents
+whose trust edges it was computed from, and an index from agent to entries
+lets an edge change drop only the results whose neighborhood it touched, so
+hot queries stay cached under a continuous stream of trust updates. Entries
+whose neighborhood is too large to index depend on every change, and caches
+of results that depend on the agent count can be cleared on membership changes.
+The graph holds the cache's listener weakly, so a cache whose owner is
+dropped without close() stops receiving changes once it is collected.
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [P23P3 Schema]
+"""
+
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, Optional, Set
+
+from trust_graph import TrustGraph, TrustChangeEvent
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class _CacheEntry:
+    """Cached value and the agents it depends on (None for every agent)."""
+    value: Any
+    dependencies: Optional[Set[str]]
+
+class _WeakListener:
+    """Graph listener that forwards to a bound method without keeping its object alive."""
+
+    def __init__(self, method: Any):
+        self._method = weakref.WeakMethod(method)
+
+    def __call__(self, event: TrustChangeEvent) -> None:
+        method = self._method()
+        if method is not None:
+            method(event)
+
+class NeighborhoodCache:
+    """
+    LRU result cache invalidated by trust graph changes.
+
+    Phase: GBP23
+    Part: P23P3
+    Step: P23P3S2
+    Task: P23P3S2T1 - Core Implementation
+
+    Features:
+    - Bounded size with least-recently-used eviction
+    - Per-agent dependency index for targeted invalidation
+    - Version check that rejects results computed across a change
+    - Hit, miss, eviction and invalidation counters
+    - Weakly held graph subscription
+    """
+
+    def __init__(
+        self,
+        trust_graph: TrustGraph,
+        max_entries: int = 1024,
+        max_dependencies: int = 1024,
+        membership_sensitive: bool = False
+    ):
+        """
+        Initialize neighborhood cache and subscribe to graph changes.
+
+        Args:
+            trust_graph: Trust graph whose changes invalidate entries
+            max_entries: Maximum number of cached results
+            max_dependencies: Larger neighborhoods are invalidated by any change
+            membership_sensitive: Clear every entry when agents are added or removed
+        """
+        self.trust_graph = trust_graph
+        self.max_entries = max_entries
+        self.max_dependencies = max_dependencies
+        self.membership_sensitive = membership_sensitive
+
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._dependents: Dict[str, Set[Hashable]] = {}  # Agent -> keys depending on it
+        self._global_keys: Set[Hashable] = set()          # Keys depending on every agent
+        self._agent_versions: Dict[str, int] = {}         # Graph version of each agent's last change
+        self._reset_version = 0
+        self._latest_version = 0
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        # Unsubscribed by close() or, for an owner that never calls it, on collection
+        self._listener = _WeakListener(self._on_change)
+        trust_graph.subscribe(self._listener)
+        self._finalizer = weakref.finalize(self, trust_graph.unsubscribe, self._listener)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a cached value and mark it most recently used.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(
+        self,
+        key: Hashable,
+        value: Any,
+        dependencies: Optional[Iterable[str]],
+        version: int
+    ) -> bool:
+        """
+        Cache a value computed from the graph at a given version.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            dependencies: Agents whose edges the value was computed from, or None
+                if any change may affect it
+            version: Graph version read before computing the value
+
+        Returns:
+            bool: False if a relevant change happened since version, in which
+                case the value is stale and was not cached
+        """
+        dependency_set = None if dependencies is None else set(dependencies)
+        if dependency_set is not None and len(dependency_set) > self.max_dependencies:
+            dependency_set = None
+
+        with self._lock:
+            if self._reset_version > version:
+                return False
+            if dependency_set is None:
+                if self._latest_version > version:
+                    return False
+            elif any(self._agent_versions.get(agent_id, 0) > version for agent_id in dependency_set):
+                return False
+
+            if key in self._entries:
+                self._unlink(key, self._entries.pop(key))
+            self._entries[key] = _CacheEntry(value, dependency_set)
+            if dependency_set is None:
+                self._global_keys.add(key)
+            else:
+                for agent_id in dependency_set:
+                    self._dependents.setdefault(agent_id, set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                old_key, old_entry = self._entries.popitem(last=False)
+                self._unlink(old_key, old_entry)
+                self.evictions += 1
+            return True
+
+    def invalidate(self, key: Hashable) -> bool:
+        """
+        Drop a single entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            bool: True if the entry was cached
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return False
+            self._unlink(key, entry)
+            self.invalidations += 1
+            return True
+
+    def invalidate_agents(self, agent_ids: Iterable[str], version: Optional[int] = None) -> int:
+        """
+        Drop every entry that depends on any of the given agents.
+
+        Args:
+            agent_ids: Agents whose trust edges changed
+            version: Graph version of the change; defaults to the current version
+
+        Returns:
+            int: Number of entries dropped
+        """
+        if version is None:
+            version = self.trust_graph.version
+        with self._lock:
+            keys = set(self._global_keys)
+            for agent_id in agent_ids:
+                self._agent_versions[agent_id] = max(self._agent_versions.get(agent_id, 0), version)
+                keys.update(self._dependents.get(agent_id, ()))
+            self._latest_version = max(self._latest_version, version)
+            for key in keys:
+                self._unlink(key, self._entries.pop(key))
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._clear_entries()
+
+    def close(self) -> None:
+        """Stop listening to graph changes and drop every entry."""
+        self._finalizer()
+        self.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict containing size, hit rate and invalidation counters
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "global_entries": len(self._global_keys),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations
+            }
+
+    def _on_change(self, event: TrustChangeEvent) -> None:
+        """Graph listener; runs under the graph lock and only takes the cache lock."""
+        if event.kind == "reset" or (self.membership_sensitive and event.kind in ("agent_added", "agent_removed")):
+            with self._lock:
+                self._reset_version = max(self._reset_version, event.version)
+                self._latest_version = max(self._latest_version, event.version)
+                self._agent_versions.clear()
+                self._clear_entries()
+            return
+        self.invalidate_agents(event.agents, event.version)
+
+    def _clear_entries(self) -> None:
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self._dependents.clear()
+        self._global_keys.clear()
+
+    def _unlink(self, key: Hashable, entry: _CacheEntry) -> None:
+        """Remove a popped entry from the dependency index."""
+        if entry.dependencies is None:
+            self._global_keys.discard(key)
+            return
+        for agent_id in entry.dependencies:
+            keys = self._dependents.get(agent_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._dependents[agent_id]
+
+def bounded_neighborhood(
+    trust_graph: TrustGraph,
+    agent_id: str,
+    max_hops: int,
+    limit: int
+) -> Optional[Set[str]]:
+    """
+    Agents within max_hops outgoing trust edges of an agent, including itself.
+
+    Args:
+        trust_graph: Trust graph to search
+        agent_id: Start agent
+        max_hops: Maximum number of edges from the start agent
+        limit: Stop and return None once the neighborhood exceeds this size
+
+    Returns:
+        Set of agent IDs, or None if the neighborhood is larger than limit
+    """
+    visited = {agent_id}
+    frontier = [agent_id]
+    for _ in range(max_hops):
+        next_frontier = []
+        for current in frontier:
+            for neighbor in trust_graph.get_neighbors(current):
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    next_frontier.append(neighbor)
+        if len(visited) > limit:
+            return None
+        if not next_frontier:
+            break
+        frontier = next_frontier
+    return visited
@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""
+GitBridge Trust Graph Columnar Edge Store
+Phase: GBP23
+Part: P23P1
+Step: P23P1S4
+Task: P23P1S4T1 - Compact Array-Backed Edge Storage
+
+Memory-compact storage backend for TrustGraph edges. Agent IDs are interned
+to integers and edge fields live in parallel typed arrays, with a CSR-style
+adjacency index and a sparse side table for edge metadata. The store behaves
+like the ``Dict[Tuple[str, str], TrustEdge]`` it replaces, handing out
+lightweight write-through ``EdgeView`` objects instead of dataclasses.
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [P23P1 Schema]
+"""
+
+import logging
+from array import array
+from collections.abc import Mapping, MutableMapping
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from trust_graph import TrustEdge
+
+logger = logging.getLogger(__name__)
+
+# Pending (not yet CSR-indexed) edges tolerated before the index is rebuilt
+MIN_PENDING_REBUILD = 1024
+# Tombstoned slots tolerated before the arrays are compacted
+MIN_DEAD_COMPACT = 1024
+
+def _to_timestamp(value: datetime) -> float:
+    """Convert a datetime to POSIX seconds."""
+    return value.timestamp()
+
+def _from_timestamp(value: float) -> datetime:
+    """Convert POSIX seconds to an aware UTC datetime."""
+    return datetime.fromtimestamp(value, timezone.utc)
+
+class _DetachedMetadata(dict):
+    """
+    Empty metadata dict that joins the store's side table on first write.
+
+    The edge is looked up by its packed key at write time, since compaction
+    may have moved it to another slot; writes after the edge is removed are
+    not attached.
+    """
+
+    def __init__(self, store: "ColumnarEdgeStore", packed: int):
+        super().__init__()
+        self._store = store
+        self._packed = packed
+
+    def _attach(self) -> None:
+        if not self:
+            return
+        slot = self._store._slots.get(self._packed)
+        if slot is not None:
+            self._store._metadata[slot] = self
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        super().__setitem__(key, value)
+        self._attach()
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        super().update(*args, **kwargs)
+        self._attach()
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        value = super().setdefault(key, default)
+        self._attach()
+        return value
+
+class EdgeView:
+    """
+    Write-through view of a single edge in a ColumnarEdgeStore.
+
+    Views are transient: they index a storage slot and must not be held
+    across edge removals, which may compact the underlying arrays.
+    """
+
+    __slots__ = ('_store', '_slot')
+
+    def __init__(self, store: "ColumnarEdgeStore", slot: int):
+        self._store = store
+        self._slot = slot
+
+    @property
+    def from_agent(self) -> str:
+        return self._store._names[self._store._from[self._slot]]
+
+    @property
+    def to_agent(self) -> str:
+        return self._store._names[self._store._to[self._slot]]
+
+    @property
+    def trust_score(self) -> float:
+        return self._store._trust[self._slot]
+
+    @trust_score.setter
+    def trust_score(self, value: float) -> None:
+        self._store._trust[self._slot] = value
+
+    @property
+    def confidence(self) -> float:
+        return self._store._confidence[self._slot]
+
+    @confidence.setter
+    def confidence(self, value: float) -> None:
+        self._store._confidence[self._slot] = value
+
+    @property
+    def interaction_count(self) -> int:
+        return self._store._count[self._slot]
+
+    @interaction_count.setter
+    def interaction_count(self, value: int) -> None:
+        self._store._count[self._slot] = value
+
+    @property
+    def created_at(self) -> datetime:
+        return _from_timestamp(self._store._created[self._slot])
+
+    @created_at.setter
+    def created_at(self, value: datetime) -> None:
+        self._store._created[self._slot] = _to_timestamp(value)
+
+    @property
+    def updated_at(self) -> datetime:
+        return _from_timestamp(self._store._updated[self._slot])
+
+    @updated_at.setter
+    def updated_at(self, value: datetime) -> None:
+        self._store._updated[self._slot] = _to_timestamp(value)
+
+    @property
+    def ttl_hours(self) -> int:
+        return self._store._ttl[self._slot]
+
+    @ttl_hours.setter
+    def ttl_hours(self, value: int) -> None:
+        self._store._ttl[self._slot] = value
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        metadata = self._store._metadata.get(self._slot)
+        if metadata is None:
+            store = self._store
+            return _DetachedMetadata(store, (store._from[self._slot] << 32) | store._to[self._slot])
+        return metadata
+
+    @metadata.setter
+    def metadata(self, value: Dict[str, Any]) -> None:
+        if value:
+            self._store._metadata[self._slot] = value
+        else:
+            self._store._metadata.pop(self._slot, None)
+
+    # Trust semantics are shared with the dataclass implementation
+    is_expired = TrustEdge.is_expired
+    decay_score = TrustEdge.decay_score
+    update_score = TrustEdge.update_score
+
+    def to_edge(self) -> TrustEdge:
+        """Materialize this view as a standalone TrustEdge."""
+        return TrustEdge(
+            from_agent=self.from_agent,
+            to_agent=self.to_agent,
+            trust_score=self.trust_score,
+            confidence=self.confidence,
+            interaction_count=self.interaction_count,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+            ttl_hours=self.ttl_hours,
+            metadata=dict(self._store._metadata.get(self._slot, {}))
+        )
+
+    def __repr__(self) -> str:
+        return (f"EdgeView(from_agent={self.from_agent!r}, to_agent={self.to_agent!r}, "
+                f"trust_score={self.trust_score!r}, confidence={self.confidence!r})")
+
+class ColumnarAdjacency(Mapping):
+    """Read-only ``agent -> neighbors`` mapping backed by the store's CSR index."""
+
+    def __init__(self, store: "ColumnarEdgeStore"):
+        self._store = store
+
+    def __getitem__(self, agent_id: str) -> List[str]:
+        if agent_id not in self:
+            raise KeyError(agent_id)
+        return self._store.neighbors(agent_id)
+
+    def __contains__(self, agent_id: object) -> bool:
+        return agent_id in self._store._ids and agent_id not in self._store._removed
+
+    def __iter__(self) -> Iterator[str]:
+        removed = self._store._removed
+        return (agent_id for agent_id in self._store._ids if agent_id not in removed)
+
+    def __len__(self) -> int:
+        return len(self._store._ids) - len(self._store._removed)
+
+class ColumnarEdgeStore(MutableMapping):
+    """
+    Array-backed edge storage with integer agent IDs.
+
+    Phase: GBP23
+    Part: P23P1
+    Step: P23P1S4
+    Task: P23P1S4T1 - Core Implementation
+
+    Features:
+    - Agent ID interning to dense integers
+    - Parallel typed arrays for scores, counts and timestamps
+    - CSR adjacency with an append overlay for recent edges
+    - Sparse metadata side table
+    - Tombstoned deletes with periodic compaction
+    """
+
+    def __init__(self):
+        """Initialize an empty columnar edge store."""
+        # Agent interning
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._removed: Set[str] = set()  # Interned agents no longer in the graph
+
+        # Parallel edge columns, indexed by slot
+        self._from = array('i')
+        self._to = array('i')
+        self._trust = array('d')
+        self._confidence = array('d')
+        self._count = array('q')
+        self._created = array('d')
+        self._updated = array('d')
+        self._ttl = array('q')
+        self._alive = bytearray()
+
+        # Packed (from_id << 32 | to_id) -> slot
+        self._slots: Dict[int, int] = {}
+        self._metadata: Dict[int, Dict[str, Any]] = {}
+        self._dead = 0
+
+        # CSR adjacency: slots grouped by source, plus overlay for new edges
+        self._csr_offsets = array('q', [0])
+        self._csr_slots = array('q')
+        self._pending: Dict[int, List[int]] = {}
+        self._pending_count = 0
+
+        self.adjacency = ColumnarAdjacency(self)
+
+    def intern(self, agent_id: str) -> int:
+        """
+        Get the integer ID for an agent, assigning one if needed.
+
+        Args:
+            agent_id: Agent identifier
+
+        Returns:
+            int: Dense integer ID
+        """
+        agent_index = self._ids.get(agent_id)
+        if agent_index is None:
+            agent_index = len(self._names)
+            self._ids[agent_id] = agent_index
+            self._names.append(agent_id)
+        else:
+            self._removed.discard(agent_id)
+        return agent_index
+
+    def release(self, agent_id: str) -> None:
+        """
+        Hide a removed agent from the adjacency view.
+
+        Its integer ID stays assigned, since tombstoned slots may still refer
+        to it, and interning the agent again makes it visible.
+
+        Args:
+            agent_id: Agent identifier
+        """
+        if agent_id in self._ids:
+            self._removed.add(agent_id)
+
+    def _packed_key(self, key: Tuple[str, str]) -> Optional[int]:
+        from_index = self._ids.get(key[0])
+        to_index = self._ids.get(key[1])
+        if from_index is None or to_index is None:
+            return None
+        return (from_index << 32) | to_index
+
+    def _slot_of(self, key: Tuple[str, str]) -> Optional[int]:
+        packed = self._packed_key(key)
+        if packed is None:
+            return None
+        return self._slots.get(packed)
+
+    def __getitem__(self, key: Tuple[str, str]) -> EdgeView:
+        slot = self._slot_of(key)
+        if slot is None:
+            raise KeyError(key)
+        return EdgeView(self, slot)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, tuple) and len(key) == 2 and self._slot_of(key) is not None
+
+    def __setitem__(self, key: Tuple[str, str], edge: Any) -> None:
+        slot = self._slot_of(key)
+        if slot is None:
+            from_index = self.intern(key[0])
+            to_index = self.intern(key[1])
+            slot = len(self._alive)
+            self._from.append(from_index)
+            self._to.append(to_index)
+            self._trust.append(edge.trust_score)
+            self._confidence.append(edge.confidence)
+            self._count.append(edge.interaction_count)
+            self._created.append(_to_timestamp(edge.created_at))
+            self._updated.append(_to_timestamp(edge.updated_at))
+            self._ttl.append(edge.ttl_hours)
+            self._alive.append(1)
+            self._slots[(from_index << 32) | to_index] = slot
+            self._pending.setdefault(from_index, []).append(slot)
+            self._pending_count += 1
+        else:
+            self._trust[slot] = edge.trust_score
+            self._confidence[slot] = edge.confidence
+            self._count[slot] = edge.interaction_count
+            self._created[slot] = _to_timestamp(edge.created_at)
+            self._updated[slot] = _to_timestamp(edge.updated_at)
+            self._ttl[slot] = edge.ttl_hours
+
+        metadata = edge.metadata
+        if metadata:
+            self._metadata[slot] = metadata
+        else:
+            self._metadata.pop(slot, None)
+
+    def __delitem__(self, key: Tuple[str, str]) -> None:
+        packed = self._packed_key(key)
+        slot = self._slots.pop(packed, None) if packed is not None else None
+        if slot is None:
+            raise KeyError(key)
+        self._alive[slot] = 0
+        self._metadata.pop(slot, None)
+        self._dead += 1
+        if self._dead > MIN_DEAD_COMPACT and self._dead > len(self._slots):
+            self.compact()
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        names = self._names
+        for slot in self._live_slots():
+            yield (names[self._from[slot]], names[self._to[slot]])
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def _live_slots(self) -> List[int]:
+        alive = self._alive
+        return [slot for slot in range(len(alive)) if alive[slot]]
+
+    def keys(self) -> List[Tuple[str, str]]:
+        return list(self)
+
+    def values(self) -> List[EdgeView]:
+        return [EdgeView(self, slot) for slot in self._live_slots()]
+
+    def items(self) -> List[Tuple[Tuple[str, str], EdgeView]]:
+        names = self._names
+        return [
+            ((names[self._from[slot]], names[self._to[slot]]), EdgeView(self, slot))
+            for slot in self._live_slots()
+        ]
+
+    def keys_for_slots(self, slots: List[int]) -> List[Tuple[str, str]]:
+        """
+        Resolve storage slots to (from_agent, to_agent) keys.
+
+        Args:
+            slots: Storage slot indices
+
+        Returns:
+            List of edge keys in slot order
+        """
+        names = self._names
+        return [(names[self._from[slot]], names[self._to[slot]]) for slot in slots]
+
+    def clear(self) -> None:
+        """Remove every edge and interned agent."""
+        self.__init__()
+
+    def neighbors(self, agent_id: str) -> List[str]:
+        """
+        Get the targets of all edges leaving an agent.
+
+        Args:
+            agent_id: Source agent ID
+
+        Returns:
+            List of neighbor agent IDs
+        """
+        from_index = self._ids.get(agent_id)
+        if from_index is None:
+            return []
+        if self._pending_count > max(MIN_PENDING_REBUILD, len(self._slots) // 4):
+            self._rebuild_csr()
+
+        row: List[int] = []
+        if from_index + 1 < len(self._csr_offsets):
+            row.extend(self._csr_slots[self._csr_offsets[from_index]:self._csr_offsets[from_index + 1]])
+        row.extend(self._pending.get(from_index, ()))
+
+        alive = self._alive
+        names = self._names
+        return [names[self._to[slot]] for slot in row if alive[slot]]
+
+    def _rebuild_csr(self) -> None:
+        """Rebuild the CSR adjacency index from live slots (counting sort)."""
+        agent_count = len(self._names)
+        counts = [0] * (agent_count + 1)
+        live_slots = self._live_slots()
+        for slot in live_slots:
+            counts[self._from[slot] + 1] += 1
+        for i in range(agent_count):
+            counts[i + 1] += counts[i]
+
+        offsets = array('q', counts)
+        cursor = counts[:-1]
+        csr_slots = array('q', bytes(8 * len(live_slots)))
+        for slot in live_slots:
+            from_index = self._from[slot]
+            csr_slots[cursor[from_index]] = slot
+            cursor[from_index] += 1
+
+        self._csr_offsets = offsets
+        self._csr_slots = csr_slots
+        self._pending.clear()
+        self._pending_count = 0
+
+    def compact(self) -> int:
+        """
+        Drop tombstoned slots and renumber the remaining edges.
+
+        Returns:
+            int: Number of slots reclaimed
+        """
+        live_slots = self._live_slots()
+        reclaimed = len(self._alive) - len(live_slots)
+        if reclaimed == 0:
+            return 0
+
+        remap = {old: new for new, old in enumerate(live_slots)}
+        for name in ('_from', '_to', '_trust', '_confidence', '_count', '_created', '_updated', '_ttl'):
+            column = getattr(self, name)
+            setattr(self, name, array(column.typecode, (column[slot] for slot in live_slots)))
+        self._alive = bytearray(b'\x01' * len(live_slots))
+        self._slots = {packed: remap[slot] for packed, slot in self._slots.items()}
+        self._metadata = {remap[slot]: metadata for slot, metadata in self._metadata.items()}
+        self._dead = 0
+        self._rebuild_csr()
+
+        logger.debug(f"[P23P1S4T1] Compacted columnar edge store, reclaimed {reclaimed} slots")
+        return reclaimed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get storage statistics.
+
+        Returns:
+            Dict containing storage statistics
+        """
+        columns = (self._from, self._to, self._trust, self._confidence, self._count,
+                   self._created, self._updated, self._ttl, self._csr_offsets, self._csr_slots)
+        return {
+            'interned_agents': len(self._names),
+            'live_edges': len(self._slots),
+            'dead_slots': self._dead,
+            'pending_index_edges': self._pending_count,
+            'metadata_entries': len(self._metadata),
+            'column_bytes': sum(column.itemsize * len(column) for column in columns) + len(self._alive)
+        }
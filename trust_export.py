@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+GitBridge Trust Visualization Streaming Export
+Phase: GBP23
+Part: P23P4
+Step: P23P4S3
+Task: P23P4S3T1 - Streaming Visualization Export
+
+Streaming JSON, SVG and DOT export for TrustVisualizer. Elements are rendered
+one at a time and written in bounded chunks to a file, socket or generator
+consumer, so exporting a large trust graph never holds the whole document or a
+dict per node and edge in memory. Optional level-of-detail culling drops edges
+below a trust threshold and collapses high-trust clusters into single
+aggregate nodes with merged inter-cluster edges.
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [P23P4 Schema]
+"""
+
+import json
+import logging
+import math
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+from xml.sax.saxutils import escape
+
+from trust_network_metrics import DisjointSet
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("json", "svg", "dot")
+CHUNK_SIZE = 1 << 16          # Characters buffered before a chunk is emitted
+VIEWPORT_MARGIN = 50.0        # SVG padding around the outermost nodes
+MAX_CLUSTER_NODE_SIZE = 60.0  # Size cap for aggregate cluster nodes
+
+@dataclass
+class ExportSummary:
+    """Counts for one streaming export."""
+    format: str
+    nodes_written: int = 0
+    edges_written: int = 0
+    edges_culled: int = 0
+    clusters_aggregated: int = 0
+    characters_written: int = 0
+
+@dataclass
+class _ExportNode:
+    """Node as written to the export, either an agent or an aggregate cluster."""
+    id: str
+    x: float
+    y: float
+    size: float
+    color: str
+    label: str
+    trust_score: float
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+@dataclass
+class _ExportEdge:
+    """Edge as written to the export, possibly merged from several trust edges."""
+    source: str
+    target: str
+    width: float
+    color: str
+    trust_score: float
+    confidence: float
+    label: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+def _default_edge_style(trust_score: float) -> Tuple[str, float]:
+    return "#95a5a6", 1.0 + trust_score * 4.0
+
+class StreamingExporter:
+    """
+    Chunked visualization writer with level-of-detail culling.
+
+    Phase: GBP23
+    Part: P23P4
+    Step: P23P4S3
+    Task: P23P4S3T1 - Core Implementation
+
+    Features:
+    - JSON, SVG and DOT rendered element by element
+    - Bounded write buffer for files, sockets and streaming responses
+    - Trust-threshold edge culling
+    - High-trust cluster aggregation with merged edges
+    """
+
+    def __init__(
+        self,
+        nodes: Mapping[str, Any],
+        edges: Sequence[Any],
+        paths: Sequence[Any] = (),
+        layout_type: str = "force_directed",
+        min_trust: Optional[float] = None,
+        cluster_threshold: Optional[float] = None,
+        edge_style: Callable[[float], Tuple[str, float]] = _default_edge_style
+    ):
+        """
+        Initialize streaming exporter.
+
+        Args:
+            nodes: Visual nodes by agent ID
+            edges: Visual edges
+            paths: Highlighted visual paths
+            layout_type: Layout name recorded in the export metadata
+            min_trust: Drop edges with a lower trust score
+            cluster_threshold: Collapse clusters joined by edges with at least this trust
+            edge_style: Maps a trust score to (color, width) for merged edges
+        """
+        self.nodes = nodes
+        self.edges = edges
+        self.paths = paths
+        self.layout_type = layout_type
+        self.min_trust = min_trust
+        self.cluster_threshold = cluster_threshold
+        self.edge_style = edge_style
+
+        # Level-of-detail state, filled in by _prepare
+        self._representative: Dict[str, str] = {}
+        self._cluster_nodes: List[_ExportNode] = []
+
+    def iter_chunks(self, format: str = "json") -> Iterator[str]:
+        """
+        Render the visualization as a sequence of text chunks.
+
+        Args:
+            format: Export format ("json", "svg", "dot")
+
+        Returns:
+            Iterator[str]: Chunks of at most about CHUNK_SIZE characters
+
+        Raises:
+            ValueError: If the format is not supported
+        """
+        summary = ExportSummary(format=format)
+        return self._buffered(self._renderer(format)(summary), summary)
+
+    def write(self, output: Union[str, Path, Any], format: str = "json") -> ExportSummary:
+        """
+        Stream the visualization to a file path, text stream or socket.
+
+        Args:
+            output: File path, object with write(), or socket with sendall()
+            format: Export format ("json", "svg", "dot")
+
+        Returns:
+            ExportSummary: Counts of written and culled elements
+        """
+        summary = ExportSummary(format=format)
+        chunks = self._buffered(self._renderer(format)(summary), summary)
+
+        if isinstance(output, (str, Path)):
+            with open(output, 'w', encoding='utf-8') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+        elif hasattr(output, 'sendall'):
+            for chunk in chunks:
+                output.sendall(chunk.encode('utf-8'))
+        else:
+            for chunk in chunks:
+                output.write(chunk)
+
+        logger.info(f"[P23P4S3T1] Streamed {format} export: {summary.nodes_written} nodes, "
+                    f"{summary.edges_written} edges, {summary.edges_culled} culled, "
+                    f"{summary.clusters_aggregated} clusters aggregated")
+        return summary
+
+    def _renderer(self, format: str) -> Callable[[ExportSummary], Iterator[str]]:
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {format}")
+        return getattr(self, f"_render_{format}")
+
+    @staticmethod
+    def _buffered(pieces: Iterable[str], summary: ExportSummary) -> Iterator[str]:
+        """Join small rendered pieces into chunks of roughly CHUNK_SIZE characters."""
+        buffer: List[str] = []
+        buffered = 0
+        for piece in pieces:
+            buffer.append(piece)
+            buffered += len(piece)
+            if buffered >= CHUNK_SIZE:
+                summary.characters_written += buffered
+                yield "".join(buffer)
+                buffer.clear()
+                buffered = 0
+        if buffer:
+            summary.characters_written += buffered
+            yield "".join(buffer)
+
+    def _prepare(self, summary: ExportSummary) -> None:
+        """Group agents into aggregate clusters when cluster_threshold is set."""
+        self._representative = {}
+        self._cluster_nodes = []
+        if self.cluster_threshold is None:
+            return
+
+        agent_ids = list(self.nodes)
+        index = {agent_id: i for i, agent_id in enumerate(agent_ids)}
+        clusters = DisjointSet(len(agent_ids))
+        for edge in self.edges:
+            if edge.trust_score >= self.cluster_threshold and edge.source in index and edge.target in index:
+                clusters.union(index[edge.source], index[edge.target])
+
+        members: Dict[int, List[int]] = {}
+        for i in range(len(agent_ids)):
+            root = clusters.find(i)
+            if clusters.size[root] > 1:
+                members.setdefault(root, []).append(i)
+
+        # Clusters are numbered in agent order so IDs are stable between exports
+        for cluster_number, member_indices in enumerate(members.values()):
+            cluster_id = f"cluster_{cluster_number}"
+            member_nodes = [self.nodes[agent_ids[i]] for i in member_indices]
+            count = len(member_nodes)
+            hue = (cluster_number * 137.5) % 360
+            self._cluster_nodes.append(_ExportNode(
+                id=cluster_id,
+                x=sum(node.x for node in member_nodes) / count,
+                y=sum(node.y for node in member_nodes) / count,
+                size=min(MAX_CLUSTER_NODE_SIZE, max(node.size for node in member_nodes) * math.sqrt(count)),
+                color=f"hsl({hue}, 70%, 50%)",
+                label=f"{count} agents",
+                trust_score=sum(node.trust_score for node in member_nodes) / count,
+                metadata={"aggregated": True, "members": [node.id for node in member_nodes]}
+            ))
+            for node in member_nodes:
+                self._representative[node.id] = cluster_id
+        summary.clusters_aggregated = len(self._cluster_nodes)
+
+    def _iter_nodes(self) -> Iterator[Any]:
+        """Agents outside aggregate clusters, then the aggregate cluster nodes."""
+        for node_id, node in self.nodes.items():
+            if node_id not in self._representative:
+                yield node
+        yield from self._cluster_nodes
+
+    def _iter_edges(self, summary: ExportSummary) -> Iterator[Any]:
+        """
+        Edges that survive culling. Edges between unclustered agents stream
+        straight through; edges touching a cluster are merged per endpoint pair.
+        """
+        merged: Dict[Tuple[str, str], List[float]] = {}
+        for edge in self.edges:
+            if self.min_trust is not None and edge.trust_score < self.min_trust:
+                summary.edges_culled += 1
+                continue
+            source = self._representative.get(edge.source, edge.source)
+            target = self._representative.get(edge.target, edge.target)
+            if source == edge.source and target == edge.target:
+                yield edge
+                continue
+            if source == target:
+                summary.edges_culled += 1  # Internal to a cluster
+                continue
+            totals = merged.get((source, target))
+            if totals is None:
+                merged[(source, target)] = [1, edge.trust_score, edge.confidence]
+            else:
+                totals[0] += 1
+                totals[1] += edge.trust_score
+                totals[2] += edge.confidence
+
+        for (source, target), (count, trust_sum, confidence_sum) in merged.items():
+            trust_score = trust_sum / count
+            color, width = self.edge_style(trust_score)
+            yield _ExportEdge(
+                source=source,
+                target=target,
+                width=width,
+                color=color,
+                trust_score=trust_score,
+                confidence=confidence_sum / count,
+                label=f"{trust_score:.2f}",
+                metadata={"aggregated": True, "edges": int(count)}
+            )
+
+    def _render_json(self, summary: ExportSummary) -> Iterator[str]:
+        self._prepare(summary)
+        yield '{\n  "nodes": ['
+        separator = "\n    "
+        for node in self._iter_nodes():
+            yield separator + json.dumps({
+                "id": node.id,
+                "x": node.x,
+                "y": node.y,
+                "size": node.size,
+                "color": node.color,
+                "label": node.label,
+                "trust_score": node.trust_score,
+                "metadata": node.metadata
+            })
+            separator = ",\n    "
+            summary.nodes_written += 1
+
+        yield '\n  ],\n  "edges": ['
+        separator = "\n    "
+        for edge in self._iter_edges(summary):
+            yield separator + json.dumps({
+                "source": edge.source,
+                "target": edge.target,
+                "width": edge.width,
+                "color": edge.color,
+                "trust_score": edge.trust_score,
+                "confidence": edge.confidence,
+                "label": edge.label,
+                "metadata": edge.metadata
+            })
+            separator = ",\n    "
+            summary.edges_written += 1
+
+        yield '\n  ],\n  "paths": ['
+        separator = "\n    "
+        for path in self.paths:
+            yield separator + json.dumps({
+                "path": path.path,
+                "trust_score": path.trust_score,
+                "confidence": path.confidence,
+                "color": path.color,
+                "width": path.width,
+                "highlight": path.highlight
+            })
+            separator = ",\n    "
+
+        yield '\n  ],\n  "metadata": ' + json.dumps({
+            "total_nodes": summary.nodes_written,
+            "total_edges": summary.edges_written,
+            "total_paths": len(self.paths),
+            "culled_edges": summary.edges_culled,
+            "aggregated_clusters": summary.clusters_aggregated,
+            "layout_type": self.layout_type,
+            "exported_at": datetime.now(timezone.utc).isoformat()
+        }) + '\n}\n'
+
+    def _render_svg(self, summary: ExportSummary) -> Iterator[str]:
+        self._prepare(summary)
+
+        # Viewport from one pass over node positions
+        min_x = min_y = math.inf
+        max_x = max_y = -math.inf
+        positions: Dict[str, Tuple[float, float]] = {}
+        for node in self._iter_nodes():
+            positions[node.id] = (node.x, node.y)
+            min_x, max_x = min(min_x, node.x), max(max_x, node.x)
+            min_y, max_y = min(min_y, node.y), max(max_y, node.y)
+        if not positions:
+            min_x = min_y = max_x = max_y = 0.0
+        min_x -= VIEWPORT_MARGIN
+        min_y -= VIEWPORT_MARGIN
+        width = max_x + VIEWPORT_MARGIN - min_x
+        height = max_y + VIEWPORT_MARGIN - min_y
+
+        yield f'''<?xml version="1.0" encoding="UTF-8"?>
+<svg width="{width}" height="{height}" viewBox="{min_x} {min_y} {width} {height}" xmlns="http://www.w3.org/2000/svg">
+  <defs>
+    <marker id="arrowhead" markerWidth="10" markerHeight="7"
+            refX="9" refY="3.5" orient="auto">
+      <polygon points="0 0, 10 3.5, 0 7" fill="#95a5a6"/>
+    </marker>
+  </defs>
+
+  <!-- Edges -->
+'''
+        for edge in self._iter_edges(summary):
+            source = positions.get(edge.source)
+            target = positions.get(edge.target)
+            if source is None or target is None:
+                continue
+            yield f'''  <line x1="{source[0]}" y1="{source[1]}"
+        x2="{target[0]}" y2="{target[1]}"
+        stroke="{edge.color}" stroke-width="{edge.width}"
+        marker-end="url(#arrowhead)"/>
+'''
+            summary.edges_written += 1
+
+        yield "  <!-- Nodes -->\n"
+        for node in self._iter_nodes():
+            yield f'''  <circle cx="{node.x}" cy="{node.y}" r="{node.size}"
+        fill="{node.color}" stroke="#2c3e50" stroke-width="2"/>
+  <text x="{node.x}" y="{node.y + node.size + 15}"
+        text-anchor="middle" font-family="Arial" font-size="12" fill="#2c3e50">
+    {escape(node.label)}
+  </text>
+'''
+            summary.nodes_written += 1
+
+        yield "</svg>"
+
+    def _render_dot(self, summary: ExportSummary) -> Iterator[str]:
+        self._prepare(summary)
+        yield ("digraph trust_graph {\n"
+               "  rankdir=LR;\n"
+               "  node [shape=circle, style=filled];\n"
+               "  edge [arrowsize=0.5];\n\n")
+
+        for node in self._iter_nodes():
+            yield f'  {_dot_id(node.id)} [label={_dot_id(node.label)}, fillcolor="{node.color}", width={node.size/10:.1f}];\n'
+            summary.nodes_written += 1
+
+        for edge in self._iter_edges(summary):
+            yield f'  {_dot_id(edge.source)} -> {_dot_id(edge.target)} [label="{edge.label}", color="{edge.color}", penwidth={edge.width}];\n'
+            summary.edges_written += 1
+
+        yield "}\n"
+
+def _dot_id(value: str) -> str:
+    """Quote a string as a DOT identifier."""
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
@@ -16,16 +16,23 @@ Schema: [P23P1 Schema]
 
 import json
 import logging
-from typing import Dict, List, Any, Optional, Set, Tuple
+from typing import Dict, List, Any, Optional, Set, Tuple, Iterable, Callable
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 import math
 import threading
 import os
+from collections import deque
+
+from trust_wal import TrustWAL
 
 logger = logging.getLogger(__name__)
 
+PERSISTENCE_MODES = ("snapshot", "wal")
+STORAGE_BACKENDS = ("dict", "columnar")
+CHANGE_LOG_SIZE = 65536  # Edge changes kept for incremental consumers
+
 @dataclass
 class TrustEdge:
     """Represents a trust relationship between two agents."""
@@ -39,19 +46,21 @@ class TrustEdge:
     ttl_hours: int = 8760  # 1 year default
     metadata: Dict[str, Any] = field(default_factory=dict)
     
-    def is_expired(self) -> bool:
+    def is_expired(self, now: Optional[datetime] = None) -> bool:
         """Check if this trust edge has expired based on TTL."""
-        age_hours = (datetime.now(timezone.utc) - self.updated_at).total_seconds() / 3600
+        now = now or datetime.now(timezone.utc)
+        age_hours = (now - self.updated_at).total_seconds() / 3600
         return age_hours > self.ttl_hours
         
-    def decay_score(self, decay_rate: float = 0.1) -> None:
+    def decay_score(self, decay_rate: float = 0.1, now: Optional[datetime] = None) -> None:
         """Apply time-based decay to trust score."""
-        age_hours = (datetime.now(timezone.utc) - self.updated_at).total_seconds() / 3600
+        now = now or datetime.now(timezone.utc)
+        age_hours = (now - self.updated_at).total_seconds() / 3600
         if age_hours > 0:
             decay_factor = math.exp(-decay_rate * age_hours / 24)  # Daily decay
             self.trust_score *= decay_factor
             self.confidence *= decay_factor
-            self.updated_at = datetime.now(timezone.utc)
+            self.updated_at = now
             
     def update_score(self, new_score: float, confidence: float = 1.0, metadata: Optional[Dict[str, Any]] = None) -> None:
         """Update trust score with new interaction data."""
@@ -95,6 +104,58 @@ class TrustNode:
             return 0.0
         return self.failed_interactions / self.total_interactions
 
+def _as_trust_edge(edge: Any) -> TrustEdge:
+    """Materialize columnar edge views as TrustEdge dataclasses."""
+    return edge if isinstance(edge, TrustEdge) else edge.to_edge()
+
+def _to_record(obj: Any) -> Dict[str, Any]:
+    """Convert a node or edge dataclass to a JSON-ready dict."""
+    record = asdict(obj if isinstance(obj, TrustNode) else _as_trust_edge(obj))
+    for key, value in record.items():
+        if isinstance(value, datetime):
+            record[key] = value.isoformat()
+    return record
+
+def _node_from_dict(node_data: Dict[str, Any]) -> TrustNode:
+    """Rebuild a TrustNode from its serialized form."""
+    return TrustNode(
+        agent_id=node_data['agent_id'],
+        created_at=datetime.fromisoformat(node_data['created_at']),
+        updated_at=datetime.fromisoformat(node_data['updated_at']),
+        total_interactions=node_data['total_interactions'],
+        successful_interactions=node_data['successful_interactions'],
+        failed_interactions=node_data['failed_interactions'],
+        metadata=node_data.get('metadata', {})
+    )
+
+@dataclass
+class TrustChangeEvent:
+    """Change notification delivered to TrustGraph subscribers."""
+    kind: str  # "agent_added", "agent_removed", "edge_upserted", "edge_removed" or "reset"
+    version: int
+    key: Optional[Tuple[str, Optional[str]]] = None  # Edge key, or (agent_id, None) for agent events
+    
+    @property
+    def agents(self) -> Tuple[str, ...]:
+        """Agents touched by the change; empty for a reset."""
+        if self.key is None:
+            return ()
+        return tuple(agent_id for agent_id in self.key if agent_id is not None)
+
+def _edge_from_dict(edge_data: Dict[str, Any]) -> TrustEdge:
+    """Rebuild a TrustEdge from its serialized form."""
+    return TrustEdge(
+        from_agent=edge_data['from_agent'],
+        to_agent=edge_data['to_agent'],
+        trust_score=edge_data['trust_score'],
+        confidence=edge_data['confidence'],
+        interaction_count=edge_data['interaction_count'],
+        created_at=datetime.fromisoformat(edge_data['created_at']),
+        updated_at=datetime.fromisoformat(edge_data['updated_at']),
+        ttl_hours=edge_data.get('ttl_hours', 8760),
+        metadata=edge_data.get('metadata', {})
+    )
+
 class TrustGraph:
     """
     Core trust graph engine for tracking agent trust relationships.
@@ -111,9 +172,20 @@ class TrustGraph:
     - Thread-safe operations
     - Circular reference detection
     - Export/import capabilities
+    - Optional write-ahead log persistence
+    - Optional compact columnar edge storage
     """
     
-    def __init__(self, storage_path: str = "trust_data", auto_save: bool = True, high_performance: bool = False):
+    def __init__(
+        self,
+        storage_path: str = "trust_data",
+        auto_save: bool = True,
+        high_performance: bool = False,
+        persistence_mode: str = "snapshot",
+        wal_compact_threshold: int = 10000,
+        wal_fsync: bool = False,
+        storage_backend: str = "dict"
+    ):
         """
         Initialize trust graph.
         
@@ -121,14 +193,44 @@ class TrustGraph:
             storage_path: Directory for storing trust data
             auto_save: Whether to automatically save changes
             high_performance: Enable high-performance mode for bulk operations
+            persistence_mode: "snapshot" rewrites the full graph on every change,
+                "wal" appends delta records and compacts periodically
+            wal_compact_threshold: WAL records before compacting into a snapshot
+            wal_fsync: Whether to fsync the WAL after every append
+            storage_backend: "dict" keeps one TrustEdge object per edge,
+                "columnar" stores edges in typed arrays with interned agent IDs
         """
+        if persistence_mode not in PERSISTENCE_MODES:
+            raise ValueError(f"Unsupported persistence mode: {persistence_mode}")
+        if storage_backend not in STORAGE_BACKENDS:
+            raise ValueError(f"Unsupported storage backend: {storage_backend}")
+            
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
         
+        # Persistence
+        self.persistence_mode = persistence_mode
+        self.wal_compact_threshold = wal_compact_threshold
+        self._wal: Optional[TrustWAL] = None
+        if persistence_mode == "wal":
+            self._wal = TrustWAL(self.storage_path / "trust_graph.wal", fsync=wal_fsync)
+        
         # Graph data structures
         self.nodes: Dict[str, TrustNode] = {}
-        self.edges: Dict[Tuple[str, str], TrustEdge] = {}
-        self.adjacency_list: Dict[str, Set[str]] = {}
+        self.storage_backend = storage_backend
+        self._edge_store = None
+        self._decay_engine = None
+        if storage_backend == "columnar":
+            from trust_edge_store import ColumnarEdgeStore
+            from trust_decay import VectorizedDecayEngine
+            self._edge_store = ColumnarEdgeStore()
+            self._decay_engine = VectorizedDecayEngine(self._edge_store)
+            # Edge views and CSR adjacency stand in for the dict structures
+            self.edges = self._edge_store
+            self.adjacency_list = self._edge_store.adjacency
+        else:
+            self.edges: Dict[Tuple[str, str], TrustEdge] = {}
+            self.adjacency_list: Dict[str, Set[str]] = {}
         
         # Configuration
         self.auto_save = auto_save
@@ -140,6 +242,12 @@ class TrustGraph:
         # Thread safety
         self._lock = threading.RLock()
         
+        # Change tracking for incremental consumers (e.g. TransitiveTrustMatrix)
+        self.version = 0
+        self._change_log: deque = deque()
+        self._change_floor = 0
+        self._listeners: List[Callable[[TrustChangeEvent], None]] = []
+        
         # Load existing data
         self._load_data()
         
@@ -163,10 +271,11 @@ class TrustGraph:
                 
             node = TrustNode(agent_id=agent_id, metadata=metadata or {})
             self.nodes[agent_id] = node
-            self.adjacency_list[agent_id] = set()
+            self._register_agent(agent_id)
+            self._record_change([(agent_id, None)])
+            self._publish("agent_added", [(agent_id, None)])
             
-            if self.auto_save:
-                self._save_data()
+            self._persist(node_ids=[agent_id])
                 
             logger.info(f"[P23P1S1T1] Added agent {agent_id} to trust graph")
             return True
@@ -186,28 +295,12 @@ class TrustGraph:
                 logger.warning(f"[P23P1S1T1] Agent {agent_id} not found in trust graph")
                 return False
                 
-            # Remove all edges involving this agent
-            edges_to_remove = []
-            for (from_agent, to_agent) in self.edges.keys():
-                if from_agent == agent_id or to_agent == agent_id:
-                    edges_to_remove.append((from_agent, to_agent))
-                    
-            for edge_key in edges_to_remove:
-                del self.edges[edge_key]
-                
-            # Remove from adjacency list
-            if agent_id in self.adjacency_list:
-                del self.adjacency_list[agent_id]
-                
-            # Remove from other agents' adjacency lists
-            for adj_list in self.adjacency_list.values():
-                adj_list.discard(agent_id)
-                
-            # Remove node
-            del self.nodes[agent_id]
+            removed_edges = self._remove_agent_state(agent_id)
+            self._record_change()
+            self._publish("edge_removed", removed_edges)
+            self._publish("agent_removed", [(agent_id, None)])
             
-            if self.auto_save:
-                self._save_data()
+            self._persist(records=[{'op': 'remove_agent', 'agent_id': agent_id}])
                 
             logger.info(f"[P23P1S1T1] Removed agent {agent_id} from trust graph")
             return True
@@ -272,7 +365,7 @@ class TrustGraph:
                 )
                 edge.updated_at = current_time  # Use cached time
                 self.edges[edge_key] = edge
-                self.adjacency_list[from_agent].add(to_agent)
+                self._link(from_agent, to_agent)
                 
             # Update node statistics
             self.nodes[to_agent].total_interactions += 1
@@ -282,9 +375,10 @@ class TrustGraph:
                 elif trust_score < 0:
                     self.nodes[to_agent].failed_interactions += 1
             self.nodes[to_agent].updated_at = current_time
+            self._record_change([edge_key])
+            self._publish("edge_upserted", [edge_key])
             
-            if self.auto_save:
-                self._save_data()
+            self._persist(node_ids=[to_agent], edge_keys=[edge_key])
                 
             if not self.high_performance:
                 logger.debug(f"[P23P1S1T1] Updated trust: {from_agent} -> {to_agent} = {trust_score:.3f}")
@@ -398,14 +492,17 @@ class TrustGraph:
             int: Number of edges that were decayed
         """
         with self._lock:
-            decayed_count = 0
-            for edge in self.edges.values():
-                if not edge.is_expired():
-                    edge.decay_score(self.decay_rate)
-                    decayed_count += 1
+            current_time = datetime.now(timezone.utc)
+            decayed_count = self._decay_edges(self.decay_rate, current_time)
                     
-            if self.auto_save and decayed_count > 0:
-                self._save_data()
+            if decayed_count > 0:
+                self._record_change()
+                self._publish("reset")
+                self._persist(records=[{
+                    'op': 'decay',
+                    'decay_rate': self.decay_rate,
+                    'at': current_time.isoformat()
+                }])
                 
             logger.info(f"[P23P1S1T1] Applied decay to {decayed_count} trust edges")
             return decayed_count
@@ -418,18 +515,23 @@ class TrustGraph:
             int: Number of edges removed
         """
         with self._lock:
-            expired_edges = []
-            for edge_key, edge in self.edges.items():
-                if edge.is_expired():
-                    expired_edges.append(edge_key)
+            if self._decay_engine is not None:
+                expired_edges = self._decay_engine.expired_keys()
+            else:
+                expired_edges = []
+                for edge_key, edge in self.edges.items():
+                    if edge.is_expired():
+                        expired_edges.append(edge_key)
                     
-            for edge_key in expired_edges:
-                from_agent, to_agent = edge_key
-                del self.edges[edge_key]
-                self.adjacency_list[from_agent].discard(to_agent)
+            self._remove_edges(expired_edges)
                 
-            if self.auto_save and expired_edges:
-                self._save_data()
+            if expired_edges:
+                self._record_change(expired_edges)
+                self._publish("edge_removed", expired_edges)
+                self._persist(records=[{
+                    'op': 'remove_edges',
+                    'edges': [list(edge_key) for edge_key in expired_edges]
+                }])
                 
             logger.info(f"[P23P1S1T1] Removed {len(expired_edges)} expired trust edges")
             return len(expired_edges)
@@ -567,7 +669,7 @@ class TrustGraph:
             if format == "json":
                 data = {
                     'nodes': [asdict(node) for node in self.nodes.values()],
-                    'edges': [asdict(edge) for edge in self.edges.values()],
+                    'edges': [asdict(_as_trust_edge(edge)) for edge in self.edges.values()],
                     'metadata': {
                         'exported_at': datetime.now(timezone.utc).isoformat(),
                         'version': '1.0.0'
@@ -591,72 +693,315 @@ class TrustGraph:
             else:
                 raise ValueError(f"Unsupported export format: {format}")
                 
-    def _save_data(self) -> None:
+    def compact(self) -> bool:
+        """
+        Fold the write-ahead log into a fresh snapshot.
+        
+        Returns:
+            bool: True if the snapshot was written successfully
+        """
+        with self._lock:
+            if not self._save_data():
+                return False
+            if self._wal is not None:
+                self._wal.truncate()
+                logger.info(f"[P23P1S3T1] Compacted trust graph WAL into snapshot at seq {self._wal.seq}")
+            return True
+            
+    def close(self) -> None:
+        """Flush and release persistence resources."""
+        with self._lock:
+            if self._wal is not None:
+                self._wal.close()
+                
+    def get_changes_since(self, version: int) -> Tuple[int, Optional[List[Tuple[str, Optional[str]]]]]:
+        """
+        Get the edges and agents changed after a given graph version.
+        
+        Args:
+            version: Graph version the caller last synchronized with
+            
+        Returns:
+            Tuple of (current version, changed keys). Keys are (from_agent, to_agent)
+            edge keys, or (agent_id, None) for added agents. Changed keys are None
+            when the log no longer covers the requested range (bulk changes such as
+            decay, agent removal or reload) and the caller must re-read the graph.
+        """
+        with self._lock:
+            if version < self._change_floor:
+                return self.version, None
+            changes = []
+            for change_version, key in reversed(self._change_log):
+                if change_version <= version:
+                    break
+                changes.append(key)
+            changes.reverse()
+            return self.version, changes
+            
+    def subscribe(self, listener: Callable[[TrustChangeEvent], None]) -> None:
+        """
+        Register a listener for change notifications.
+        
+        Listeners run synchronously while the graph lock is held, so they must
+        be quick and must not block on locks held by threads that read the graph.
+        
+        Args:
+            listener: Callable receiving a TrustChangeEvent per change
+        """
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+                
+    def unsubscribe(self, listener: Callable[[TrustChangeEvent], None]) -> bool:
+        """
+        Remove a change listener.
+        
+        Args:
+            listener: Previously subscribed listener
+            
+        Returns:
+            bool: True if the listener was subscribed
+        """
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+                return True
+            return False
+            
+    def _publish(self, kind: str, keys: Optional[Iterable[Tuple[str, Optional[str]]]] = None) -> None:
+        """
+        Notify listeners of a change at the current version.
+        
+        Args:
+            kind: Event kind
+            keys: Touched edge keys or (agent_id, None) entries; None for a reset
+        """
+        if not self._listeners:
+            return
+        events = [TrustChangeEvent(kind, self.version)] if keys is None else [
+            TrustChangeEvent(kind, self.version, key) for key in keys
+        ]
+        for listener in list(self._listeners):
+            for event in events:
+                try:
+                    listener(event)
+                except Exception as e:
+                    logger.error(f"[P23P1S1T1] Trust change listener failed on {event.kind}: {e}")
+                    
+    def _record_change(self, keys: Optional[Iterable[Tuple[str, Optional[str]]]] = None) -> None:
+        """
+        Bump the graph version and log the touched keys.
+        
+        Args:
+            keys: Changed edge keys or (agent_id, None) entries; None marks a
+                bulk change that incremental consumers cannot replay
+        """
+        self.version += 1
+        if keys is None:
+            self._change_log.clear()
+            self._change_floor = self.version
+            return
+        for key in keys:
+            if len(self._change_log) >= CHANGE_LOG_SIZE:
+                self._change_floor = self._change_log.popleft()[0]
+            self._change_log.append((self.version, key))
+            
+    def _persist(
+        self,
+        node_ids: Iterable[str] = (),
+        edge_keys: Iterable[Tuple[str, str]] = (),
+        records: Iterable[Dict[str, Any]] = ()
+    ) -> None:
+        """
+        Persist a change according to the configured persistence mode.
+        
+        Args:
+            node_ids: Nodes whose current state should be logged
+            edge_keys: Edges whose current state should be logged
+            records: Additional delta records (removals, decay)
+        """
+        if not self.auto_save:
+            return
+        if self._wal is None:
+            self._save_data()
+            return
+            
+        deltas = [{'op': 'node', **_to_record(self.nodes[agent_id])} for agent_id in node_ids if agent_id in self.nodes]
+        deltas.extend({'op': 'edge', **_to_record(self.edges[key])} for key in edge_keys if key in self.edges)
+        deltas.extend(records)
+        
+        try:
+            self._wal.append(deltas)
+        except Exception as e:
+            logger.error(f"[P23P1S3T1] Failed to append to trust graph WAL: {e}")
+            return
+            
+        if self._wal.record_count >= self.wal_compact_threshold:
+            self.compact()
+            
+    def _snapshot_data(self) -> Dict[str, Any]:
+        """Build the full snapshot representation of the graph."""
+        metadata = {
+            'saved_at': datetime.now(timezone.utc).isoformat(),
+            'version': '1.0.0'
+        }
+        if self._wal is not None:
+            metadata['wal_seq'] = self._wal.seq
+        return {
+            'nodes': [asdict(node) for node in self.nodes.values()],
+            'edges': [asdict(_as_trust_edge(edge)) for edge in self.edges.values()],
+            'metadata': metadata
+        }
+        
+    def _save_data(self) -> bool:
         """Save trust graph data to disk."""
         try:
-            data = {
-                'nodes': [asdict(node) for node in self.nodes.values()],
-                'edges': [asdict(edge) for edge in self.edges.values()],
-                'metadata': {
-                    'saved_at': datetime.now(timezone.utc).isoformat(),
-                    'version': '1.0.0'
-                }
-            }
+            data_file = self.storage_path / "trust_graph.json"
+            tmp_file = data_file.with_suffix(".json.tmp")
             
-            with open(self.storage_path / "trust_graph.json", 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            with open(tmp_file, 'w') as f:
+                json.dump(self._snapshot_data(), f, indent=2, default=str)
+            os.replace(tmp_file, data_file)
                 
             logger.debug(f"[P23P1S1T1] Saved trust graph data to {self.storage_path}")
+            return True
             
         except Exception as e:
             logger.error(f"[P23P1S1T1] Failed to save trust graph data: {e}")
+            return False
             
     def _load_data(self) -> None:
         """Load trust graph data from disk."""
+        snapshot_seq = 0
         try:
             data_file = self.storage_path / "trust_graph.json"
             if not data_file.exists():
                 logger.info(f"[P23P1S1T1] No existing trust graph data found at {data_file}")
-                return
+            else:
+                with open(data_file, 'r') as f:
+                    data = json.load(f)
+                    
+                self._load_snapshot(data)
+                snapshot_seq = data.get('metadata', {}).get('wal_seq', 0)
                 
-            with open(data_file, 'r') as f:
-                data = json.load(f)
+                logger.info(f"[P23P1S1T1] Loaded trust graph data: {len(self.nodes)} nodes, {len(self.edges)} edges")
+            
+        except Exception as e:
+            logger.error(f"[P23P1S1T1] Failed to load trust graph data: {e}")
+            
+        if self._wal is not None:
+            self._replay_wal(snapshot_seq)
+            
+    def _load_snapshot(self, data: Dict[str, Any]) -> None:
+        """Populate nodes, edges and adjacency from snapshot data."""
+        for node_data in data.get('nodes', []):
+            node = _node_from_dict(node_data)
+            self.nodes[node.agent_id] = node
+            self._register_agent(node.agent_id)
+            
+        for edge_data in data.get('edges', []):
+            edge = _edge_from_dict(edge_data)
+            self.edges[(edge.from_agent, edge.to_agent)] = edge
+            self._link(edge.from_agent, edge.to_agent)
+            
+    def _replay_wal(self, after_seq: int) -> None:
+        """Apply WAL records newer than the loaded snapshot."""
+        replayed = 0
+        try:
+            for record in self._wal.replay(after_seq):
+                try:
+                    self._apply_wal_record(record)
+                    replayed += 1
+                except Exception as e:
+                    logger.error(f"[P23P1S3T1] Skipping invalid WAL record {record.get('seq')}: {e}")
+        except Exception as e:
+            logger.error(f"[P23P1S3T1] Failed to replay trust graph WAL: {e}")
+            
+        if replayed:
+            logger.info(f"[P23P1S3T1] Replayed {replayed} WAL records up to seq {self._wal.seq}")
+            
+    def _apply_wal_record(self, record: Dict[str, Any]) -> None:
+        """Apply a single WAL delta record to in-memory state."""
+        op = record.pop('op')
+        record.pop('seq', None)
+        
+        if op == 'node':
+            node = _node_from_dict(record)
+            self.nodes[node.agent_id] = node
+            self._register_agent(node.agent_id)
+        elif op == 'edge':
+            edge = _edge_from_dict(record)
+            self.edges[(edge.from_agent, edge.to_agent)] = edge
+            self._link(edge.from_agent, edge.to_agent)
+        elif op == 'remove_agent':
+            if record['agent_id'] in self.nodes:
+                self._remove_agent_state(record['agent_id'])
+        elif op == 'remove_edges':
+            self._remove_edges([tuple(edge_key) for edge_key in record['edges']])
+        elif op == 'decay':
+            self._decay_edges(record['decay_rate'], datetime.fromisoformat(record['at']))
+        else:
+            raise ValueError(f"Unknown WAL operation: {op}")
+            
+    def _remove_agent_state(self, agent_id: str) -> List[Tuple[str, str]]:
+        """Remove an agent and all edges touching it from in-memory state; returns removed edge keys."""
+        # Remove all edges involving this agent
+        edges_to_remove = []
+        for (from_agent, to_agent) in self.edges.keys():
+            if from_agent == agent_id or to_agent == agent_id:
+                edges_to_remove.append((from_agent, to_agent))
                 
-            # Load nodes
-            for node_data in data.get('nodes', []):
-                node = TrustNode(
-                    agent_id=node_data['agent_id'],
-                    created_at=datetime.fromisoformat(node_data['created_at']),
-                    updated_at=datetime.fromisoformat(node_data['updated_at']),
-                    total_interactions=node_data['total_interactions'],
-                    successful_interactions=node_data['successful_interactions'],
-                    failed_interactions=node_data['failed_interactions'],
-                    metadata=node_data.get('metadata', {})
-                )
-                self.nodes[node.agent_id] = node
-                self.adjacency_list[node.agent_id] = set()
+        for edge_key in edges_to_remove:
+            del self.edges[edge_key]
+            
+        if self._edge_store is None:
+            # Remove from adjacency list
+            if agent_id in self.adjacency_list:
+                del self.adjacency_list[agent_id]
                 
-            # Load edges
-            for edge_data in data.get('edges', []):
-                edge = TrustEdge(
-                    from_agent=edge_data['from_agent'],
-                    to_agent=edge_data['to_agent'],
-                    trust_score=edge_data['trust_score'],
-                    confidence=edge_data['confidence'],
-                    interaction_count=edge_data['interaction_count'],
-                    created_at=datetime.fromisoformat(edge_data['created_at']),
-                    updated_at=datetime.fromisoformat(edge_data['updated_at']),
-                    ttl_hours=edge_data.get('ttl_hours', 8760),
-                    metadata=edge_data.get('metadata', {})
-                )
-                edge_key = (edge.from_agent, edge.to_agent)
-                self.edges[edge_key] = edge
-                self.adjacency_list[edge.from_agent].add(edge.to_agent)
+            # Remove from other agents' adjacency lists
+            for adj_list in self.adjacency_list.values():
+                adj_list.discard(agent_id)
+        else:
+            self._edge_store.release(agent_id)
+            
+        # Remove node
+        del self.nodes[agent_id]
+        return edges_to_remove
+        
+    def _register_agent(self, agent_id: str) -> None:
+        """Make an agent known to the adjacency structure."""
+        if self._edge_store is None:
+            self.adjacency_list.setdefault(agent_id, set())
+        else:
+            self._edge_store.intern(agent_id)
+            
+    def _link(self, from_agent: str, to_agent: str) -> None:
+        """Record adjacency for a newly inserted edge."""
+        # The columnar store indexes adjacency on edge insertion
+        if self._edge_store is None:
+            self.adjacency_list.setdefault(from_agent, set()).add(to_agent)
+        
+    def _remove_edges(self, edge_keys: List[Tuple[str, str]]) -> None:
+        """Remove edges from in-memory state."""
+        for edge_key in edge_keys:
+            if edge_key in self.edges:
+                del self.edges[edge_key]
+                if self._edge_store is None:
+                    from_agent, to_agent = edge_key
+                    self.adjacency_list[from_agent].discard(to_agent)
                 
-            logger.info(f"[P23P1S1T1] Loaded trust graph data: {len(self.nodes)} nodes, {len(self.edges)} edges")
+    def _decay_edges(self, decay_rate: float, now: datetime) -> int:
+        """Decay every non-expired edge as of a fixed point in time."""
+        if self._decay_engine is not None:
+            return self._decay_engine.apply_decay(decay_rate, now)
             
-        except Exception as e:
-            logger.error(f"[P23P1S1T1] Failed to load trust graph data: {e}")
+        decayed_count = 0
+        for edge in self.edges.values():
+            if not edge.is_expired(now):
+                edge.decay_score(decay_rate, now)
+                decayed_count += 1
+        return decayed_count
 
     def save_to_file(self, file_path: str) -> bool:
         """
@@ -671,7 +1016,7 @@ class TrustGraph:
         try:
             data = {
                 'nodes': [asdict(node) for node in self.nodes.values()],
-                'edges': [asdict(edge) for edge in self.edges.values()],
+                'edges': [asdict(_as_trust_edge(edge)) for edge in self.edges.values()],
                 'metadata': {
                     'saved_at': datetime.now(timezone.utc).isoformat(),
                     'version': '1.0.0'
@@ -709,38 +1054,16 @@ class TrustGraph:
             # Clear existing data
             self.nodes.clear()
             self.edges.clear()
-            self.adjacency_list.clear()
-            
-            # Load nodes
-            for node_data in data.get('nodes', []):
-                node = TrustNode(
-                    agent_id=node_data['agent_id'],
-                    created_at=datetime.fromisoformat(node_data['created_at']),
-                    updated_at=datetime.fromisoformat(node_data['updated_at']),
-                    total_interactions=node_data['total_interactions'],
-                    successful_interactions=node_data['successful_interactions'],
-                    failed_interactions=node_data['failed_interactions'],
-                    metadata=node_data.get('metadata', {})
-                )
-                self.nodes[node.agent_id] = node
-                self.adjacency_list[node.agent_id] = set()
-                
-            # Load edges
-            for edge_data in data.get('edges', []):
-                edge = TrustEdge(
-                    from_agent=edge_data['from_agent'],
-                    to_agent=edge_data['to_agent'],
-                    trust_score=edge_data['trust_score'],
-                    confidence=edge_data['confidence'],
-                    interaction_count=edge_data['interaction_count'],
-                    created_at=datetime.fromisoformat(edge_data['created_at']),
-                    updated_at=datetime.fromisoformat(edge_data['updated_at']),
-                    ttl_hours=edge_data.get('ttl_hours', 8760),
-                    metadata=edge_data.get('metadata', {})
-                )
-                edge_key = (edge.from_agent, edge.to_agent)
-                self.edges[edge_key] = edge
-                self.adjacency_list[edge.from_agent].add(edge.to_agent)
+            if self._edge_store is None:
+                self.adjacency_list.clear()
+            
+            self._load_snapshot(data)
+            self._record_change()
+            self._publish("reset")
+            
+            # The WAL only holds deltas, so persist the loaded graph as the new snapshot
+            if self._wal is not None:
+                self.compact()
                 
             logger.info(f"[P23P1S1T1] Loaded trust graph from {file_path}: {len(self.nodes)} nodes, {len(self.edges)} edges")
             return True
@@ -769,6 +1092,9 @@ class TrustGraph:
             
         with self._lock:
             successful_updates = 0
+            touched_nodes: Set[str] = set()
+            touched_edges: Set[Tuple[str, str]] = set()
+            created_agents: Set[str] = set()
             
             # Pre-create agents if needed (batch operation)
             if not high_performance:
@@ -782,7 +1108,9 @@ class TrustGraph:
                 for agent_id in agents_to_create:
                     node = TrustNode(agent_id=agent_id, metadata={})
                     self.nodes[agent_id] = node
-                    self.adjacency_list[agent_id] = set()
+                    self._register_agent(agent_id)
+                touched_nodes.update(agents_to_create)
+                created_agents.update(agents_to_create)
             
             # Process all updates
             for from_agent, to_agent, trust_score, confidence, metadata in trust_updates:
@@ -792,11 +1120,14 @@ class TrustGraph:
                         if from_agent not in self.nodes:
                             node = TrustNode(agent_id=from_agent, metadata={})
                             self.nodes[from_agent] = node
-                            self.adjacency_list[from_agent] = set()
+                            self._register_agent(from_agent)
+                            touched_nodes.add(from_agent)
+                            created_agents.add(from_agent)
                         if to_agent not in self.nodes:
                             node = TrustNode(agent_id=to_agent, metadata={})
                             self.nodes[to_agent] = node
-                            self.adjacency_list[to_agent] = set()
+                            self._register_agent(to_agent)
+                            created_agents.add(to_agent)
                     
                     # Validate trust score (skip in high-performance mode)
                     if not high_performance:
@@ -831,7 +1162,7 @@ class TrustGraph:
                             metadata=metadata or {}
                         )
                         self.edges[edge_key] = edge
-                        self.adjacency_list[from_agent].add(to_agent)
+                        self._link(from_agent, to_agent)
                     
                     # Update node statistics (simplified in high-performance mode)
                     if not high_performance:
@@ -846,6 +1177,8 @@ class TrustGraph:
                         self.nodes[to_agent].total_interactions += 1
                         self.nodes[to_agent].updated_at = datetime.now(timezone.utc)
                     
+                    touched_nodes.add(to_agent)
+                    touched_edges.add(edge_key)
                     successful_updates += 1
                     
                 except Exception as e:
@@ -853,8 +1186,11 @@ class TrustGraph:
                         logger.error(f"[P23P1S1T1] Failed to update trust {from_agent} -> {to_agent}: {e}")
             
             # Batch save (only once for all updates)
-            if self.auto_save and successful_updates > 0:
-                self._save_data()
+            self._record_change([(agent_id, None) for agent_id in touched_nodes] + list(touched_edges))
+            self._publish("agent_added", [(agent_id, None) for agent_id in created_agents])
+            self._publish("edge_upserted", touched_edges)
+            if successful_updates > 0:
+                self._persist(node_ids=touched_nodes, edge_keys=touched_edges)
             
             if not high_performance:
                 logger.info(f"[P23P1S1T1] Batch updated {successful_updates} trust relationships")
@@ -879,6 +1215,9 @@ class TrustGraph:
             enabled: Whether to enable auto-save
         """
         self.auto_save = enabled
+        if enabled and self._wal is not None:
+            # Changes made while auto-save was off never reached the WAL
+            self.compact()
         logger.info(f"[P23P1S1T1] Auto-save {'enabled' if enabled else 'disabled'}")
         
     def get_performance_stats(self) -> Dict[str, Any]:
@@ -888,15 +1227,22 @@ class TrustGraph:
         Returns:
             Dict containing performance information
         """
-        return {
+        stats = {
             'high_performance_mode': self.high_performance,
             'auto_save_enabled': self.auto_save,
+            'persistence_mode': self.persistence_mode,
+            'storage_backend': self.storage_backend,
             'total_nodes': len(self.nodes),
             'total_edges': len(self.edges),
             'decay_rate': self.decay_rate,
             'max_trust_score': self.max_trust_score,
             'min_trust_score': self.min_trust_score
         }
+        if self._wal is not None:
+            stats.update(self._wal.get_stats())
+        if self._edge_store is not None:
+            stats.update(self._edge_store.get_stats())
+        return stats
 
 def main():
     """CLI interface for trust graph operations."""
@@ -904,16 +1250,17 @@ def main():
     
     parser = argparse.ArgumentParser(description="GitBridge Trust Graph CLI")
     parser.add_argument("--storage", default="trust_data", help="Storage directory")
-    parser.add_argument("--command", required=True, choices=["add", "update", "get", "stats", "export", "decay", "cleanup"])
+    parser.add_argument("--command", required=True, choices=["add", "update", "get", "stats", "export", "decay", "cleanup", "compact"])
     parser.add_argument("--from-agent", help="Source agent ID")
     parser.add_argument("--to-agent", help="Target agent ID")
     parser.add_argument("--trust-score", type=float, help="Trust score (-1.0 to 1.0)")
     parser.add_argument("--confidence", type=float, default=1.0, help="Confidence (0.0 to 1.0)")
     parser.add_argument("--format", default="json", choices=["json", "csv", "dot"], help="Export format")
+    parser.add_argument("--persistence", default="snapshot", choices=list(PERSISTENCE_MODES), help="Persistence mode")
     
     args = parser.parse_args()
     
-    graph = TrustGraph(storage_path=args.storage)
+    graph = TrustGraph(storage_path=args.storage, persistence_mode=args.persistence)
     
     if args.command == "add":
         if not args.from_agent:
@@ -953,6 +1300,10 @@ def main():
     elif args.command == "cleanup":
         count = graph.cleanup_expired_edges()
         print(f"Removed {count} expired edges")
+        
+    elif args.command == "compact":
+        success = graph.compact()
+        print(f"Compacted: {success}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,623 @@
+#!/usr/bin/env python3
+"""
+GitBridge Transitive Trust Matrix
+Phase: GBP23
+Part: P23P3
+Step: P23P3S3
+Task: P23P3S3T1 - All-Pairs Transitive Trust
+
+Precomputed all-pairs transitive trust for TrustAnalyzer consumers. Each cell
+holds the trust of the best path of at most ``max_hops`` hops, using the same
+per-hop ``decay_factor ** hop_index`` discount as the path engine, together
+with the hop count and confidence of that path. Rows are computed with
+batched max-product matrix operations, one exactly-h-hop layer at a time, and
+are maintained incrementally from the graph change log: an edge change only
+recomputes the rows of agents that can reach the edge within the hop bound.
+
+Path confidence does not constrain the best path here. When its confidence
+is below a caller's threshold, use TrustAnalyzer.analyze_trust_paths for the
+best path that meets it. ReachabilityIndex answers unbounded reachability
+over edges with at least a minimum trust from the same change log.
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [P23P3 Schema]
+"""
+
+import logging
+import threading
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from trust_graph import TrustGraph
+
+logger = logging.getLogger(__name__)
+
+MAX_CHUNK_CELLS = 1 << 22  # Candidate cells materialized per batched hop
+FULL_REBUILD_FRACTION = 0.5  # Recompute everything past this share of dirty rows
+
+class TransitiveTrustMatrix:
+    """
+    Incrementally maintained all-pairs transitive trust.
+
+    Phase: GBP23
+    Part: P23P3
+    Step: P23P3S3
+    Task: P23P3S3T1 - Core Implementation
+
+    Features:
+    - Bounded-hop max-product trust with per-hop decay
+    - Batched NumPy propagation over the edge list
+    - Incremental row updates driven by TrustGraph.get_changes_since
+    - O(1) pairwise trust, path length, confidence and reachability reads
+    """
+
+    def __init__(self, trust_graph: TrustGraph, max_hops: int, decay_factor: float):
+        """
+        Initialize transitive trust matrix.
+
+        Args:
+            trust_graph: Trust graph to track
+            max_hops: Maximum number of hops in a transitive path
+            decay_factor: Trust decay factor per hop (0.0 to 1.0)
+        """
+        self.trust_graph = trust_graph
+        self.max_hops = max_hops
+        self.decay_factor = decay_factor
+
+        self._lock = threading.RLock()
+        self._version = -1
+        self._reset()
+
+        self.full_rebuilds = 0
+        self.incremental_updates = 0
+        self.rows_recomputed = 0
+
+    def get_trust(self, source: str, target: str) -> float:
+        """
+        Get the transitive trust from source to target.
+
+        Args:
+            source: Source agent ID
+            target: Target agent ID
+
+        Returns:
+            float: Trust of the best path, 0.0 if target is unreachable
+        """
+        with self._lock:
+            self._sync()
+            i, j = self._index.get(source), self._index.get(target)
+            if i is None or j is None:
+                return 0.0
+            return float(self._trust[i, j])
+
+    def get_path_length(self, source: str, target: str) -> Optional[int]:
+        """
+        Get the hop count of the best path from source to target.
+
+        Args:
+            source: Source agent ID
+            target: Target agent ID
+
+        Returns:
+            Optional[int]: Number of hops, or None if target is unreachable
+        """
+        with self._lock:
+            self._sync()
+            i, j = self._index.get(source), self._index.get(target)
+            if i is None or j is None or self._hops[i, j] == 0:
+                return None
+            return int(self._hops[i, j])
+
+    def get_confidence(self, source: str, target: str) -> float:
+        """
+        Get the confidence of the best path from source to target.
+
+        Args:
+            source: Source agent ID
+            target: Target agent ID
+
+        Returns:
+            float: Product of the path's edge confidences, 0.0 if target is unreachable
+        """
+        with self._lock:
+            self._sync()
+            i, j = self._index.get(source), self._index.get(target)
+            if i is None or j is None:
+                return 0.0
+            return float(self._confidence[i, j])
+
+    def is_reachable(self, source: str, target: str) -> bool:
+        """Check whether target is reachable from source within the hop bound."""
+        return self.get_path_length(source, target) is not None
+
+    def get_reachable_count(self, agent_id: str) -> int:
+        """
+        Get the number of other agents reachable from an agent.
+
+        Args:
+            agent_id: Source agent ID
+
+        Returns:
+            int: Number of agents with positive transitive trust
+        """
+        with self._lock:
+            self._sync()
+            i = self._index.get(agent_id)
+            return int(self._reach_counts[i]) if i is not None else 0
+
+    def get_efficiency(self) -> float:
+        """
+        Get network efficiency over all reachable pairs.
+
+        Returns:
+            float: 1 / (1 + average best-path length), 0.0 if no pair is connected
+        """
+        with self._lock:
+            self._sync()
+            if self._total_reach == 0:
+                return 0.0
+            return 1.0 / (1.0 + self._total_hops / self._total_reach)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get matrix statistics.
+
+        Returns:
+            Dict containing matrix statistics
+        """
+        with self._lock:
+            return {
+                'agents': len(self._agents),
+                'edges': len(self._edge_pos),
+                'graph_version': self._version,
+                'reachable_pairs': self._total_reach,
+                'matrix_bytes': self._trust.nbytes + self._hops.nbytes + self._confidence.nbytes,
+                'full_rebuilds': self.full_rebuilds,
+                'incremental_updates': self.incremental_updates,
+                'rows_recomputed': self.rows_recomputed
+            }
+
+    def _reset(self) -> None:
+        """Drop all agents, edges and computed rows."""
+        self._index: Dict[str, int] = {}
+        self._agents: List[str] = []
+        self._edge_pos: Dict[Tuple[str, str], int] = {}
+        self._src = array('q')
+        self._dst = array('q')
+        self._weight = array('d')
+        self._edge_confidence = array('d')
+        self._trust = np.zeros((0, 0), dtype=np.float64)
+        self._hops = np.zeros((0, 0), dtype=np.int16)
+        self._confidence = np.zeros((0, 0), dtype=np.float64)
+        self._reach_counts = np.zeros(0, dtype=np.int64)
+        self._hop_sums = np.zeros(0, dtype=np.int64)
+        self._total_reach = 0
+        self._total_hops = 0
+
+    def _sync(self) -> None:
+        """Bring the matrix up to date with the trust graph."""
+        version, changes = self.trust_graph.get_changes_since(self._version)
+        if version == self._version:
+            return
+        if changes is None:
+            self._rebuild()
+        else:
+            self._apply_changes(changes)
+        self._version = version
+
+    def _rebuild(self) -> None:
+        """Recompute every row from the current graph."""
+        self._reset()
+        for agent_id in self.trust_graph.get_all_agents():
+            self._intern(agent_id)
+        for edge in self.trust_graph.get_all_edges():
+            self._intern(edge.from_agent)
+            self._intern(edge.to_agent)
+            self._set_edge(edge.from_agent, edge.to_agent, edge.trust_score, edge.confidence)
+
+        self._recompute_rows(np.arange(len(self._agents)))
+        self.full_rebuilds += 1
+        logger.debug(f"[P23P3S3T1] Rebuilt transitive trust matrix for {len(self._agents)} agents")
+
+    def _apply_changes(self, changes: Iterable[Tuple[str, Optional[str]]]) -> None:
+        """Recompute the rows affected by changed edges."""
+        changed_sources = set()
+        for from_agent, to_agent in set(changes):
+            self._intern(from_agent)
+            if to_agent is None:
+                continue
+            self._intern(to_agent)
+            edge = self.trust_graph.get_edge(from_agent, to_agent)
+            if edge is None:
+                changed = self._set_edge(from_agent, to_agent, 0.0, 0.0)
+            else:
+                changed = self._set_edge(from_agent, to_agent, edge.trust_score, edge.confidence)
+            if changed:
+                changed_sources.add(self._index[from_agent])
+
+        if not changed_sources:
+            return
+        rows = self._upstream(changed_sources)
+        if len(rows) > FULL_REBUILD_FRACTION * len(self._agents):
+            rows = np.arange(len(self._agents))
+        self._recompute_rows(rows)
+        self.incremental_updates += 1
+
+    def _intern(self, agent_id: str) -> int:
+        """Get the matrix index of an agent, growing the matrix if needed."""
+        index = self._index.get(agent_id)
+        if index is not None:
+            return index
+
+        index = len(self._agents)
+        self._index[agent_id] = index
+        self._agents.append(agent_id)
+        capacity = len(self._reach_counts)
+        if index >= capacity:
+            # Grow geometrically so repeated agent additions stay amortized O(n)
+            new_capacity = max(16, capacity * 2)
+            trust = np.zeros((new_capacity, new_capacity), dtype=self._trust.dtype)
+            hops = np.zeros((new_capacity, new_capacity), dtype=self._hops.dtype)
+            confidence = np.zeros((new_capacity, new_capacity), dtype=self._confidence.dtype)
+            trust[:capacity, :capacity] = self._trust
+            hops[:capacity, :capacity] = self._hops
+            confidence[:capacity, :capacity] = self._confidence
+            self._trust, self._hops, self._confidence = trust, hops, confidence
+            self._reach_counts = np.concatenate([self._reach_counts, np.zeros(new_capacity - capacity, dtype=np.int64)])
+            self._hop_sums = np.concatenate([self._hop_sums, np.zeros(new_capacity - capacity, dtype=np.int64)])
+        return index
+
+    def _set_edge(self, from_agent: str, to_agent: str, trust_score: float, confidence: float) -> bool:
+        """
+        Store the propagation weight and confidence of an edge.
+
+        Returns:
+            bool: True if the weight or confidence changed
+        """
+        # Only positive trust propagates, matching the path engine
+        weight = trust_score if trust_score > 0 and from_agent != to_agent else 0.0
+        if weight == 0.0:
+            confidence = 0.0
+        key = (from_agent, to_agent)
+        position = self._edge_pos.get(key)
+        if position is None:
+            if weight == 0.0:
+                return False
+            self._edge_pos[key] = len(self._weight)
+            self._src.append(self._index[from_agent])
+            self._dst.append(self._index[to_agent])
+            self._weight.append(weight)
+            self._edge_confidence.append(confidence)
+            return True
+        if self._weight[position] == weight and self._edge_confidence[position] == confidence:
+            return False
+        self._weight[position] = weight
+        self._edge_confidence[position] = confidence
+        return True
+
+    def _edge_columns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Get (src, dst, weight, confidence) for propagating edges, sorted by dst."""
+        weight = np.frombuffer(self._weight, dtype=np.float64)
+        live = np.flatnonzero(weight > 0)
+        src = np.frombuffer(self._src, dtype=np.int64)[live]
+        dst = np.frombuffer(self._dst, dtype=np.int64)[live]
+        confidence = np.frombuffer(self._edge_confidence, dtype=np.float64)[live]
+        weight = weight[live]
+        order = np.argsort(dst, kind='stable')
+        return src[order], dst[order], weight[order], confidence[order]
+
+    def _upstream(self, sources: Iterable[int]) -> np.ndarray:
+        """
+        Find agents whose rows depend on edges leaving the given sources.
+
+        A best path uses an edge out of u only if u is reached first within
+        max_hops - 1 hops, so the affected rows are u and its bounded ancestors.
+        """
+        src, dst, _, _ = self._edge_columns()
+        seen = np.zeros(len(self._agents), dtype=bool)
+        frontier = np.zeros(len(self._agents), dtype=bool)
+        frontier[list(sources)] = True
+        seen |= frontier
+        for _ in range(self.max_hops - 1):
+            parents = np.zeros(len(self._agents), dtype=bool)
+            parents[src[frontier[dst]]] = True
+            frontier = parents & ~seen
+            if not frontier.any():
+                break
+            seen |= frontier
+        return np.flatnonzero(seen)
+
+    def _recompute_rows(self, rows: np.ndarray) -> None:
+        """Recompute transitive trust rows and the derived reachability totals."""
+        n = len(self._agents)
+        if len(rows) == 0:
+            return
+        trust, hops, confidence = self._propagate(rows, n)
+        reach = np.count_nonzero(hops, axis=1)
+        hop_sums = hops.sum(axis=1, dtype=np.int64)
+
+        self._total_reach += int(reach.sum() - self._reach_counts[rows].sum())
+        self._total_hops += int(hop_sums.sum() - self._hop_sums[rows].sum())
+        self._reach_counts[rows] = reach
+        self._hop_sums[rows] = hop_sums
+        self._trust[rows, :n] = trust
+        self._hops[rows, :n] = hops
+        self._confidence[rows, :n] = confidence
+        self.rows_recomputed += len(rows)
+
+    def _propagate(self, rows: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Compute best bounded-hop trust, its hop count and its confidence for source rows.
+
+        Hop h of a path is discounted by decay_factor ** h, so the layers are
+        exactly-h-hop max-product walks; the best over all layers is always a
+        simple path because cycles only add hops with trust <= 1. A walk that
+        does not beat the best trust already found for its cell is dropped from
+        its layer, since the earlier walk extends at least as well in fewer
+        hops. Among equally trusted walks the most confident one is kept.
+        """
+        best = np.zeros((len(rows), n), dtype=np.float64)
+        best_hops = np.zeros((len(rows), n), dtype=np.int16)
+        best_confidence = np.zeros((len(rows), n), dtype=np.float64)
+        src, dst, weight, edge_confidence = self._edge_columns()
+        if len(weight) == 0:
+            return best, best_hops, best_confidence
+
+        chunk = max(1, MAX_CHUNK_CELLS // len(weight))
+        for start in range(0, len(rows), chunk):
+            block = rows[start:start + chunk]
+            local = np.arange(len(block))
+            block_best = best[start:start + len(block)]
+            block_hops = best_hops[start:start + len(block)]
+            block_confidence = best_confidence[start:start + len(block)]
+
+            layer = np.zeros((len(block), n), dtype=np.float64)
+            layer_confidence = np.zeros((len(block), n), dtype=np.float64)
+            layer[local, block] = 1.0
+            layer_confidence[local, block] = 1.0
+            for hop in range(self.max_hops):
+                # Only edges leaving agents reached by this layer can extend a walk
+                live = np.flatnonzero(layer.any(axis=0)[src])
+                if len(live) == 0:
+                    break
+                hop_src = src[live]
+                targets, starts, counts = np.unique(dst[live], return_index=True, return_counts=True)
+                candidates = layer[:, hop_src] * (weight[live] * self.decay_factor ** hop)
+                candidate_confidence = layer_confidence[:, hop_src] * edge_confidence[live]
+                maxima = np.maximum.reduceat(candidates, starts, axis=1)
+                # Confidence of the most trusted walk into each target
+                candidate_confidence[candidates != np.repeat(maxima, counts, axis=1)] = 0.0
+
+                layer = np.zeros((len(block), n), dtype=np.float64)
+                layer_confidence = np.zeros((len(block), n), dtype=np.float64)
+                layer[:, targets] = maxima
+                layer_confidence[:, targets] = np.maximum.reduceat(candidate_confidence, starts, axis=1)
+                layer[local, block] = 0.0  # Trust back to the source is not transitive trust
+
+                improved = layer > block_best
+                block_best[improved] = layer[improved]
+                block_hops[improved] = hop + 1
+                block_confidence[improved] = layer_confidence[improved]
+                layer[~improved] = 0.0
+                layer_confidence[~improved] = 0.0
+
+        return best, best_hops, best_confidence
+
+class ReachabilityIndex:
+    """
+    Incrementally maintained reachability over strong trust edges.
+
+    Phase: GBP23
+    Part: P23P3
+    Step: P23P3S3
+    Task: P23P3S3T1 - Core Implementation
+
+    Features:
+    - Unbounded reachability over edges with trust of at least min_trust
+    - One integer bitset of reachable agents per agent
+    - Edge additions extend the sets of agents that reach the new edge;
+      removals recompute the transitive closure from strongly connected components
+    - O(1) reachable-count and reachability reads
+    """
+
+    def __init__(self, trust_graph: TrustGraph, min_trust: float):
+        """
+        Initialize reachability index.
+
+        Args:
+            trust_graph: Trust graph to track
+            min_trust: Minimum trust score of an edge that extends reachability
+        """
+        self.trust_graph = trust_graph
+        self.min_trust = min_trust
+
+        self._lock = threading.RLock()
+        self._version = -1
+        self._reset()
+
+        self.full_rebuilds = 0
+        self.incremental_updates = 0
+
+    def get_reachable_count(self, agent_id: str) -> int:
+        """
+        Get the number of other agents reachable from an agent.
+
+        Args:
+            agent_id: Source agent ID
+
+        Returns:
+            int: Number of agents reachable over strong edges
+        """
+        with self._lock:
+            self._sync()
+            i = self._index.get(agent_id)
+            return self._reach[i].bit_count() - 1 if i is not None else 0
+
+    def is_reachable(self, source: str, target: str) -> bool:
+        """Check whether target is reachable from source over strong edges."""
+        with self._lock:
+            self._sync()
+            i, j = self._index.get(source), self._index.get(target)
+            return i is not None and j is not None and i != j and bool(self._reach[i] >> j & 1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get index statistics.
+
+        Returns:
+            Dict containing index statistics
+        """
+        with self._lock:
+            return {
+                'agents': len(self._agents),
+                'strong_edges': sum(len(successors) for successors in self._succ),
+                'graph_version': self._version,
+                'full_rebuilds': self.full_rebuilds,
+                'incremental_updates': self.incremental_updates
+            }
+
+    def _reset(self) -> None:
+        """Drop all agents, edges and reachable sets."""
+        self._index: Dict[str, int] = {}
+        self._agents: List[str] = []
+        self._succ: List[set] = []
+        self._reach: List[int] = []
+
+    def _sync(self) -> None:
+        """Bring the index up to date with the trust graph."""
+        version, changes = self.trust_graph.get_changes_since(self._version)
+        if version == self._version:
+            return
+        if changes is None:
+            self._rebuild()
+        else:
+            self._apply_changes(changes)
+        self._version = version
+
+    def _rebuild(self) -> None:
+        """Recompute every reachable set from the current graph."""
+        self._reset()
+        for agent_id in self.trust_graph.get_all_agents():
+            self._intern(agent_id)
+        for edge in self.trust_graph.get_all_edges():
+            i, j = self._intern(edge.from_agent), self._intern(edge.to_agent)
+            if i != j and edge.trust_score >= self.min_trust:
+                self._succ[i].add(j)
+
+        self._close()
+        self.full_rebuilds += 1
+        logger.debug(f"[P23P3S3T1] Rebuilt reachability index for {len(self._agents)} agents")
+
+    def _apply_changes(self, changes: Iterable[Tuple[str, Optional[str]]]) -> None:
+        """Extend reachable sets for added strong edges, or recompute after removals."""
+        added = []
+        removed = False
+        for from_agent, to_agent in set(changes):
+            i = self._intern(from_agent)
+            if to_agent is None:
+                continue
+            j = self._intern(to_agent)
+            edge = self.trust_graph.get_edge(from_agent, to_agent)
+            strong = i != j and edge is not None and edge.trust_score >= self.min_trust
+            if strong and j not in self._succ[i]:
+                self._succ[i].add(j)
+                added.append((i, j))
+            elif not strong and j in self._succ[i]:
+                self._succ[i].discard(j)
+                removed = True
+
+        if removed:
+            self._close()
+            self.full_rebuilds += 1
+            return
+        for i, j in added:
+            gained = self._reach[j]
+            if self._reach[i] & gained == gained:
+                continue
+            # Every agent that reaches i now reaches everything j reaches
+            for k, reach in enumerate(self._reach):
+                if reach >> i & 1:
+                    self._reach[k] = reach | gained
+        if added:
+            self.incremental_updates += 1
+
+    def _intern(self, agent_id: str) -> int:
+        """Get the index of an agent, adding it if needed."""
+        index = self._index.get(agent_id)
+        if index is None:
+            index = len(self._agents)
+            self._index[agent_id] = index
+            self._agents.append(agent_id)
+            self._succ.append(set())
+            self._reach.append(1 << index)
+        return index
+
+    def _close(self) -> None:
+        """
+        Recompute the transitive closure of the strong edges.
+
+        Tarjan's algorithm emits each strongly connected component after every
+        component it reaches, so a component's set is its members plus the
+        already computed sets of its successor components.
+        """
+        n = len(self._agents)
+        successors = [list(targets) for targets in self._succ]
+        order = [-1] * n
+        low = [0] * n
+        on_stack = [False] * n
+        component = [-1] * n
+        component_reach: List[int] = []
+        stack: List[int] = []
+        counter = 0
+
+        for root in range(n):
+            if order[root] != -1:
+                continue
+            order[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            work = [(root, 0)]
+            while work:
+                v, position = work[-1]
+                if position < len(successors[v]):
+                    work[-1] = (v, position + 1)
+                    w = successors[v][position]
+                    if order[w] == -1:
+                        order[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = True
+                        work.append((w, 0))
+                    elif on_stack[w]:
+                        low[v] = min(low[v], order[w])
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[v])
+                if low[v] != order[v]:
+                    continue
+
+                members = []
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    component[w] = len(component_reach)
+                    members.append(w)
+                    if w == v:
+                        break
+                reach = 0
+                for member in members:
+                    reach |= 1 << member
+                for member in members:
+                    for w in successors[member]:
+                        if component[w] != component[v]:
+                            reach |= component_reach[component[w]]
+                component_reach.append(reach)
+                for member in members:
+                    self._reach[member] = reach
@@ -21,13 +21,16 @@ from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 import math
+import random
 import statistics
-from collections import defaultdict, Counter
+from collections import defaultdict, Counter, deque
 import threading
 
 from trust_graph import TrustGraph, TrustEdge
 from trust_analyzer import TrustAnalyzer, TrustAnalysis
 from behavior_model import BehaviorModel, AgentBehavior
+from trust_network_metrics import NetworkMetricsEngine, NetworkStructure
+from trust_cache import NeighborhoodCache, bounded_neighborhood
 
 logger = logging.getLogger(__name__)
 
@@ -103,7 +106,8 @@ class TrustMetricsCalculator:
         self, 
         trust_graph: TrustGraph, 
         analyzer: Optional[TrustAnalyzer] = None,
-        behavior_model: Optional[BehaviorModel] = None
+        behavior_model: Optional[BehaviorModel] = None,
+        cache_size: int = 1024
     ):
         """
         Initialize trust metrics calculator.
@@ -112,19 +116,32 @@ class TrustMetricsCalculator:
             trust_graph: Trust graph to analyze
             analyzer: Optional trust analyzer for path analysis
             behavior_model: Optional behavior model for behavioral metrics
+            cache_size: Maximum number of cached agent metrics
         """
         self.trust_graph = trust_graph
         self.analyzer = analyzer or TrustAnalyzer(trust_graph)
+        self._owns_analyzer = analyzer is None
         self.behavior_model = behavior_model
+        self.network_engine = NetworkMetricsEngine(trust_graph)
         
-        # Metrics cache
-        self._metrics_cache: Dict[str, TrustMetrics] = {}
+        # Metrics cache; agent metrics are invalidated by trust changes in their
+        # neighborhood and, since centrality depends on the agent count, by membership changes
+        self._metrics_cache = NeighborhoodCache(trust_graph, max_entries=cache_size, membership_sensitive=True)
         self._network_cache: Optional[NetworkMetrics] = None
+        self._network_cache_version = -1
         self._cache_lock = threading.RLock()
+        self._reachability_index = None
+        
+        # Work done per calculate_network_metrics phase, cumulative
+        self.network_operations: Dict[str, int] = defaultdict(int)
+        self.clustering_pairs = 0  # Neighbor pairs checked for triangles, cumulative
         
         # Configuration
         self.cache_ttl = 3600  # 1 hour cache TTL
         self.min_confidence_threshold = 0.1
+        self.max_matrix_agents = 2000  # Above this, search instead of keeping O(N^2) all-pairs state
+        self.efficiency_sample_pairs = 500  # Agent pairs searched for efficiency above max_matrix_agents
+        self.reachability_min_trust = 0.3  # Edges below this do not extend reachability
         
         logger.info(f"[P23P5S1T1] TrustMetricsCalculator initialized")
         
@@ -141,14 +158,13 @@ class TrustMetricsCalculator:
         """
         # Check cache first
         cache_key = f"agent_{agent_id}_{include_behavior}"
-        with self._cache_lock:
-            if cache_key in self._metrics_cache:
-                cached = self._metrics_cache[cache_key]
-                # Check if cache is still valid
-                if (datetime.now(timezone.utc) - cached.metadata.get("calculated_at", datetime.min.replace(tzinfo=timezone.utc))).total_seconds() < self.cache_ttl:
-                    return cached
-                    
+        cached = self._metrics_cache.get(cache_key)
+        # Behavioral data and edge expiry are not graph events, so entries still age out
+        if cached is not None and (datetime.now(timezone.utc) - cached.metadata.get("calculated_at", datetime.min.replace(tzinfo=timezone.utc))).total_seconds() < self.cache_ttl:
+            return cached
+            
         # Calculate metrics
+        graph_version = self.trust_graph.version
         metrics = TrustMetrics(agent_id=agent_id)
         
         # Basic trust scores
@@ -235,13 +251,18 @@ class TrustMetricsCalculator:
         # Add calculation timestamp
         metrics.metadata["calculated_at"] = datetime.now(timezone.utc)
         
-        # Cache results
-        with self._cache_lock:
-            self._metrics_cache[cache_key] = metrics
+        # Cache results against the agent, its neighbors and its reachability region
+        self._metrics_cache.put(cache_key, metrics, self._metrics_dependencies(agent_id), graph_version)
             
         logger.info(f"[P23P5S1T1] Calculated trust metrics for agent {agent_id}")
         return metrics
         
+    def _metrics_dependencies(self, agent_id: str) -> Optional[Set[str]]:
+        """Agents whose trust edges can change an agent's metrics, or None if too many."""
+        # Reachability is unbounded in hops, so any agent reachable from this one matters
+        total_agents = len(self.trust_graph.get_all_agents())
+        return bounded_neighborhood(self.trust_graph, agent_id, total_agents, self._metrics_cache.max_dependencies)
+        
     def _calculate_clustering_coefficient(self, agent_id: str) -> float:
         """Calculate local clustering coefficient for an agent."""
         neighbors = self.trust_graph.get_neighbors(agent_id)
@@ -252,6 +273,7 @@ class TrustMetricsCalculator:
         triangles = 0
         possible_triangles = len(neighbors) * (len(neighbors) - 1) / 2
         
+        self.clustering_pairs += int(possible_triangles)
         for i, neighbor1 in enumerate(neighbors):
             for neighbor2 in neighbors[i+1:]:
                 # Check if there's a trust edge between neighbors
@@ -263,27 +285,48 @@ class TrustMetricsCalculator:
         return triangles / possible_triangles if possible_triangles > 0 else 0.0
         
     def _calculate_reachability(self, agent_id: str) -> float:
-        """Calculate trust reachability for an agent."""
-        all_agents = set(self.trust_graph.get_all_agents())
-        reachable_agents = set()
+        """
+        Calculate trust reachability for an agent.
         
-        # Use BFS to find reachable agents
-        queue = [agent_id]
+        Share of agents, the agent itself included, reachable over any number
+        of edges with trust of at least reachability_min_trust. Read from the
+        reachability index up to max_matrix_agents agents, found by search above.
+        """
+        all_agents = self.trust_graph.get_all_agents()
+        if not all_agents:
+            return 0.0
+            
+        if len(all_agents) <= self.max_matrix_agents:
+            reachable = self._get_reachability_index().get_reachable_count(agent_id) + 1
+        else:
+            reachable = len(self._find_reachable(agent_id, self.reachability_min_trust))
+        return min(1.0, reachable / len(all_agents))
+        
+    def _get_reachability_index(self):
+        """Get the reachability index for the current reachability_min_trust."""
+        with self._cache_lock:
+            index = self._reachability_index
+            if index is None or index.min_trust != self.reachability_min_trust:
+                from trust_matrix import ReachabilityIndex
+                index = ReachabilityIndex(self.trust_graph, self.reachability_min_trust)
+                self._reachability_index = index
+            return index
+        
+    def _find_reachable(self, agent_id: str, min_trust: float) -> Set[str]:
+        """BFS over edges with at least min_trust, including the start agent."""
         visited = {agent_id}
+        queue = deque([agent_id])
         
         while queue:
-            current = queue.pop(0)
-            reachable_agents.add(current)
-            
-            neighbors = self.trust_graph.get_neighbors(current)
-            for neighbor in neighbors:
+            current = queue.popleft()
+            for neighbor in self.trust_graph.get_neighbors(current):
                 if neighbor not in visited:
                     edge = self.trust_graph.get_edge(current, neighbor)
-                    if edge and edge.trust_score >= 0.3:  # Minimum trust threshold
+                    if edge and edge.trust_score >= min_trust:
                         visited.add(neighbor)
                         queue.append(neighbor)
                         
-        return len(reachable_agents) / len(all_agents) if all_agents else 0.0
+        return visited
         
     def _calculate_behavioral_metrics(self, agent_id: str) -> Dict[str, Any]:
         """Calculate behavioral metrics for an agent."""
@@ -310,25 +353,29 @@ class TrustMetricsCalculator:
         Returns:
             NetworkMetrics: Network-wide trust metrics
         """
-        # Check cache
+        # Check cache; network metrics depend on every edge, so any graph change invalidates them
         with self._cache_lock:
-            if self._network_cache:
+            if self._network_cache and self._network_cache_version == self.trust_graph.version:
                 cached = self._network_cache
                 if (datetime.now(timezone.utc) - cached.metadata.get("calculated_at", datetime.min.replace(tzinfo=timezone.utc))).total_seconds() < self.cache_ttl:
                     return cached
                     
         # Calculate network metrics
+        graph_version = self.trust_graph.version
         metrics = NetworkMetrics()
         
-        agents = self.trust_graph.get_all_agents()
-        edges = self.trust_graph.get_all_edges()
+        # Degrees, trust totals and components in a single edge scan
+        engine = self.network_engine
+        scanned, articulation_steps = engine.edges_examined + engine.union_find_steps, engine.articulation_steps
+        structure = engine.compute()
+        self.network_operations["structure"] += engine.edges_examined + engine.union_find_steps - scanned
+        self.network_operations["articulation"] += engine.articulation_steps - articulation_steps
         
-        metrics.total_agents = len(agents)
-        metrics.total_edges = len(edges)
+        metrics.total_agents = len(structure.agents)
+        metrics.total_edges = structure.total_edges
         
         # Average trust score
-        if edges:
-            metrics.average_trust_score = sum(edge.trust_score for edge in edges) / len(edges)
+        metrics.average_trust_score = structure.average_trust
             
         # Trust density
         if metrics.total_agents > 1:
@@ -339,36 +386,34 @@ class TrustMetricsCalculator:
         metrics.trust_clustering_coefficient = self._calculate_global_clustering_coefficient()
         
         # Trust centralization
-        metrics.trust_centralization = self._calculate_centralization()
+        metrics.trust_centralization = self._calculate_centralization(structure)
         
         # Trust fragmentation
-        metrics.trust_fragmentation = self._calculate_fragmentation()
+        metrics.trust_fragmentation = self._calculate_fragmentation(structure)
         
         # Trust stability (based on confidence scores)
-        if edges:
-            avg_confidence = sum(edge.confidence for edge in edges) / len(edges)
-            metrics.trust_stability = avg_confidence
+        metrics.trust_stability = structure.average_confidence
             
         # Trust efficiency (average path length)
         metrics.trust_efficiency = self._calculate_efficiency()
         
         # Trust resilience (ability to maintain connectivity)
-        metrics.trust_resilience = self._calculate_resilience()
+        metrics.trust_resilience = self._calculate_resilience(structure)
         
-        # High and low trust agents
-        agent_metrics = {}
-        for agent in agents:
-            agent_metrics[agent] = self.calculate_agent_metrics(agent, include_behavior=False)
-            
+        # High and low trust agents (by average incoming trust)
         high_trust_threshold = 0.7
         low_trust_threshold = 0.3
         
-        metrics.high_trust_agents = sum(1 for m in agent_metrics.values() if m.average_trust_score >= high_trust_threshold)
-        metrics.low_trust_agents = sum(1 for m in agent_metrics.values() if m.average_trust_score <= low_trust_threshold)
+        average_trust = [structure.average_incoming_trust(i) for i in range(len(structure.agents))]
+        metrics.high_trust_agents = sum(1 for score in average_trust if score >= high_trust_threshold)
+        metrics.low_trust_agents = sum(1 for score in average_trust if score <= low_trust_threshold)
         
         # Trust communities
-        clusters = self.analyzer.find_trust_clusters()
-        metrics.trust_communities = len(clusters)
+        metrics.trust_communities = len(structure.cluster_sizes)
+        
+        # Single points of failure
+        metrics.metadata["articulation_points"] = len(structure.articulation.articulation_points)
+        metrics.metadata["bridges"] = len(structure.articulation.bridges)
         
         # Add calculation timestamp
         metrics.metadata["calculated_at"] = datetime.now(timezone.utc)
@@ -376,6 +421,7 @@ class TrustMetricsCalculator:
         # Cache results
         with self._cache_lock:
             self._network_cache = metrics
+            self._network_cache_version = graph_version
             
         logger.info(f"[P23P5S1T1] Calculated network trust metrics")
         return metrics
@@ -385,6 +431,7 @@ class TrustMetricsCalculator:
         agents = self.trust_graph.get_all_agents()
         total_clustering = 0.0
         valid_agents = 0
+        pairs = self.clustering_pairs
         
         for agent in agents:
             clustering = self._calculate_clustering_coefficient(agent)
@@ -392,81 +439,60 @@ class TrustMetricsCalculator:
                 total_clustering += clustering
                 valid_agents += 1
                 
+        self.network_operations["clustering"] += len(agents) + self.clustering_pairs - pairs
         return total_clustering / valid_agents if valid_agents > 0 else 0.0
         
-    def _calculate_centralization(self) -> float:
+    def _calculate_centralization(self, structure: Optional[NetworkStructure] = None) -> float:
         """Calculate network centralization."""
-        agents = self.trust_graph.get_all_agents()
-        if len(agents) < 2:
-            return 0.0
-            
-        # Calculate centrality for each agent
-        centralities = []
-        for agent in agents:
-            incoming_edges = []
-            outgoing_edges = []
-            
-            for edge in self.trust_graph.get_all_edges():
-                if edge.to_agent == agent:
-                    incoming_edges.append(edge)
-                if edge.from_agent == agent:
-                    outgoing_edges.append(edge)
-                    
-            centrality = (len(incoming_edges) + len(outgoing_edges)) / (len(agents) - 1)
-            centralities.append(centrality)
-            
-        # Calculate centralization as variance of centralities
-        if centralities:
-            mean_centrality = sum(centralities) / len(centralities)
-            variance = sum((c - mean_centrality) ** 2 for c in centralities) / len(centralities)
-            return min(variance, 1.0)  # Normalize to 0-1 range
-            
-        return 0.0
+        structure = structure or self.network_engine.compute()
+        return structure.centralization()
         
-    def _calculate_fragmentation(self) -> float:
+    def _calculate_fragmentation(self, structure: Optional[NetworkStructure] = None) -> float:
         """Calculate network fragmentation."""
-        clusters = self.analyzer.find_trust_clusters()
-        total_agents = len(self.trust_graph.get_all_agents())
-        
-        if total_agents == 0:
-            return 0.0
-            
         # Fragmentation is higher when there are more small clusters
-        if not clusters:
-            return 1.0  # Completely fragmented
-            
-        # Calculate fragmentation based on cluster size distribution
-        cluster_sizes = [len(cluster) for cluster in clusters]
-        avg_cluster_size = sum(cluster_sizes) / len(cluster_sizes)
-        
-        # Normalize fragmentation (0 = no fragmentation, 1 = complete fragmentation)
-        fragmentation = 1.0 - (avg_cluster_size / total_agents)
-        return max(0.0, min(1.0, fragmentation))
+        structure = structure or self.network_engine.compute()
+        return structure.fragmentation()
         
     def _calculate_efficiency(self) -> float:
-        """Calculate network efficiency (inverse of average path length)."""
+        """
+        Calculate network efficiency (inverse of average path length).
+        
+        Averaged over the best-trust paths of all connected agent pairs, read
+        from the transitive trust matrix up to max_matrix_agents agents. Above
+        that, best paths are searched for a fixed-seed sample of
+        efficiency_sample_pairs ordered pairs, or all pairs if there are fewer.
+        Path confidence does not constrain the best path either way.
+        """
         agents = list(self.trust_graph.get_all_agents())
         if len(agents) < 2:
             return 0.0
             
+        matrix = self.analyzer.get_trust_matrix(max_agents=self.max_matrix_agents)
+        if matrix is not None:
+            rows = matrix.rows_recomputed
+            efficiency = matrix.get_efficiency()
+            self.network_operations["efficiency"] += (matrix.rows_recomputed - rows) * len(agents)
+            return efficiency
+            
+        total_pairs = len(agents) * (len(agents) - 1)
+        if total_pairs <= self.efficiency_sample_pairs:
+            pairs = [(a, b) for a in agents for b in agents if a != b]
+        else:
+            rng = random.Random(0)
+            pairs = []
+            for _ in range(self.efficiency_sample_pairs):
+                source, target = rng.sample(agents, 2)
+                pairs.append((source, target))
+                
         total_path_length = 0
         path_count = 0
-        
-        # Sample a subset of agent pairs for efficiency
-        sample_size = min(50, len(agents) * (len(agents) - 1) // 2)
-        pairs_checked = 0
-        
-        for i, agent1 in enumerate(agents):
-            for agent2 in agents[i+1:]:
-                if pairs_checked >= sample_size:
-                    break
-                    
-                analysis = self.analyzer.analyze_trust_paths(agent1, agent2, max_paths=1)
-                if analysis.best_path:
-                    total_path_length += analysis.best_path.path_length
-                    path_count += 1
-                    
-                pairs_checked += 1
+        labels = self.analyzer.path_labels_settled
+        for source, target in pairs:
+            analysis = self.analyzer.analyze_trust_paths(source, target, max_paths=1, min_confidence=0.0)
+            if analysis.best_path:
+                total_path_length += analysis.best_path.path_length
+                path_count += 1
+        self.network_operations["efficiency"] += len(pairs) + self.analyzer.path_labels_settled - labels
                 
         if path_count > 0:
             avg_path_length = total_path_length / path_count
@@ -475,65 +501,27 @@ class TrustMetricsCalculator:
             
         return 0.0
         
-    def _calculate_resilience(self) -> float:
+    def _calculate_resilience(self, structure: Optional[NetworkStructure] = None) -> float:
         """Calculate network resilience."""
-        # Simplified resilience calculation based on connectivity
-        agents = list(self.trust_graph.get_all_agents())
-        if len(agents) < 2:
-            return 0.0
-            
-        # Calculate resilience as the fraction of agents that remain connected
-        # when a random agent is removed
-        resilience_scores = []
-        
-        for _ in range(min(10, len(agents))):  # Sample for efficiency
-            # Simulate removing a random agent
-            remaining_agents = agents.copy()
-            removed_agent = remaining_agents.pop()
-            
-            # Count connected components
-            components = self._find_connected_components(remaining_agents)
-            largest_component = max(len(comp) for comp in components) if components else 0
-            
-            # Resilience is the fraction of agents in the largest component
-            resilience = largest_component / len(remaining_agents) if remaining_agents else 0.0
-            resilience_scores.append(resilience)
-            
-        return sum(resilience_scores) / len(resilience_scores) if resilience_scores else 0.0
+        # Expected connectivity after any single agent fails, from articulation points
+        structure = structure or self.network_engine.compute()
+        return structure.resilience()
         
-    def _find_connected_components(self, agents: List[str]) -> List[Set[str]]:
-        """Find connected components in the trust graph."""
-        components = []
-        visited = set()
+    def get_critical_agents(self, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Get agents whose failure would split the trust network.
         
-        for agent in agents:
-            if agent in visited:
-                continue
-                
-            # Start BFS from this agent
-            component = set()
-            queue = [agent]
-            
-            while queue:
-                current = queue.pop(0)
-                if current in visited:
-                    continue
-                    
-                visited.add(current)
-                component.add(current)
-                
-                # Add neighbors
-                neighbors = self.trust_graph.get_neighbors(current)
-                for neighbor in neighbors:
-                    if neighbor in agents and neighbor not in visited:
-                        edge = self.trust_graph.get_edge(current, neighbor)
-                        if edge and edge.trust_score >= 0.3:
-                            queue.append(neighbor)
-                            
-            if component:
-                components.append(component)
-                
-        return components
+        Args:
+            limit: Maximum number of agents to return
+            
+        Returns:
+            List of (agent_id, criticality) tuples, most critical first. Criticality
+            is the share of other agents cut off from the largest remaining piece.
+        """
+        critical = self.network_engine.compute().critical_agents()
+        if limit:
+            critical = critical[:limit]
+        return critical
         
     def analyze_trust_trends(
         self, 
@@ -728,6 +716,19 @@ class TrustMetricsCalculator:
         else:
             raise ValueError(f"Unsupported export format: {format}")
             
+    def close(self) -> None:
+        """Stop listening to trust graph changes and drop cached results."""
+        with self._cache_lock:
+            self._metrics_cache.close()
+        if self._owns_analyzer:
+            self.analyzer.close()
+            
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        
     def clear_cache(self) -> None:
         """Clear the metrics cache."""
         with self._cache_lock:
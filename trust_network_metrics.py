@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+GitBridge Trust Network Structure Engine
+Phase: GBP23
+Part: P23P5
+Step: P23P5S2
+Task: P23P5S2T1 - Single-Pass Network Structure
+
+Single-pass structural summary of a trust graph for TrustMetricsCalculator.
+One scan over the edges fills in/out-degree and incoming-trust arrays indexed
+by interned agent position and merges trust-thresholded clusters in a
+union-find structure, so centralization, fragmentation and community counts
+are O(N + E) instead of one edge scan or BFS per agent. Resilience comes from
+a single iterative Tarjan DFS over the trust-connected graph, which finds
+articulation points and bridges and, for every agent, how the network would
+split if that agent failed.
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [P23P5 Schema]
+"""
+
+import logging
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from trust_graph import TrustGraph
+
+logger = logging.getLogger(__name__)
+
+class DisjointSet:
+    """Array-backed union-find with union by size and path halving."""
+
+    def __init__(self, size: int):
+        self.parent = array('l', range(size))
+        self.size = array('l', [1]) * size
+        self.steps = 0  # Parent links followed by find, cumulative
+
+    def find(self, item: int) -> int:
+        parent = self.parent
+        steps = 0
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+            steps += 1
+        self.steps += steps
+        return item
+
+    def union(self, a: int, b: int) -> bool:
+        """Merge the sets containing a and b; returns False if already merged."""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return False
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+        return True
+
+    def component_sizes(self) -> List[int]:
+        """Get the size of every component."""
+        return [self.size[i] for i in range(len(self.parent)) if self.parent[i] == i]
+
+@dataclass
+class ArticulationResult:
+    """Failure impact of every agent from one Tarjan DFS."""
+    component_sizes: List[int] = field(default_factory=list)
+    articulation_points: List[int] = field(default_factory=list)
+    bridges: List[Tuple[int, int]] = field(default_factory=list)
+    cut_off: array = field(default_factory=lambda: array('l'))    # Agents separated from the largest remaining piece
+    largest_after: array = field(default_factory=lambda: array('l'))  # Largest component once the agent fails
+    steps: int = 0  # Agents visited plus adjacency entries examined
+
+def find_articulation_points(n: int, sources: array, targets: array) -> ArticulationResult:
+    """
+    Find articulation points, bridges and per-agent failure impact.
+
+    Runs Tarjan's lowlink DFS iteratively over the undirected view of the
+    given edges. Reciprocal trust collapses into one link, so a pair of agents
+    that only trust each other is still reported as a bridge.
+
+    Args:
+        n: Number of agents
+        sources: Edge source indices
+        targets: Edge target indices
+
+    Returns:
+        ArticulationResult: Components, cut vertices, bridges and failure impact
+    """
+    adjacency: List[List[Tuple[int, int]]] = [[] for _ in range(n)]
+    links = {(u, v) if u < v else (v, u) for u, v in zip(sources, targets) if u != v}
+    for edge_id, (u, v) in enumerate(links):
+        adjacency[u].append((v, edge_id))
+        adjacency[v].append((u, edge_id))
+
+    disc = array('l', [-1]) * n
+    low = array('l', [0]) * n
+    subtree = array('l', [1]) * n
+    component = array('l', [0]) * n
+    separated_sum = array('l', [0]) * n  # Size of child subtrees that detach when the agent fails
+    separated_max = array('l', [0]) * n
+    separated_count = array('l', [0]) * n
+    result = ArticulationResult()
+    timer = 0
+    steps = 0
+
+    for root in range(n):
+        if disc[root] != -1:
+            continue
+        component_id = len(result.component_sizes)
+        disc[root] = low[root] = timer
+        timer += 1
+        members = [root]
+        stack = [(root, -1, iter(adjacency[root]))]
+
+        while stack:
+            v, parent_edge, neighbors = stack[-1]
+            for w, edge_id in neighbors:
+                steps += 1
+                if edge_id == parent_edge:
+                    continue
+                if disc[w] == -1:
+                    disc[w] = low[w] = timer
+                    timer += 1
+                    members.append(w)
+                    stack.append((w, edge_id, iter(adjacency[w])))
+                    break
+                if disc[w] < low[v]:
+                    low[v] = disc[w]
+            else:
+                stack.pop()
+                if not stack:
+                    continue
+                u = stack[-1][0]
+                if low[v] < low[u]:
+                    low[u] = low[v]
+                subtree[u] += subtree[v]
+                if low[v] >= disc[u]:
+                    # v's subtree only reaches the rest of the network through u
+                    separated_sum[u] += subtree[v]
+                    separated_count[u] += 1
+                    if subtree[v] > separated_max[u]:
+                        separated_max[u] = subtree[v]
+                if low[v] > disc[u]:
+                    result.bridges.append((u, v))
+
+        steps += len(members)
+        for member in members:
+            component[member] = component_id
+        result.component_sizes.append(subtree[root])
+
+    # Largest component outside each component, for agents whose failure leaves it intact
+    order = sorted(range(len(result.component_sizes)), key=result.component_sizes.__getitem__, reverse=True)
+    first = order[0] if order else -1
+    first_size = result.component_sizes[first] if order else 0
+    second_size = result.component_sizes[order[1]] if len(order) > 1 else 0
+
+    result.cut_off = array('l', [0]) * n
+    result.largest_after = array('l', [0]) * n
+    for v in range(n):
+        size = result.component_sizes[component[v]]
+        # Only a DFS root spans its whole component; others keep their parent side
+        is_root = subtree[v] == size
+        rest = 0 if is_root else size - 1 - separated_sum[v]
+        pieces = separated_count[v] + (1 if rest > 0 else 0)
+        largest_piece = max(separated_max[v], rest)
+        if pieces >= 2:
+            result.articulation_points.append(v)
+        result.cut_off[v] = size - 1 - largest_piece
+        other = second_size if component[v] == first else first_size
+        result.largest_after[v] = max(largest_piece, other)
+
+    result.steps = steps + n
+    return result
+
+@dataclass
+class NetworkStructure:
+    """Degree arrays and component sizes from one pass over the trust edges."""
+    agents: List[str] = field(default_factory=list)
+    total_edges: int = 0
+    trust_sum: float = 0.0
+    confidence_sum: float = 0.0
+    in_degree: array = field(default_factory=lambda: array('l'))
+    out_degree: array = field(default_factory=lambda: array('l'))
+    incoming_trust: array = field(default_factory=lambda: array('d'))
+    connected_sizes: List[int] = field(default_factory=list)  # Components over connectivity threshold
+    cluster_sizes: List[int] = field(default_factory=list)    # Multi-agent components over cluster threshold
+    articulation: ArticulationResult = field(default_factory=ArticulationResult)
+
+    @property
+    def average_trust(self) -> float:
+        return self.trust_sum / self.total_edges if self.total_edges else 0.0
+
+    @property
+    def average_confidence(self) -> float:
+        return self.confidence_sum / self.total_edges if self.total_edges else 0.0
+
+    def average_incoming_trust(self, index: int) -> float:
+        """Average incoming trust of the agent at a given index."""
+        count = self.in_degree[index]
+        return self.incoming_trust[index] / count if count else 0.0
+
+    def centralization(self) -> float:
+        """Variance of degree centrality, capped at 1.0."""
+        n = len(self.agents)
+        if n < 2:
+            return 0.0
+        centralities = [(i + o) / (n - 1) for i, o in zip(self.in_degree, self.out_degree)]
+        mean_centrality = sum(centralities) / n
+        variance = sum((c - mean_centrality) ** 2 for c in centralities) / n
+        return min(variance, 1.0)
+
+    def fragmentation(self) -> float:
+        """1 - average cluster size / agents; 1.0 when no multi-agent cluster exists."""
+        total_agents = len(self.agents)
+        if total_agents == 0:
+            return 0.0
+        if not self.cluster_sizes:
+            return 1.0
+        avg_cluster_size = sum(self.cluster_sizes) / len(self.cluster_sizes)
+        return max(0.0, min(1.0, 1.0 - avg_cluster_size / total_agents))
+
+    def resilience(self) -> float:
+        """
+        Expected share of surviving agents still in the largest component
+        after a single agent fails, averaged over every possible failure.
+        """
+        n = len(self.agents)
+        if n < 2:
+            return 0.0
+        return sum(self.articulation.largest_after) / (n * (n - 1))
+
+    def criticality(self, index: int) -> float:
+        """Share of other agents cut off from the main piece if this agent fails."""
+        n = len(self.agents)
+        return self.articulation.cut_off[index] / (n - 1) if n > 1 else 0.0
+
+    def critical_agents(self) -> List[Tuple[str, float]]:
+        """Articulation points with their criticality, most critical first."""
+        ranked = [(self.agents[i], self.criticality(i)) for i in self.articulation.articulation_points]
+        ranked.sort(key=lambda item: item[1], reverse=True)
+        return ranked
+
+    def bridges(self) -> List[Tuple[str, str]]:
+        """Trust links whose loss would disconnect part of the network."""
+        return [(self.agents[u], self.agents[v]) for u, v in self.articulation.bridges]
+
+class NetworkMetricsEngine:
+    """
+    Linear-time structural metrics over a trust graph.
+
+    Phase: GBP23
+    Part: P23P5
+    Step: P23P5S2
+    Task: P23P5S2T1 - Core Implementation
+
+    Features:
+    - In/out-degree and incoming trust arrays in one edge scan
+    - Union-find trust clusters
+    - Articulation points, bridges and per-agent criticality in one DFS
+    - Centralization, fragmentation and resilience without per-agent scans
+    """
+
+    def __init__(
+        self,
+        trust_graph: TrustGraph,
+        connectivity_threshold: float = 0.3,
+        cluster_threshold: float = 0.6
+    ):
+        """
+        Initialize network metrics engine.
+
+        Args:
+            trust_graph: Trust graph to analyze
+            connectivity_threshold: Minimum trust for an edge to connect agents
+            cluster_threshold: Minimum trust for an edge to join a trust cluster
+        """
+        self.trust_graph = trust_graph
+        self.connectivity_threshold = connectivity_threshold
+        self.cluster_threshold = cluster_threshold
+        self.edges_examined = 0  # Edges scanned by compute, cumulative
+        self.union_find_steps = 0  # Parent links followed while clustering, cumulative
+        self.articulation_steps = 0  # Articulation DFS steps, cumulative
+
+    def compute(self) -> NetworkStructure:
+        """
+        Scan the trust graph once and summarize its structure.
+
+        Returns:
+            NetworkStructure: Degree arrays, trust totals and component sizes
+        """
+        agents = list(self.trust_graph.get_all_agents())
+        index: Dict[str, int] = {agent: i for i, agent in enumerate(agents)}
+        n = len(agents)
+
+        in_degree = array('l', [0]) * n
+        out_degree = array('l', [0]) * n
+        incoming_trust = array('d', [0.0]) * n
+        link_sources = array('l')
+        link_targets = array('l')
+        clusters = DisjointSet(n)
+        trust_sum = 0.0
+        confidence_sum = 0.0
+        total_edges = 0
+
+        for edge in self.trust_graph.get_all_edges():
+            source = index.get(edge.from_agent)
+            target = index.get(edge.to_agent)
+            if source is None or target is None:
+                continue
+            trust = edge.trust_score
+            total_edges += 1
+            trust_sum += trust
+            confidence_sum += edge.confidence
+            out_degree[source] += 1
+            in_degree[target] += 1
+            incoming_trust[target] += trust
+            if trust >= self.connectivity_threshold:
+                link_sources.append(source)
+                link_targets.append(target)
+            if trust >= self.cluster_threshold:
+                clusters.union(source, target)
+
+        self.edges_examined += total_edges
+        self.union_find_steps += clusters.steps
+        articulation = find_articulation_points(n, link_sources, link_targets)
+        self.articulation_steps += articulation.steps
+
+        logger.debug(f"[P23P5S2T1] Summarized network structure: {n} agents, {total_edges} edges, "
+                     f"{len(articulation.articulation_points)} articulation points")
+        return NetworkStructure(
+            agents=agents,
+            total_edges=total_edges,
+            trust_sum=trust_sum,
+            confidence_sum=confidence_sum,
+            in_degree=in_degree,
+            out_degree=out_degree,
+            incoming_trust=incoming_trust,
+            connected_sizes=articulation.component_sizes,
+            cluster_sizes=[size for size in clusters.component_sizes() if size > 1],
+            articulation=articulation
+        )
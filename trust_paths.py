@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+GitBridge Trust Path Engine
+Phase: GBP23
+Part: P23P3
+Step: P23P3S2
+Task: P23P3S2T1 - Best-Path and K-Best Trust Search
+
+Path engine for TrustAnalyzer. Path trust is the product of per-hop trust
+scores, each discounted by ``decay_factor ** hop_index``, so the search runs
+in log space over (agent, hop) labels with parent pointers instead of copying
+partial paths. The single best path comes from a max-product Dijkstra with
+Pareto pruning on hop count and confidence; further paths come from Yen's
+k-shortest simple paths algorithm.
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [P23P3 Schema]
+"""
+
+import heapq
+import logging
+import math
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+
+from trust_graph import TrustGraph
+
+logger = logging.getLogger(__name__)
+
+class PathResult(NamedTuple):
+    """A trust path with its cumulative metrics at every node."""
+    nodes: List[str]
+    costs: List[float]       # Cumulative -log(trust) used for ordering
+    trusts: List[float]      # Cumulative decayed trust product
+    confidences: List[float] # Cumulative confidence product
+
+    @property
+    def cost(self) -> float:
+        return self.costs[-1]
+
+    @property
+    def total_trust(self) -> float:
+        return self.trusts[-1]
+
+    @property
+    def confidence(self) -> float:
+        return self.confidences[-1]
+
+class TrustPathEngine:
+    """
+    Best-path and k-best-path search over a trust graph.
+
+    Phase: GBP23
+    Part: P23P3
+    Step: P23P3S2
+    Task: P23P3S2T1 - Core Implementation
+
+    Features:
+    - Log-space max-product Dijkstra with parent pointers
+    - Hop-aware decay and confidence constraints
+    - Yen-style k-best simple paths
+    - Per-query memoization of outgoing edges
+    """
+
+    def __init__(self, trust_graph: TrustGraph, max_hops: int, decay_factor: float):
+        """
+        Initialize path engine.
+
+        Args:
+            trust_graph: Trust graph to search
+            max_hops: Maximum number of hops in a returned path
+            decay_factor: Trust decay factor per hop (0.0 to 1.0)
+        """
+        self.trust_graph = trust_graph
+        self.max_hops = max_hops
+        self.decay_factor = decay_factor
+        self._decay_cost = -math.log(decay_factor) if decay_factor > 0 else math.inf
+        self._out_edges: Dict[str, List[Tuple[str, float, float, float]]] = {}
+        self.labels_settled = 0  # Labels expanded by searches, cumulative
+
+    def k_best_paths(
+        self,
+        source: str,
+        target: str,
+        k: int,
+        min_confidence: float
+    ) -> List[PathResult]:
+        """
+        Find the k highest-trust simple paths from source to target.
+
+        Args:
+            source: Source agent ID
+            target: Target agent ID
+            k: Maximum number of paths to return
+            min_confidence: Minimum path confidence
+
+        Returns:
+            List of paths ordered by descending total trust
+        """
+        if source == target or k <= 0 or self.max_hops <= 0:
+            return []
+
+        self._out_edges = {}
+        try:
+            best = self._search(source, target, 0, 0.0, 1.0, 1.0, min_confidence, frozenset(), frozenset())
+            if best is None:
+                return []
+
+            found = [best]
+            seen = {tuple(best.nodes)}
+            candidates: List[Tuple[float, int, PathResult]] = []
+            counter = 0
+
+            while len(found) < k:
+                previous = found[-1]
+                for i in range(len(previous.nodes) - 1):
+                    root = previous.nodes[:i + 1]
+                    banned_edges = frozenset(
+                        (path.nodes[i], path.nodes[i + 1])
+                        for path in found
+                        if len(path.nodes) > i + 1 and path.nodes[:i + 1] == root
+                    )
+                    spur = self._search(
+                        root[-1], target, i,
+                        previous.costs[i], previous.trusts[i], previous.confidences[i],
+                        min_confidence, frozenset(root[:-1]), banned_edges
+                    )
+                    if spur is None:
+                        continue
+
+                    candidate = PathResult(
+                        nodes=root[:-1] + spur.nodes,
+                        costs=previous.costs[:i] + spur.costs,
+                        trusts=previous.trusts[:i] + spur.trusts,
+                        confidences=previous.confidences[:i] + spur.confidences
+                    )
+                    key = tuple(candidate.nodes)
+                    if key not in seen:
+                        seen.add(key)
+                        counter += 1
+                        heapq.heappush(candidates, (candidate.cost, counter, candidate))
+
+                if not candidates:
+                    break
+                found.append(heapq.heappop(candidates)[2])
+
+            return found
+        finally:
+            self._out_edges = {}
+
+    def best_path(self, source: str, target: str, min_confidence: float) -> Optional[PathResult]:
+        """
+        Find the single highest-trust path from source to target.
+
+        Args:
+            source: Source agent ID
+            target: Target agent ID
+            min_confidence: Minimum path confidence
+
+        Returns:
+            PathResult or None if no qualifying path exists
+        """
+        paths = self.k_best_paths(source, target, 1, min_confidence)
+        return paths[0] if paths else None
+
+    def _edges_from(self, agent: str) -> List[Tuple[str, float, float, float]]:
+        """Get (neighbor, trust, confidence, -log trust) for usable outgoing edges."""
+        edges = self._out_edges.get(agent)
+        if edges is None:
+            edges = []
+            for neighbor in self.trust_graph.get_neighbors(agent):
+                edge = self.trust_graph.get_edge(agent, neighbor)
+                if edge and edge.trust_score > 0:
+                    edges.append((neighbor, edge.trust_score, edge.confidence, -math.log(edge.trust_score)))
+            self._out_edges[agent] = edges
+        return edges
+
+    def _search(
+        self,
+        start: str,
+        target: str,
+        start_hops: int,
+        start_cost: float,
+        start_trust: float,
+        start_confidence: float,
+        min_confidence: float,
+        banned_nodes: FrozenSet[str],
+        banned_edges: FrozenSet[Tuple[str, str]]
+    ) -> Optional[PathResult]:
+        """
+        Label-setting Dijkstra from start to target.
+
+        Labels are (agent, hops, cost, trust, confidence, parent) tuples in flat
+        lists; a label is pruned when another label at the same agent has no
+        more hops, no higher cost and no lower confidence.
+        """
+        if start_confidence < min_confidence:
+            return None
+
+        label_agent = [start]
+        label_hops = [start_hops]
+        label_cost = [start_cost]
+        label_trust = [start_trust]
+        label_confidence = [start_confidence]
+        label_parent = [-1]
+        label_alive = [True]
+        frontier: Dict[str, List[int]] = {start: [0]}
+        heap = [(start_cost, 0)]
+
+        while heap:
+            cost, label = heapq.heappop(heap)
+            if not label_alive[label]:
+                continue
+
+            self.labels_settled += 1
+            agent = label_agent[label]
+            if agent == target and label != 0:
+                return self._reconstruct(label, label_agent, label_cost, label_trust, label_confidence, label_parent)
+
+            hops = label_hops[label]
+            if hops >= self.max_hops:
+                continue
+
+            hop_penalty = hops * self._decay_cost if hops else 0.0
+            hop_decay = self.decay_factor ** hops
+            for neighbor, trust, confidence, edge_cost in self._edges_from(agent):
+                if neighbor == start or neighbor in banned_nodes or (agent, neighbor) in banned_edges:
+                    continue
+
+                new_confidence = label_confidence[label] * confidence
+                if new_confidence < min_confidence:
+                    continue
+                new_cost = cost + edge_cost + hop_penalty
+                new_hops = hops + 1
+
+                existing = frontier.setdefault(neighbor, [])
+                if any(
+                    label_hops[other] <= new_hops and label_cost[other] <= new_cost
+                    and label_confidence[other] >= new_confidence
+                    for other in existing
+                ):
+                    continue
+
+                # Drop labels the new one dominates
+                kept = []
+                for other in existing:
+                    if (new_hops <= label_hops[other] and new_cost <= label_cost[other]
+                            and new_confidence >= label_confidence[other]):
+                        label_alive[other] = False
+                    else:
+                        kept.append(other)
+
+                new_label = len(label_agent)
+                label_agent.append(neighbor)
+                label_hops.append(new_hops)
+                label_cost.append(new_cost)
+                label_trust.append(label_trust[label] * (trust * hop_decay))
+                label_confidence.append(new_confidence)
+                label_parent.append(label)
+                label_alive.append(True)
+                kept.append(new_label)
+                frontier[neighbor] = kept
+                heapq.heappush(heap, (new_cost, new_label))
+
+        return None
+
+    @staticmethod
+    def _reconstruct(
+        label: int,
+        label_agent: List[str],
+        label_cost: List[float],
+        label_trust: List[float],
+        label_confidence: List[float],
+        label_parent: List[int]
+    ) -> PathResult:
+        """Walk parent pointers back from a target label."""
+        chain = []
+        while label != -1:
+            chain.append(label)
+            label = label_parent[label]
+        chain.reverse()
+        return PathResult(
+            nodes=[label_agent[i] for i in chain],
+            costs=[label_cost[i] for i in chain],
+            trusts=[label_trust[i] for i in chain],
+            confidences=[label_confidence[i] for i in chain]
+        )
@@ -16,7 +16,7 @@ Schema: [P23P4 Schema]
 
 import json
 import logging
-from typing import Dict, List, Any, Optional, Tuple, Set
+from typing import Dict, List, Any, Optional, Tuple, Set, Iterator, Union
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
@@ -26,6 +26,8 @@ import threading
 
 from trust_graph import TrustGraph, TrustEdge
 from trust_analyzer import TrustAnalyzer, TrustPath, TrustAnalysis
+from trust_layout import ForceLayoutEngine
+from trust_export import StreamingExporter, ExportSummary
 
 logger = logging.getLogger(__name__)
 
@@ -100,6 +102,7 @@ class TrustVisualizer:
         self.layout_type = "force_directed"  # "force_directed", "circular", "hierarchical"
         self.node_spacing = 100.0
         self.edge_length = 150.0
+        self.layout_engine = ForceLayoutEngine(edge_length=self.edge_length)
         
         # Color schemes
         self.color_schemes = {
@@ -127,6 +130,9 @@ class TrustVisualizer:
     def _build_visualization(self) -> None:
         """Build the initial visualization from the trust graph."""
         with self._lock:
+            # Keep current positions so the layout can warm-start
+            previous_positions = {node_id: (node.x, node.y) for node_id, node in self.nodes.items()}
+            
             # Clear existing visualization
             self.nodes.clear()
             self.edges.clear()
@@ -166,7 +172,7 @@ class TrustVisualizer:
             self._calculate_node_trust_scores()
             
             # Apply layout
-            self._apply_layout()
+            self._apply_layout(previous_positions)
             
     def _calculate_node_trust_scores(self) -> None:
         """Calculate trust scores for nodes based on incoming edges."""
@@ -200,12 +206,17 @@ class TrustVisualizer:
         """Get node size based on trust score."""
         return 8.0 + (trust_score * 12.0)  # Range: 8.0 to 20.0
         
-    def _apply_layout(self) -> None:
-        """Apply layout algorithm to position nodes."""
+    def _apply_layout(self, previous_positions: Optional[Dict[str, Tuple[float, float]]] = None) -> None:
+        """
+        Apply layout algorithm to position nodes.
+        
+        Args:
+            previous_positions: Earlier node positions to warm-start force layout from
+        """
         if self.layout_type == "circular":
             self._apply_circular_layout()
         elif self.layout_type == "force_directed":
-            self._apply_force_directed_layout()
+            self._apply_force_directed_layout(previous_positions)
         elif self.layout_type == "hierarchical":
             self._apply_hierarchical_layout()
             
@@ -220,50 +231,23 @@ class TrustVisualizer:
             node.x = center_x + radius * math.cos(angle)
             node.y = center_y + radius * math.sin(angle)
             
-    def _apply_force_directed_layout(self) -> None:
-        """Apply force-directed layout (simplified)."""
-        # Simple force-directed layout with repulsion and attraction
-        nodes_list = list(self.nodes.values())
+    def _apply_force_directed_layout(self, previous_positions: Optional[Dict[str, Tuple[float, float]]] = None) -> None:
+        """
+        Apply tree-accelerated force-directed layout.
         
-        # Initialize random positions
-        for node in nodes_list:
-            node.x = 400.0 + (hash(node.id) % 200 - 100)
-            node.y = 300.0 + (hash(node.id) % 200 - 100)
-            
-        # Apply forces for a few iterations
-        for _ in range(50):
-            # Repulsion between all nodes
-            for i, node1 in enumerate(nodes_list):
-                for j, node2 in enumerate(nodes_list[i+1:], i+1):
-                    dx = node2.x - node1.x
-                    dy = node2.y - node1.y
-                    distance = math.sqrt(dx*dx + dy*dy)
-                    
-                    if distance > 0:
-                        # Repulsion force
-                        force = 1000.0 / (distance * distance)
-                        node1.x -= (dx / distance) * force * 0.01
-                        node1.y -= (dy / distance) * force * 0.01
-                        node2.x += (dx / distance) * force * 0.01
-                        node2.y += (dy / distance) * force * 0.01
-                        
-            # Attraction along edges
-            for edge in self.edges.values():
-                source_node = self.nodes[edge.source]
-                target_node = self.nodes[edge.target]
-                
-                dx = target_node.x - source_node.x
-                dy = target_node.y - source_node.y
-                distance = math.sqrt(dx*dx + dy*dy)
-                
-                if distance > 0:
-                    # Attraction force based on trust score
-                    force = (distance - self.edge_length) * edge.trust_score * 0.1
-                    source_node.x += (dx / distance) * force
-                    source_node.y += (dy / distance) * force
-                    target_node.x -= (dx / distance) * force
-                    target_node.y -= (dy / distance) * force
-                    
+        Args:
+            previous_positions: Earlier node positions; when most nodes have one,
+                only a short settling run is done instead of a full relayout
+        """
+        node_ids = list(self.nodes.keys())
+        edges = [(edge.source, edge.target, edge.trust_score) for edge in self.edges.values()]
+        
+        positions = self.layout_engine.layout(node_ids, edges, previous_positions)
+        for node_id, (x, y) in zip(node_ids, positions.tolist()):
+            node = self.nodes[node_id]
+            node.x = x
+            node.y = y
+            
     def _apply_hierarchical_layout(self) -> None:
         """Apply hierarchical layout."""
         # Simple hierarchical layout based on trust scores
@@ -415,116 +399,83 @@ class TrustVisualizer:
                 }
             }
             
-    def export_visualization(self, format: str = "json", output_file: Optional[str] = None) -> str:
+    def export_visualization(
+        self,
+        format: str = "json",
+        output_file: Optional[str] = None,
+        min_trust: Optional[float] = None,
+        cluster_threshold: Optional[float] = None
+    ) -> str:
         """
         Export visualization to various formats.
         
         Args:
             format: Export format ("json", "svg", "dot")
             output_file: Optional output file path
+            min_trust: Optional trust threshold below which edges are dropped
+            cluster_threshold: Optional trust level at which clusters collapse into one node
             
         Returns:
             str: Exported visualization data or file path
         """
-        if format == "json":
-            data = self.get_visualization_data()
-            json_data = json.dumps(data, indent=2)
-            
-            if output_file:
-                with open(output_file, 'w') as f:
-                    f.write(json_data)
-                return output_file
-            else:
-                return json_data
-                
-        elif format == "svg":
-            return self._export_svg(output_file)
-            
-        elif format == "dot":
-            return self._export_dot(output_file)
-            
-        else:
-            raise ValueError(f"Unsupported export format: {format}")
-            
-    def _export_svg(self, output_file: Optional[str] = None) -> str:
-        """Export visualization as SVG."""
-        data = self.get_visualization_data()
-        
-        # Calculate viewport
-        min_x = min(node["x"] for node in data["nodes"]) - 50
-        max_x = max(node["x"] for node in data["nodes"]) + 50
-        min_y = min(node["y"] for node in data["nodes"]) - 50
-        max_y = max(node["y"] for node in data["nodes"]) + 50
-        width = max_x - min_x
-        height = max_y - min_y
-        
-        svg_content = f'''<?xml version="1.0" encoding="UTF-8"?>
-<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">
-  <defs>
-    <marker id="arrowhead" markerWidth="10" markerHeight="7" 
-            refX="9" refY="3.5" orient="auto">
-      <polygon points="0 0, 10 3.5, 0 7" fill="#95a5a6"/>
-    </marker>
-  </defs>
-  
-  <!-- Edges -->
-'''
-        
-        # Add edges
-        for edge in data["edges"]:
-            source_node = next(n for n in data["nodes"] if n["id"] == edge["source"])
-            target_node = next(n for n in data["nodes"] if n["id"] == edge["target"])
-            
-            svg_content += f'''  <line x1="{source_node['x']}" y1="{source_node['y']}" 
-        x2="{target_node['x']}" y2="{target_node['y']}" 
-        stroke="{edge['color']}" stroke-width="{edge['width']}" 
-        marker-end="url(#arrowhead)"/>
-'''
-            
-        # Add nodes
-        for node in data["nodes"]:
-            svg_content += f'''  <circle cx="{node['x']}" cy="{node['y']}" r="{node['size']}" 
-        fill="{node['color']}" stroke="#2c3e50" stroke-width="2"/>
-  <text x="{node['x']}" y="{node['y'] + node['size'] + 15}" 
-        text-anchor="middle" font-family="Arial" font-size="12" fill="#2c3e50">
-    {node['label']}
-  </text>
-'''
-            
-        svg_content += "</svg>"
-        
+        exporter = self._create_exporter(min_trust, cluster_threshold)
         if output_file:
-            with open(output_file, 'w') as f:
-                f.write(svg_content)
+            exporter.write(output_file, format)
             return output_file
-        else:
-            return svg_content
-            
-    def _export_dot(self, output_file: Optional[str] = None) -> str:
-        """Export visualization as DOT format for Graphviz."""
-        data = self.get_visualization_data()
+        return "".join(exporter.iter_chunks(format))
         
-        dot_content = "digraph trust_graph {\n"
-        dot_content += "  rankdir=LR;\n"
-        dot_content += "  node [shape=circle, style=filled];\n"
-        dot_content += "  edge [arrowsize=0.5];\n\n"
+    def stream_visualization(
+        self,
+        output: Union[str, Path, Any],
+        format: str = "json",
+        min_trust: Optional[float] = None,
+        cluster_threshold: Optional[float] = None
+    ) -> ExportSummary:
+        """
+        Stream visualization to a file, text stream or socket with bounded memory.
         
-        # Add nodes
-        for node in data["nodes"]:
-            dot_content += f'  "{node["id"]}" [label="{node["label"]}", fillcolor="{node["color"]}", width={node["size"]/10:.1f}];\n'
+        Args:
+            output: File path, object with write(), or socket with sendall()
+            format: Export format ("json", "svg", "dot")
+            min_trust: Optional trust threshold below which edges are dropped
+            cluster_threshold: Optional trust level at which clusters collapse into one node
             
-        # Add edges
-        for edge in data["edges"]:
-            dot_content += f'  "{edge["source"]}" -> "{edge["target"]}" [label="{edge["label"]}", color="{edge["color"]}", penwidth={edge["width"]}];\n'
+        Returns:
+            ExportSummary: Counts of written, culled and aggregated elements
+        """
+        return self._create_exporter(min_trust, cluster_threshold).write(output, format)
+        
+    def iter_visualization(
+        self,
+        format: str = "json",
+        min_trust: Optional[float] = None,
+        cluster_threshold: Optional[float] = None
+    ) -> Iterator[str]:
+        """
+        Render visualization as text chunks, e.g. for a streaming HTTP response.
+        
+        Args:
+            format: Export format ("json", "svg", "dot")
+            min_trust: Optional trust threshold below which edges are dropped
+            cluster_threshold: Optional trust level at which clusters collapse into one node
             
-        dot_content += "}\n"
+        Returns:
+            Iterator[str]: Export chunks in document order
+        """
+        return self._create_exporter(min_trust, cluster_threshold).iter_chunks(format)
         
-        if output_file:
-            with open(output_file, 'w') as f:
-                f.write(dot_content)
-            return output_file
-        else:
-            return dot_content
+    def _create_exporter(self, min_trust: Optional[float], cluster_threshold: Optional[float]) -> StreamingExporter:
+        """Snapshot node and edge references so the export can run without the lock."""
+        with self._lock:
+            return StreamingExporter(
+                nodes=dict(self.nodes),
+                edges=list(self.edges.values()),
+                paths=list(self.paths),
+                layout_type=self.layout_type,
+                min_trust=min_trust,
+                cluster_threshold=cluster_threshold,
+                edge_style=lambda trust_score: (self._get_trust_color(trust_score), self._get_trust_width(trust_score))
+            )
             
     def update_node_position(self, node_id: str, x: float, y: float) -> bool:
         """
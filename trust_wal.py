@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+GitBridge Trust Graph Write-Ahead Log
+Phase: GBP23
+Part: P23P1
+Step: P23P1S3
+Task: P23P1S3T1 - Append-Only Trust Persistence
+
+Append-only write-ahead log for trust graph deltas. Each record is a single
+compact JSON line carrying a monotonically increasing sequence number, so
+per-update I/O stays constant regardless of graph size. Snapshots record the
+last sequence number they contain, which makes replay after a crash between
+snapshot and truncation idempotent.
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [P23P1 Schema]
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class TrustWAL:
+    """
+    Append-only delta log for TrustGraph persistence.
+
+    Phase: GBP23
+    Part: P23P1
+    Step: P23P1S3
+    Task: P23P1S3T1 - Core Implementation
+
+    Features:
+    - Compact single-line JSON records
+    - Sequence numbers for idempotent replay
+    - Tolerates a torn trailing record after a crash
+    - Skips and reports corrupt records followed by valid ones
+    - Optional fsync for power-loss durability
+    """
+
+    def __init__(self, wal_path: Path, fsync: bool = False):
+        """
+        Initialize write-ahead log.
+
+        Args:
+            wal_path: Path of the log file
+            fsync: Whether to fsync after every append
+        """
+        self.wal_path = Path(wal_path)
+        self.fsync = fsync
+        self.seq = 0
+        self.record_count = 0
+        self.corrupt_records = 0
+        self._file = None
+
+    def append(self, records: List[Dict[str, Any]]) -> int:
+        """
+        Append delta records to the log.
+
+        Args:
+            records: Records to append; each gets a sequence number
+
+        Returns:
+            int: Sequence number of the last appended record
+        """
+        if not records:
+            return self.seq
+
+        lines = []
+        for record in records:
+            self.seq += 1
+            record['seq'] = self.seq
+            lines.append(json.dumps(record, separators=(',', ':'), default=str))
+
+        if self._file is None:
+            self._file = open(self.wal_path, 'a', encoding='utf-8')
+        self._file.write('\n'.join(lines) + '\n')
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+        self.record_count += len(records)
+        return self.seq
+
+    def replay(self, after_seq: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Yield logged records newer than a snapshot.
+
+        Args:
+            after_seq: Sequence number already contained in the snapshot
+
+        Yields:
+            Dict: Delta records in append order
+        """
+        self.seq = max(self.seq, after_seq)
+        if not self.wal_path.exists():
+            return
+
+        offset = 0
+        bad_line: Optional[int] = None  # First undecodable line since the last valid record
+        bad_offset = 0
+        unterminated = False
+        with open(self.wal_path, 'rb') as f:
+            for line_number, raw in enumerate(f, 1):
+                line = raw.strip()
+                offset += len(raw)
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    if bad_line is None:
+                        bad_line, bad_offset = line_number, offset - len(raw)
+                    continue
+
+                if bad_line is not None:
+                    # Valid records follow, so this is corruption rather than a torn write;
+                    # skip it instead of discarding the committed records after it
+                    self.corrupt_records += 1
+                    logger.error(f"[P23P1S3T1] Skipping corrupt WAL record at line {bad_line} of {self.wal_path}; "
+                                 f"later records are still applied")
+                    bad_line = None
+                unterminated = not raw.endswith(b'\n')
+                self.record_count += 1
+                seq = record.get('seq', 0)
+                self.seq = max(self.seq, seq)
+                if seq > after_seq:
+                    yield record
+
+        # Later appends must start on a fresh line, not after the torn bytes
+        if bad_line is not None:
+            logger.warning(f"[P23P1S3T1] Ignoring truncated WAL record at line {bad_line}")
+            self._repair(bad_offset)
+        elif unterminated:
+            with open(self.wal_path, 'ab') as f:
+                f.write(b'\n')
+
+    def _repair(self, good_offset: int) -> None:
+        """Cut the log back to its last complete record."""
+        self.close()
+        os.truncate(self.wal_path, good_offset)
+        logger.info(f"[P23P1S3T1] Truncated WAL to {good_offset} bytes after a torn record")
+
+    def truncate(self) -> None:
+        """Discard all logged records after they were folded into a snapshot."""
+        self.close()
+        with open(self.wal_path, 'w', encoding='utf-8') as f:
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        self.record_count = 0
+
+    def close(self) -> None:
+        """Close the underlying file handle."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get write-ahead log statistics.
+
+        Returns:
+            Dict containing log statistics
+        """
+        size_bytes: Optional[int] = None
+        if self.wal_path.exists():
+            size_bytes = self.wal_path.stat().st_size
+        return {
+            'wal_path': str(self.wal_path),
+            'wal_seq': self.seq,
+            'wal_records': self.record_count,
+            'wal_corrupt_records': self.corrupt_records,
+            'wal_size_bytes': size_bytes or 0,
+            'wal_fsync': self.fsync
+        }
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+GitBridge Buffered Log Sink
+Phase: GBP20
+Part: P20P7
+Step: P20P7S3
+Task: P20P7S3T4 - Buffered Asynchronous Log Writer
+
+Shared background writer for JSONL logs produced on the request path.
+Producers enqueue records into a bounded queue and return immediately; a
+single writer thread serializes them, appends them in batches to files it
+keeps open, and rotates files by size or age. When the queue is full a record
+is dropped and counted rather than blocking the request. The shared sink is
+flushed and closed at interpreter exit.
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [Corrected P20P7 Schema]
+"""
+
+import os
+import json
+import time
+import queue
+import atexit
+import logging
+import threading
+from typing import Dict, Any, List, Optional, Tuple, IO
+
+logger = logging.getLogger(__name__)
+
+class _Marker:
+    """Queue item that asks the writer to flush (and optionally stop)."""
+
+    def __init__(self, stop: bool = False):
+        self.stop = stop
+        self.done = threading.Event()
+
+class LogSink:
+    """
+    Bounded, batched, rotating JSONL writer running on a background thread.
+
+    Phase: GBP20
+    Part: P20P7
+    Step: P20P7S3
+    Task: P20P7S3T4 - Core Implementation
+
+    Features:
+    - Non-blocking enqueue with counted drops under backpressure
+    - Batched writes to files kept open between batches
+    - Size and age based rotation with numbered backups
+    - Explicit flush and close, plus a close-at-exit hook
+    """
+
+    def __init__(
+        self,
+        max_queue: int = 10000,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        max_bytes: int = 10 * 1024 * 1024,
+        rotate_interval: Optional[float] = None,
+        backup_count: int = 5,
+        enqueue_timeout: float = 0.0
+    ):
+        """
+        Initialize log sink and start its writer thread.
+
+        Args:
+            max_queue: Maximum number of records waiting to be written
+            batch_size: Maximum number of records written per batch
+            flush_interval: Longest time a record waits before it is written
+            max_bytes: Rotate a file once it reaches this size (0 disables)
+            rotate_interval: Rotate a file once it is this many seconds old (None disables)
+            backup_count: Number of rotated files kept as path.1 ... path.N
+            enqueue_timeout: Seconds a producer may wait for queue space before
+                the record is dropped (0 never waits)
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backup_count = backup_count
+        self.enqueue_timeout = enqueue_timeout
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._files: Dict[str, Tuple[IO[str], float]] = {}  # Path -> (handle, opened at)
+        self._stats_lock = threading.Lock()
+        self._closed = False
+
+        # Statistics
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.rotations = 0
+        self.write_errors = 0
+
+        self._thread = threading.Thread(target=self._run, name="gitbridge-log-sink", daemon=True)
+        self._thread.start()
+
+    def write(self, path: str, record: Dict[str, Any]) -> bool:
+        """
+        Enqueue a record for appending to a JSONL file.
+
+        The record is serialized on the writer thread, so callers must not
+        modify it afterwards.
+
+        Args:
+            path: Log file path
+            record: JSON-serializable record
+
+        Returns:
+            bool: False if the record was dropped because the queue was full
+        """
+        if not self._closed:
+            try:
+                if self.enqueue_timeout > 0:
+                    self._queue.put((path, record), timeout=self.enqueue_timeout)
+                else:
+                    self._queue.put_nowait((path, record))
+                with self._stats_lock:
+                    self.enqueued += 1
+                return True
+            except queue.Full:
+                pass
+        with self._stats_lock:
+            self.dropped += 1
+        return False
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Wait until every record enqueued so far is written.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            bool: True if the records were written within the timeout
+        """
+        return self._send_marker(_Marker(), timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Write pending records, close files and stop the writer thread.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            bool: True if the sink shut down within the timeout
+        """
+        if self._closed:
+            return True
+        self._closed = True
+        stopped = self._send_marker(_Marker(stop=True), timeout)
+        self._thread.join(timeout)
+        return stopped
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get sink statistics.
+
+        Returns:
+            Dict containing queue depth and enqueue, write and drop counters
+        """
+        with self._stats_lock:
+            return {
+                "queued": self._queue.qsize(),
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "dropped": self.dropped,
+                "batches": self.batches,
+                "rotations": self.rotations,
+                "write_errors": self.write_errors
+            }
+
+    def _send_marker(self, marker: _Marker, timeout: Optional[float]) -> bool:
+        if not self._thread.is_alive():
+            return False
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.done.wait(timeout)
+
+    def _run(self) -> None:
+        """Writer loop: collect a batch, write it, then acknowledge markers."""
+        while True:
+            try:
+                items = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                self._rotate_expired()
+                continue
+
+            # Drain up to a batch without waiting
+            while len(items) < self.batch_size and not isinstance(items[-1], _Marker):
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            records = [item for item in items if not isinstance(item, _Marker)]
+            if records:
+                self._write_batch(records)
+
+            marker = items[-1] if isinstance(items[-1], _Marker) else None
+            if marker is not None:
+                for handle, _ in self._files.values():
+                    handle.flush()
+                if marker.stop:
+                    self._close_files()
+                    marker.done.set()
+                    return
+                marker.done.set()
+
+    def _write_batch(self, records: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Append records grouped by file, rotating files that are full or old."""
+        by_path: Dict[str, List[str]] = {}
+        for path, record in records:
+            try:
+                by_path.setdefault(path, []).append(json.dumps(record, default=str) + '\n')
+            except (TypeError, ValueError) as e:
+                logger.error(f"[P20P7S3T4] Unserializable log record for {path}: {e}")
+                with self._stats_lock:
+                    self.write_errors += 1
+
+        written = 0
+        for path, lines in by_path.items():
+            try:
+                handle = self._open(path)
+                handle.write(''.join(lines))
+                handle.flush()
+                written += len(lines)
+                if self.max_bytes and handle.tell() >= self.max_bytes:
+                    self._rotate(path)
+            except OSError as e:
+                logger.error(f"[P20P7S3T4] Failed to write {len(lines)} records to {path}: {e}")
+                self._discard(path)
+                with self._stats_lock:
+                    self.write_errors += len(lines)
+
+        with self._stats_lock:
+            self.written += written
+            self.batches += 1
+
+    def _open(self, path: str) -> IO[str]:
+        """Get the open handle for a path, rotating it first if it is too old."""
+        entry = self._files.get(path)
+        if entry is not None and self.rotate_interval is not None and time.time() - entry[1] >= self.rotate_interval:
+            self._rotate(path)
+            entry = None
+        if entry is None:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            entry = self._files[path] = (open(path, 'a', encoding='utf-8'), time.time())
+        return entry[0]
+
+    def _rotate_expired(self) -> None:
+        """Rotate open files that have exceeded rotate_interval while idle."""
+        if self.rotate_interval is None:
+            return
+        now = time.time()
+        for path, (_, opened_at) in list(self._files.items()):
+            if now - opened_at >= self.rotate_interval:
+                self._rotate(path)
+
+    def _rotate(self, path: str) -> None:
+        """
+        Close a file and shift it to path.1, keeping backup_count backups.
+
+        A failed rotation is logged and counted as a write error; the file is
+        reopened and appended to by the next batch.
+        """
+        self._discard(path)
+        try:
+            if self.backup_count > 0:
+                for index in range(self.backup_count - 1, 0, -1):
+                    source = f"{path}.{index}"
+                    if os.path.exists(source):
+                        os.replace(source, f"{path}.{index + 1}")
+                os.replace(path, f"{path}.1")
+            else:
+                os.remove(path)
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.error(f"[P20P7S3T4] Failed to rotate {path}: {e}")
+            with self._stats_lock:
+                self.write_errors += 1
+            return
+        with self._stats_lock:
+            self.rotations += 1
+        logger.debug(f"[P20P7S3T4] Rotated {path}")
+
+    def _discard(self, path: str) -> None:
+        """Close and forget a path's handle; a failing close is logged, not raised."""
+        entry = self._files.pop(path, None)
+        if entry is None:
+            return
+        try:
+            entry[0].close()
+        except OSError as e:
+            logger.error(f"[P20P7S3T4] Failed to close {path}: {e}")
+
+    def _close_files(self) -> None:
+        for handle, _ in self._files.values():
+            handle.close()
+        self._files.clear()
+
+_default_sink: Optional[LogSink] = None
+_default_sink_lock = threading.Lock()
+
+def get_log_sink() -> LogSink:
+    """Get the process-wide log sink, closed automatically at exit."""
+    global _default_sink
+    with _default_sink_lock:
+        if _default_sink is None:
+            _default_sink = LogSink()
+            atexit.register(_default_sink.close)
+        return _default_sink
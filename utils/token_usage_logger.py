@@ -4,15 +4,18 @@ GitBridge Token Usage Logger
 Task: P20P6B - Grok Integration Enhancements
 
 Centralized token usage tracking system for SmartRouter's dynamic load balancing.
+Records are handed to the shared background log sink, so logging a call does
+no file I/O on the request path.
 """
 
 import os
-import json
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 from dataclasses import dataclass, asdict
-from threading import Lock
+
+from utils.log_sink import LogSink, get_log_sink
+from utils.usage_rollup import UsageRollup
 
 # Configure logging
 logging.basicConfig(
@@ -42,18 +45,17 @@ class TokenUsageRecord:
 class TokenUsageLogger:
     """Centralized token usage tracking system."""
     
-    def __init__(self, log_file: str = 'logs/usage_grok.log'):
+    def __init__(self, log_file: str = 'logs/usage_grok.log', sink: Optional[LogSink] = None):
         """
         Initialize token usage logger.
         
         Args:
             log_file: Path to log file
+            sink: Log sink that writes the records (defaults to the shared sink)
         """
         self.log_file = log_file
-        self._lock = Lock()  # Thread-safe logging
-        
-        # Ensure log directory exists
-        os.makedirs(os.path.dirname(log_file), exist_ok=True)
+        self.sink = sink or get_log_sink()
+        self.rollup = UsageRollup(log_file)
         
         # Cost per token rates (can be updated via environment variables)
         self.cost_rates = {
@@ -96,14 +98,11 @@ class TokenUsageLogger:
                 error=error
             )
             
-            # Log to file (thread-safe)
-            with self._lock:
-                with open(self.log_file, 'a') as f:
-                    json.dump(asdict(record), f)
-                    f.write('\n')
+            # Hand off to the background writer
+            self.sink.write(self.log_file, asdict(record))
                     
             # Log summary
-            logger.info(
+            logger.debug(
                 f"Token usage logged - Model: {model}, "
                 f"Tokens: {total_tokens}, Cost: ${cost:.4f}, "
                 f"Latency: {latency:.2f}s"
@@ -113,67 +112,48 @@ class TokenUsageLogger:
             logger.error(f"Failed to log token usage: {str(e)}")
             
     def get_usage_summary(self, provider: Optional[str] = None,
-                       model: Optional[str] = None) -> Dict[str, Any]:
+                       model: Optional[str] = None,
+                       start: Optional[datetime] = None,
+                       end: Optional[datetime] = None) -> Dict[str, Any]:
         """
         Get usage summary statistics.
         
+        Only log lines appended since the previous call are parsed; the
+        summary itself is computed from hourly rollups.
+        
         Args:
             provider: Filter by provider
             model: Filter by model
+            start: Only hours ending after this time
+            end: Only hours starting at or before this time
             
         Returns:
             Dict containing usage statistics
         """
-        summary = {
-            "total_cost": 0.0,
-            "total_tokens": 0,
-            "total_calls": 0,
-            "successful_calls": 0,
-            "average_latency": 0.0,
-            "by_model": {}
-        }
+        # Include records still waiting in the sink
+        self.sink.flush()
+        self.rollup.refresh()
+        return self.rollup.summary(provider, model, start, end)
         
-        try:
-            with open(self.log_file, 'r') as f:
-                total_latency = 0.0
-                
-                for line in f:
-                    record = json.loads(line)
-                    
-                    # Apply filters
-                    if provider and record['provider'] != provider:
-                        continue
-                    if model and record['model'] != model:
-                        continue
-                        
-                    # Update summary
-                    summary["total_cost"] += record["cost_usd"]
-                    summary["total_tokens"] += record["total_tokens"]
-                    summary["total_calls"] += 1
-                    if record["success"]:
-                        summary["successful_calls"] += 1
-                    total_latency += record["latency"]
-                    
-                    # Update model-specific stats
-                    model_key = record["model"]
-                    if model_key not in summary["by_model"]:
-                        summary["by_model"][model_key] = {
-                            "total_tokens": 0,
-                            "total_cost": 0.0,
-                            "calls": 0
-                        }
-                    summary["by_model"][model_key]["total_tokens"] += record["total_tokens"]
-                    summary["by_model"][model_key]["total_cost"] += record["cost_usd"]
-                    summary["by_model"][model_key]["calls"] += 1
-                    
-                # Calculate average latency
-                if summary["total_calls"] > 0:
-                    summary["average_latency"] = total_latency / summary["total_calls"]
-                    
-        except FileNotFoundError:
-            logger.warning(f"Usage log file not found: {self.log_file}")
+    def get_hourly_usage(self, provider: Optional[str] = None,
+                       model: Optional[str] = None,
+                       start: Optional[datetime] = None,
+                       end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Get usage per hour, oldest first.
+        
+        Args:
+            provider: Filter by provider
+            model: Filter by model
+            start: Only hours ending after this time
+            end: Only hours starting at or before this time
             
-        return summary
+        Returns:
+            List of hourly cost, token and call totals
+        """
+        self.sink.flush()
+        self.rollup.refresh()
+        return self.rollup.hourly(provider, model, start, end)
 
 # Global instance
 token_logger = TokenUsageLogger()
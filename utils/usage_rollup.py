@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+GitBridge Token Usage Rollups
+Phase: GBP20
+Part: P20P7
+Step: P20P7S3
+Task: P20P7S3T5 - Incremental Token Usage Aggregation
+
+Incremental aggregator for the JSONL token usage log. Running totals are kept
+per (provider, model, hour) and the aggregator remembers the byte offset it
+has read up to, so each refresh parses only newly appended lines and a
+summary costs O(buckets) regardless of log size. Totals and offset are
+checkpointed next to the log, which lets a restarted process resume without
+re-reading history. After rotation the old log is finished from whichever
+numbered backup holds it and any newer backups are read before the new file.
+
+Author: GitBridge Development Team
+Date: 2025-06-19
+Schema: [Corrected P20P7 Schema]
+"""
+
+import os
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+HOUR_KEY_LENGTH = 13  # "YYYY-MM-DDTHH" prefix of an ISO timestamp
+
+BucketKey = Tuple[str, str, str]  # (provider, model, hour)
+
+def _hour_key(moment: datetime) -> str:
+    return moment.strftime('%Y-%m-%dT%H')
+
+class UsageRollup:
+    """
+    Hourly token usage totals maintained incrementally from a JSONL log.
+
+    Phase: GBP20
+    Part: P20P7
+    Step: P20P7S3
+    Task: P20P7S3T5 - Core Implementation
+
+    Features:
+    - Parses only lines appended since the last refresh
+    - Per (provider, model, hour) cost, token, call and latency totals
+    - Filtered and time-range summaries in O(buckets)
+    - Checkpointed offset and totals, rotation aware
+    """
+
+    def __init__(self, log_file: str, checkpoint_file: Optional[str] = None):
+        """
+        Initialize usage rollup and load its checkpoint.
+
+        Args:
+            log_file: Path to the JSONL usage log
+            checkpoint_file: Where totals and offset are saved (defaults to
+                log_file + '.rollup.json')
+        """
+        self.log_file = log_file
+        self.checkpoint_file = checkpoint_file or f"{log_file}.rollup.json"
+
+        self._buckets: Dict[BucketKey, Dict[str, float]] = {}
+        self._offset = 0
+        self._inode: Optional[int] = None
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.lines_parsed = 0
+        self.lines_skipped = 0
+        self.rotations_missed = 0
+
+        self._load_checkpoint()
+
+    def refresh(self) -> int:
+        """
+        Fold newly appended log lines into the totals.
+
+        Returns:
+            int: Number of records added
+        """
+        with self._lock:
+            try:
+                stat = os.stat(self.log_file)
+            except FileNotFoundError:
+                return 0
+
+            added = 0
+            if self._inode is not None and stat.st_ino != self._inode:
+                added += self._read_rotated()
+            if stat.st_size < self._offset:
+                # Truncated in place; lines before the offset were already read
+                self._offset = 0
+            self._inode = stat.st_ino
+
+            if stat.st_size > self._offset:
+                added += self._read_from(self.log_file)
+            if added:
+                self._save_checkpoint()
+            return added
+
+    def summary(
+        self,
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """
+        Summarize usage from the rollups.
+
+        Args:
+            provider: Filter by provider
+            model: Filter by model
+            start: Only hours ending after this time
+            end: Only hours starting at or before this time
+
+        Returns:
+            Dict with total cost, tokens, calls, successful calls, average
+            latency and per-model totals
+        """
+        summary = {
+            "total_cost": 0.0,
+            "total_tokens": 0,
+            "total_calls": 0,
+            "successful_calls": 0,
+            "average_latency": 0.0,
+            "by_model": {}
+        }
+        total_latency = 0.0
+
+        for (_, model_key, _), totals in self._select(provider, model, start, end):
+            summary["total_cost"] += totals["cost_usd"]
+            summary["total_tokens"] += int(totals["total_tokens"])
+            summary["total_calls"] += int(totals["calls"])
+            summary["successful_calls"] += int(totals["successful_calls"])
+            total_latency += totals["latency"]
+
+            model_summary = summary["by_model"].setdefault(model_key, {
+                "total_tokens": 0,
+                "total_cost": 0.0,
+                "calls": 0
+            })
+            model_summary["total_tokens"] += int(totals["total_tokens"])
+            model_summary["total_cost"] += totals["cost_usd"]
+            model_summary["calls"] += int(totals["calls"])
+
+        if summary["total_calls"] > 0:
+            summary["average_latency"] = total_latency / summary["total_calls"]
+        return summary
+
+    def hourly(
+        self,
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Usage per hour, oldest first.
+
+        Args:
+            provider: Filter by provider
+            model: Filter by model
+            start: Only hours ending after this time
+            end: Only hours starting at or before this time
+
+        Returns:
+            List of dicts with hour, cost, tokens, calls and successful calls
+        """
+        hours: Dict[str, Dict[str, Any]] = {}
+        for (_, _, hour), totals in self._select(provider, model, start, end):
+            row = hours.setdefault(hour, {
+                "hour": hour,
+                "total_cost": 0.0,
+                "total_tokens": 0,
+                "total_calls": 0,
+                "successful_calls": 0
+            })
+            row["total_cost"] += totals["cost_usd"]
+            row["total_tokens"] += int(totals["total_tokens"])
+            row["total_calls"] += int(totals["calls"])
+            row["successful_calls"] += int(totals["successful_calls"])
+        return [hours[hour] for hour in sorted(hours)]
+
+    def _select(
+        self,
+        provider: Optional[str],
+        model: Optional[str],
+        start: Optional[datetime],
+        end: Optional[datetime]
+    ) -> List[Tuple[BucketKey, Dict[str, float]]]:
+        """Buckets matching the filters; hour keys compare correctly as strings."""
+        start_key = _hour_key(start) if start else None
+        end_key = _hour_key(end) if end else None
+        with self._lock:
+            return [
+                (key, dict(totals)) for key, totals in self._buckets.items()
+                if (provider is None or key[0] == provider)
+                and (model is None or key[1] == model)
+                and (start_key is None or key[2] >= start_key)
+                and (end_key is None or key[2] <= end_key)
+            ]
+
+    def _read_rotated(self) -> int:
+        """
+        Finish the old log from whichever backup now holds it, then read every
+        newer backup in full, oldest first. The log may have rotated several
+        times since the last refresh, so backups .1, .2, ... are searched for
+        the recorded inode.
+        """
+        backups = []
+        while True:
+            backup = f"{self.log_file}.{len(backups) + 1}"
+            try:
+                backups.append((backup, os.stat(backup).st_ino))
+            except FileNotFoundError:
+                break
+
+        added = 0
+        for index, (_, inode) in enumerate(backups):
+            if inode != self._inode:
+                continue
+            for backup, _ in reversed(backups[:index + 1]):
+                added += self._read_from(backup)
+                self._offset = 0
+            return added
+
+        # The old log was rotated past the last backup; its tail and any backups after it are lost
+        self.rotations_missed += 1
+        self._offset = 0
+        logger.warning(
+            f"[P20P7S3T5] Rotated usage log for {self.log_file} not found in {len(backups)} backups; "
+            f"usage totals may be undercounted ({self.rotations_missed} missed)"
+        )
+        return added
+
+    def _read_from(self, path: str) -> int:
+        """Parse complete lines after the current offset; a partial last line waits."""
+        added = 0
+        with open(path, 'rb') as f:
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                self._offset += len(line)
+                try:
+                    record = json.loads(line)
+                    key = (record['provider'], record['model'], record['timestamp'][:HOUR_KEY_LENGTH])
+                    totals = self._buckets.get(key)
+                    if totals is None:
+                        totals = self._buckets[key] = {
+                            "cost_usd": 0.0,
+                            "total_tokens": 0,
+                            "calls": 0,
+                            "successful_calls": 0,
+                            "latency": 0.0
+                        }
+                    totals["cost_usd"] += record['cost_usd']
+                    totals["total_tokens"] += record['total_tokens']
+                    totals["calls"] += 1
+                    totals["successful_calls"] += 1 if record['success'] else 0
+                    totals["latency"] += record['latency']
+                    added += 1
+                except (ValueError, KeyError, TypeError):
+                    # Not a usage record (e.g. a plain log line in the same file)
+                    self.lines_skipped += 1
+        self.lines_parsed += added
+        return added
+
+    def _load_checkpoint(self) -> None:
+        try:
+            with open(self.checkpoint_file, 'r') as f:
+                checkpoint = json.load(f)
+            if checkpoint.get("log_file") != os.path.abspath(self.log_file):
+                return
+            self._offset = checkpoint["offset"]
+            self._inode = checkpoint["inode"]
+            self._buckets = {
+                (row["provider"], row["model"], row["hour"]): row["totals"]
+                for row in checkpoint["buckets"]
+            }
+        except FileNotFoundError:
+            return
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"[P20P7S3T5] Ignoring unreadable usage checkpoint {self.checkpoint_file}: {e}")
+            self._buckets, self._offset, self._inode = {}, 0, None
+
+    def _save_checkpoint(self) -> None:
+        checkpoint = {
+            "log_file": os.path.abspath(self.log_file),
+            "offset": self._offset,
+            "inode": self._inode,
+            "buckets": [
+                {"provider": provider, "model": model, "hour": hour, "totals": totals}
+                for (provider, model, hour), totals in self._buckets.items()
+            ]
+        }
+        temp_file = f"{self.checkpoint_file}.tmp"
+        try:
+            with open(temp_file, 'w') as f:
+                json.dump(checkpoint, f)
+            os.replace(temp_file, self.checkpoint_file)
+        except OSError as e:
+            logger.warning(f"[P20P7S3T5] Failed to save usage checkpoint: {e}")